@@ -0,0 +1,272 @@
+import numpy as np
+import re
+
+# Tokenizers shared by the analyzers. Description tokens are kept at 3+ chars
+# (what content correlation uses); pattern detection narrows them to 4+ chars.
+LOCATION_TOKEN_RE = re.compile(r'\b\w+\b')
+DESCRIPTION_TOKEN_RE = re.compile(r'\b\w{3,}\b')
+
+MISSING_DATE = np.iinfo(np.int64).min
+
+
+def intern_values(values):
+    """
+    Intern a sequence of hashable values into integer codes.
+
+    Codes are assigned in order of first appearance, so iterating the
+    returned labels matches the iteration order of a Counter built over
+    the same values. None maps to code -1.
+
+    Returns:
+        tuple: (codes as int32 array, labels tuple)
+    """
+    table = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        if value is None:
+            codes[i] = -1
+            continue
+        code = table.get(value)
+        if code is None:
+            code = table[value] = len(table)
+        codes[i] = code
+    return codes, tuple(table)
+
+
+def small_int_codes(codes):
+    """Downcast interned codes to the smallest signed int type that fits"""
+    if len(codes) == 0 or codes.max() < np.iinfo(np.int8).max:
+        return codes.astype(np.int8)
+    if codes.max() < np.iinfo(np.int16).max:
+        return codes.astype(np.int16)
+    return codes
+
+
+class TokenColumn:
+    """
+    Pre-split token lists stored in CSR form over a shared vocabulary.
+
+    Row i's tokens are ids[offsets[i]:offsets[i+1]] in document order
+    (duplicates kept). Per-row unique sets and an inverted index are built
+    lazily because only some analyzers need them.
+    """
+
+    def __init__(self, texts, pattern):
+        vocab = {}
+        ids = []
+        offsets = np.zeros(len(texts) + 1, dtype=np.int64)
+        for i, text in enumerate(texts):
+            if text:
+                for token in pattern.findall(text.lower()):
+                    token_id = vocab.get(token)
+                    if token_id is None:
+                        token_id = vocab[token] = len(vocab)
+                    ids.append(token_id)
+            offsets[i + 1] = len(ids)
+
+        self.vocab = tuple(vocab)
+        self.ids = np.array(ids, dtype=np.int32)
+        self.offsets = offsets
+        self._unique_rows = None
+        self._postings = None
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def row(self, i):
+        return self.ids[self.offsets[i]:self.offsets[i + 1]]
+
+    def unique_rows(self):
+        """Sorted unique token ids for every row"""
+        if self._unique_rows is None:
+            self._unique_rows = [np.unique(self.row(i)) for i in range(len(self))]
+        return self._unique_rows
+
+    def set_sizes(self):
+        return np.array([len(row) for row in self.unique_rows()], dtype=np.int64)
+
+    def postings(self):
+        """
+        Inverted index over the unique row sets.
+
+        Returns:
+            tuple: (row indices grouped by token, per-token offsets into them)
+        """
+        if self._postings is None:
+            rows = self.unique_rows()
+            lengths = np.array([len(row) for row in rows], dtype=np.int64)
+            tokens = np.concatenate(rows) if rows else np.empty(0, dtype=np.int32)
+            docs = np.repeat(np.arange(len(rows), dtype=np.int64), lengths)
+            order = np.argsort(tokens, kind='stable')
+            posting_offsets = np.zeros(len(self.vocab) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(tokens, minlength=len(self.vocab)), out=posting_offsets[1:])
+            self._postings = (docs[order], posting_offsets)
+        return self._postings
+
+    def rows_containing(self, token_id):
+        """Row indices (ascending) whose token set contains token_id"""
+        postings, posting_offsets = self.postings()
+        return postings[posting_offsets[token_id]:posting_offsets[token_id + 1]]
+
+    def document_frequencies(self):
+        """Number of rows containing each vocabulary token"""
+        return np.diff(self.postings()[1])
+
+    def intersection_counts(self, i):
+        """
+        Count shared unique tokens between row i and every row.
+
+        Walks the postings of row i's tokens, so the cost is proportional to
+        the postings touched rather than to n * vocabulary.
+        """
+        hits = [self.rows_containing(t) for t in self.unique_rows()[i]]
+        if not hits:
+            return np.zeros(len(self), dtype=np.int64)
+        return np.bincount(np.concatenate(hits), minlength=len(self))
+
+
+class CaseSnapshot:
+    """
+    Columnar, read-only view of a case's evidence, suspects and suspect links.
+
+    Built once per analysis run and shared by every analyzer. Dates are int64
+    epoch seconds (MISSING_DATE when absent), categorical columns are interned
+    into small integer codes with a parallel labels tuple, and free text is
+    pre-tokenized into TokenColumns.
+    """
+
+    def __init__(self, case_id, evidence_rows, suspect_rows, link_rows):
+        """
+        Args:
+            case_id (int): Case the snapshot belongs to
+            evidence_rows (list): Tuples of (id, evidence_number, type, description,
+                location, collection_date, status, reliability)
+            suspect_rows (list): Tuples of (id, full_name, status)
+            link_rows (list): Tuples of (suspect_id, evidence_id, match_status,
+                confidence, evidence_type, reliability)
+        """
+        self.case_id = case_id
+
+        # Evidence columns
+        columns = list(zip(*evidence_rows)) if evidence_rows else [()] * 8
+        ids, numbers, types, descriptions, locations, dates, statuses, reliabilities = columns
+
+        self.evidence_ids = np.array(ids, dtype=np.int64)
+        self.evidence_numbers = tuple(numbers)
+        self.descriptions = tuple(descriptions)
+        self.locations = tuple(location or None for location in locations)
+        self.dates = to_epoch_seconds(dates)
+
+        type_codes, self.type_labels = intern_values(types)
+        self.type_codes = small_int_codes(type_codes)
+        status_codes, self.status_labels = intern_values(statuses)
+        self.status_codes = small_int_codes(status_codes)
+        reliability_codes, self.reliability_labels = intern_values(reliabilities)
+        self.reliability_codes = small_int_codes(reliability_codes)
+
+        # Raw locations drive spatial patterns; lower-cased keys drive spatial correlation
+        self.location_codes, self.location_labels = intern_values(self.locations)
+        self.location_key_codes, _ = intern_values(
+            [location.lower() if location else None for location in self.locations]
+        )
+
+        self.location_tokens = TokenColumn(self.locations, LOCATION_TOKEN_RE)
+        self.description_tokens = TokenColumn(self.descriptions, DESCRIPTION_TOKEN_RE)
+
+        # Suspect columns
+        suspect_columns = list(zip(*suspect_rows)) if suspect_rows else [()] * 3
+        suspect_ids, suspect_names, suspect_statuses = suspect_columns
+        self.suspect_ids = np.array(suspect_ids, dtype=np.int64)
+        self.suspect_names = tuple(suspect_names)
+        suspect_status_codes, self.suspect_status_labels = intern_values(suspect_statuses)
+        self.suspect_status_codes = small_int_codes(suspect_status_codes)
+
+        # Link columns, grouped by suspect via CSR offsets
+        suspect_index = {suspect_id: i for i, suspect_id in enumerate(suspect_ids)}
+        link_rows = sorted(link_rows, key=lambda row: suspect_index[row[0]])
+        link_columns = list(zip(*link_rows)) if link_rows else [()] * 6
+        link_suspects, link_evidence, matches, confidences, link_types, link_reliabilities = link_columns
+
+        link_suspect_index = np.array([suspect_index[s] for s in link_suspects], dtype=np.int64)
+        self.link_offsets = np.zeros(len(suspect_ids) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(link_suspect_index, minlength=len(suspect_ids)), out=self.link_offsets[1:])
+
+        self.link_evidence_ids = np.array(link_evidence, dtype=np.int64)
+        match_codes, self.match_labels = intern_values(matches)
+        self.link_match_codes = small_int_codes(match_codes)
+        self.link_confidences = np.array(
+            [np.nan if c is None else c for c in confidences], dtype=np.float64
+        )
+        link_type_codes, self.link_type_labels = intern_values(link_types)
+        self.link_type_codes = small_int_codes(link_type_codes)
+        link_reliability_codes, self.link_reliability_labels = intern_values(link_reliabilities)
+        self.link_reliability_codes = small_int_codes(link_reliability_codes)
+
+    def __repr__(self):
+        return (f'<CaseSnapshot case={self.case_id} evidence={self.evidence_count} '
+                f'suspects={self.suspect_count} links={len(self.link_evidence_ids)}>')
+
+    @property
+    def evidence_count(self):
+        return len(self.evidence_ids)
+
+    @property
+    def suspect_count(self):
+        return len(self.suspect_ids)
+
+    def has_date(self):
+        return self.dates != MISSING_DATE
+
+    def type_label(self, i):
+        code = self.type_codes[i]
+        return self.type_labels[code] if code >= 0 else None
+
+    def label_weights(self, labels, weights, default=0.0):
+        """
+        Map a labels tuple onto a float lookup array indexed by code.
+
+        The array carries one trailing default entry so that code -1
+        (missing value) indexes it directly.
+        """
+        return np.array([weights.get(label, default) for label in labels] + [default], dtype=np.float64)
+
+    def prepare_features(self):
+        """
+        Build the lazily derived token features up front.
+
+        Call before handing the snapshot to analyzers running on several
+        threads so they share one copy instead of racing to build it.
+        """
+        for tokens in (self.location_tokens, self.description_tokens):
+            tokens.postings()
+        return self
+
+    def suspect_links(self, i):
+        """Slice bounds of suspect i's links in the link columns"""
+        return self.link_offsets[i], self.link_offsets[i + 1]
+
+
+def to_epoch_seconds(dates):
+    """Convert naive datetimes (treated as UTC) to int64 epoch seconds"""
+    result = np.full(len(dates), MISSING_DATE, dtype=np.int64)
+    present = [i for i, value in enumerate(dates) if value is not None]
+    if present:
+        values = np.array([dates[i] for i in present], dtype='datetime64[s]')
+        result[present] = values.astype(np.int64)
+    return result
+
+
+def build_case_snapshot(case_id, evidence_rows, suspect_rows=(), link_rows=()):
+    """
+    Build a CaseSnapshot from plain row tuples.
+
+    Args:
+        case_id (int): Case the rows belong to
+        evidence_rows (list): Evidence tuples, see CaseSnapshot
+        suspect_rows (list): Suspect tuples, see CaseSnapshot
+        link_rows (list): Link tuples, see CaseSnapshot
+
+    Returns:
+        CaseSnapshot: Columnar snapshot ready for the analyzers
+    """
+    return CaseSnapshot(case_id, list(evidence_rows), list(suspect_rows), list(link_rows))
@@ -0,0 +1,89 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from src.analysis_tools.evidence_correlation import find_evidence_correlations
+from src.analysis_tools.pattern_detection import detect_patterns
+from src.analysis_tools.probability_calculator import calculate_suspect_probabilities
+
+def run_comprehensive_analysis(snapshot, min_strength=0.3, min_confidence=0.5, prior_prob=0.5):
+    """
+    Run correlation, pattern and probability analysis over one case snapshot.
+    
+    The three stages share the snapshot's features and run concurrently.
+    Each stage is timed individually.
+    
+    Args:
+        snapshot (CaseSnapshot): Columnar case data
+        min_strength (float): Minimum correlation strength threshold (0-1)
+        min_confidence (float): Minimum pattern confidence threshold (0-1)
+        prior_prob (float): Prior probability for all suspects (0-1)
+        
+    Returns:
+        dict: Results per stage plus a 'timings' dict of milliseconds per stage
+    """
+    timings = {}
+    
+    # Build shared token features once, before the stages start
+    started = time.perf_counter()
+    snapshot.prepare_features()
+    timings['features'] = _elapsed_ms(started)
+    
+    stages = {
+        'correlations': lambda: find_evidence_correlations(snapshot, min_strength=min_strength),
+        'patterns': lambda: detect_patterns(snapshot, min_confidence=min_confidence),
+        'probabilities': lambda: calculate_suspect_probabilities(snapshot, prior_prob=prior_prob)
+    }
+    
+    with ThreadPoolExecutor(max_workers=len(stages)) as executor:
+        futures = {name: executor.submit(_timed, stage) for name, stage in stages.items()}
+    
+    results = {}
+    for name, future in futures.items():
+        results[name], timings[name] = future.result()
+    
+    results['timings'] = timings
+    return results
+
+def summarize_comprehensive_analysis(snapshot, results):
+    """
+    Generate the executive summary and findings text for a comprehensive report.
+    
+    Returns:
+        tuple: (executive_summary, findings)
+    """
+    correlations = results['correlations']
+    patterns = results['patterns']
+    probabilities = results['probabilities']
+    
+    executive_summary = (
+        f"Automated comprehensive analysis of {snapshot.evidence_count} evidence items "
+        f"and {snapshot.suspect_count} suspects identified {len(correlations)} evidence correlations, "
+        f"{len(patterns)} patterns and {len(probabilities)} suspect probability assessments."
+    )
+    
+    findings = []
+    if correlations:
+        top = correlations[0]
+        findings.append(
+            f"Strongest correlation: {top['evidence_a_number']} and {top['evidence_b_number']} "
+            f"({top['correlation_type']}, strength {top['correlation_strength']})"
+        )
+    if patterns:
+        findings.append(f"Most confident pattern: {patterns[0]['pattern_name']} ({patterns[0]['confidence_score']})")
+    if probabilities:
+        top = probabilities[0]
+        findings.append(f"Highest probability: {top['suspect_name']} ({top['probability_score']}). {top['hypothesis']}")
+    
+    if findings:
+        findings_text = ". ".join(findings) + "."
+    else:
+        findings_text = "No correlations, patterns or probability assessments met the configured thresholds."
+    
+    return executive_summary, findings_text
+
+def _timed(stage):
+    started = time.perf_counter()
+    result = stage()
+    return result, _elapsed_ms(started)
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
@@ -1,18 +1,34 @@
 import numpy as np
 from datetime import datetime
 import re
+from src.analysis_tools.case_snapshot import CaseSnapshot
+
+# Weights for the overall correlation strength (weighted average)
+CORRELATION_WEIGHTS = {
+    'temporal': 0.3,
+    'spatial': 0.3,
+    'content': 0.3,
+    'type': 0.1
+}
+
+# Evidence collected this many hours apart or more has no temporal correlation
+MAX_TEMPORAL_HOURS = 72
 
 def find_evidence_correlations(evidence_data, min_strength=0.3):
     """
     Analyzes evidence items to find correlations between them.
     
     Args:
-        evidence_data (list): List of dictionaries containing evidence information
+        evidence_data (list or CaseSnapshot): List of dictionaries containing evidence
+            information, or a columnar snapshot of the case
         min_strength (float): Minimum correlation strength threshold (0-1)
         
     Returns:
         list: List of correlation dictionaries with correlation details
     """
+    if isinstance(evidence_data, CaseSnapshot):
+        return find_snapshot_correlations(evidence_data, min_strength)
+    
     correlations = []
     
     # Skip if less than 2 evidence items
@@ -38,12 +54,7 @@ def find_evidence_correlations(evidence_data, min_strength=0.3):
             type_score = 1.0 if evidence_a.get('type') == evidence_b.get('type') else 0.0
             
             # Calculate overall correlation strength (weighted average)
-            weights = {
-                'temporal': 0.3,
-                'spatial': 0.3,
-                'content': 0.3,
-                'type': 0.1
-            }
+            weights = CORRELATION_WEIGHTS
             
             overall_strength = (
                 temporal_score * weights['temporal'] +
@@ -54,19 +65,10 @@ def find_evidence_correlations(evidence_data, min_strength=0.3):
             
             # Only include correlations above the threshold
             if overall_strength >= min_strength:
-                correlation_types = []
-                if temporal_score >= 0.7:
-                    correlation_types.append('temporal')
-                if spatial_score >= 0.7:
-                    correlation_types.append('spatial')
-                if content_score >= 0.7:
-                    correlation_types.append('content')
-                if type_score >= 0.7:
-                    correlation_types.append('type')
-                
-                if not correlation_types:
-                    correlation_types.append('composite')
-                
+                correlation_types = classify_correlation(
+                    temporal_score, spatial_score, content_score, type_score
+                )
+
                 # Generate description
                 description = generate_correlation_description(
                     evidence_a, evidence_b, temporal_score, spatial_score, 
@@ -115,7 +117,7 @@ def calculate_temporal_correlation(evidence_a, evidence_b):
         
         # Calculate score (closer = higher score)
         # 0 hours apart = 1.0, 24 hours apart = 0.5, 72+ hours apart = 0.0
-        max_hours = 72
+        max_hours = MAX_TEMPORAL_HOURS
         score = max(0, 1 - (time_diff / max_hours))
         
         return score
@@ -181,6 +183,28 @@ def calculate_content_correlation(evidence_a, evidence_b):
     
     return intersection / union
 
+def classify_correlation(temporal_score, spatial_score, content_score, type_score):
+    """
+    Determine which correlation types are strong enough to report.
+    
+    Returns:
+        list: Correlation type names, or ['composite'] if none stands out
+    """
+    correlation_types = []
+    if temporal_score >= 0.7:
+        correlation_types.append('temporal')
+    if spatial_score >= 0.7:
+        correlation_types.append('spatial')
+    if content_score >= 0.7:
+        correlation_types.append('content')
+    if type_score >= 0.7:
+        correlation_types.append('type')
+    
+    if not correlation_types:
+        correlation_types.append('composite')
+    
+    return correlation_types
+
 def generate_correlation_description(evidence_a, evidence_b, temporal_score, 
                                      spatial_score, content_score, type_score, 
                                      correlation_types):
@@ -190,34 +214,48 @@ def generate_correlation_description(evidence_a, evidence_b, temporal_score,
     Returns:
         str: Correlation description
     """
-    parts = []
-    
-    # Type correlation
-    if 'type' in correlation_types:
-        parts.append(f"Both items are {evidence_a.get('type', 'unknown')} evidence")
-    
-    # Temporal correlation
+    hours_apart = None
     if 'temporal' in correlation_types:
         try:
             date_a = datetime.fromisoformat(evidence_a.get('date', ''))
             date_b = datetime.fromisoformat(evidence_b.get('date', ''))
-            time_diff = abs((date_a - date_b).total_seconds()) / 3600
-            
-            if time_diff < 1:
-                parts.append(f"Collected within the same hour")
-            elif time_diff < 24:
-                parts.append(f"Collected approximately {int(time_diff)} hours apart")
-            else:
-                days = int(time_diff / 24)
-                parts.append(f"Collected {days} day{'s' if days > 1 else ''} apart")
+            hours_apart = abs((date_a - date_b).total_seconds()) / 3600
         except:
             pass
     
+    return compose_correlation_description(
+        correlation_types,
+        evidence_a.get('type', 'unknown'),
+        hours_apart,
+        evidence_a.get('location', ''),
+        evidence_b.get('location', '')
+    )
+
+def compose_correlation_description(correlation_types, evidence_type, hours_apart, loc_a, loc_b):
+    """
+    Build the correlation description from already extracted values.
+    
+    Returns:
+        str: Correlation description
+    """
+    parts = []
+    
+    # Type correlation
+    if 'type' in correlation_types:
+        parts.append(f"Both items are {evidence_type} evidence")
+    
+    # Temporal correlation
+    if 'temporal' in correlation_types and hours_apart is not None:
+        if hours_apart < 1:
+            parts.append(f"Collected within the same hour")
+        elif hours_apart < 24:
+            parts.append(f"Collected approximately {int(hours_apart)} hours apart")
+        else:
+            days = int(hours_apart / 24)
+            parts.append(f"Collected {days} day{'s' if days > 1 else ''} apart")
+    
     # Spatial correlation
     if 'spatial' in correlation_types:
-        loc_a = evidence_a.get('location', '')
-        loc_b = evidence_b.get('location', '')
-        
         if loc_a == loc_b:
             parts.append(f"Both found at the same location ({loc_a})")
         else:
@@ -234,3 +272,112 @@ def generate_correlation_description(evidence_a, evidence_b, temporal_score,
         description = "Multiple factors suggest these evidence items may be related."
     
     return description
+
+def find_snapshot_correlations(snapshot, min_strength=0.3):
+    """
+    Columnar variant of find_evidence_correlations over a CaseSnapshot.
+    
+    Scores each evidence item against all later items at once with NumPy
+    instead of comparing dictionaries pair by pair. Scores, ordering and
+    output shape match the dictionary-based implementation.
+    
+    Args:
+        snapshot (CaseSnapshot): Columnar case data
+        min_strength (float): Minimum correlation strength threshold (0-1)
+        
+    Returns:
+        list: List of correlation dictionaries with correlation details
+    """
+    correlations = []
+    count = snapshot.evidence_count
+    
+    # Skip if less than 2 evidence items
+    if count < 2:
+        return correlations
+    
+    weights = CORRELATION_WEIGHTS
+    dates = snapshot.dates
+    has_date = snapshot.has_date()
+    location_keys = snapshot.location_key_codes
+    location_tokens = snapshot.location_tokens
+    location_sizes = location_tokens.set_sizes()
+    description_tokens = snapshot.description_tokens
+    description_sizes = description_tokens.set_sizes()
+    type_codes = snapshot.type_codes
+    
+    for i in range(count - 1):
+        others = np.arange(i + 1, count)
+        
+        # Temporal correlation (time proximity)
+        temporal = np.zeros(len(others))
+        if has_date[i]:
+            dated = has_date[others]
+            hours = np.abs(dates[others][dated] - dates[i]) / 3600
+            temporal[dated] = np.maximum(0, 1 - (hours / MAX_TEMPORAL_HOURS))
+        
+        # Spatial correlation (exact location match, otherwise word overlap)
+        spatial = _jaccard_scores(location_tokens, location_sizes, i, others)
+        if location_keys[i] >= 0:
+            spatial[location_keys[others] == location_keys[i]] = 1.0
+        
+        # Content correlation (description word overlap)
+        content = _jaccard_scores(description_tokens, description_sizes, i, others)
+        
+        # Type correlation
+        type_match = (type_codes[others] == type_codes[i]).astype(np.float64)
+        
+        overall = (
+            temporal * weights['temporal'] +
+            spatial * weights['spatial'] +
+            content * weights['content'] +
+            type_match * weights['type']
+        )
+        
+        # Only build result dictionaries for correlations above the threshold
+        for k in np.flatnonzero(overall >= min_strength):
+            j = others[k]
+            correlation_types = classify_correlation(temporal[k], spatial[k], content[k], type_match[k])
+            
+            hours_apart = None
+            if has_date[i] and has_date[j]:
+                hours_apart = abs(int(dates[i]) - int(dates[j])) / 3600
+            
+            description = compose_correlation_description(
+                correlation_types,
+                snapshot.type_label(i) or 'unknown',
+                hours_apart,
+                snapshot.locations[i] or '',
+                snapshot.locations[j] or ''
+            )
+            
+            correlations.append({
+                'evidence_a_id': int(snapshot.evidence_ids[i]),
+                'evidence_a_number': snapshot.evidence_numbers[i],
+                'evidence_b_id': int(snapshot.evidence_ids[j]),
+                'evidence_b_number': snapshot.evidence_numbers[j],
+                'correlation_type': ','.join(correlation_types),
+                'correlation_strength': round(float(overall[k]), 2),
+                'description': description,
+                'detected_by': 'Automated Correlation Analysis',
+                'temporal_score': round(float(temporal[k]), 2),
+                'spatial_score': round(float(spatial[k]), 2),
+                'content_score': round(float(content[k]), 2),
+                'type_score': round(float(type_match[k]), 2)
+            })
+    
+    # Sort by correlation strength descending
+    correlations.sort(key=lambda x: x['correlation_strength'], reverse=True)
+    
+    return correlations
+
+def _jaccard_scores(tokens, sizes, i, others):
+    """Jaccard similarity between row i's token set and each row in others"""
+    scores = np.zeros(len(others))
+    if sizes[i] == 0:
+        return scores
+    
+    intersection = tokens.intersection_counts(i)[others]
+    union = sizes[i] + sizes[others] - intersection
+    valid = sizes[others] > 0
+    scores[valid] = intersection[valid] / union[valid]
+    return scores
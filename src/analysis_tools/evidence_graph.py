@@ -0,0 +1,327 @@
+import numpy as np
+
+# Node types and edge kinds; the integer codes are positions in these tuples
+NODE_TYPES = ('case', 'evidence', 'suspect', 'location')
+CASE, EVIDENCE, SUSPECT, LOCATION = range(len(NODE_TYPES))
+
+EDGE_KINDS = ('member', 'link', 'correlation', 'location')
+MEMBER, LINK, CORRELATION, SHARED_LOCATION = range(len(EDGE_KINDS))
+ALL_KINDS = (1 << len(EDGE_KINDS)) - 1
+
+# Node keys pack the type into the high bits of a single int64
+TYPE_SHIFT = 56
+ID_MASK = (1 << TYPE_SHIFT) - 1
+
+# Overlay edges kept before the CSR arrays are rebuilt
+MIN_COMPACT_EDGES = 10000
+COMPACT_FRACTION = 0.1
+
+
+def kind_mask(kinds=None):
+    """Bit mask of edge kinds by name; all kinds if kinds is empty"""
+    if not kinds:
+        return ALL_KINDS
+    mask = 0
+    for kind in kinds:
+        mask |= 1 << EDGE_KINDS.index(kind)
+    return mask
+
+
+def node_keys(node_type, ids):
+    return (np.int64(node_type) << TYPE_SHIFT) | np.asarray(ids, dtype=np.int64)
+
+
+def normalize_location(location):
+    return ' '.join(location.lower().split()) if location else None
+
+
+class EvidenceGraph:
+    """
+    Undirected graph of cases, evidence, suspects and locations in CSR form.
+
+    Nodes are identified by packed int64 keys (type << 56 | id) held in one
+    sorted array, so a node's index is a binary search and the graph needs
+    no per-node Python objects. Each undirected edge is stored in both
+    directions: neighbours of node i are indices[indptr[i]:indptr[i + 1]],
+    with the edge kind in kinds at the same positions.
+
+    Edges added after construction go to a small overlay (and new nodes get
+    indices after the CSR nodes) until compact() folds them into the arrays,
+    which happens automatically once the overlay grows past a fraction of
+    the graph. Traversals are level-synchronous and vectorized over each
+    BFS frontier. Instances are not thread safe; callers serialize access.
+    """
+
+    def __init__(self, src_keys, dst_keys, kinds, location_labels=()):
+        self.location_labels = list(location_labels)
+        self._location_codes = {label: code for code, label in enumerate(self.location_labels)}
+        self._build(
+            np.asarray(src_keys, dtype=np.int64),
+            np.asarray(dst_keys, dtype=np.int64),
+            np.asarray(kinds, dtype=np.int8)
+        )
+
+    def _build(self, src_keys, dst_keys, kinds):
+        # Correlating an item with itself adds nothing to connectivity
+        keep = src_keys != dst_keys
+        src_keys, dst_keys, kinds = src_keys[keep], dst_keys[keep], kinds[keep]
+
+        self.keys = np.unique(np.concatenate([src_keys, dst_keys]))
+        node_count = len(self.keys)
+        src = np.searchsorted(self.keys, src_keys)
+        dst = np.searchsorted(self.keys, dst_keys)
+
+        both_src = np.concatenate([src, dst])
+        both_dst = np.concatenate([dst, src])
+        order = np.argsort(both_src, kind='stable')
+
+        self.indptr = np.zeros(node_count + 1, dtype=np.int64)
+        np.cumsum(np.bincount(both_src, minlength=node_count), out=self.indptr[1:])
+        index_type = np.int32 if node_count < np.iinfo(np.int32).max else np.int64
+        self.indices = both_dst[order].astype(index_type)
+        self.kinds = np.concatenate([kinds, kinds])[order]
+
+        self.csr_edge_count = len(src)
+        self._extra_keys = []       # Keys of nodes added after the build, index = node_count + position
+        self._extra_index = {}
+        self._overlay = {}          # node index -> list of (neighbour index, kind)
+        self.overlay_edge_count = 0
+
+    @property
+    def node_count(self):
+        return len(self.keys) + len(self._extra_keys)
+
+    @property
+    def edge_count(self):
+        return self.csr_edge_count + self.overlay_edge_count
+
+    def location_code(self, label, create=False):
+        code = self._location_codes.get(label)
+        if code is None and create:
+            code = self._location_codes[label] = len(self.location_labels)
+            self.location_labels.append(label)
+        return code
+
+    def node_index(self, node_type, node_id):
+        """Index of a node, or None if it is not in the graph"""
+        key = int(node_keys(node_type, node_id))
+        position = int(np.searchsorted(self.keys, key))
+        if position < len(self.keys) and self.keys[position] == key:
+            return position
+        return self._extra_index.get(key)
+
+    def node_key(self, index):
+        """(type name, id) of a node index"""
+        key = int(self.keys[index]) if index < len(self.keys) else self._extra_keys[index - len(self.keys)]
+        return NODE_TYPES[key >> TYPE_SHIFT], key & ID_MASK
+
+    def _ensure_node(self, key):
+        position = int(np.searchsorted(self.keys, key))
+        if position < len(self.keys) and self.keys[position] == key:
+            return position
+        index = self._extra_index.get(key)
+        if index is None:
+            index = self._extra_index[key] = len(self.keys) + len(self._extra_keys)
+            self._extra_keys.append(key)
+        return index
+
+    def add_edges(self, src_keys, dst_keys, kinds):
+        """Add edges to the overlay, creating nodes as needed"""
+        for src_key, dst_key, kind in zip(src_keys, dst_keys, kinds):
+            if src_key == dst_key:
+                continue
+            a = self._ensure_node(int(src_key))
+            b = self._ensure_node(int(dst_key))
+            self._overlay.setdefault(a, []).append((b, int(kind)))
+            self._overlay.setdefault(b, []).append((a, int(kind)))
+            self.overlay_edge_count += 1
+
+        if self.overlay_edge_count > max(MIN_COMPACT_EDGES, COMPACT_FRACTION * self.csr_edge_count):
+            self.compact()
+
+    def edge_arrays(self):
+        """Every edge once, as (source keys, destination keys, kinds)"""
+        all_keys = np.concatenate([self.keys, np.array(self._extra_keys, dtype=np.int64)])
+        src = np.repeat(np.arange(len(self.keys), dtype=np.int64), np.diff(self.indptr))
+        once = src < self.indices
+        src_keys = [all_keys[src[once]]]
+        dst_keys = [all_keys[self.indices[once]]]
+        kinds = [self.kinds[once]]
+
+        overlay = [(a, b, kind) for a, edges in self._overlay.items() for b, kind in edges if a < b]
+        if overlay:
+            a, b, kind = (np.array(column) for column in zip(*overlay))
+            src_keys.append(all_keys[a])
+            dst_keys.append(all_keys[b])
+            kinds.append(kind.astype(np.int8))
+
+        return np.concatenate(src_keys), np.concatenate(dst_keys), np.concatenate(kinds)
+
+    def compact(self):
+        """Fold overlay edges and nodes into the CSR arrays"""
+        if self.overlay_edge_count or self._extra_keys:
+            self._build(*self.edge_arrays())
+
+    def _expand(self, frontier, mask):
+        """
+        Neighbours of every frontier node over edges allowed by mask.
+
+        Returns:
+            tuple: (neighbour indices, the frontier node each came from, edge kinds)
+        """
+        csr_frontier = frontier[frontier < len(self.keys)]
+        starts = self.indptr[csr_frontier]
+        counts = self.indptr[csr_frontier + 1] - starts
+        total = int(counts.sum())
+        if total:
+            # Positions of all neighbour slices, concatenated without a Python loop
+            positions = np.arange(total, dtype=np.int64) - np.repeat(np.cumsum(counts) - counts - starts, counts)
+            neighbours = self.indices[positions].astype(np.int64)
+            sources = np.repeat(csr_frontier, counts)
+            kinds = self.kinds[positions]
+        else:
+            neighbours = sources = np.empty(0, dtype=np.int64)
+            kinds = np.empty(0, dtype=np.int8)
+
+        if self._overlay:
+            extra = [(b, a, kind) for a in frontier.tolist() for b, kind in self._overlay.get(a, ())]
+            if extra:
+                b, a, kind = (np.array(column) for column in zip(*extra))
+                neighbours = np.concatenate([neighbours, b.astype(np.int64)])
+                sources = np.concatenate([sources, a.astype(np.int64)])
+                kinds = np.concatenate([kinds, kind.astype(np.int8)])
+
+        if mask != ALL_KINDS:
+            allowed = (np.left_shift(1, kinds.astype(np.int64)) & mask) != 0
+            neighbours, sources, kinds = neighbours[allowed], sources[allowed], kinds[allowed]
+        return neighbours, sources, kinds
+
+    def bfs(self, source, max_depth=None, mask=ALL_KINDS, target=None, max_nodes=None):
+        """
+        Breadth-first search from one node index.
+
+        Args:
+            source (int): Start node index
+            max_depth (int): Stop after this many hops; unlimited if None
+            mask (int): Allowed edge kinds, see kind_mask
+            target (int): Stop as soon as this node is reached
+            max_nodes (int): Stop once at least this many nodes were reached
+
+        Returns:
+            tuple: (visited indices in BFS order, their depths, parent arrays dict)
+        """
+        distance = np.full(self.node_count, -1, dtype=np.int32)
+        parent = np.full(self.node_count, -1, dtype=np.int64)
+        parent_kind = np.full(self.node_count, -1, dtype=np.int8)
+        distance[source] = 0
+
+        visited = [np.array([source], dtype=np.int64)]
+        frontier = visited[0]
+        reached = 1
+        depth = 0
+        while len(frontier) and (max_depth is None or depth < max_depth):
+            depth += 1
+            neighbours, sources, kinds = self._expand(frontier, mask)
+            new = distance[neighbours] == -1
+            neighbours, sources, kinds = neighbours[new], sources[new], kinds[new]
+            neighbours, first = np.unique(neighbours, return_index=True)
+
+            distance[neighbours] = depth
+            parent[neighbours] = sources[first]
+            parent_kind[neighbours] = kinds[first]
+            visited.append(neighbours)
+            reached += len(neighbours)
+            frontier = neighbours
+
+            if target is not None and distance[target] >= 0:
+                break
+            if max_nodes is not None and reached >= max_nodes:
+                break
+
+        order = np.concatenate(visited)
+        return order, distance[order], {'parent': parent, 'kind': parent_kind, 'distance': distance}
+
+    def shortest_path(self, source, target, mask=ALL_KINDS, max_depth=None):
+        """
+        Fewest-hop path between two node indices.
+
+        Returns:
+            list: (node index, kind of the edge leading to it or None) pairs from
+                  source to target, or None if they are not connected
+        """
+        if source == target:
+            return [(source, None)]
+        _, _, tree = self.bfs(source, max_depth=max_depth, mask=mask, target=target)
+        if tree['distance'][target] < 0:
+            return None
+
+        path = []
+        node = target
+        while node != source:
+            path.append((node, EDGE_KINDS[tree['kind'][node]]))
+            node = int(tree['parent'][node])
+        path.append((source, None))
+        path.reverse()
+        return path
+
+    def neighbourhood(self, source, k, mask=ALL_KINDS, max_nodes=None):
+        """
+        Nodes within k hops, nearest first.
+
+        Returns:
+            tuple: (node indices, hop distances), truncated to max_nodes
+        """
+        order, depths, _ = self.bfs(source, max_depth=k, mask=mask, max_nodes=max_nodes)
+        if max_nodes is not None:
+            order, depths = order[:max_nodes], depths[:max_nodes]
+        return order, depths
+
+    def component_labels(self, mask=ALL_KINDS):
+        """
+        Connected component label (smallest member index) of every node.
+
+        Vectorized union-find: each round hooks the larger root of every edge
+        onto the smaller one, then shortcuts parents until every node points
+        at its root. Converges in a logarithmic number of rounds in practice.
+        """
+        labels = np.arange(self.node_count, dtype=np.int64)
+        all_keys = np.concatenate([self.keys, np.array(self._extra_keys, dtype=np.int64)])
+        src_keys, dst_keys, kinds = self.edge_arrays()
+        if mask != ALL_KINDS:
+            allowed = (np.left_shift(1, kinds.astype(np.int64)) & mask) != 0
+            src_keys, dst_keys = src_keys[allowed], dst_keys[allowed]
+        src = self._indices_of(all_keys, src_keys)
+        dst = self._indices_of(all_keys, dst_keys)
+
+        while True:
+            low = np.minimum(labels[src], labels[dst])
+            high = np.maximum(labels[src], labels[dst])
+            pending = low != high
+            if not pending.any():
+                return labels
+            np.minimum.at(labels, high[pending], low[pending])
+            while True:
+                jumped = labels[labels]
+                if np.array_equal(jumped, labels):
+                    break
+                labels = jumped
+
+    def _indices_of(self, all_keys, keys):
+        extra_count = len(self._extra_keys)
+        if not extra_count:
+            return np.searchsorted(self.keys, keys)
+        order = np.argsort(all_keys, kind='stable')
+        return order[np.searchsorted(all_keys, keys, sorter=order)]
+
+    def components(self, mask=ALL_KINDS):
+        """
+        Component sizes, largest first.
+
+        Returns:
+            tuple: (component labels array, unique labels, sizes) with
+                   unique labels and sizes sorted by size descending
+        """
+        labels = self.component_labels(mask)
+        unique, sizes = np.unique(labels, return_counts=True)
+        order = np.argsort(-sizes, kind='stable')
+        return labels, unique[order], sizes[order]
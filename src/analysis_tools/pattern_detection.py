@@ -2,6 +2,10 @@ import numpy as np
 from datetime import datetime
 import re
 from collections import Counter, defaultdict
+from src.analysis_tools.case_snapshot import CaseSnapshot
+
+# Terms too generic to count as a content pattern
+CONTENT_STOP_TERMS = ['evidence', 'found', 'collected', 'located']
 
 def detect_patterns(evidence_data, min_confidence=0.5):
     """
@@ -9,12 +13,16 @@ def detect_patterns(evidence_data, min_confidence=0.5):
     spatial patterns, method patterns, etc.
     
     Args:
-        evidence_data (list): List of dictionaries containing evidence information
+        evidence_data (list or CaseSnapshot): List of dictionaries containing evidence
+            information, or a columnar snapshot of the case
         min_confidence (float): Minimum confidence threshold (0-1)
         
     Returns:
         list: List of pattern dictionaries with details
     """
+    if isinstance(evidence_data, CaseSnapshot):
+        return detect_snapshot_patterns(evidence_data, min_confidence)
+    
     patterns = []
     
     # Skip if insufficient evidence items
@@ -306,60 +314,81 @@ def detect_type_patterns(evidence_data, min_confidence):
             # Check for repeating sequences
             types_sequence = [e['type'] for e in dated_evidence]
             
-            # Look for repeating sequences of length 2-3
-            for seq_len in range(2, 4):
-                if len(types_sequence) >= seq_len * 2:  # Need at least two repetitions
-                    sequences = defaultdict(list)
+            patterns.extend(detect_type_sequences(
+                [e['id'] for e in dated_evidence], types_sequence, len(typed_evidence), min_confidence
+            ))
+    
+    return patterns
+
+def detect_type_sequences(sequence_ids, types_sequence, typed_count, min_confidence):
+    """
+    Find evidence type subsequences that repeat in chronological order.
+    
+    Args:
+        sequence_ids (list): Evidence IDs sorted chronologically
+        types_sequence (list): Evidence type of each item in sequence_ids
+        typed_count (int): Number of typed evidence items in the case
+        min_confidence (float): Minimum confidence threshold (0-1)
+        
+    Returns:
+        list: Sequential patterns detected
+    """
+    patterns = []
+    
+    # Look for repeating sequences of length 2-3
+    for seq_len in range(2, 4):
+        if len(types_sequence) >= seq_len * 2:  # Need at least two repetitions
+            sequences = defaultdict(list)
+            
+            # Extract all subsequences and their positions
+            for i in range(len(types_sequence) - seq_len + 1):
+                subseq = tuple(types_sequence[i:i+seq_len])
+                sequences[subseq].append(i)
+            
+            # Find repeating sequences
+            for subseq, positions in sequences.items():
+                if len(positions) >= 2:
+                    # Calculate average distance between repetitions
+                    distances = [positions[i+1] - positions[i] for i in range(len(positions)-1)]
+                    avg_distance = sum(distances) / len(distances)
+                    
+                    # Calculate variation in distances
+                    if len(distances) > 1:
+                        std_dev = np.std(distances)
+                        variation_coef = std_dev / avg_distance if avg_distance > 0 else float('inf')
+                        regularity = max(0, min(1, 1 - variation_coef))
+                    else:
+                        regularity = 0.5  # Only one distance, moderate confidence
                     
-                    # Extract all subsequences and their positions
-                    for i in range(len(types_sequence) - seq_len + 1):
-                        subseq = tuple(types_sequence[i:i+seq_len])
-                        sequences[subseq].append(i)
+                    # Calculate overall confidence based on repetitions and regularity
+                    confidence = min(1.0, len(positions) / (typed_count / seq_len) * 0.7 + regularity * 0.3)
                     
-                    # Find repeating sequences
-                    for subseq, positions in sequences.items():
-                        if len(positions) >= 2:
-                            # Calculate average distance between repetitions
-                            distances = [positions[i+1] - positions[i] for i in range(len(positions)-1)]
-                            avg_distance = sum(distances) / len(distances)
-                            
-                            # Calculate variation in distances
-                            if len(distances) > 1:
-                                std_dev = np.std(distances)
-                                variation_coef = std_dev / avg_distance if avg_distance > 0 else float('inf')
-                                regularity = max(0, min(1, 1 - variation_coef))
-                            else:
-                                regularity = 0.5  # Only one distance, moderate confidence
-                            
-                            # Calculate overall confidence based on repetitions and regularity
-                            confidence = min(1.0, len(positions) / (len(typed_evidence) / seq_len) * 0.7 + regularity * 0.3)
-                            
-                            if confidence >= min_confidence:
-                                # Get evidence IDs involved in this pattern
-                                pattern_evidence_ids = []
-                                for pos in positions:
-                                    for i in range(seq_len):
-                                        if pos + i < len(dated_evidence):
-                                            pattern_evidence_ids.append(dated_evidence[pos + i]['id'])
-                                
-                                evidence_ids = ",".join(map(str, pattern_evidence_ids))
-                                
-                                pattern = {
-                                    'pattern_name': f"Repeating evidence sequence: {' → '.join(subseq)}",
-                                    'description': f"A sequence of evidence types ({' → '.join(subseq)}) appears repeatedly in chronological order.",
-                                    'detection_method': "Sequential pattern analysis",
-                                    'confidence_score': round(confidence, 2),
-                                    'evidence_ids': evidence_ids,
-                                    'pattern_type': 'sequential',
-                                    'details': {
-                                        'sequence': subseq,
-                                        'repetitions': len(positions),
-                                        'avg_distance': avg_distance,
-                                        'regularity': round(regularity, 2)
-                                    }
-                                }
-                                
-                                patterns.append(pattern)
+                    if confidence >= min_confidence:
+                        # Get evidence IDs involved in this pattern
+                        pattern_evidence_ids = []
+                        for pos in positions:
+                            for i in range(seq_len):
+                                if pos + i < len(sequence_ids):
+                                    pattern_evidence_ids.append(sequence_ids[pos + i])
+                        
+                        evidence_ids = ",".join(map(str, pattern_evidence_ids))
+                        
+                        pattern = {
+                            'pattern_name': f"Repeating evidence sequence: {' → '.join(subseq)}",
+                            'description': f"A sequence of evidence types ({' → '.join(subseq)}) appears repeatedly in chronological order.",
+                            'detection_method': "Sequential pattern analysis",
+                            'confidence_score': round(confidence, 2),
+                            'evidence_ids': evidence_ids,
+                            'pattern_type': 'sequential',
+                            'details': {
+                                'sequence': subseq,
+                                'repetitions': len(positions),
+                                'avg_distance': avg_distance,
+                                'regularity': round(regularity, 2)
+                            }
+                        }
+                        
+                        patterns.append(pattern)
     
     return patterns
 
@@ -404,7 +433,7 @@ def detect_content_patterns(evidence_data, min_confidence):
     
     # Find common significant terms
     for term, count in term_counts.items():
-        if count >= 3 and term not in ['evidence', 'found', 'collected', 'located']:
+        if count >= 3 and term not in CONTENT_STOP_TERMS:
             # Calculate percentage of evidence items containing this term
             evidence_with_term = sum(1 for terms in evidence_terms.values() if term in terms)
             percentage = evidence_with_term / len(described_evidence)
@@ -461,3 +490,336 @@ def detect_content_patterns(evidence_data, min_confidence):
                     patterns.append(pattern)
     
     return patterns
+
+def detect_snapshot_patterns(snapshot, min_confidence=0.5):
+    """
+    Columnar variant of detect_patterns over a CaseSnapshot.
+    
+    Counting is done with NumPy over the snapshot's interned codes and
+    pre-split tokens. Patterns, ordering and output shape match the
+    dictionary-based implementation.
+    
+    Args:
+        snapshot (CaseSnapshot): Columnar case data
+        min_confidence (float): Minimum confidence threshold (0-1)
+        
+    Returns:
+        list: List of pattern dictionaries with details
+    """
+    patterns = []
+    
+    # Skip if insufficient evidence items
+    if snapshot.evidence_count < 3:
+        return patterns
+    
+    patterns.extend(detect_snapshot_temporal_patterns(snapshot, min_confidence))
+    patterns.extend(detect_snapshot_spatial_patterns(snapshot, min_confidence))
+    patterns.extend(detect_snapshot_type_patterns(snapshot, min_confidence))
+    patterns.extend(detect_snapshot_content_patterns(snapshot, min_confidence))
+    
+    # Sort by confidence score descending
+    patterns.sort(key=lambda x: x['confidence_score'], reverse=True)
+    
+    return patterns
+
+def _join_ids(snapshot, indices):
+    return ",".join(map(str, snapshot.evidence_ids[indices].tolist()))
+
+def _first_by_count(values, counts):
+    """
+    Most frequent value, ties broken by first appearance in values.
+    
+    Mirrors Counter(values).most_common(1) for integer-coded values.
+    """
+    best = counts.max()
+    candidates = np.flatnonzero(counts == best)
+    first_seen = [np.argmax(values == candidate) for candidate in candidates]
+    return int(candidates[int(np.argmin(first_seen))]), int(best)
+
+def detect_snapshot_temporal_patterns(snapshot, min_confidence):
+    """
+    Detect time-based patterns in evidence collection.
+    
+    Returns:
+        list: Temporal patterns detected
+    """
+    patterns = []
+    
+    dated = np.flatnonzero(snapshot.has_date())
+    
+    # Skip if insufficient dated evidence
+    if len(dated) < 3:
+        return patterns
+    
+    # Evidence indices in chronological order
+    ordered = dated[np.argsort(snapshot.dates[dated], kind='stable')]
+    dates = snapshot.dates[ordered]
+    
+    # Check for regular time intervals
+    intervals = np.diff(dates) / 3600
+    avg_interval = sum(intervals.tolist()) / len(intervals)
+    if avg_interval <= 48:  # Only consider patterns within 2 days
+        std_dev = np.std(intervals)
+        variation_coef = std_dev / avg_interval if avg_interval > 0 else float('inf')
+        
+        # Lower variation coefficient means more consistent intervals
+        if variation_coef < 0.5:
+            confidence = max(0, min(1, 1 - variation_coef))
+            
+            if confidence >= min_confidence:
+                if avg_interval < 1:
+                    interval_desc = f"{int(avg_interval * 60)} minutes"
+                elif avg_interval < 24:
+                    interval_desc = f"{int(avg_interval)} hours"
+                else:
+                    interval_desc = f"{avg_interval / 24:.1f} days"
+                
+                patterns.append({
+                    'pattern_name': f"Regular time interval pattern ({interval_desc})",
+                    'description': f"Evidence items were collected or created at regular intervals of approximately {interval_desc}.",
+                    'detection_method': "Temporal interval analysis",
+                    'confidence_score': round(float(confidence), 2),
+                    'evidence_ids': _join_ids(snapshot, ordered),
+                    'pattern_type': 'temporal',
+                    'details': {
+                        'average_interval_hours': avg_interval,
+                        'variation_coefficient': float(variation_coef)
+                    }
+                })
+    
+    # Check for time of day patterns
+    hours = (dates // 3600) % 24
+    most_common_hour, count = _first_by_count(hours, np.bincount(hours, minlength=24))
+    if count >= 3 and count >= len(ordered) * 0.6:
+        confidence = min(1.0, count / len(ordered))
+        
+        if confidence >= min_confidence:
+            hour_str = f"{most_common_hour:02d}:00-{most_common_hour+1:02d}:00"
+            
+            patterns.append({
+                'pattern_name': f"Time of day pattern ({hour_str})",
+                'description': f"Multiple evidence items were collected or created during the same time window ({hour_str}).",
+                'detection_method': "Time of day analysis",
+                'confidence_score': round(confidence, 2),
+                'evidence_ids': _join_ids(snapshot, ordered[hours == most_common_hour]),
+                'pattern_type': 'temporal',
+                'details': {
+                    'hour_of_day': most_common_hour,
+                    'items_in_pattern': count,
+                    'total_items': len(ordered)
+                }
+            })
+    
+    return patterns
+
+def detect_snapshot_spatial_patterns(snapshot, min_confidence):
+    """
+    Detect location-based patterns in evidence.
+    
+    Returns:
+        list: Spatial patterns detected
+    """
+    patterns = []
+    
+    location_codes = snapshot.location_codes
+    located_count = int(np.count_nonzero(location_codes >= 0))
+    
+    # Skip if insufficient located evidence
+    if located_count < 3:
+        return patterns
+    
+    # Location codes are interned in order of first appearance, matching Counter order
+    location_counts = np.bincount(location_codes[location_codes >= 0], minlength=len(snapshot.location_labels))
+    
+    for code in np.flatnonzero(location_counts >= 3):
+        count = int(location_counts[code])
+        confidence = min(1.0, count / located_count)
+        
+        if confidence < min_confidence:
+            continue
+        
+        location = snapshot.location_labels[code]
+        members = np.flatnonzero(location_codes == code)
+        types = Counter(snapshot.type_label(i) for i in members)
+        most_common_type, type_count = types.most_common(1)[0]
+        
+        if type_count == count:
+            # All items of same type at this location
+            pattern = {
+                'pattern_name': f"Location-specific {most_common_type} evidence",
+                'description': f"Multiple {most_common_type} evidence items were found at the same location: {location}.",
+                'detection_method': "Location clustering analysis",
+                'confidence_score': round(confidence, 2),
+                'evidence_ids': _join_ids(snapshot, members),
+                'pattern_type': 'spatial',
+                'details': {
+                    'location': location,
+                    'items_at_location': count,
+                    'evidence_type': most_common_type,
+                    'total_items': located_count
+                }
+            }
+        else:
+            # Mixed types at this location
+            pattern = {
+                'pattern_name': f"Evidence concentration at {location}",
+                'description': f"Multiple evidence items of different types were found at the same location: {location}.",
+                'detection_method': "Location clustering analysis",
+                'confidence_score': round(confidence, 2),
+                'evidence_ids': _join_ids(snapshot, members),
+                'pattern_type': 'spatial',
+                'details': {
+                    'location': location,
+                    'items_at_location': count,
+                    'evidence_types': dict(types),
+                    'total_items': located_count
+                }
+            }
+        
+        patterns.append(pattern)
+    
+    return patterns
+
+def detect_snapshot_type_patterns(snapshot, min_confidence):
+    """
+    Detect patterns in evidence types.
+    
+    Returns:
+        list: Type-based patterns detected
+    """
+    patterns = []
+    
+    type_codes = snapshot.type_codes
+    typed = np.flatnonzero(type_codes >= 0)
+    typed_count = len(typed)
+    
+    # Skip if insufficient evidence
+    if typed_count < 3:
+        return patterns
+    
+    # Type codes are interned in order of first appearance, matching Counter order
+    type_counts = np.bincount(type_codes[typed], minlength=len(snapshot.type_labels))
+    
+    for code in np.flatnonzero(type_counts >= 3):
+        count = int(type_counts[code])
+        if count < typed_count * 0.5:  # At least 50% of items
+            continue
+        
+        confidence = min(1.0, count / typed_count)
+        
+        if confidence >= min_confidence:
+            evidence_type = snapshot.type_labels[code]
+            
+            patterns.append({
+                'pattern_name': f"Predominant {evidence_type} evidence",
+                'description': f"The case contains a high proportion of {evidence_type} evidence ({count} out of {typed_count} items).",
+                'detection_method': "Evidence type distribution analysis",
+                'confidence_score': round(confidence, 2),
+                'evidence_ids': _join_ids(snapshot, np.flatnonzero(type_codes == code)),
+                'pattern_type': 'typological',
+                'details': {
+                    'evidence_type': evidence_type,
+                    'count': count,
+                    'percentage': round(count / typed_count * 100, 1),
+                    'total_items': typed_count
+                }
+            })
+    
+    # Check for chronological type sequences
+    if typed_count >= 4 and snapshot.has_date()[typed].all():
+        ordered = typed[np.argsort(snapshot.dates[typed], kind='stable')]
+        types_sequence = [snapshot.type_labels[code] for code in type_codes[ordered]]
+        
+        patterns.extend(detect_type_sequences(
+            snapshot.evidence_ids[ordered].tolist(), types_sequence, typed_count, min_confidence
+        ))
+    
+    return patterns
+
+def detect_snapshot_content_patterns(snapshot, min_confidence):
+    """
+    Detect patterns in evidence descriptions and content.
+    
+    Returns:
+        list: Content-based patterns detected
+    """
+    patterns = []
+    
+    described_count = sum(1 for description in snapshot.descriptions if description)
+    
+    # Skip if insufficient evidence
+    if described_count < 3:
+        return patterns
+    
+    # Significant terms are the 4+ char, non-numeric subset of the description tokens
+    tokens = snapshot.description_tokens
+    significant = np.array([len(term) >= 4 and not term.isdigit() for term in tokens.vocab], dtype=bool)
+    if not significant.any():
+        return patterns
+    
+    term_ids = tokens.ids[significant[tokens.ids]]
+    term_counts = np.bincount(term_ids, minlength=len(tokens.vocab))
+    document_counts = tokens.document_frequencies()
+    total_terms = len(term_ids)
+    
+    # Vocabulary ids follow first appearance, matching Counter order
+    for term_id in np.flatnonzero(term_counts >= 3):
+        term = tokens.vocab[term_id]
+        if term in CONTENT_STOP_TERMS:
+            continue
+        
+        count = int(term_counts[term_id])
+        evidence_with_term = int(document_counts[term_id])
+        percentage = evidence_with_term / described_count
+        
+        confidence = min(1.0, percentage * 0.7 + (count / total_terms) * 0.3)
+        
+        if confidence < min_confidence:
+            continue
+        
+        members = tokens.rows_containing(term_id)
+        type_counts = Counter(label for label in (snapshot.type_label(i) for i in members) if label)
+        
+        if not type_counts:
+            continue
+        
+        most_common_type, type_count = type_counts.most_common(1)[0]
+        type_specificity = type_count / len(members)
+        
+        if type_specificity > 0.8 and len(members) >= 3:
+            # Term is highly associated with a specific evidence type
+            pattern = {
+                'pattern_name': f"Term '{term}' in {most_common_type} evidence",
+                'description': f"The term '{term}' appears frequently in {most_common_type} evidence descriptions ({evidence_with_term} items).",
+                'detection_method': "Textual content analysis",
+                'confidence_score': round(confidence, 2),
+                'evidence_ids': _join_ids(snapshot, members),
+                'pattern_type': 'content',
+                'details': {
+                    'term': term,
+                    'occurrences': count,
+                    'evidence_items': evidence_with_term,
+                    'evidence_type': most_common_type,
+                    'type_specificity': round(type_specificity, 2)
+                }
+            }
+        else:
+            # Term appears across different evidence types
+            pattern = {
+                'pattern_name': f"Common term: '{term}'",
+                'description': f"The term '{term}' appears frequently across different types of evidence ({evidence_with_term} items).",
+                'detection_method': "Textual content analysis",
+                'confidence_score': round(confidence, 2),
+                'evidence_ids': _join_ids(snapshot, members),
+                'pattern_type': 'content',
+                'details': {
+                    'term': term,
+                    'occurrences': count,
+                    'evidence_items': evidence_with_term,
+                    'evidence_types': dict(type_counts)
+                }
+            }
+        
+        patterns.append(pattern)
+    
+    return patterns
@@ -1,17 +1,42 @@
 import numpy as np
-from collections import defaultdict
+from collections import Counter, defaultdict
+from src.analysis_tools.case_snapshot import CaseSnapshot
+
+# Evidence weights by match status
+MATCH_WEIGHTS = {
+    'match': 0.8,
+    'partial_match': 0.4,
+    'possible_match': 0.2,
+    'no_match': -0.6,
+    'inconclusive': 0.0
+}
+
+# Evidence weights by reliability
+RELIABILITY_WEIGHTS = {
+    'high': 1.0,
+    'medium': 0.7,
+    'low': 0.4,
+    'unknown': 0.2
+}
+
+SUPPORTING_STATUSES = ['match', 'partial_match']
+CONFLICTING_STATUSES = ['no_match', 'inconclusive']
 
 def calculate_suspect_probabilities(suspect_data, prior_prob=0.5):
     """
     Calculate probability scores for suspects based on evidence links.
     
     Args:
-        suspect_data (list): List of dictionaries containing suspect information and evidence links
+        suspect_data (list or CaseSnapshot): List of dictionaries containing suspect
+            information and evidence links, or a columnar snapshot of the case
         prior_prob (float): Prior probability for all suspects (0-1)
         
     Returns:
         list: List of probability assessment dictionaries
     """
+    if isinstance(suspect_data, CaseSnapshot):
+        return calculate_snapshot_probabilities(suspect_data, prior_prob)
+    
     probabilities = []
     
     # Process each suspect
@@ -31,9 +56,9 @@ def calculate_suspect_probabilities(suspect_data, prior_prob=0.5):
         
         # Create supporting and conflicting evidence lists
         supporting_links = [link for link in evidence_links 
-                            if link.get('match_status') in ['match', 'partial_match']]
+                            if link.get('match_status') in SUPPORTING_STATUSES]
         conflicting_links = [link for link in evidence_links 
-                             if link.get('match_status') in ['no_match', 'inconclusive']]
+                             if link.get('match_status') in CONFLICTING_STATUSES]
         
         # Extract evidence IDs
         supporting_evidence_ids = [str(link['evidence_id']) for link in supporting_links]
@@ -78,22 +103,8 @@ def calculate_bayesian_probability(evidence_links, prior_prob=0.5):
     # Start with prior probability
     p = prior_prob
     
-    # Evidence weights by match status
-    match_weights = {
-        'match': 0.8,
-        'partial_match': 0.4,
-        'possible_match': 0.2,
-        'no_match': -0.6,
-        'inconclusive': 0.0
-    }
-    
-    # Evidence weights by reliability
-    reliability_weights = {
-        'high': 1.0,
-        'medium': 0.7,
-        'low': 0.4,
-        'unknown': 0.2
-    }
+    match_weights = MATCH_WEIGHTS
+    reliability_weights = RELIABILITY_WEIGHTS
     
     # Calculate likelihood ratio for each piece of evidence
     for link in evidence_links:
@@ -164,8 +175,6 @@ def identify_key_factors(evidence_links, probability):
     Returns:
         str: Description of key factors
     """
-    factors = []
-    
     # Count evidence by type and match status
     type_counts = defaultdict(int)
     match_counts = defaultdict(int)
@@ -176,9 +185,25 @@ def identify_key_factors(evidence_links, probability):
         if 'match_status' in link:
             match_counts[link['match_status']] += 1
     
+    return describe_key_factors(len(evidence_links), type_counts, match_counts)
+
+def describe_key_factors(link_count, type_counts, match_counts):
+    """
+    Describe the key factors from pre-computed evidence counts.
+    
+    Args:
+        link_count (int): Number of evidence links assessed
+        type_counts (dict): Link count per evidence type, in link order
+        match_counts (dict): Link count per match status
+        
+    Returns:
+        str: Description of key factors
+    """
+    factors = []
+    
     # Describe amount of evidence
-    if evidence_links:
-        factors.append(f"Analysis based on {len(evidence_links)} pieces of evidence")
+    if link_count:
+        factors.append(f"Analysis based on {link_count} pieces of evidence")
     
     # Describe matching evidence
     match_count = match_counts.get('match', 0)
@@ -202,7 +227,7 @@ def identify_key_factors(evidence_links, probability):
     # Describe predominant evidence types if applicable
     if type_counts:
         most_common_type = max(type_counts.items(), key=lambda x: x[1])
-        if most_common_type[1] >= 3 and most_common_type[1] >= len(evidence_links) * 0.5:
+        if most_common_type[1] >= 3 and most_common_type[1] >= link_count * 0.5:
             s = 's' if most_common_type[1] > 1 else ''
             factors.append(f"Predominantly {most_common_type[0]} evidence ({most_common_type[1]} item{s})")
     
@@ -233,3 +258,81 @@ def generate_hypothesis(suspect_name, probability):
         return f"Evidence substantially indicates {suspect_name} was not involved"
     else:
         return f"Evidence strongly suggests {suspect_name} was not involved in the crime"
+
+def calculate_snapshot_probabilities(snapshot, prior_prob=0.5):
+    """
+    Columnar variant of calculate_suspect_probabilities over a CaseSnapshot.
+    
+    Per-link weights and likelihood ratios are computed for every link at
+    once from the snapshot's interned codes; only the Bayesian update itself
+    runs per link. Results match the dictionary-based implementation.
+    
+    Args:
+        snapshot (CaseSnapshot): Columnar case data
+        prior_prob (float): Prior probability for all suspects (0-1)
+        
+    Returns:
+        list: List of probability assessment dictionaries
+    """
+    probabilities = []
+    
+    # Unknown match statuses carry no weight; unknown reliabilities leave the weight unchanged
+    match_weight = snapshot.label_weights(snapshot.match_labels, MATCH_WEIGHTS)
+    reliability_weight = snapshot.label_weights(snapshot.link_reliability_labels, RELIABILITY_WEIGHTS, default=1.0)
+    confidences = snapshot.link_confidences
+    
+    weights = match_weight[snapshot.link_match_codes] * reliability_weight[snapshot.link_reliability_codes]
+    weights = weights * np.where(np.isnan(confidences), 1.0, confidences)
+    
+    # Likelihood ratio per link (supporting > 1, conflicting < 1)
+    with np.errstate(divide='ignore'):
+        ratios = np.where(weights > 0, 1 + weights, 1 / (1 - weights))
+    
+    supporting = np.array([label in SUPPORTING_STATUSES for label in snapshot.match_labels] + [False])
+    conflicting = np.array([label in CONFLICTING_STATUSES for label in snapshot.match_labels] + [False])
+    match_codes = snapshot.link_match_codes
+    
+    for i in range(snapshot.suspect_count):
+        start, end = snapshot.suspect_links(i)
+        
+        # Skip if no evidence links
+        if start == end:
+            continue
+        
+        link_count = int(end - start)
+        codes = match_codes[start:end]
+        
+        # Update probability using Bayes' rule, skipping links with no impact
+        probability = prior_prob
+        for lr in ratios[start:end][weights[start:end] != 0].tolist():
+            probability = (probability * lr) / (probability * lr + (1-probability))
+        
+        evidence_ids = snapshot.link_evidence_ids[start:end]
+        supporting_ids = evidence_ids[supporting[codes]].tolist()
+        conflicting_ids = evidence_ids[conflicting[codes]].tolist()
+        
+        type_counts = Counter(snapshot.link_type_labels[code] for code in snapshot.link_type_codes[start:end])
+        match_counts = Counter(snapshot.match_labels[code] if code >= 0 else None for code in codes)
+        factors = describe_key_factors(link_count, type_counts, match_counts)
+        
+        name = snapshot.suspect_names[i]
+        
+        probabilities.append({
+            'suspect_id': int(snapshot.suspect_ids[i]),
+            'suspect_name': name,
+            'hypothesis': generate_hypothesis(name, probability),
+            'probability_score': round(probability, 3),
+            'confidence_interval': calculate_confidence_interval(probability, link_count),
+            'assessment_method': 'Bayesian evidence analysis',
+            'factors_considered': factors,
+            'supporting_evidence_ids': ','.join(map(str, supporting_ids)),
+            'conflicting_evidence_ids': ','.join(map(str, conflicting_ids)),
+            'evidence_count': link_count,
+            'supporting_count': len(supporting_ids),
+            'conflicting_count': len(conflicting_ids)
+        })
+    
+    # Sort by probability score descending
+    probabilities.sort(key=lambda x: x['probability_score'], reverse=True)
+    
+    return probabilities
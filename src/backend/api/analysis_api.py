@@ -1,15 +1,25 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, abort, send_file
 from datetime import datetime
+from sqlalchemy import select, insert, func
 import json
+import time
 from src.database.db_init import db
 from src.backend.models.analysis_model import AnalysisReport, PatternAnalysis, EvidenceCorrelation, ProbabilityAssessment
 from src.backend.models.analysis_model import AnalysisType, ConfidenceLevel
 from src.backend.models.evidence_model import Evidence
 from src.backend.models.suspect_model import Suspect
 from src.backend.utils.auth import token_required, has_permission
-from src.analysis_tools.evidence_correlation import find_evidence_correlations
-from src.analysis_tools.pattern_detection import detect_patterns
-from src.analysis_tools.probability_calculator import calculate_suspect_probabilities
+from src.backend.utils.reference_data import get_user_names
+from src.backend.utils.schemas import REPORT_SUMMARY
+from src.backend.utils.http_middleware import versioned
+from src.backend.utils.report_loader import load_report_detail, REPORT_SECTIONS, MAX_SECTION_LIMIT
+from src.backend.utils.metrics import observe_analysis
+from src.backend.utils.analysis_profiler import profiled, load_profile, list_profiles, artifact_path, ARTIFACTS
+from src.database.counters import increment_counters
+from src.database.sharding import fan_out
+from src.database.replicas import replica_reads
+from src.backend.utils.case_events import publish_case_event
+from src.backend.utils.batch import parse_batch_request, missing_fields, coerce_ids, existing_ids, invalid_value, split_valid, bulk_insert, batch_response
 
 analysis_bp = Blueprint('analysis', __name__)
 
@@ -20,11 +30,26 @@ def get_all_reports(current_user):
     if not has_permission(current_user, 'analysis:view'):
         return jsonify({'message': 'Not authorized to view analysis reports'}), 403
     
+    filters = request.args.to_dict()
+    
+    # Without a case, users who see every department get the reports of all shards, merged
+    if not filters.get('case_id') and has_permission(current_user, 'department:view_all'):
+        results = fan_out(lambda: report_summaries(filters))
+        report_list = [report for _, reports in results for report in reports]
+        if len(results) > 1:
+            report_list.sort(key=lambda report: report['created_at'] or datetime.min, reverse=True)
+    else:
+        report_list = report_summaries(filters)
+    
+    return jsonify(report_list), 200
+
+def report_summaries(filters):
+    """Report list entries matching the list filters, newest first, as plain dictionaries"""
     # Parse query parameters
-    case_id = request.args.get('case_id')
-    analysis_type = request.args.get('type')
-    analyst_id = request.args.get('analyst_id')
-    is_final = request.args.get('is_final', '').lower() == 'true'
+    case_id = filters.get('case_id')
+    analysis_type = filters.get('type')
+    analyst_id = filters.get('analyst_id')
+    is_final = filters.get('is_final', '').lower() == 'true'
     
     # Build query
     query = AnalysisReport.query
@@ -38,118 +63,65 @@ def get_all_reports(current_user):
     if analyst_id:
         query = query.filter(AnalysisReport.analyst_id == analyst_id)
         
-    if request.args.get('is_final') is not None:
+    if filters.get('is_final') is not None:
         query = query.filter(AnalysisReport.is_final == is_final)
     
     # Execute query with sorting
     reports = query.order_by(AnalysisReport.created_at.desc()).all()
     
-    # Return results
-    report_list = []
-    for report in reports:
-        report_list.append({
-            'id': report.id,
-            'case_id': report.case_id,
-            'title': report.title,
-            'analysis_type': report.analysis_type.value,
-            'analyst_id': report.analyst_id,
-            'analyst_name': report.analyst.get_full_name() if report.analyst else None,
-            'created_at': report.created_at.isoformat() if report.created_at else None,
-            'updated_at': report.updated_at.isoformat() if report.updated_at else None,
-            'overall_confidence': report.overall_confidence.value if report.overall_confidence else None,
-            'is_final': report.is_final,
-            'reviewer_id': report.reviewer_id,
-            'reviewer_name': report.reviewer.get_full_name() if report.reviewer else None,
-            'pattern_count': len(report.identified_patterns),
-            'correlation_count': len(report.evidence_correlations),
-            'probability_count': len(report.probability_assessments)
-        })
+    # Resolve analyst and reviewer names from the reference cache
+    user_names = get_user_names(
+        [report.analyst_id for report in reports] + [report.reviewer_id for report in reports]
+    )
     
-    return jsonify(report_list), 200
+    return REPORT_SUMMARY.many(reports, {'user_names': user_names})
+
+def report_version(report_id):
+    """
+    Version stamp of a report detail response.
+    
+    updated_at is bumped on every report update, including the counter
+    updates made when patterns, correlations or assessments are added. The
+    detail also renders rows the report only references: suspect names
+    (versioned by the assessed suspects' updated_at) and the analyst and
+    reviewer names, which come from the reference cache without a query.
+    Evidence numbers cannot change, so they need no stamp.
+    """
+    report = db.session.execute(
+        select(
+            AnalysisReport.updated_at, AnalysisReport.pattern_count,
+            AnalysisReport.correlation_count, AnalysisReport.probability_count,
+            AnalysisReport.analyst_id, AnalysisReport.reviewer_id
+        ).where(AnalysisReport.id == report_id)
+    ).first()
+    if report is None:
+        return None
+    
+    assessed_suspects = select(ProbabilityAssessment.suspect_id).where(ProbabilityAssessment.report_id == report_id)
+    suspects = db.session.execute(
+        select(func.max(Suspect.updated_at), func.count()).where(Suspect.id.in_(assessed_suspects))
+    ).first()
+    user_names = get_user_names([report.analyst_id, report.reviewer_id])
+    
+    return tuple(report), tuple(suspects), sorted(user_names.items())
 
 @analysis_bp.route('/reports/<int:report_id>', methods=['GET'])
 @token_required
+@versioned(report_version, permission='analysis:view')
 def get_report(current_user, report_id):
     """Get details for a specific analysis report"""
     if not has_permission(current_user, 'analysis:view'):
         return jsonify({'message': 'Not authorized to view analysis reports'}), 403
     
-    report = AnalysisReport.query.get_or_404(report_id)
+    # Optional keyset pagination of the child sections
+    limit = request.args.get('limit', type=int)
+    if limit is not None:
+        limit = max(1, min(limit, MAX_SECTION_LIMIT))
+    after = {section: request.args.get(f'{section}_after', type=int) for section in REPORT_SECTIONS}
     
-    # Build detailed response
-    report_detail = {
-        'id': report.id,
-        'case_id': report.case_id,
-        'title': report.title,
-        'analysis_type': report.analysis_type.value,
-        'analyst_id': report.analyst_id,
-        'analyst_name': report.analyst.get_full_name() if report.analyst else None,
-        'created_at': report.created_at.isoformat() if report.created_at else None,
-        'updated_at': report.updated_at.isoformat() if report.updated_at else None,
-        'executive_summary': report.executive_summary,
-        'methodology': report.methodology,
-        'findings': report.findings,
-        'conclusions': report.conclusions,
-        'recommendations': report.recommendations,
-        'overall_confidence': report.overall_confidence.value if report.overall_confidence else None,
-        'supporting_evidence_ids': report.supporting_evidence_ids,
-        'report_file': report.report_file,
-        'is_final': report.is_final,
-        'reviewer_id': report.reviewer_id,
-        'reviewer_name': report.reviewer.get_full_name() if report.reviewer else None,
-        'review_comments': report.review_comments,
-        'review_date': report.review_date.isoformat() if report.review_date else None,
-        'patterns': [],
-        'correlations': [],
-        'probability_assessments': []
-    }
-    
-    # Add patterns
-    for pattern in report.identified_patterns:
-        report_detail['patterns'].append({
-            'id': pattern.id,
-            'pattern_name': pattern.pattern_name,
-            'description': pattern.description,
-            'detection_method': pattern.detection_method,
-            'confidence_score': pattern.confidence_score,
-            'evidence_ids': pattern.evidence_ids,
-            'visual_representation': pattern.visual_representation,
-            'created_at': pattern.created_at.isoformat() if pattern.created_at else None
-        })
-    
-    # Add correlations
-    for correlation in report.evidence_correlations:
-        evidence_a = Evidence.query.get(correlation.evidence_a_id)
-        evidence_b = Evidence.query.get(correlation.evidence_b_id)
-        
-        report_detail['correlations'].append({
-            'id': correlation.id,
-            'evidence_a_id': correlation.evidence_a_id,
-            'evidence_a_number': evidence_a.evidence_number if evidence_a else None,
-            'evidence_b_id': correlation.evidence_b_id,
-            'evidence_b_number': evidence_b.evidence_number if evidence_b else None,
-            'correlation_type': correlation.correlation_type,
-            'correlation_strength': correlation.correlation_strength,
-            'description': correlation.description,
-            'detected_by': correlation.detected_by
-        })
-    
-    # Add probability assessments
-    for assessment in report.probability_assessments:
-        suspect = Suspect.query.get(assessment.suspect_id)
-        
-        report_detail['probability_assessments'].append({
-            'id': assessment.id,
-            'suspect_id': assessment.suspect_id,
-            'suspect_name': suspect.get_full_name() if suspect else None,
-            'hypothesis': assessment.hypothesis,
-            'probability_score': assessment.probability_score,
-            'confidence_interval': assessment.confidence_interval,
-            'assessment_method': assessment.assessment_method,
-            'factors_considered': assessment.factors_considered,
-            'supporting_evidence_ids': assessment.supporting_evidence_ids,
-            'conflicting_evidence_ids': assessment.conflicting_evidence_ids
-        })
+    report_detail = load_report_detail(report_id, limit=limit, after=after)
+    if report_detail is None:
+        abort(404)
     
     return jsonify(report_detail), 200
 
@@ -189,6 +161,14 @@ def create_report(current_user):
     db.session.add(new_report)
     db.session.commit()
     
+    publish_case_event(new_report.case_id, 'report_added', {
+        'report_id': new_report.id,
+        'title': new_report.title,
+        'analysis_type': new_report.analysis_type.value,
+        'analyst_id': current_user.id,
+        'is_final': new_report.is_final
+    }, permission='analysis:view')
+    
     return jsonify({
         'message': 'Analysis report created successfully',
         'report_id': new_report.id
@@ -414,7 +394,9 @@ def add_probability(current_user, report_id):
     }), 201
 
 @analysis_bp.route('/analyze/correlations', methods=['POST'])
+@replica_reads
 @token_required
+@profiled('correlations')
 def analyze_correlations(current_user):
     """Automatically detect correlations between evidence items"""
     if not has_permission(current_user, 'analysis:run'):
@@ -426,27 +408,23 @@ def analyze_correlations(current_user):
     if 'case_id' not in data:
         return jsonify({'message': 'Case ID is required'}), 400
     
-    # Get all evidence for the case
-    case_evidence = Evidence.query.filter_by(case_id=data['case_id']).all()
-    if not case_evidence:
-        return jsonify({'message': 'No evidence found for this case'}), 404
+    # The analysis engines pull in numpy, so they load on first use instead of at startup
+    from src.backend.utils.snapshot_loader import load_case_snapshot
+    from src.analysis_tools.evidence_correlation import find_evidence_correlations
     
-    # Prepare evidence data for analysis
-    evidence_data = []
-    for evidence in case_evidence:
-        evidence_data.append({
-            'id': evidence.id,
-            'evidence_number': evidence.evidence_number,
-            'type': evidence.evidence_type.value,
-            'description': evidence.description,
-            'location': evidence.location_found,
-            'date': evidence.collection_date.isoformat() if evidence.collection_date else None,
-            'status': evidence.status.value,
-            'reliability': evidence.reliability.value
-        })
+    # Load the case's evidence columns
+    started = time.perf_counter()
+    snapshot = load_case_snapshot(data['case_id'], include_suspects=False)
+    load_seconds = time.perf_counter() - started
+    if not snapshot.evidence_count:
+        return jsonify({'message': 'No evidence found for this case'}), 404
     
     # Run correlation analysis algorithm
-    correlations = find_evidence_correlations(evidence_data, min_strength=data.get('min_strength', 0.3))
+    started = time.perf_counter()
+    correlations = find_evidence_correlations(snapshot, min_strength=data.get('min_strength', 0.3))
+    observe_analysis('correlations', 'load', load_seconds, snapshot.evidence_count)
+    observe_analysis('correlations', 'analyze', time.perf_counter() - started, snapshot.evidence_count)
+    publish_analysis_completed(current_user, data['case_id'], 'correlations', correlations=len(correlations))
     
     # Return results
     return jsonify({
@@ -455,7 +433,9 @@ def analyze_correlations(current_user):
     }), 200
 
 @analysis_bp.route('/analyze/patterns', methods=['POST'])
+@replica_reads
 @token_required
+@profiled('patterns')
 def analyze_patterns(current_user):
     """Automatically detect patterns in evidence and case data"""
     if not has_permission(current_user, 'analysis:run'):
@@ -467,25 +447,22 @@ def analyze_patterns(current_user):
     if 'case_id' not in data:
         return jsonify({'message': 'Case ID is required'}), 400
     
-    # Get all evidence for the case
-    case_evidence = Evidence.query.filter_by(case_id=data['case_id']).all()
-    if not case_evidence:
-        return jsonify({'message': 'No evidence found for this case'}), 404
+    from src.backend.utils.snapshot_loader import load_case_snapshot
+    from src.analysis_tools.pattern_detection import detect_patterns
     
-    # Prepare evidence data for analysis
-    evidence_data = []
-    for evidence in case_evidence:
-        evidence_data.append({
-            'id': evidence.id,
-            'evidence_number': evidence.evidence_number,
-            'type': evidence.evidence_type.value,
-            'description': evidence.description,
-            'location': evidence.location_found,
-            'date': evidence.collection_date.isoformat() if evidence.collection_date else None
-        })
+    # Load the case's evidence columns
+    started = time.perf_counter()
+    snapshot = load_case_snapshot(data['case_id'], include_suspects=False)
+    load_seconds = time.perf_counter() - started
+    if not snapshot.evidence_count:
+        return jsonify({'message': 'No evidence found for this case'}), 404
     
     # Run pattern detection algorithm
-    patterns = detect_patterns(evidence_data, min_confidence=data.get('min_confidence', 0.5))
+    started = time.perf_counter()
+    patterns = detect_patterns(snapshot, min_confidence=data.get('min_confidence', 0.5))
+    observe_analysis('patterns', 'load', load_seconds, snapshot.evidence_count)
+    observe_analysis('patterns', 'analyze', time.perf_counter() - started, snapshot.evidence_count)
+    publish_analysis_completed(current_user, data['case_id'], 'patterns', patterns=len(patterns))
     
     # Return results
     return jsonify({
@@ -494,7 +471,9 @@ def analyze_patterns(current_user):
     }), 200
 
 @analysis_bp.route('/analyze/probabilities', methods=['POST'])
+@replica_reads
 @token_required
+@profiled('probabilities')
 def analyze_probabilities(current_user):
     """Calculate probability scores for suspects based on evidence"""
     if not has_permission(current_user, 'analysis:run'):
@@ -506,39 +485,384 @@ def analyze_probabilities(current_user):
     if 'case_id' not in data:
         return jsonify({'message': 'Case ID is required'}), 400
     
-    # Get all suspects for the case
-    case_suspects = Suspect.query.filter_by(case_id=data['case_id']).all()
-    if not case_suspects:
-        return jsonify({'message': 'No suspects found for this case'}), 404
+    from src.backend.utils.snapshot_loader import load_case_snapshot
+    from src.analysis_tools.probability_calculator import calculate_suspect_probabilities
     
-    # Get evidence links for all suspects
-    suspect_data = []
-    for suspect in case_suspects:
-        # Get evidence links
-        evidence_links = []
-        for link in suspect.evidence_links:
-            evidence = Evidence.query.get(link.evidence_id)
-            if evidence:
-                evidence_links.append({
-                    'evidence_id': link.evidence_id,
-                    'evidence_type': evidence.evidence_type.value,
-                    'match_status': link.match_status,
-                    'confidence': link.confidence,
-                    'reliability': evidence.reliability.value
-                })
-        
-        suspect_data.append({
-            'id': suspect.id,
-            'name': suspect.get_full_name(),
-            'status': suspect.status.value,
-            'evidence_links': evidence_links
-        })
+    # Load the case's suspects and their evidence links
+    started = time.perf_counter()
+    snapshot = load_case_snapshot(data['case_id'], include_evidence=False)
+    load_seconds = time.perf_counter() - started
+    if not snapshot.suspect_count:
+        return jsonify({'message': 'No suspects found for this case'}), 404
     
     # Run probability calculation algorithm
-    probabilities = calculate_suspect_probabilities(suspect_data)
+    started = time.perf_counter()
+    probabilities = calculate_suspect_probabilities(snapshot)
+    observe_analysis('probabilities', 'load', load_seconds, snapshot.suspect_count)
+    observe_analysis('probabilities', 'analyze', time.perf_counter() - started, snapshot.suspect_count)
+    publish_analysis_completed(current_user, data['case_id'], 'probabilities', probabilities=len(probabilities))
     
     # Return results
     return jsonify({
         'message': f'Calculated probabilities for {len(probabilities)} suspects',
         'probabilities': probabilities
     }), 200
+
+@analysis_bp.route('/analyze/comprehensive', methods=['POST'])
+@replica_reads
+@token_required
+@profiled('comprehensive')
+def analyze_comprehensive(current_user):
+    """Run all automated analyses for a case and store them as one comprehensive report"""
+    if not has_permission(current_user, 'analysis:run'):
+        return jsonify({'message': 'Not authorized to run automated analysis'}), 403
+    
+    data = request.get_json()
+    
+    # Validate required fields
+    if 'case_id' not in data:
+        return jsonify({'message': 'Case ID is required'}), 400
+    
+    persist = data.get('persist', True)
+    if persist and not has_permission(current_user, 'analysis:create'):
+        return jsonify({'message': 'Not authorized to create analysis reports'}), 403
+    
+    from src.backend.utils.snapshot_loader import load_case_snapshot
+    from src.analysis_tools.comprehensive_analysis import run_comprehensive_analysis
+    
+    # Load the case once for all stages
+    started = time.perf_counter()
+    snapshot = load_case_snapshot(data['case_id'])
+    load_ms = round((time.perf_counter() - started) * 1000, 2)
+    
+    if not snapshot.evidence_count and not snapshot.suspect_count:
+        return jsonify({'message': 'No evidence or suspects found for this case'}), 404
+    
+    # Run correlation, pattern and probability stages concurrently
+    results = run_comprehensive_analysis(
+        snapshot,
+        min_strength=data.get('min_strength', 0.3),
+        min_confidence=data.get('min_confidence', 0.5)
+    )
+    timings = {'load': load_ms}
+    timings.update(results.pop('timings'))
+    
+    report_id = None
+    if persist:
+        started = time.perf_counter()
+        report_id = save_comprehensive_report(current_user, snapshot, results, data.get('title'))
+        timings['persist'] = round((time.perf_counter() - started) * 1000, 2)
+    
+    for stage, milliseconds in timings.items():
+        observe_analysis('comprehensive', stage, milliseconds / 1000, snapshot.evidence_count)
+    publish_analysis_completed(current_user, data['case_id'], 'comprehensive', report_id=report_id,
+                               correlations=len(results['correlations']), patterns=len(results['patterns']),
+                               probabilities=len(results['probabilities']))
+    
+    # Return results
+    return jsonify({
+        'message': (f'Found {len(results["correlations"])} correlations, {len(results["patterns"])} patterns '
+                    f'and {len(results["probabilities"])} probability assessments'),
+        'report_id': report_id,
+        'correlations': results['correlations'],
+        'patterns': results['patterns'],
+        'probabilities': results['probabilities'],
+        'timings_ms': timings
+    }), 201 if persist else 200
+
+def publish_analysis_completed(current_user, case_id, analyzer, report_id=None, **counts):
+    """Tell the case's event streams that an automated analysis finished, with its result counts"""
+    publish_case_event(case_id, 'analysis_completed', {
+        'analyzer': analyzer,
+        'report_id': report_id,
+        'analyst_id': current_user.id,
+        'counts': counts
+    }, permission='analysis:view')
+
+def save_comprehensive_report(current_user, snapshot, results, title=None):
+    """Persist a comprehensive report and all of its children in a single transaction"""
+    from src.analysis_tools.comprehensive_analysis import summarize_comprehensive_analysis
+    now = datetime.utcnow()
+    executive_summary, findings = summarize_comprehensive_analysis(snapshot, results)
+    
+    # supporting_evidence_ids stays empty: the pattern, correlation and probability rows link
+    # their own evidence, and every id of a large case would not fit the column
+    report = AnalysisReport(
+        case_id=snapshot.case_id,
+        title=title or f"Comprehensive analysis {now.strftime('%Y-%m-%d %H:%M')}",
+        analysis_type=AnalysisType.COMPREHENSIVE,
+        analyst_id=current_user.id,
+        created_at=now,
+        executive_summary=executive_summary,
+        methodology="Automated correlation, pattern and Bayesian probability analysis over a shared case snapshot",
+        findings=findings
+    )
+    db.session.add(report)
+    db.session.flush()
+    
+    # Bulk insert the report children (executemany) instead of one ORM object per row
+    pattern_rows = [{
+        'report_id': report.id,
+        'pattern_name': pattern['pattern_name'],
+        'description': pattern['description'],
+        'detection_method': pattern['detection_method'],
+        'confidence_score': pattern['confidence_score'],
+        'evidence_ids': pattern['evidence_ids'],
+        'created_at': now,
+        'created_by': current_user.id
+    } for pattern in results['patterns']]
+    
+    correlation_rows = [{
+        'report_id': report.id,
+        'evidence_a_id': correlation['evidence_a_id'],
+        'evidence_b_id': correlation['evidence_b_id'],
+        'correlation_type': correlation['correlation_type'],
+        'correlation_strength': correlation['correlation_strength'],
+        'description': correlation['description'],
+        'detected_by': correlation['detected_by'],
+        'created_at': now
+    } for correlation in results['correlations']]
+    
+    probability_rows = [{
+        'report_id': report.id,
+        'suspect_id': assessment['suspect_id'],
+        'hypothesis': assessment['hypothesis'],
+        'probability_score': assessment['probability_score'],
+        'confidence_interval': assessment['confidence_interval'],
+        'assessment_method': assessment['assessment_method'],
+        'factors_considered': assessment['factors_considered'],
+        'supporting_evidence_ids': assessment['supporting_evidence_ids'],
+        'conflicting_evidence_ids': assessment['conflicting_evidence_ids'],
+        'created_at': now,
+        'assessed_by': current_user.id
+    } for assessment in results['probabilities']]
+    
+    for model, rows in ((PatternAnalysis, pattern_rows),
+                        (EvidenceCorrelation, correlation_rows),
+                        (ProbabilityAssessment, probability_rows)):
+        if rows:
+            db.session.execute(insert(model), rows)
+            increment_counters(model, rows)
+    
+    db.session.commit()
+    
+    return report.id
+
+@analysis_bp.route('/profiles', methods=['GET'])
+@token_required
+def get_profiles(current_user):
+    """List stored analysis profiles, newest first; without analysis:profile only the caller's own"""
+    user_id = None if has_permission(current_user, 'analysis:profile') else current_user.id
+    return jsonify(list_profiles(user_id)), 200
+
+@analysis_bp.route('/profiles/<job_id>', methods=['GET'])
+@token_required
+def get_profile(current_user, job_id):
+    """Get the metadata of one stored analysis profile"""
+    profile = load_profile(job_id)
+    if profile is None:
+        return jsonify({'message': 'Profile not found'}), 404
+    if profile.get('user_id') != current_user.id and not has_permission(current_user, 'analysis:profile'):
+        return jsonify({'message': 'Not authorized to view this profile'}), 403
+    return jsonify(profile), 200
+
+@analysis_bp.route('/profiles/<job_id>/<artifact>', methods=['GET'])
+@token_required
+def download_profile(current_user, job_id, artifact):
+    """Download a profile artifact: pstats for pstats/snakeviz, collapsed for flamegraph tools"""
+    profile = load_profile(job_id)
+    if profile is None or artifact not in profile.get('artifacts', []):
+        return jsonify({'message': 'Profile artifact not found'}), 404
+    if profile.get('user_id') != current_user.id and not has_permission(current_user, 'analysis:profile'):
+        return jsonify({'message': 'Not authorized to view this profile'}), 403
+    filename, mimetype = ARTIFACTS[artifact]
+    return send_file(
+        artifact_path(job_id, artifact),
+        mimetype=mimetype,
+        as_attachment=True,
+        download_name=f"{job_id}-{filename}"
+    )
+
+@analysis_bp.route('/reports/<int:report_id>/patterns/batch', methods=['POST'])
+@token_required
+def add_patterns_batch(current_user, report_id):
+    """Add many pattern analyses to a report in one transaction"""
+    if not has_permission(current_user, 'analysis:update'):
+        return jsonify({'message': 'Not authorized to update analysis reports'}), 403
+    
+    report = AnalysisReport.query.get_or_404(report_id)
+    
+    # Check if user is the analyst or has admin privileges
+    if report.analyst_id != current_user.id and not has_permission(current_user, 'analysis:update_any'):
+        return jsonify({'message': 'You can only update your own reports'}), 403
+    
+    items, mode, error = parse_batch_request(request.get_json())
+    if error:
+        return error
+    
+    # Validate every item in one pass
+    errors = {}
+    for index, item in enumerate(items):
+        missing = missing_fields(item, ('pattern_name', 'description'))
+        if missing:
+            errors[index] = f"Missing required fields: {', '.join(missing)}"
+            continue
+        invalid = invalid_value(PatternAnalysis, item, ('pattern_name', 'description', 'detection_method',
+                                                        'confidence_score', 'evidence_ids', 'visual_representation'))
+        if invalid:
+            errors[index] = invalid
+    
+    valid, results = split_valid(errors, len(items), mode)
+    
+    now = datetime.utcnow()
+    rows = [{
+        'report_id': report_id,
+        'pattern_name': items[index]['pattern_name'],
+        'description': items[index]['description'],
+        'detection_method': items[index].get('detection_method'),
+        'confidence_score': items[index].get('confidence_score'),
+        'evidence_ids': items[index].get('evidence_ids'),
+        'visual_representation': items[index].get('visual_representation'),
+        'created_at': now,
+        'created_by': current_user.id
+    } for index in valid]
+    
+    # Save to database
+    pattern_ids = bulk_insert(PatternAnalysis, rows)
+    db.session.commit()
+    
+    for index, pattern_id in zip(valid, pattern_ids):
+        results[index] = {'index': index, 'status': 'created', 'pattern_id': pattern_id}
+    
+    return batch_response(results, mode, bool(pattern_ids))
+
+@analysis_bp.route('/reports/<int:report_id>/correlations/batch', methods=['POST'])
+@token_required
+def add_correlations_batch(current_user, report_id):
+    """Add many evidence correlations to a report in one transaction"""
+    if not has_permission(current_user, 'analysis:update'):
+        return jsonify({'message': 'Not authorized to update analysis reports'}), 403
+    
+    report = AnalysisReport.query.get_or_404(report_id)
+    
+    # Check if user is the analyst or has admin privileges
+    if report.analyst_id != current_user.id and not has_permission(current_user, 'analysis:update_any'):
+        return jsonify({'message': 'You can only update your own reports'}), 403
+    
+    items, mode, error = parse_batch_request(request.get_json())
+    if error:
+        return error
+    
+    # Verify all referenced evidence exists with one IN query
+    errors = coerce_ids(items, ('evidence_a_id', 'evidence_b_id'))
+    found_evidence = existing_ids(Evidence.id, [
+        item.get(key) for index, item in enumerate(items) if isinstance(item, dict) and index not in errors
+        for key in ('evidence_a_id', 'evidence_b_id')
+    ])
+    
+    # Validate every item in one pass
+    required_fields = ['evidence_a_id', 'evidence_b_id', 'correlation_type', 'correlation_strength', 'description']
+    for index, item in enumerate(items):
+        if index in errors:
+            continue
+        missing = missing_fields(item, required_fields)
+        if missing:
+            errors[index] = f"Missing required fields: {', '.join(missing)}"
+        elif item['evidence_a_id'] not in found_evidence or item['evidence_b_id'] not in found_evidence:
+            errors[index] = 'One or both evidence items not found'
+        else:
+            invalid = invalid_value(EvidenceCorrelation, item, ('correlation_type', 'correlation_strength', 'description',
+                                                                'detected_by', 'verification_notes'))
+            if invalid:
+                errors[index] = invalid
+    
+    valid, results = split_valid(errors, len(items), mode)
+    
+    now = datetime.utcnow()
+    rows = [{
+        'report_id': report_id,
+        'evidence_a_id': items[index]['evidence_a_id'],
+        'evidence_b_id': items[index]['evidence_b_id'],
+        'correlation_type': items[index]['correlation_type'],
+        'correlation_strength': items[index]['correlation_strength'],
+        'description': items[index]['description'],
+        'detected_by': items[index].get('detected_by'),
+        'created_at': now,
+        'verified_by': current_user.id if items[index].get('verified', False) else None,
+        'verification_notes': items[index].get('verification_notes')
+    } for index in valid]
+    
+    # Save to database
+    correlation_ids = bulk_insert(EvidenceCorrelation, rows)
+    db.session.commit()
+    
+    for index, correlation_id in zip(valid, correlation_ids):
+        results[index] = {'index': index, 'status': 'created', 'correlation_id': correlation_id}
+    
+    return batch_response(results, mode, bool(correlation_ids))
+
+@analysis_bp.route('/reports/<int:report_id>/probabilities/batch', methods=['POST'])
+@token_required
+def add_probabilities_batch(current_user, report_id):
+    """Add many probability assessments to a report in one transaction"""
+    if not has_permission(current_user, 'analysis:update'):
+        return jsonify({'message': 'Not authorized to update analysis reports'}), 403
+    
+    report = AnalysisReport.query.get_or_404(report_id)
+    
+    # Check if user is the analyst or has admin privileges
+    if report.analyst_id != current_user.id and not has_permission(current_user, 'analysis:update_any'):
+        return jsonify({'message': 'You can only update your own reports'}), 403
+    
+    items, mode, error = parse_batch_request(request.get_json())
+    if error:
+        return error
+    
+    # Verify all referenced suspects exist with one IN query
+    errors = coerce_ids(items, ('suspect_id',))
+    found_suspects = existing_ids(Suspect.id, [
+        item.get('suspect_id') for index, item in enumerate(items) if isinstance(item, dict) and index not in errors
+    ])
+    
+    # Validate every item in one pass
+    required_fields = ['suspect_id', 'hypothesis', 'probability_score']
+    for index, item in enumerate(items):
+        if index in errors:
+            continue
+        missing = missing_fields(item, required_fields)
+        if missing:
+            errors[index] = f"Missing required fields: {', '.join(missing)}"
+        elif item['suspect_id'] not in found_suspects:
+            errors[index] = 'Suspect not found'
+        else:
+            invalid = invalid_value(ProbabilityAssessment, item, ('hypothesis', 'probability_score', 'confidence_interval',
+                                                                  'assessment_method', 'factors_considered',
+                                                                  'supporting_evidence_ids', 'conflicting_evidence_ids'))
+            if invalid:
+                errors[index] = invalid
+    
+    valid, results = split_valid(errors, len(items), mode)
+    
+    now = datetime.utcnow()
+    rows = [{
+        'report_id': report_id,
+        'suspect_id': items[index]['suspect_id'],
+        'hypothesis': items[index]['hypothesis'],
+        'probability_score': items[index]['probability_score'],
+        'confidence_interval': items[index].get('confidence_interval'),
+        'assessment_method': items[index].get('assessment_method'),
+        'factors_considered': items[index].get('factors_considered'),
+        'supporting_evidence_ids': items[index].get('supporting_evidence_ids'),
+        'conflicting_evidence_ids': items[index].get('conflicting_evidence_ids'),
+        'created_at': now,
+        'assessed_by': current_user.id
+    } for index in valid]
+    
+    # Save to database
+    assessment_ids = bulk_insert(ProbabilityAssessment, rows)
+    db.session.commit()
+    
+    for index, assessment_id in zip(valid, assessment_ids):
+        results[index] = {'index': index, 'status': 'created', 'assessment_id': assessment_id}
+    
+    return batch_response(results, mode, bool(assessment_ids))
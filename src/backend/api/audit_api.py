@@ -0,0 +1,92 @@
+from flask import Blueprint, request, jsonify, current_app
+from datetime import datetime
+from src.backend.models.audit_model import LogSealBatch
+from src.backend.utils.auth import token_required, has_permission
+from src.backend.utils.log_sealing import SEALED_LOGS, inclusion_proof, seal_pending_logs, DEFAULT_BATCH_SIZE, DEFAULT_SEAL_DELAY
+from src.backend.utils.log_archive import ARCHIVE_KEYS, query_archived_logs
+
+audit_bp = Blueprint('audit', __name__)
+
+@audit_bp.route('/proof/<log_table>/<int:entry_id>', methods=['GET'])
+@token_required
+def get_inclusion_proof(current_user, log_table, entry_id):
+    """Prove that a log entry is included in a sealed batch"""
+    if not has_permission(current_user, 'audit:view'):
+        return jsonify({'message': 'Not authorized to view audit proofs'}), 403
+    
+    if log_table not in SEALED_LOGS:
+        return jsonify({'message': f'Unknown log table, expected one of: {", ".join(SEALED_LOGS)}'}), 400
+    
+    proof = inclusion_proof(log_table, entry_id)
+    if proof is None:
+        return jsonify({'message': 'Log entry has not been sealed yet'}), 404
+    
+    return jsonify(proof), 200
+
+@audit_bp.route('/batches', methods=['GET'])
+@token_required
+def get_seal_batches(current_user):
+    """List sealed batch roots, newest first"""
+    if not has_permission(current_user, 'audit:view'):
+        return jsonify({'message': 'Not authorized to view audit proofs'}), 403
+    
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    before_seq = request.args.get('before_seq', type=int)
+    
+    query = LogSealBatch.query
+    if before_seq:
+        query = query.filter(LogSealBatch.seq < before_seq)
+    
+    batches = query.order_by(LogSealBatch.seq.desc()).limit(limit).all()
+    
+    return jsonify([{
+        'seq': batch.seq,
+        'log_table': batch.log_table,
+        'first_id': batch.first_id,
+        'last_id': batch.last_id,
+        'leaf_count': batch.leaf_count,
+        'merkle_root': batch.merkle_root,
+        'prev_hash': batch.prev_hash,
+        'batch_hash': batch.batch_hash,
+        'sealed_at': batch.sealed_at.isoformat()
+    } for batch in batches]), 200
+
+@audit_bp.route('/seal', methods=['POST'])
+@token_required
+def seal_logs(current_user):
+    """Seal pending log entries now instead of waiting for the background run"""
+    if not has_permission(current_user, 'audit:seal'):
+        return jsonify({'message': 'Not authorized to seal audit logs'}), 403
+    
+    sealed = seal_pending_logs(
+        batch_size=current_app.config.get('LOG_SEAL_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+        seal_delay=current_app.config.get('LOG_SEAL_DELAY', DEFAULT_SEAL_DELAY)
+    )
+    
+    return jsonify({'message': f'Sealed {sealed} batches', 'batches_sealed': sealed}), 200
+
+@audit_bp.route('/archive/<log_table>', methods=['GET'])
+@token_required
+def get_archived_logs(current_user, log_table):
+    """Query archived log entries by indexed key and time range"""
+    if not has_permission(current_user, 'audit:view'):
+        return jsonify({'message': 'Not authorized to view audit logs'}), 403
+    
+    if log_table not in ARCHIVE_KEYS:
+        return jsonify({'message': f'Unknown log table, expected one of: {", ".join(ARCHIVE_KEYS)}'}), 400
+    
+    # At most one indexed key filter, e.g. ?evidence_id=12 or ?user_id=3
+    key_name = next((key for key in ARCHIVE_KEYS[log_table] if key in request.args), None)
+    key_value = request.args.get(key_name, type=int) if key_name else None
+    
+    try:
+        start = datetime.fromisoformat(request.args['start']) if request.args.get('start') else None
+        end = datetime.fromisoformat(request.args['end']) if request.args.get('end') else None
+    except ValueError:
+        return jsonify({'message': 'Invalid date format, expected ISO 8601'}), 400
+    
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    
+    entries = query_archived_logs(log_table, key_name, key_value, start, end, limit)
+    
+    return jsonify(entries), 200
@@ -2,8 +2,9 @@ from flask import Blueprint, request, jsonify, current_app
 from werkzeug.security import generate_password_hash, check_password_hash
 from datetime import datetime
 from src.database.db_init import db
-from src.backend.models.user_model import User, Role, UserActivity
+from src.backend.models.user_model import User, UserActivity
 from src.backend.utils.auth import token_required, generate_token, has_permission
+from src.backend.utils.reference_data import get_role, get_all_roles, invalidate_reference_data, USERS
 
 auth_bp = Blueprint('auth', __name__)
 
@@ -78,7 +79,7 @@ def register(current_user):
         return jsonify({'message': 'Email already exists'}), 409
     
     # Validate role exists
-    role = Role.query.get(data['role_id'])
+    role = get_role(data['role_id'])
     if not role:
         return jsonify({'message': 'Invalid role ID'}), 400
     
@@ -101,6 +102,7 @@ def register(current_user):
     # Save user to database
     db.session.add(new_user)
     db.session.commit()
+    invalidate_reference_data(USERS)
     
     # Log user creation
     activity = UserActivity(
@@ -173,6 +175,7 @@ def update_profile(current_user):
     
     # Save changes
     db.session.commit()
+    invalidate_reference_data(USERS)
     
     return jsonify({'message': 'Profile updated successfully'}), 200
 
@@ -227,7 +230,8 @@ def get_user(current_user, user_id):
         },
         'created_at': user.created_at.isoformat() if user.created_at else None,
         'last_login': user.last_login.isoformat() if user.last_login else None,
-        'is_active': user.is_active
+        'is_active': user.is_active,
+        'profile_analysis': user.profile_analysis
     }
     
     # Include additional information for admins
@@ -273,7 +277,7 @@ def update_user(current_user, user_id):
     # Admin-only fields
     if has_permission(current_user, 'user:admin'):
         if 'role_id' in data:
-            role = Role.query.get(data['role_id'])
+            role = get_role(data['role_id'])
             if not role:
                 return jsonify({'message': 'Invalid role ID'}), 400
             user.role_id = data['role_id']
@@ -281,6 +285,9 @@ def update_user(current_user, user_id):
         if 'is_active' in data:
             user.is_active = data['is_active']
             
+        if 'profile_analysis' in data:
+            user.profile_analysis = bool(data['profile_analysis'])
+            
         # Reset password if requested
         if data.get('reset_password'):
             new_password = data.get('new_password', 'ChangeMe123!')
@@ -298,6 +305,7 @@ def update_user(current_user, user_id):
     
     # Save changes
     db.session.commit()
+    invalidate_reference_data(USERS)
     
     return jsonify({'message': 'User updated successfully'}), 200
 
@@ -306,20 +314,20 @@ def update_user(current_user, user_id):
 def get_roles(current_user):
     """Get list of all roles"""
     # Everyone can view roles, but only basic info if not admin
-    roles = Role.query.all()
+    include_admin_fields = has_permission(current_user, 'user:admin')
     role_list = []
     
-    for role in roles:
+    for role in get_all_roles():
         role_data = {
-            'id': role.id,
-            'name': role.name,
-            'description': role.description
+            'id': role['id'],
+            'name': role['name'],
+            'description': role['description']
         }
         
         # Include permissions for admins
-        if has_permission(current_user, 'user:admin'):
-            role_data['permissions'] = role.permissions
-            role_data['user_count'] = len(role.users)
+        if include_admin_fields:
+            role_data['permissions'] = role['permissions']
+            role_data['user_count'] = role['user_count']
         
         role_list.append(role_data)
     
@@ -1,9 +1,17 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, make_response
 from datetime import datetime
+from sqlalchemy import select, func
 from src.database.db_init import db
 from src.backend.models.case_model import Case, CaseNote, TimelineEvent, CaseStatus, CasePriority
-from src.backend.models.user_model import User
+from src.backend.models.evidence_model import Evidence, EvidenceLog
+from src.backend.models.suspect_model import Suspect, SuspectEvidenceLink, SuspectInterview
+from src.backend.models.analysis_model import AnalysisReport
 from src.backend.utils.auth import token_required, has_permission
+from src.backend.utils.reference_data import get_available_investigators, get_user_names, get_user_name
+from src.backend.utils.schemas import CASE_SUMMARY
+from src.database.sharding import fan_out, route_to_department, same_shard
+from src.backend.utils.case_events import publish_case_event, case_event_stream
+import hashlib
 import uuid
 
 case_bp = Blueprint('case', __name__)
@@ -15,13 +23,29 @@ def get_all_cases(current_user):
     if not has_permission(current_user, 'case:view'):
         return jsonify({'message': 'Not authorized to view cases'}), 403
     
+    filters = request.args.to_dict()
+    
+    # Users who see every department get the cases of all shards, listed in parallel and merged
+    if has_permission(current_user, 'department:view_all'):
+        results = fan_out(lambda: case_summaries(filters))
+        case_list = [case for _, cases in results for case in cases]
+        if len(results) > 1:
+            case_list.sort(key=case_sort_key(filters.get('sort_by', 'opened_date')),
+                           reverse=filters.get('sort_dir', 'desc') == 'desc')
+    else:
+        case_list = case_summaries(filters)
+    
+    return jsonify(case_list), 200
+
+def case_summaries(filters):
+    """Case list entries matching the list filters, as plain dictionaries"""
     # Parse query parameters
-    status = request.args.get('status')
-    priority = request.args.get('priority')
-    investigator_id = request.args.get('investigator_id')
-    search_term = request.args.get('search')
-    sort_by = request.args.get('sort_by', 'opened_date')
-    sort_dir = request.args.get('sort_dir', 'desc')
+    status = filters.get('status')
+    priority = filters.get('priority')
+    investigator_id = filters.get('investigator_id')
+    search_term = filters.get('search')
+    sort_by = filters.get('sort_by', 'opened_date')
+    sort_dir = filters.get('sort_dir', 'desc')
     
     # Build query
     query = Case.query
@@ -61,24 +85,20 @@ def get_all_cases(current_user):
     # Execute query
     cases = query.all()
     
-    # Return results
-    case_list = []
-    for case in cases:
-        case_list.append({
-            'id': case.id,
-            'case_number': case.case_number,
-            'title': case.title,
-            'status': case.status.value,
-            'priority': case.priority.value,
-            'crime_type': case.crime_type,
-            'opened_date': case.opened_date.isoformat() if case.opened_date else None,
-            'investigator_id': case.investigator_id,
-            'investigator_name': User.query.get(case.investigator_id).get_full_name(),
-            'evidence_count': len(case.evidence_items),
-            'suspect_count': len(case.suspects)
-        })
+    # Resolve investigator names from the reference cache
+    user_names = get_user_names(case.investigator_id for case in cases)
     
-    return jsonify(case_list), 200
+    return CASE_SUMMARY.many(cases, {'user_names': user_names})
+
+def case_sort_key(sort_by):
+    """Sort key for merging case lists from several shards the way the database orders one"""
+    if sort_by == 'priority':
+        return lambda case: getattr(case['priority'], 'name', '')  # Enum columns store and sort by name
+    if sort_by == 'title':
+        return lambda case: case['title']
+    if sort_by == 'opened_date':
+        return lambda case: (case['opened_date'] is not None, case['opened_date'] or datetime.min)
+    return lambda case: case['id']
 
 @case_bp.route('/<int:case_id>', methods=['GET'])
 @token_required
@@ -90,8 +110,7 @@ def get_case(current_user, case_id):
     case = Case.query.get_or_404(case_id)
     
     # Collect all investigators for the UI dropdown
-    investigators = User.query.filter_by(role_id=2).all()  # Assuming role_id 2 is "Investigator"
-    investigator_list = [{'id': i.id, 'name': i.get_full_name()} for i in investigators]
+    investigator_list, _ = get_available_investigators()
     
     # Build response
     response = {
@@ -107,11 +126,11 @@ def get_case(current_user, case_id):
         'opened_date': case.opened_date.isoformat() if case.opened_date else None,
         'closed_date': case.closed_date.isoformat() if case.closed_date else None,
         'investigator_id': case.investigator_id,
-        'investigator_name': User.query.get(case.investigator_id).get_full_name(),
+        'investigator_name': get_user_name(case.investigator_id),
         'department': case.department,
         'available_investigators': investigator_list,
-        'evidence_count': len(case.evidence_items),
-        'suspect_count': len(case.suspects),
+        'evidence_count': case.evidence_count,
+        'suspect_count': case.suspect_count,
         'timeline_count': len(case.timeline_events),
         'note_count': len(case.notes),
         'report_count': len(case.reports)
@@ -154,6 +173,9 @@ def create_case(current_user):
         department=data.get('department', current_user.department)
     )
     
+    # The case is stored in its department's shard, which may not be the user's
+    route_to_department(new_case.department)
+    
     # Save to database
     db.session.add(new_case)
     db.session.commit()
@@ -185,6 +207,10 @@ def update_case(current_user, case_id):
     case = Case.query.get_or_404(case_id)
     data = request.get_json()
     
+    # Moving a case between shards copies all of its data; that is the shard tool's job
+    if 'department' in data and not same_shard(case.department, data['department']):
+        return jsonify({'message': 'The new department is stored in another shard; move the case with the shard tool'}), 409
+    
     # Update fields
     if 'title' in data:
         case.title = data['title']
@@ -237,19 +263,9 @@ def get_case_timeline(current_user, case_id):
     Case.query.get_or_404(case_id)  # Check case exists
     
     timeline_events = TimelineEvent.query.filter_by(case_id=case_id).order_by(TimelineEvent.event_time).all()
+    user_names = get_user_names(event.created_by for event in timeline_events)
     
-    events = []
-    for event in timeline_events:
-        events.append({
-            'id': event.id,
-            'event_time': event.event_time.isoformat(),
-            'event_description': event.event_description,
-            'event_location': event.event_location,
-            'evidence_id': event.evidence_id,
-            'created_by': User.query.get(event.created_by).get_full_name(),
-            'is_verified': event.is_verified,
-            'verification_method': event.verification_method
-        })
+    events = [timeline_event_dict(event, user_names) for event in timeline_events]
     
     return jsonify(events), 200
 
@@ -283,6 +299,9 @@ def add_timeline_event(current_user, case_id):
     db.session.add(new_event)
     db.session.commit()
     
+    publish_case_event(case_id, 'timeline_event_added',
+                       timeline_event_dict(new_event, get_user_names([current_user.id])))
+    
     return jsonify({
         'message': 'Timeline event added successfully',
         'event_id': new_event.id
@@ -297,26 +316,10 @@ def get_case_notes(current_user, case_id):
     
     Case.query.get_or_404(case_id)  # Check case exists
     
-    # Handle private notes
-    if has_permission(current_user, 'notes:view_all'):
-        notes = CaseNote.query.filter_by(case_id=case_id).order_by(CaseNote.created_at.desc()).all()
-    else:
-        notes = CaseNote.query.filter(
-            CaseNote.case_id == case_id,
-            (CaseNote.is_private == False) | (CaseNote.user_id == current_user.id)
-        ).order_by(CaseNote.created_at.desc()).all()
-    
-    notes_list = []
-    for note in notes:
-        notes_list.append({
-            'id': note.id,
-            'note_text': note.note_text,
-            'created_at': note.created_at.isoformat(),
-            'updated_at': note.updated_at.isoformat() if note.updated_at else None,
-            'user_id': note.user_id,
-            'user_name': User.query.get(note.user_id).get_full_name(),
-            'is_private': note.is_private
-        })
+    notes = visible_notes_query(current_user, case_id).all()
+    user_names = get_user_names(note.user_id for note in notes)
+    
+    notes_list = [case_note_dict(note, user_names) for note in notes]
     
     return jsonify(notes_list), 200
 
@@ -347,7 +350,229 @@ def add_case_note(current_user, case_id):
     db.session.add(new_note)
     db.session.commit()
     
+    publish_case_event(case_id, 'note_added', case_note_dict(new_note, get_user_names([current_user.id])),
+                       private_to=current_user.id if new_note.is_private else None)
+    
     return jsonify({
         'message': 'Note added successfully',
         'note_id': new_note.id
     }), 201
+
+@case_bp.route('/<int:case_id>/events', methods=['GET'])
+@token_required
+def stream_case_events(current_user, case_id):
+    """Stream new evidence, notes, timeline events, custody changes and analyses of a case as server-sent events"""
+    if not has_permission(current_user, 'case:view'):
+        return jsonify({'message': 'Not authorized to view cases'}), 403
+    
+    Case.query.get_or_404(case_id)  # Check case exists
+    
+    return case_event_stream(current_user, case_id, request.headers.get('Last-Event-ID'))
+
+@case_bp.route('/<int:case_id>/view', methods=['GET'])
+@token_required
+def get_case_view(current_user, case_id):
+    """Get a case with its timeline, notes, evidence and suspects in one response"""
+    if not has_permission(current_user, 'case:view'):
+        return jsonify({'message': 'Not authorized to view cases'}), 403
+    
+    case = Case.query.get_or_404(case_id)
+    
+    can_view_evidence = has_permission(current_user, 'evidence:view')
+    can_view_suspects = has_permission(current_user, 'suspect:view')
+    investigator_list, investigators_version = get_available_investigators()
+    fingerprint = case_fingerprint(case_id)
+    
+    # Notes visibility and section permissions are per user, so they are part of the validator
+    etag = hashlib.sha1(repr((
+        case_row_values(case),
+        tuple(fingerprint),
+        investigators_version,
+        current_user.id,
+        has_permission(current_user, 'notes:view_all'),
+        can_view_evidence,
+        can_view_suspects
+    )).encode()).hexdigest()
+    
+    # Nothing changed since the client's copy: skip loading and serializing the sections
+    if request.if_none_match.contains_weak(etag):
+        response = make_response('', 304)
+        response.set_etag(etag, weak=True)
+        return response
+    
+    timeline_events = TimelineEvent.query.filter_by(case_id=case_id).order_by(TimelineEvent.event_time).all()
+    notes = visible_notes_query(current_user, case_id).all()
+    
+    # Every user referenced by the view, in one query
+    user_names = get_user_names(
+        [case.investigator_id] +
+        [event.created_by for event in timeline_events] +
+        [note.user_id for note in notes]
+    )
+    
+    response_data = {
+        'case': {
+            'id': case.id,
+            'case_number': case.case_number,
+            'title': case.title,
+            'description': case.description,
+            'status': case.status.value,
+            'priority': case.priority.value,
+            'crime_type': case.crime_type,
+            'crime_date': case.crime_date.isoformat() if case.crime_date else None,
+            'crime_location': case.crime_location,
+            'opened_date': case.opened_date.isoformat() if case.opened_date else None,
+            'closed_date': case.closed_date.isoformat() if case.closed_date else None,
+            'investigator_id': case.investigator_id,
+            'investigator_name': user_names.get(case.investigator_id),
+            'department': case.department,
+            'available_investigators': investigator_list,
+            'evidence_count': fingerprint.evidence_count,
+            'suspect_count': fingerprint.suspect_count,
+            'timeline_count': fingerprint.timeline_count,
+            'note_count': fingerprint.note_count,
+            'report_count': fingerprint.report_count
+        },
+        'timeline': [timeline_event_dict(event, user_names) for event in timeline_events],
+        'notes': [case_note_dict(note, user_names) for note in notes]
+    }
+    
+    if can_view_evidence:
+        response_data['evidence'] = case_evidence_list(case_id)
+    
+    if can_view_suspects:
+        response_data['suspects'] = case_suspect_list(case_id)
+    
+    response = make_response(jsonify(response_data), 200)
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'private, no-cache'
+    return response
+
+def visible_notes_query(current_user, case_id):
+    """Notes on a case the user may read, newest first"""
+    # Handle private notes
+    if has_permission(current_user, 'notes:view_all'):
+        query = CaseNote.query.filter_by(case_id=case_id)
+    else:
+        query = CaseNote.query.filter(
+            CaseNote.case_id == case_id,
+            (CaseNote.is_private == False) | (CaseNote.user_id == current_user.id)
+        )
+    return query.order_by(CaseNote.created_at.desc())
+
+def timeline_event_dict(event, user_names):
+    return {
+        'id': event.id,
+        'event_time': event.event_time.isoformat(),
+        'event_description': event.event_description,
+        'event_location': event.event_location,
+        'evidence_id': event.evidence_id,
+        'created_by': user_names.get(event.created_by),
+        'is_verified': event.is_verified,
+        'verification_method': event.verification_method
+    }
+
+def case_note_dict(note, user_names):
+    return {
+        'id': note.id,
+        'note_text': note.note_text,
+        'created_at': note.created_at.isoformat(),
+        'updated_at': note.updated_at.isoformat() if note.updated_at else None,
+        'user_id': note.user_id,
+        'user_name': user_names.get(note.user_id),
+        'is_private': note.is_private
+    }
+
+def case_row_values(case):
+    """The case's own column values, used in its view validator"""
+    return tuple(getattr(case, column.key) for column in Case.__table__.columns)
+
+def case_fingerprint(case_id):
+    """
+    Row counts and latest-modified timestamps of everything shown in the case view.
+
+    Counts catch deletions, timestamps catch edits. Evidence has no modified
+    column, so its changes are tracked through the non-view entries of the
+    evidence log that every evidence write path appends to.
+
+    Returns:
+        Row: Named counts and timestamps, computed in a single statement
+    """
+    case_evidence = select(Evidence.id).where(Evidence.case_id == case_id)
+    case_suspects = select(Suspect.id).where(Suspect.case_id == case_id)
+    
+    return db.session.execute(select(
+        select(func.count(Evidence.id)).where(Evidence.case_id == case_id)
+            .scalar_subquery().label('evidence_count'),
+        select(func.max(EvidenceLog.timestamp))
+            .where(EvidenceLog.evidence_id.in_(case_evidence), EvidenceLog.action != 'view')
+            .scalar_subquery().label('evidence_changed'),
+        select(func.count(Suspect.id)).where(Suspect.case_id == case_id)
+            .scalar_subquery().label('suspect_count'),
+        select(func.max(func.coalesce(Suspect.updated_at, Suspect.created_at))).where(Suspect.case_id == case_id)
+            .scalar_subquery().label('suspects_changed'),
+        select(func.count(SuspectEvidenceLink.id)).where(SuspectEvidenceLink.suspect_id.in_(case_suspects))
+            .scalar_subquery().label('link_count'),
+        select(func.max(SuspectEvidenceLink.linked_at)).where(SuspectEvidenceLink.suspect_id.in_(case_suspects))
+            .scalar_subquery().label('links_changed'),
+        select(func.count(SuspectInterview.id)).where(SuspectInterview.suspect_id.in_(case_suspects))
+            .scalar_subquery().label('interview_count'),
+        select(func.count(TimelineEvent.id)).where(TimelineEvent.case_id == case_id)
+            .scalar_subquery().label('timeline_count'),
+        select(func.max(TimelineEvent.created_at)).where(TimelineEvent.case_id == case_id)
+            .scalar_subquery().label('timeline_changed'),
+        select(func.count(CaseNote.id)).where(CaseNote.case_id == case_id)
+            .scalar_subquery().label('note_count'),
+        select(func.max(func.coalesce(CaseNote.updated_at, CaseNote.created_at))).where(CaseNote.case_id == case_id)
+            .scalar_subquery().label('notes_changed'),
+        select(func.count(AnalysisReport.id)).where(AnalysisReport.case_id == case_id)
+            .scalar_subquery().label('report_count')
+    )).one()
+
+def _counts_by(column, key_column, keys):
+    """Grouped row counts of column's table per key_column value"""
+    return dict(db.session.execute(
+        select(key_column, func.count(column)).where(key_column.in_(keys)).group_by(key_column)
+    ).all())
+
+def case_evidence_list(case_id):
+    """Evidence list entries for a case"""
+    evidence_items = Evidence.query.filter_by(case_id=case_id).all()
+    
+    return [{
+        'id': item.id,
+        'evidence_number': item.evidence_number,
+        'case_id': item.case_id,
+        'evidence_type': item.evidence_type.value,
+        'description': item.description,
+        'location_found': item.location_found,
+        'collection_date': item.collection_date.isoformat() if item.collection_date else None,
+        'status': item.status.value,
+        'reliability': item.reliability.value,
+        'is_key_evidence': item.is_key_evidence,
+        'storage_location': item.storage_location,
+        'chain_of_custody_complete': item.chain_of_custody_complete,
+        'file_count': item.file_count,
+        'analysis_count': item.analysis_count,
+        'custody_changes': item.custody_count
+    } for item in evidence_items]
+
+def case_suspect_list(case_id):
+    """Suspect list entries for a case, with link and interview counts loaded in grouped queries"""
+    suspects = Suspect.query.filter_by(case_id=case_id).order_by(Suspect.id).all()
+    case_suspects = select(Suspect.id).where(Suspect.case_id == case_id)
+    
+    interview_counts = _counts_by(SuspectInterview.id, SuspectInterview.suspect_id, case_suspects)
+    link_counts = _counts_by(SuspectEvidenceLink.id, SuspectEvidenceLink.suspect_id, case_suspects)
+    
+    return [{
+        'id': suspect.id,
+        'case_id': suspect.case_id,
+        'name': suspect.get_full_name(),
+        'alias': suspect.alias,
+        'status': suspect.status.value,
+        'evidence_count': link_counts.get(suspect.id, 0),
+        'interview_count': interview_counts.get(suspect.id, 0),
+        'risk_assessment': suspect.risk_assessment,
+        'match_score': suspect.match_score
+    } for suspect in suspects]
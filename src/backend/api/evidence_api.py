@@ -1,12 +1,22 @@
 from flask import Blueprint, request, jsonify, current_app
 from datetime import datetime
 import os
-import uuid
 from werkzeug.utils import secure_filename
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
 from src.database.db_init import db
-from src.backend.models.evidence_model import Evidence, EvidenceFile, CustodyChange, EvidenceAnalysis
-from src.backend.models.evidence_model import EvidenceType, EvidenceStatus, ReliabilityLevel
+from src.backend.models.evidence_model import Evidence, EvidenceFile, CustodyChange, EvidenceAnalysis, EvidenceLog
+from src.backend.models.evidence_model import EvidenceType, EvidenceStatus, ReliabilityLevel, GENESIS_HASH, custody_record_hash
+from src.backend.models.case_model import Case
+from src.backend.models.user_model import User
 from src.backend.utils.auth import token_required, has_permission
+from src.backend.utils.schemas import EVIDENCE_SUMMARY
+from src.backend.utils.custody_chain import last_custody_record, seal_chain, verify_evidence_custody
+from src.backend.utils.sequence import next_evidence_number, allocate_evidence_numbers
+from src.backend.utils.match_scores import refresh_match_scores, suspects_linked_to
+from src.database.counters import increment_counters
+from src.backend.utils.batch import parse_batch_request, missing_fields, coerce_id, coerce_ids, existing_ids, invalid_value, split_valid, bulk_insert, batch_response
+from src.backend.utils.case_events import publish_case_event
 
 evidence_bp = Blueprint('evidence', __name__)
 
@@ -53,25 +63,7 @@ def get_all_evidence(current_user):
     evidence_items = query.all()
     
     # Return results
-    evidence_list = []
-    for item in evidence_items:
-        evidence_list.append({
-            'id': item.id,
-            'evidence_number': item.evidence_number,
-            'case_id': item.case_id,
-            'evidence_type': item.evidence_type.value,
-            'description': item.description,
-            'location_found': item.location_found,
-            'collection_date': item.collection_date.isoformat() if item.collection_date else None,
-            'status': item.status.value,
-            'reliability': item.reliability.value,
-            'is_key_evidence': item.is_key_evidence,
-            'storage_location': item.storage_location,
-            'chain_of_custody_complete': item.chain_of_custody_complete,
-            'file_count': len(item.files),
-            'analysis_count': len(item.analysis_results),
-            'custody_changes': len(item.custody_chain)
-        })
+    evidence_list = EVIDENCE_SUMMARY.many(evidence_items)
     
     return jsonify(evidence_list), 200
 
@@ -171,10 +163,9 @@ def create_evidence(current_user):
     
     # Generate evidence number if not provided
     if not data.get('evidence_number'):
-        case_id = data['case_id']
-        count = Evidence.query.filter_by(case_id=case_id).count() + 1
-        random_id = str(uuid.uuid4())[:6]
-        data['evidence_number'] = f"E-{case_id}-{count:03d}-{random_id}"
+        data['evidence_number'] = next_evidence_number(data['case_id'])
+    elif Evidence.query.filter_by(evidence_number=data['evidence_number']).first():
+        return jsonify({'message': f"Evidence number {data['evidence_number']} already exists"}), 409
     
     # Create new evidence object
     new_evidence = Evidence(
@@ -192,9 +183,13 @@ def create_evidence(current_user):
         storage_location=data.get('storage_location')
     )
     
-    # Save to database
+    # Save to database; the unique evidence_number index rejects a number taken concurrently
     db.session.add(new_evidence)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'message': 'Evidence number was taken by another request, please retry'}), 409
     
     # Create initial custody record
     initial_custody = CustodyChange(
@@ -205,6 +200,7 @@ def create_evidence(current_user):
         location=data.get('location_found'),
         notes="Evidence collected and entered into system"
     )
+    initial_custody.link_to(None)
     
     db.session.add(initial_custody)
     db.session.commit()
@@ -222,6 +218,10 @@ def create_evidence(current_user):
     db.session.add(log_entry)
     db.session.commit()
     
+    publish_case_event(new_evidence.case_id, 'evidence_added', evidence_event_data(new_evidence.id, {
+        column.key: getattr(new_evidence, column.key) for column in Evidence.__table__.columns
+    }), permission='evidence:view')
+    
     return jsonify({
         'message': 'Evidence created successfully',
         'evidence_id': new_evidence.id,
@@ -243,6 +243,7 @@ def update_evidence(current_user, evidence_id):
         evidence.description = data['description']
     if 'evidence_type' in data:
         evidence.evidence_type = EvidenceType(data['evidence_type'])
+    location_changed = 'location_found' in data and data['location_found'] != evidence.location_found
     if 'location_found' in data:
         evidence.location_found = data['location_found']
     if 'collection_date' in data:
@@ -251,6 +252,9 @@ def update_evidence(current_user, evidence_id):
         evidence.status = EvidenceStatus(data['status'])
     if 'reliability' in data:
         evidence.reliability = ReliabilityLevel(data['reliability'])
+        
+        # Linked suspects' match scores depend on this evidence's reliability
+        refresh_match_scores(suspects_linked_to(evidence.id))
     if 'is_key_evidence' in data:
         evidence.is_key_evidence = data['is_key_evidence']
     if 'notes' in data:
@@ -263,6 +267,11 @@ def update_evidence(current_user, evidence_id):
     # Save changes
     db.session.commit()
     
+    # Shared-location edges are not append-only, so cached graphs must rebuild
+    if location_changed:
+        from src.backend.utils.graph_cache import invalidate_graphs
+        invalidate_graphs()
+    
     # Log update
     from src.backend.models.evidence_model import EvidenceLog
     log_entry = EvidenceLog(
@@ -292,25 +301,46 @@ def add_custody_change(current_user, evidence_id):
     if 'to_user_id' not in data:
         return jsonify({'message': 'Missing required field: to_user_id'}), 400
     
-    # Find the most recent custody record to use as the from_user
-    last_custody = CustodyChange.query.filter_by(evidence_id=evidence_id).order_by(CustodyChange.change_time.desc()).first()
+    # The record is hashed before it is stored, so hash the integer ids the database will keep
+    to_user_id = coerce_id(data['to_user_id'])
+    if to_user_id is None:
+        return jsonify({'message': 'to_user_id must be an integer id'}), 400
+    witness_id = data.get('witness_id')
+    if witness_id is not None:
+        witness_id = coerce_id(witness_id)
+        if witness_id is None:
+            return jsonify({'message': 'witness_id must be an integer id'}), 400
+    user_ids = {to_user_id, witness_id} - {None}
+    if existing_ids(User.id, user_ids) != user_ids:
+        return jsonify({'message': 'User not found'}), 400
+    
+    # Find the head of the custody chain to use as the from_user
+    last_custody = last_custody_record(evidence_id)
+    if last_custody and last_custody.seq is None:
+        # Legacy chain recorded before hash linking: seal it before appending
+        last_custody = seal_chain(evidence_id) or last_custody
     from_user_id = last_custody.to_user_id if last_custody else None
     
     # Create custody change record
     custody_change = CustodyChange(
         evidence_id=evidence_id,
         from_user_id=from_user_id,
-        to_user_id=data['to_user_id'],
+        to_user_id=to_user_id,
         change_time=datetime.utcnow(),
         reason=data.get('reason', 'Custody transfer'),
         location=data.get('location'),
-        witness_id=data.get('witness_id'),
+        witness_id=witness_id,
         notes=data.get('notes')
     )
+    custody_change.link_to(last_custody)
     
-    # Save to database
+    # Save to database; the unique (evidence_id, seq) index rejects a concurrent append
     db.session.add(custody_change)
-    db.session.commit()
+    try:
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({'message': 'Custody chain was changed by another request, please retry'}), 409
     
     # Log custody change
     from src.backend.models.evidence_model import EvidenceLog
@@ -320,16 +350,46 @@ def add_custody_change(current_user, evidence_id):
         action='custody_change',
         timestamp=datetime.utcnow(),
         ip_address=request.remote_addr,
-        details=f"Custody changed from {from_user_id} to {data['to_user_id']}"
+        details=f"Custody changed from {from_user_id} to {to_user_id}"
     )
     db.session.add(log_entry)
     db.session.commit()
     
+    publish_case_event(evidence.case_id, 'custody_changed', {
+        'evidence_id': evidence_id,
+        'custody_id': custody_change.id,
+        'seq': custody_change.seq,
+        'from_user_id': from_user_id,
+        'to_user_id': custody_change.to_user_id,
+        'change_time': custody_change.change_time.isoformat(),
+        'reason': custody_change.reason,
+        'location': custody_change.location
+    }, permission='evidence:view')
+    
     return jsonify({
         'message': 'Custody change recorded successfully',
         'custody_id': custody_change.id
     }), 201
 
+@evidence_bp.route('/<int:evidence_id>/custody/verify', methods=['POST'])
+@token_required
+def verify_custody_chain(current_user, evidence_id):
+    """Verify the hash-linked custody chain of an evidence item"""
+    if not has_permission(current_user, 'evidence:view'):
+        return jsonify({'message': 'Not authorized to view evidence'}), 403
+    
+    Evidence.query.get_or_404(evidence_id)  # Check evidence exists
+    
+    _, status, record_count, break_seq, break_reason = verify_evidence_custody(evidence_id)
+    
+    return jsonify({
+        'evidence_id': evidence_id,
+        'status': status,
+        'record_count': record_count,
+        'break_seq': break_seq,
+        'break_reason': break_reason
+    }), 200
+
 @evidence_bp.route('/<int:evidence_id>/analysis', methods=['POST'])
 @token_required
 def add_evidence_analysis(current_user, evidence_id):
@@ -365,6 +425,7 @@ def add_evidence_analysis(current_user, evidence_id):
     if data.get('update_evidence_status'):
         evidence.status = EvidenceStatus(data.get('new_status', 'analyzed'))
         evidence.reliability = ReliabilityLevel(data.get('new_reliability', evidence.reliability.value))
+        refresh_match_scores(suspects_linked_to(evidence_id))
         db.session.commit()
     
     # Log analysis addition
@@ -380,6 +441,17 @@ def add_evidence_analysis(current_user, evidence_id):
     db.session.add(log_entry)
     db.session.commit()
     
+    publish_case_event(evidence.case_id, 'evidence_analyzed', {
+        'evidence_id': evidence_id,
+        'analysis_id': analysis.id,
+        'analysis_method': analysis.analysis_method,
+        'conclusion': analysis.conclusion,
+        'confidence_level': analysis.confidence_level,
+        'analyst_id': current_user.id,
+        'evidence_status': evidence.status.value,
+        'reliability': evidence.reliability.value
+    }, permission='evidence:view')
+    
     return jsonify({
         'message': 'Analysis added successfully',
         'analysis_id': analysis.id
@@ -469,3 +541,163 @@ def upload_evidence_file(current_user, evidence_id):
         }), 201
     
     return jsonify({'message': 'Error uploading file'}), 500
+
+@evidence_bp.route('/batch', methods=['POST'])
+@token_required
+def create_evidence_batch(current_user):
+    """Create many evidence items, with their initial custody records and logs, in one transaction"""
+    if not has_permission(current_user, 'evidence:create'):
+        return jsonify({'message': 'Not authorized to create evidence'}), 403
+    
+    items, mode, error = parse_batch_request(request.get_json())
+    if error:
+        return error
+    
+    # Reject ids and evidence numbers of the wrong type before they reach the IN queries
+    errors = coerce_ids(items, ('case_id', 'collector_id'))
+    for index, item in enumerate(items):
+        if index not in errors and isinstance(item, dict) and item.get('evidence_number') is not None:
+            invalid = invalid_value(Evidence, item, ('evidence_number',))
+            if invalid:
+                errors[index] = invalid
+    dict_items = [item for index, item in enumerate(items) if isinstance(item, dict) and index not in errors]
+    
+    # Look up referenced cases, collectors and already used evidence numbers with IN queries
+    found_cases = existing_ids(Case.id, [item.get('case_id') for item in dict_items])
+    found_collectors = existing_ids(User.id, [item.get('collector_id') for item in dict_items])
+    taken_numbers = existing_ids(Evidence.evidence_number, [item.get('evidence_number') for item in dict_items])
+    
+    # Validate every item in one pass
+    required_fields = ['case_id', 'evidence_type', 'description', 'collection_date']
+    parsed = {}
+    for index, item in enumerate(items):
+        if index in errors:
+            continue
+        
+        missing = missing_fields(item, required_fields)
+        if missing:
+            errors[index] = f"Missing required fields: {', '.join(missing)}"
+            continue
+        
+        if item['case_id'] not in found_cases:
+            errors[index] = 'Case not found'
+            continue
+        
+        if item.get('collector_id') is not None and item['collector_id'] not in found_collectors:
+            errors[index] = 'Collector not found'
+            continue
+        
+        invalid = invalid_value(Evidence, item, ('description', 'location_found', 'collector_id',
+                                                 'is_key_evidence', 'notes', 'storage_location'))
+        if invalid:
+            errors[index] = invalid
+            continue
+        
+        number = item.get('evidence_number')
+        if number and number in taken_numbers:
+            errors[index] = f'Evidence number {number} already exists'
+            continue
+        
+        try:
+            parsed[index] = {
+                'evidence_type': EvidenceType(item['evidence_type']),
+                'collection_date': datetime.fromisoformat(item['collection_date']),
+                'status': EvidenceStatus(item.get('status', 'collected')),
+                'reliability': ReliabilityLevel(item.get('reliability', 'unknown'))
+            }
+        except (TypeError, ValueError) as e:
+            errors[index] = f'Invalid value: {e}'
+            continue
+        
+        if number:
+            taken_numbers.add(number)
+    
+    valid, results = split_valid(errors, len(items), mode)
+    
+    # Generate evidence numbers for items that did not provide one
+    numbers = {index: items[index]['evidence_number'] for index in valid if items[index].get('evidence_number')}
+    needs_number = [index for index in valid if index not in numbers]
+    by_case = {}
+    for index in needs_number:
+        by_case.setdefault(items[index]['case_id'], []).append(index)
+    for case_id, indices in by_case.items():
+        numbers.update(zip(indices, allocate_evidence_numbers(case_id, len(indices))))
+    
+    now = datetime.utcnow()
+    evidence_rows = [{
+        'evidence_number': numbers[index],
+        'case_id': items[index]['case_id'],
+        'description': items[index]['description'],
+        'location_found': items[index].get('location_found'),
+        'collector_id': items[index].get('collector_id', current_user.id),
+        'is_key_evidence': items[index].get('is_key_evidence', False),
+        'notes': items[index].get('notes'),
+        'storage_location': items[index].get('storage_location'),
+        **parsed[index]
+    } for index in valid]
+    
+    # Save evidence, initial custody records and creation logs in one transaction
+    evidence_ids = bulk_insert(Evidence, evidence_rows)
+    
+    if evidence_ids:
+        custody_rows = []
+        for index, evidence_id in zip(valid, evidence_ids):
+            custody = {
+                'evidence_id': evidence_id,
+                'from_user_id': None,
+                'to_user_id': current_user.id,
+                'change_time': now,
+                'reason': "Initial collection",
+                'location': items[index].get('location_found'),
+                'witness_id': None,
+                'notes': "Evidence collected and entered into system",
+                'seq': 1,
+                'prev_hash': GENESIS_HASH
+            }
+            custody['record_hash'] = custody_record_hash(
+                evidence_id, 1, None, current_user.id, now, custody['reason'],
+                custody['location'], None, custody['notes'], GENESIS_HASH
+            )
+            custody_rows.append(custody)
+        db.session.execute(insert(CustodyChange), custody_rows)
+        increment_counters(CustodyChange, custody_rows)
+        
+        db.session.execute(insert(EvidenceLog), [{
+            'evidence_id': evidence_id,
+            'user_id': current_user.id,
+            'action': 'create',
+            'timestamp': now,
+            'ip_address': request.remote_addr,
+            'details': f"Evidence created by {current_user.username} (batch import)"
+        } for evidence_id in evidence_ids])
+    
+    db.session.commit()
+    
+    for index, evidence_id in zip(valid, evidence_ids):
+        results[index] = {
+            'index': index,
+            'status': 'created',
+            'evidence_id': evidence_id,
+            'evidence_number': numbers[index]
+        }
+    
+    for row, evidence_id in zip(evidence_rows, evidence_ids):
+        publish_case_event(row['case_id'], 'evidence_added', evidence_event_data(evidence_id, row),
+                           permission='evidence:view')
+    
+    return batch_response(results, mode, bool(evidence_ids))
+
+def evidence_event_data(evidence_id, values):
+    """The evidence_added delta of a new evidence item, from its column values"""
+    return {
+        'evidence_id': evidence_id,
+        'evidence_number': values['evidence_number'],
+        'evidence_type': values['evidence_type'].value,
+        'description': values['description'],
+        'location_found': values['location_found'],
+        'collection_date': values['collection_date'].isoformat(),
+        'status': values['status'].value,
+        'reliability': values['reliability'].value,
+        'is_key_evidence': values['is_key_evidence'],
+        'collector_id': values['collector_id']
+    }
@@ -0,0 +1,171 @@
+from flask import Blueprint, request, jsonify
+from src.backend.utils.auth import token_required, has_permission
+
+graph_bp = Blueprint('graph', __name__)
+
+DEFAULT_MAX_DEPTH = 6
+MAX_HOPS = 10
+DEFAULT_NODE_LIMIT = 500
+MAX_NODE_LIMIT = 10000
+
+def _graph_args():
+    """
+    Parse the scope and edge kinds shared by every graph endpoint.
+    
+    Returns:
+        tuple: (case_id or None, edge kind mask, error response or None)
+    """
+    # The graph engine pulls in numpy, so it loads on first use instead of at startup
+    from src.analysis_tools.evidence_graph import EDGE_KINDS, kind_mask
+    
+    case_id = request.args.get('case_id', type=int)
+    via = [kind for kind in request.args.get('via', '').split(',') if kind]
+    unknown = [kind for kind in via if kind not in EDGE_KINDS]
+    if unknown:
+        return None, None, (jsonify({
+            'message': f"Unknown edge kinds: {', '.join(unknown)}",
+            'edge_kinds': list(EDGE_KINDS)
+        }), 400)
+    return case_id, kind_mask(via), None
+
+def _graph_cache(current_user, case_id):
+    """The graph cache for the request; the global graph spans every shard for users who see every department"""
+    from src.backend.utils.graph_cache import graph_cache
+    return graph_cache(every_shard=case_id is None and has_permission(current_user, 'department:view_all'))
+
+def _bounded(name, default, maximum):
+    value = request.args.get(name, default, type=int)
+    return max(1, min(value, maximum))
+
+@graph_bp.route('/path', methods=['GET'])
+@token_required
+def shortest_path(current_user):
+    """Find the fewest-hop connection between two nodes, e.g. a suspect and an evidence item"""
+    if not has_permission(current_user, 'analysis:view'):
+        return jsonify({'message': 'Not authorized to view analysis'}), 403
+    
+    case_id, mask, error = _graph_args()
+    if error:
+        return error
+    from src.backend.utils.graph_cache import parse_node, resolve_node, describe_nodes
+    
+    # Validate required fields
+    source = parse_node(request.args.get('from'))
+    target = parse_node(request.args.get('to'))
+    if source is None or target is None:
+        return jsonify({'message': "from and to must be nodes such as 'suspect:12' or 'evidence:40'"}), 400
+    max_depth = _bounded('max_depth', DEFAULT_MAX_DEPTH, MAX_HOPS)
+    
+    def find(graph):
+        source_index = resolve_node(graph, source)
+        target_index = resolve_node(graph, target)
+        if source_index is None or target_index is None:
+            return None, None
+        path = graph.shortest_path(source_index, target_index, mask=mask, max_depth=max_depth)
+        if path is None:
+            return [], None
+        nodes = describe_nodes(graph, [index for index, _ in path])
+        return nodes, [kind for _, kind in path[1:]]
+    
+    nodes, edges = _graph_cache(current_user, case_id).query(find, case_id)
+    if nodes is None:
+        return jsonify({'message': 'Node not found in graph'}), 404
+    
+    return jsonify({
+        'connected': bool(nodes),
+        'hops': len(edges) if nodes else None,
+        'max_depth': max_depth,
+        'nodes': nodes,
+        'edges': edges or []
+    }), 200
+
+@graph_bp.route('/neighborhood', methods=['GET'])
+@token_required
+def neighborhood(current_user):
+    """Get every node within k hops of a node, nearest first"""
+    if not has_permission(current_user, 'analysis:view'):
+        return jsonify({'message': 'Not authorized to view analysis'}), 403
+    
+    case_id, mask, error = _graph_args()
+    if error:
+        return error
+    from src.backend.utils.graph_cache import parse_node, resolve_node, describe_nodes
+    
+    # Validate required fields
+    node = parse_node(request.args.get('node'))
+    if node is None:
+        return jsonify({'message': "node must be a node such as 'suspect:12'"}), 400
+    k = _bounded('k', 2, MAX_HOPS)
+    limit = _bounded('limit', DEFAULT_NODE_LIMIT, MAX_NODE_LIMIT)
+    
+    def expand(graph):
+        index = resolve_node(graph, node)
+        if index is None:
+            return None
+        # One extra node tells whether the result was cut short
+        order, depths = graph.neighbourhood(index, k, mask=mask, max_nodes=limit + 2)
+        nodes = describe_nodes(graph, order[1:limit + 1])
+        for item, depth in zip(nodes, depths[1:limit + 1].tolist()):
+            item['hops'] = depth
+        return nodes, len(order) > limit + 1
+    
+    result = _graph_cache(current_user, case_id).query(expand, case_id)
+    if result is None:
+        return jsonify({'message': 'Node not found in graph'}), 404
+    nodes, truncated = result
+    
+    return jsonify({
+        'k': k,
+        'count': len(nodes),
+        'truncated': truncated,
+        'nodes': nodes
+    }), 200
+
+@graph_bp.route('/components', methods=['GET'])
+@token_required
+def connected_components(current_user):
+    """Get connected components by size, or the component containing one node"""
+    if not has_permission(current_user, 'analysis:view'):
+        return jsonify({'message': 'Not authorized to view analysis'}), 403
+    
+    case_id, mask, error = _graph_args()
+    if error:
+        return error
+    from src.backend.utils.graph_cache import parse_node, resolve_node, describe_nodes
+    
+    node = None
+    if request.args.get('node'):
+        node = parse_node(request.args.get('node'))
+        if node is None:
+            return jsonify({'message': "node must be a node such as 'suspect:12'"}), 400
+    limit = _bounded('limit', 20, MAX_NODE_LIMIT)
+    
+    def summarize(graph):
+        labels, unique, sizes = graph.components(mask)
+        summary = {
+            'component_count': len(unique),
+            'node_count': graph.node_count,
+            'edge_count': graph.edge_count
+        }
+        if node is not None:
+            index = resolve_node(graph, node)
+            if index is None:
+                return None
+            members = (labels == labels[index]).nonzero()[0]
+            summary['size'] = len(members)
+            summary['nodes'] = describe_nodes(graph, members[:limit])
+            summary['truncated'] = len(members) > limit
+        else:
+            summary['components'] = [
+                {'size': int(size), 'representative': representative}
+                for size, representative in zip(
+                    sizes[:limit].tolist(), describe_nodes(graph, unique[:limit])
+                )
+            ]
+        return summary
+    
+    summary = _graph_cache(current_user, case_id).query(summarize, case_id)
+    if summary is None:
+        return jsonify({'message': 'Node not found in graph'}), 404
+    
+    return jsonify(summary), 200
@@ -1,9 +1,12 @@
 from flask import Blueprint, request, jsonify
 from datetime import datetime
+from sqlalchemy import select, func
 from src.database.db_init import db
 from src.backend.models.suspect_model import Suspect, SuspectStatus, SuspectEvidenceLink, SuspectInterview, SuspectAlibi
 from src.backend.models.evidence_model import Evidence
 from src.backend.utils.auth import token_required, has_permission
+from src.backend.utils.schemas import SUSPECT_SUMMARY
+from src.backend.utils.match_scores import refresh_match_scores
 
 suspect_bp = Blueprint('suspect', __name__)
 
@@ -18,6 +21,10 @@ def get_all_suspects(current_user):
     case_id = request.args.get('case_id')
     status = request.args.get('status')
     search_term = request.args.get('search')
+    min_score = request.args.get('min_score', type=int)
+    max_score = request.args.get('max_score', type=int)
+    sort_by = request.args.get('sort_by')
+    sort_dir = request.args.get('sort_dir', 'desc')
     
     # Build query
     query = Suspect.query
@@ -34,23 +41,37 @@ def get_all_suspects(current_user):
                            (Suspect.last_name.ilike(search)) | 
                            (Suspect.alias.ilike(search)))
     
+    # Score filters and sorting use the materialized, indexed match_score column
+    if min_score is not None:
+        query = query.filter(Suspect.match_score >= min_score)
+        
+    if max_score is not None:
+        query = query.filter(Suspect.match_score <= max_score)
+    
+    if sort_by == 'match_score':
+        if sort_dir == 'desc':
+            query = query.order_by(Suspect.match_score.desc(), Suspect.id)
+        else:
+            query = query.order_by(Suspect.match_score, Suspect.id)
+    else:
+        query = query.order_by(Suspect.id)
+    
     # Execute query
     suspects = query.all()
     
+    # Link and interview counts of the listed suspects, one grouped query each
+    listed = query.with_entities(Suspect.id).order_by(None)
+    counts = {
+        name: dict(db.session.execute(
+            select(model.suspect_id, func.count(model.id))
+            .where(model.suspect_id.in_(listed))
+            .group_by(model.suspect_id)
+        ).all())
+        for name, model in (('evidence_counts', SuspectEvidenceLink), ('interview_counts', SuspectInterview))
+    }
+    
     # Return results
-    suspect_list = []
-    for suspect in suspects:
-        suspect_list.append({
-            'id': suspect.id,
-            'case_id': suspect.case_id,
-            'name': suspect.get_full_name(),
-            'alias': suspect.alias,
-            'status': suspect.status.value,
-            'evidence_count': len(suspect.evidence_links),
-            'interview_count': len(suspect.interviews),
-            'risk_assessment': suspect.risk_assessment,
-            'match_score': suspect.calculate_match_score()
-        })
+    suspect_list = SUSPECT_SUMMARY.many(suspects, counts)
     
     return jsonify(suspect_list), 200
 
@@ -84,7 +105,7 @@ def get_suspect(current_user, suspect_id):
         'updated_at': suspect.updated_at.isoformat() if suspect.updated_at else None,
         'added_by': suspect.added_by,
         'risk_assessment': suspect.risk_assessment,
-        'match_score': suspect.calculate_match_score(),
+        'match_score': suspect.match_score,
         'evidence_links': [],
         'interviews': [],
         'alibis': []
@@ -257,6 +278,7 @@ def link_evidence(current_user, suspect_id):
         existing_link.confidence = data.get('confidence')
         existing_link.verification_method = data.get('verification_method')
         
+        refresh_match_scores([suspect_id])
         db.session.commit()
         
         return jsonify({
@@ -277,6 +299,7 @@ def link_evidence(current_user, suspect_id):
         )
         
         db.session.add(new_link)
+        refresh_match_scores([suspect_id])
         db.session.commit()
         
         return jsonify({
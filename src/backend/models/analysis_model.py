@@ -43,6 +43,11 @@ class AnalysisReport(db.Model):
     review_comments = db.Column(db.Text)
     review_date = db.Column(db.DateTime)
     
+    # Denormalized counts, maintained by src.database.counters
+    pattern_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    correlation_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    probability_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Relationships
     analyst = db.relationship('User', foreign_keys=[analyst_id], backref='reports_authored')
     reviewer = db.relationship('User', foreign_keys=[reviewer_id], backref='reports_reviewed')
@@ -59,7 +64,7 @@ class PatternAnalysis(db.Model):
     description = db.Column(db.Text, nullable=False)
     detection_method = db.Column(db.String(200))
     confidence_score = db.Column(db.Float)  # 0-1 scale
-    evidence_ids = db.Column(db.String(500))  # Comma-separated IDs
+    evidence_ids = db.Column(db.Text)  # Comma-separated IDs
     visual_representation = db.Column(db.String(500))  # Path to graph or image
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     created_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
@@ -104,8 +109,8 @@ class ProbabilityAssessment(db.Model):
     confidence_interval = db.Column(db.String(50))  # e.g., "0.65-0.85"
     assessment_method = db.Column(db.String(100))
     factors_considered = db.Column(db.Text)
-    supporting_evidence_ids = db.Column(db.String(500))  # Comma-separated IDs
-    conflicting_evidence_ids = db.Column(db.String(500))  # Comma-separated IDs
+    supporting_evidence_ids = db.Column(db.Text)  # Comma-separated IDs
+    conflicting_evidence_ids = db.Column(db.Text)  # Comma-separated IDs
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     assessed_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     
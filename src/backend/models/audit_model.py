@@ -0,0 +1,81 @@
+from src.database.db_init import db
+from datetime import datetime
+
+class LogSealBatch(db.Model):
+    __tablename__ = 'log_seal_batches'
+
+    id = db.Column(db.Integer, primary_key=True)
+    seq = db.Column(db.Integer, unique=True, nullable=False)  # Position in the batch chain, from 1
+    log_table = db.Column(db.String(50), nullable=False)  # evidence_logs, user_activities
+    first_id = db.Column(db.Integer, nullable=False)
+    last_id = db.Column(db.Integer, nullable=False)
+    leaf_count = db.Column(db.Integer, nullable=False)
+    merkle_root = db.Column(db.String(64), nullable=False)
+    prev_hash = db.Column(db.String(64), nullable=False)  # batch_hash of the previous batch
+    batch_hash = db.Column(db.String(64), nullable=False)
+    sealed_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+
+    nodes = db.relationship('LogMerkleNode', backref='batch', lazy=True, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        db.Index('ix_log_seal_batches_table_last_id', 'log_table', 'last_id'),
+    )
+
+    def __repr__(self):
+        return f'<LogSealBatch {self.seq}: {self.log_table} {self.first_id}-{self.last_id}>'
+
+class LogMerkleNode(db.Model):
+    __tablename__ = 'log_merkle_nodes'
+
+    batch_id = db.Column(db.Integer, db.ForeignKey('log_seal_batches.id'), primary_key=True)
+    level = db.Column(db.Integer, primary_key=True)  # 0 = leaves
+    position = db.Column(db.Integer, primary_key=True)
+    hash = db.Column(db.String(64), nullable=False)
+    entry_id = db.Column(db.Integer)  # Log row id, leaves only
+
+    __table_args__ = (
+        db.Index('ix_log_merkle_nodes_batch_entry', 'batch_id', 'entry_id'),
+    )
+
+    def __repr__(self):
+        return f'<LogMerkleNode batch {self.batch_id} level {self.level} position {self.position}>'
+
+class LogArchiveSegment(db.Model):
+    __tablename__ = 'log_archive_segments'
+
+    id = db.Column(db.Integer, primary_key=True)
+    log_table = db.Column(db.String(50), nullable=False)
+    month = db.Column(db.String(7), nullable=False)  # YYYY-MM partition
+    path = db.Column(db.String(500), nullable=False)  # Relative to the archive directory
+    first_id = db.Column(db.Integer, nullable=False)
+    last_id = db.Column(db.Integer, nullable=False)
+    first_timestamp = db.Column(db.DateTime, nullable=False)
+    last_timestamp = db.Column(db.DateTime, nullable=False)
+    row_count = db.Column(db.Integer, nullable=False)
+    sha256 = db.Column(db.String(64), nullable=False)  # Digest of the compressed file
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+    keys = db.relationship('LogArchiveKey', backref='segment', lazy=True, cascade="all, delete-orphan")
+
+    __table_args__ = (
+        db.Index('ix_log_archive_segments_table_month', 'log_table', 'month'),
+        db.Index('ix_log_archive_segments_table_last_id', 'log_table', 'last_id'),
+    )
+
+    def __repr__(self):
+        return f'<LogArchiveSegment {self.log_table} {self.month}: {self.path}>'
+
+class LogArchiveKey(db.Model):
+    __tablename__ = 'log_archive_keys'
+
+    segment_id = db.Column(db.Integer, db.ForeignKey('log_archive_segments.id'), primary_key=True)
+    key_name = db.Column(db.String(30), primary_key=True)  # evidence_id, user_id
+    key_value = db.Column(db.Integer, primary_key=True)
+    row_count = db.Column(db.Integer, nullable=False)
+
+    __table_args__ = (
+        db.Index('ix_log_archive_keys_lookup', 'key_name', 'key_value'),
+    )
+
+    def __repr__(self):
+        return f'<LogArchiveKey {self.key_name}={self.key_value} in segment {self.segment_id}>'
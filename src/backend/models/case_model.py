@@ -32,6 +32,10 @@ class Case(db.Model):
     investigator_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     department = db.Column(db.String(100))
     
+    # Denormalized counts, maintained by src.database.counters
+    evidence_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    suspect_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Relationships
     evidence_items = db.relationship('Evidence', backref='case', lazy=True, cascade="all, delete-orphan")
     suspects = db.relationship('Suspect', backref='case', lazy=True, cascade="all, delete-orphan")
@@ -50,8 +54,8 @@ class Case(db.Model):
             'status': self.status.value,
             'priority': self.priority.value,
             'opened_date': self.opened_date,
-            'evidence_count': len(self.evidence_items),
-            'suspect_count': len(self.suspects)
+            'evidence_count': self.evidence_count,
+            'suspect_count': self.suspect_count
         }
 
 class CaseNote(db.Model):
@@ -89,3 +93,13 @@ class TimelineEvent(db.Model):
     
     def __repr__(self):
         return f'<TimelineEvent {self.event_time}: {self.event_description[:30]}...>'
+
+class CaseSequence(db.Model):
+    __tablename__ = 'case_sequences'
+    
+    case_id = db.Column(db.Integer, db.ForeignKey('cases.id'), primary_key=True)
+    name = db.Column(db.String(50), primary_key=True)  # e.g., evidence
+    last_value = db.Column(db.Integer, nullable=False, default=0)  # Highest value handed out so far
+    
+    def __repr__(self):
+        return f'<CaseSequence {self.name} for Case {self.case_id}: {self.last_value}>'
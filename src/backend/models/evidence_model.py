@@ -1,6 +1,11 @@
 from src.database.db_init import db
 from datetime import datetime
 import enum
+import hashlib
+import json
+
+# prev_hash of the first custody record of every evidence item
+GENESIS_HASH = '0' * 64
 
 class EvidenceType(enum.Enum):
     PHYSICAL = "physical"
@@ -44,6 +49,11 @@ class Evidence(db.Model):
     storage_location = db.Column(db.String(200))
     chain_of_custody_complete = db.Column(db.Boolean, default=False)
     
+    # Denormalized counts, maintained by src.database.counters
+    file_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    analysis_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    custody_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Relationships
     collector = db.relationship('User', foreign_keys=[collector_id], backref='collected_evidence')
     analysis_results = db.relationship('EvidenceAnalysis', backref='evidence', lazy=True, cascade="all, delete-orphan")
@@ -86,12 +96,53 @@ class CustodyChange(db.Model):
     witness_id = db.Column(db.Integer, db.ForeignKey('users.id'))
     notes = db.Column(db.Text)
     
+    # Hash chain: records are numbered 1, 2, ... per evidence item and each stores its predecessor's hash
+    seq = db.Column(db.Integer)
+    prev_hash = db.Column(db.String(64))
+    record_hash = db.Column(db.String(64))
+    
     from_user = db.relationship('User', foreign_keys=[from_user_id], backref='custody_given')
     to_user = db.relationship('User', foreign_keys=[to_user_id], backref='custody_received')
     witness = db.relationship('User', foreign_keys=[witness_id], backref='custody_witnessed')
     
+    __table_args__ = (
+        db.Index('ix_custody_changes_evidence_seq', 'evidence_id', 'seq', unique=True),
+    )
+    
     def __repr__(self):
         return f'<CustodyChange for Evidence {self.evidence_id} from {self.from_user_id} to {self.to_user_id}>'
+    
+    def link_to(self, previous):
+        """Number this record after previous (None for the first record) and seal it"""
+        self.seq = previous.seq + 1 if previous else 1
+        self.prev_hash = previous.record_hash if previous else GENESIS_HASH
+        self.record_hash = custody_record_hash(
+            self.evidence_id, self.seq, self.from_user_id, self.to_user_id, self.change_time,
+            self.reason, self.location, self.witness_id, self.notes, self.prev_hash
+        )
+
+def custody_record_hash(evidence_id, seq, from_user_id, to_user_id, change_time,
+                        reason, location, witness_id, notes, prev_hash):
+    """SHA-256 over a custody record's content and its predecessor's hash"""
+    content = json.dumps([
+        evidence_id, seq, from_user_id, to_user_id,
+        change_time.isoformat() if change_time else None,
+        reason, location, witness_id, notes, prev_hash
+    ], separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+class CustodyVerification(db.Model):
+    __tablename__ = 'custody_verifications'
+    
+    evidence_id = db.Column(db.Integer, db.ForeignKey('evidence.id'), primary_key=True)
+    status = db.Column(db.String(20), nullable=False)  # valid, broken, unsealed
+    record_count = db.Column(db.Integer, nullable=False, default=0)
+    break_seq = db.Column(db.Integer)  # First record that failed verification
+    break_reason = db.Column(db.String(255))
+    verified_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<CustodyVerification for Evidence {self.evidence_id}: {self.status}>'
 
 class EvidenceAnalysis(db.Model):
     __tablename__ = 'evidence_analyses'
@@ -128,5 +179,10 @@ class EvidenceLog(db.Model):
     
     evidence = db.relationship('Evidence', backref='access_logs')
     
+    __table_args__ = (
+        db.Index('ix_evidence_logs_evidence_timestamp', 'evidence_id', 'timestamp'),
+        db.Index('ix_evidence_logs_timestamp', 'timestamp'),
+    )
+    
     def __repr__(self):
         return f'<EvidenceLog {self.action} on Evidence {self.evidence_id} by User {self.user_id}>'
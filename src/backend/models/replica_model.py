@@ -0,0 +1,12 @@
+from src.database.db_init import db
+from datetime import datetime
+
+class ReplicaHeartbeat(db.Model):
+    __tablename__ = 'replica_heartbeats'
+    
+    # One row, updated on the primary every few seconds; a replica's copy shows how far behind it is
+    id = db.Column(db.Integer, primary_key=True)
+    beat_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    
+    def __repr__(self):
+        return f'<ReplicaHeartbeat {self.beat_at}>'
@@ -0,0 +1,14 @@
+from src.database.db_init import db
+from datetime import datetime
+
+class ShardDirectoryEntry(db.Model):
+    __tablename__ = 'shard_directory'
+    
+    # Rows moved out of the primary database keep their ids, so their shard is looked up here
+    entity = db.Column(db.String(50), primary_key=True)  # Table name: cases, evidence, suspects, analysis_reports
+    entity_id = db.Column(db.Integer, primary_key=True)
+    shard = db.Column(db.String(50), nullable=False)
+    moved_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ShardDirectoryEntry {self.entity} {self.entity_id}: {self.shard}>'
@@ -34,12 +34,20 @@ class Suspect(db.Model):
     added_by = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     risk_assessment = db.Column(db.Float)  # 0-100 score
     
+    # Materialized compute_match_score over the evidence links, maintained by src.backend.utils.match_scores
+    match_score = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Relationships
     creator = db.relationship('User', backref='suspects_added', foreign_keys=[added_by])
     evidence_links = db.relationship('SuspectEvidenceLink', backref='suspect', lazy=True, cascade="all, delete-orphan")
     interviews = db.relationship('SuspectInterview', backref='suspect', lazy=True, cascade="all, delete-orphan")
     alibis = db.relationship('SuspectAlibi', backref='suspect', lazy=True, cascade="all, delete-orphan")
     
+    __table_args__ = (
+        db.Index('ix_suspects_case_match_score', 'case_id', 'match_score'),
+        db.Index('ix_suspects_match_score', 'match_score'),
+    )
+    
     def __repr__(self):
         return f'<Suspect {self.id}: {self.first_name} {self.last_name}>'
     
@@ -48,24 +56,34 @@ class Suspect(db.Model):
     
     def calculate_match_score(self):
         """Calculate the suspect's match score based on linked evidence"""
-        total_evidence = len(self.evidence_links)
-        if total_evidence == 0:
-            return 0
-            
-        # Sum all positive matches weighted by reliability
-        reliability_weights = {'high': 1.0, 'medium': 0.7, 'low': 0.4, 'unknown': 0.2}
-        match_scores = {'match': 1.0, 'partial_match': 0.5, 'possible_match': 0.3, 'no_match': 0.0}
-        
-        score = 0
-        for link in self.evidence_links:
-            reliability = link.evidence.reliability.value
-            match_status = link.match_status
-            
-            if match_status in match_scores and reliability in reliability_weights:
-                score += match_scores[match_status] * reliability_weights[reliability]
+        return compute_match_score(
+            (link.match_status, link.evidence.reliability.value) for link in self.evidence_links
+        )
+
+# Weights used by compute_match_score
+MATCH_STATUS_SCORES = {'match': 1.0, 'partial_match': 0.5, 'possible_match': 0.3, 'no_match': 0.0}
+RELIABILITY_WEIGHTS = {'high': 1.0, 'medium': 0.7, 'low': 0.4, 'unknown': 0.2}
+
+def compute_match_score(links):
+    """
+    Calculate a match score from (match_status, reliability value) pairs.
+    
+    Shared by Suspect.calculate_match_score and list views that load the
+    link columns directly instead of hydrating each link and its evidence.
+    """
+    links = list(links)
+    total_evidence = len(links)
+    if total_evidence == 0:
+        return 0
         
-        # Normalize to percentage
-        return min(round((score / total_evidence) * 100), 100)
+    # Sum all positive matches weighted by reliability
+    score = 0
+    for match_status, reliability in links:
+        if match_status in MATCH_STATUS_SCORES and reliability in RELIABILITY_WEIGHTS:
+            score += MATCH_STATUS_SCORES[match_status] * RELIABILITY_WEIGHTS[reliability]
+    
+    # Normalize to percentage
+    return min(round((score / total_evidence) * 100), 100)
 
 class SuspectEvidenceLink(db.Model):
     __tablename__ = 'suspect_evidence_links'
@@ -31,6 +31,7 @@ class User(db.Model):
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     last_login = db.Column(db.DateTime)
     is_active = db.Column(db.Boolean, default=True)
+    profile_analysis = db.Column(db.Boolean, default=False, server_default=db.false(), nullable=False)  # Profile every analysis request
     
     # Relationships
     cases = db.relationship('Case', backref='investigator', lazy=True)
@@ -60,5 +61,20 @@ class UserActivity(db.Model):
     
     user = db.relationship('User', backref='activities', lazy=True)
     
+    __table_args__ = (
+        db.Index('ix_user_activities_user_timestamp', 'user_id', 'timestamp'),
+        db.Index('ix_user_activities_timestamp', 'timestamp'),
+    )
+    
     def __repr__(self):
         return f'<UserActivity {self.activity_type} by {self.user_id} at {self.timestamp}>'
+
+class ReferenceDataVersion(db.Model):
+    __tablename__ = 'reference_data_versions'
+    
+    name = db.Column(db.String(50), primary_key=True)  # users, roles
+    version = db.Column(db.Integer, default=0, nullable=False)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ReferenceDataVersion {self.name}: {self.version}>'
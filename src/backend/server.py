@@ -5,6 +5,7 @@ import os
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
 sys.path.insert(0, project_root)
 
+import click
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 from dotenv import load_dotenv
@@ -14,21 +15,66 @@ from src.backend.api.suspect_api import suspect_bp
 from src.backend.api.analysis_api import analysis_bp
 from src.backend.api.auth_api import auth_bp
 from src.backend.api.report_api import report_bp
+from src.backend.api.audit_api import audit_bp
+from src.backend.api.graph_api import graph_bp
 from src.database.db_init import init_db
+from src.database.sharding import init_sharding, all_shards, use_shard, shard_name
+from src.database.replicas import init_replicas
+from src.backend.utils.serialization import ApiJSONProvider
+from src.backend.utils.http_middleware import init_http_middleware
+from src.backend.utils.query_profiler import init_query_profiler
+from src.backend.utils.metrics import init_metrics
+from src.backend.utils.log_sealing import start_log_sealer, seal_pending_logs
+from src.backend.utils.case_events import init_case_events
 
 # Load environment variables
 load_dotenv()
 
 app = Flask(__name__)
+app.json = ApiJSONProvider(app)  # orjson-backed; renders datetimes and Enums
 CORS(app)
 
 # Configure database
 app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv('DATABASE_URI', 'sqlite:///evidence_analysis.db')
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'development-secret-key')
+app.config['LOG_SEAL_INTERVAL'] = int(os.getenv('LOG_SEAL_INTERVAL', 60))  # 0 disables background sealing
+app.config['LOG_ARCHIVE_DIR'] = os.getenv('LOG_ARCHIVE_DIR')  # Defaults to <instance path>/log_archive
+app.config['COMPRESS_MIN_SIZE'] = int(os.getenv('COMPRESS_MIN_SIZE', 1024))  # Bytes
+app.config['GRAPH_MAX_CASE_GRAPHS'] = int(os.getenv('GRAPH_MAX_CASE_GRAPHS', 32))  # Per-case graphs kept per process
+app.config['QUERY_THRESHOLD'] = int(os.getenv('QUERY_THRESHOLD', 30))  # Queries per request before it is flagged
+app.config['SLOW_QUERY_MS'] = int(os.getenv('SLOW_QUERY_MS', 200))
+app.config['METRICS_DIR'] = os.getenv('METRICS_DIR')  # Shared by worker processes to aggregate metrics
+app.config['METRICS_TOKEN'] = os.getenv('METRICS_TOKEN')  # Bearer token required to scrape /api/metrics
+# Per-department shards of case data, as JSON; see src.database.sharding
+app.config['DEPARTMENT_SHARDS'] = os.getenv('DEPARTMENT_SHARDS')
+app.config['SHARD_FAN_OUT_WORKERS'] = int(os.getenv('SHARD_FAN_OUT_WORKERS', 8))  # Threads for cross-shard admin queries
+# Read replicas for GET and analysis reads, comma separated; see src.database.replicas
+app.config['READ_REPLICA_URIS'] = os.getenv('READ_REPLICA_URIS')
+app.config['REPLICA_MAX_LAG_SECONDS'] = float(os.getenv('REPLICA_MAX_LAG_SECONDS', 5))  # Lagging replicas fall back to the primary
+app.config['REPLICA_HEARTBEAT_SECONDS'] = float(os.getenv('REPLICA_HEARTBEAT_SECONDS', 1))  # 0 when another process writes it
+# Local broker that relays case events between worker processes; see src.backend.utils.case_events
+app.config['CASE_EVENTS_BROKER'] = os.getenv('CASE_EVENTS_BROKER')
+app.config['CASE_EVENTS_MAX_SECONDS'] = float(os.getenv('CASE_EVENTS_MAX_SECONDS', 3600))  # Event streams are recycled after this long
+# Apply pending schema migrations at startup; turn off where migrations run as a deploy step
+app.config['AUTO_MIGRATE'] = os.getenv('AUTO_MIGRATE', '1').lower() in ('1', 'true', 'yes')
+# Skip the schema version check when the database is known to be migrated
+# (and for `flask migrate`, which must run against an outdated schema)
+app.config['SKIP_SCHEMA_CHECK'] = (os.getenv('SKIP_SCHEMA_CHECK', '').lower() in ('1', 'true', 'yes')
+                                   or '--skip-schema-check' in sys.argv
+                                   or (os.path.basename(sys.argv[0]) == 'flask' and 'migrate' in sys.argv))
 
 # Initialize database
-init_db(app)
+init_db(app, check_schema=not app.config['SKIP_SCHEMA_CHECK'])
+
+# Route case data to department shards when configured
+init_sharding(app)
+
+# Send reads of GET and analysis requests to read replicas when configured
+init_replicas(app)
+
+# Live case activity for the /api/case/<id>/events streams
+init_case_events(app)
 
 # Register API blueprints
 app.register_blueprint(evidence_bp, url_prefix='/api/evidence')
@@ -37,6 +83,17 @@ app.register_blueprint(suspect_bp, url_prefix='/api/suspect')
 app.register_blueprint(analysis_bp, url_prefix='/api/analysis')
 app.register_blueprint(auth_bp, url_prefix='/api/auth')
 app.register_blueprint(report_bp, url_prefix='/api/report')
+app.register_blueprint(audit_bp, url_prefix='/api/audit')
+app.register_blueprint(graph_bp, url_prefix='/api/graph')
+
+# Request latency, analysis, cache and pool metrics at /api/metrics
+init_metrics(app)
+
+# Per-request query counts and DB time in Server-Timing and the log
+init_query_profiler(app)
+
+# Strong ETags, 304s and gzip/brotli encoding for API responses
+init_http_middleware(app)
 
 @app.route('/api/health', methods=['GET'])
 def health_check():
@@ -45,7 +102,87 @@ def health_check():
         'version': '1.0.0'
     }), 200
 
+@app.cli.command('migrate')
+@click.option('--to', 'target', type=int, default=None, help='Stop after this migration version')
+@click.option('--status', is_flag=True, help='List migrations and whether they are applied')
+def migrate_command(target, status):
+    """Apply pending schema migrations"""
+    from src.database.migrate import upgrade, print_status
+    if status:
+        print_status()
+        return
+    
+    applied = upgrade(target, progress=lambda migration: print(f"Applying {migration.version:04d} {migration.description}"))
+    print(f"{len(applied)} migrations applied")
+
+@app.cli.command('seal-logs')
+def seal_logs_command():
+    """Seal pending evidence log and user activity rows into Merkle batches"""
+    print(f"Sealed {seal_pending_logs()} batches")
+
+@app.cli.command('archive-logs')
+@click.option('--retention-days', type=int, default=90, help='Keep rows newer than this in the hot tables')
+def archive_logs_command(retention_days):
+    """Move old evidence log and user activity rows into monthly archive files"""
+    from src.backend.utils.log_archive import archive_old_logs
+    seal_pending_logs()
+    for log_table, archived in archive_old_logs(retention_days).items():
+        print(f"{log_table}: {archived} rows archived")
+
+@app.cli.command('split-shards')
+@click.option('--shard', 'names', multiple=True, help='Only split this shard (repeatable)')
+@click.option('--dry-run', is_flag=True, help='Report the rows each shard would receive')
+def split_shards_command(names, dry_run):
+    """Move the cases of sharded departments out of the primary database"""
+    from src.database.shard_tool import split_shard, count_rows
+    for shard in all_shards()[1:]:
+        if names and shard.name not in names:
+            continue
+        totals = count_rows(shard) if dry_run else split_shard(shard)
+        print(f"{shard.name}: " + (', '.join(f"{table} {count}" for table, count in totals.items() if count) or 'nothing to move'))
+
+@app.cli.command('repair-counters')
+def repair_counters_command():
+    """Recompute denormalized counter columns from their child tables"""
+    from src.database.counters import repair_counters
+    for shard in all_shards():
+        with use_shard(shard):
+            for counter, corrected in repair_counters().items():
+                print(f"{shard_name(shard)} {counter}: {corrected} rows corrected")
+
+@app.cli.command('recompute-match-scores')
+def recompute_match_scores_command():
+    """Recompute materialized suspect match scores from their evidence links"""
+    from src.backend.utils.match_scores import recompute_match_scores
+    for shard in all_shards():
+        with use_shard(shard):
+            print(f"{shard_name(shard)}: {recompute_match_scores()} suspect match scores corrected")
+
+@app.cli.command('verify-custody')
+@click.option('--workers', type=int, default=None, help='Worker processes (0 verifies inline, default one per CPU)')
+@click.option('--page-size', type=int, default=1000, help='Evidence items per read page')
+@click.option('--seal-legacy', is_flag=True, help='Number and hash legacy chains before verifying')
+def verify_custody_command(workers, page_size, seal_legacy):
+    """Verify every custody chain and store a status per evidence item"""
+    from src.backend.utils.custody_chain import verify_custody_chains, seal_legacy_chains
+    for shard in all_shards():
+        with use_shard(shard):
+            if seal_legacy:
+                print(f"{shard_name(shard)}: sealed {seal_legacy_chains(page_size)} legacy chains")
+            
+            report = verify_custody_chains(workers=workers, page_size=page_size)
+            print(f"{shard_name(shard)}: checked {report['records_checked']} records across "
+                  f"{report['evidence_checked']} evidence items in {report['elapsed_seconds']}s: "
+                  f"{report['valid']} valid, {report['broken']} broken, {report['unsealed']} unsealed")
+            for chain_break in report['breaks']:
+                print(f"  Evidence {chain_break['evidence_id']}: {chain_break['status']} "
+                      f"at record {chain_break['break_seq']} - {chain_break['reason']}")
+
 if __name__ == '__main__':
     port = int(os.getenv('PORT', 5000))
     debug = os.getenv('ENVIRONMENT', 'development') == 'development'
+    
+    # Seal audit logs in the background; the reloader's parent process only watches files
+    if app.config['LOG_SEAL_INTERVAL'] > 0 and (not debug or os.environ.get('WERKZEUG_RUN_MAIN')):
+        start_log_sealer(app, app.config['LOG_SEAL_INTERVAL'])
     app.run(host='0.0.0.0', port=port, debug=debug)
@@ -0,0 +1,289 @@
+import cProfile
+import json
+import os
+import pstats
+import re
+import shutil
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from functools import wraps
+from flask import request, current_app, make_response
+
+PROFILE_HEADER = 'X-Analysis-Profile'
+PROFILE_ID_HEADER = 'X-Analysis-Profile-Id'
+MODES = ('sample', 'cprofile', 'both')
+ARTIFACTS = {
+    'pstats': ('profile.pstats', 'application/octet-stream'),
+    'collapsed': ('stacks.collapsed', 'text/plain')
+}
+DEFAULT_SAMPLE_INTERVAL = 0.005   # Seconds between stack samples
+DEFAULT_PROFILES_KEPT = 100
+JOB_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+
+def profile_directory():
+    return current_app.config.get('PROFILE_DIR') or os.path.join(current_app.instance_path, 'profiles')
+
+def requested_mode(current_user):
+    """
+    Profiling mode for this request, or None when it should run unprofiled.
+
+    Users with analysis:profile opt in per request with the X-Analysis-Profile
+    header (sample, cprofile, or both for any other true value); users whose
+    profile_analysis flag an administrator has set are always profiled.
+    """
+    value = request.headers.get(PROFILE_HEADER)
+    if value and value.lower() not in ('0', 'false', 'no', 'off'):
+        from src.backend.utils.auth import has_permission
+        if has_permission(current_user, 'analysis:profile'):
+            return value.lower() if value.lower() in MODES else 'both'
+    if getattr(current_user, 'profile_analysis', False):
+        return current_app.config.get('PROFILE_DEFAULT_MODE', 'both')
+    return None
+
+# Profiles currently running, consulted when any thread is started
+_active_profiles = []
+_active_lock = threading.Lock()
+_thread_start = threading.Thread.start
+
+def _start_thread(thread):
+    """Thread.start while a profile runs: threads started by a profiled thread are followed"""
+    parent = threading.get_ident()
+    with _active_lock:
+        owner = next((profile for profile in _active_profiles if profile.follows(parent)), None)
+    if owner is not None:
+        owner._follow(thread)
+    return _thread_start(thread)
+
+class AnalysisProfile:
+    """
+    Profile a block of code and the threads it starts.
+
+    'cprofile' records every call deterministically and is saved as pstats;
+    'sample' reads the stacks of the profiled threads every sample interval
+    and is saved in the collapsed-stack format flamegraph tools read. Threads
+    started inside the block (such as the comprehensive analysis stages),
+    and the threads those start, are followed by both; threads of other
+    requests and background workers are not.
+    """
+
+    def __init__(self, mode='both', sample_interval=DEFAULT_SAMPLE_INTERVAL):
+        self.mode = mode
+        self.sample_interval = sample_interval
+        self.samples = Counter()
+        self.sample_count = 0
+        self.duration = None
+        self._profilers = []
+        self._threads = set()
+        self._stop = threading.Event()
+        self._sampler = None
+        self._lock = threading.Lock()
+
+    @property
+    def deterministic(self):
+        return self.mode in ('cprofile', 'both')
+
+    @property
+    def sampling(self):
+        return self.mode in ('sample', 'both')
+
+    def follows(self, ident):
+        with self._lock:
+            return ident in self._threads
+
+    def _follow(self, thread):
+        # Wrap the new thread's run so it profiles itself for as long as it runs
+        run = thread.run
+
+        def followed_run():
+            ident = threading.get_ident()
+            with self._lock:
+                self._threads.add(ident)
+            profiler = None
+            if self.deterministic and not self._stop.is_set():
+                profiler = cProfile.Profile()
+                with self._lock:
+                    self._profilers.append(profiler)
+                profiler.enable()
+            try:
+                run()
+            finally:
+                if profiler is not None:
+                    profiler.disable()
+                with self._lock:
+                    self._threads.discard(ident)
+
+        thread.run = followed_run
+
+    def __enter__(self):
+        self._threads.add(threading.get_ident())
+        # The sampler starts before new threads are followed, so it does not sample itself
+        if self.sampling:
+            self._sampler = threading.Thread(target=self._sample, name='analysis-profile-sampler', daemon=True)
+            self._sampler.start()
+        with _active_lock:
+            _active_profiles.append(self)
+            threading.Thread.start = _start_thread
+        if self.deterministic:
+            self._main_profiler = cProfile.Profile()
+            self._main_profiler.enable()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.duration = time.perf_counter() - self._started
+        if self.deterministic:
+            self._main_profiler.disable()
+        with _active_lock:
+            _active_profiles.remove(self)
+            if not _active_profiles:
+                threading.Thread.start = _thread_start
+        self._stop.set()
+        # Followed threads disable their own profiler when they end; this covers any still running
+        with self._lock:
+            profilers = list(self._profilers)
+        for profiler in profilers:
+            profiler.disable()
+        if self._sampler is not None:
+            self._sampler.join()
+        return False
+
+    def _sample(self):
+        while not self._stop.wait(self.sample_interval):
+            frames = sys._current_frames()
+            with self._lock:
+                threads = list(self._threads)
+            for ident in threads:
+                frame = frames.get(ident)
+                if frame is not None:
+                    self.samples[_collapse(frame)] += 1
+            self.sample_count += 1
+
+    def stats(self):
+        """pstats.Stats of the block and the threads it started, or None without cProfile"""
+        if not self.deterministic:
+            return None
+        stats = pstats.Stats(self._main_profiler)
+        for profiler in self._profilers:
+            stats.add(profiler)
+        return stats
+
+    def collapsed(self):
+        """Stack samples in collapsed format: one 'frame;frame;frame count' line per stack"""
+        return ''.join(f"{stack} {count}\n" for stack, count in self.samples.most_common())
+
+    def save(self, metadata):
+        """
+        Write the artifacts under a new job id in the profile directory.
+
+        Returns:
+            str: Job id the artifacts can be downloaded by
+        """
+        job_id = uuid.uuid4().hex
+        directory = os.path.join(profile_directory(), job_id)
+        os.makedirs(directory)
+
+        artifacts = []
+        stats = self.stats()
+        if stats is not None:
+            stats.dump_stats(os.path.join(directory, ARTIFACTS['pstats'][0]))
+            artifacts.append('pstats')
+        if self.sampling:
+            with open(os.path.join(directory, ARTIFACTS['collapsed'][0]), 'w') as collapsed_file:
+                collapsed_file.write(self.collapsed())
+            artifacts.append('collapsed')
+
+        metadata = dict(
+            metadata,
+            job_id=job_id,
+            mode=self.mode,
+            duration_ms=round(self.duration * 1000, 2),
+            samples=self.sample_count,
+            sample_interval_ms=self.sample_interval * 1000,
+            artifacts=artifacts,
+            created_at=datetime.utcnow().isoformat()
+        )
+        with open(os.path.join(directory, 'meta.json'), 'w') as meta_file:
+            json.dump(metadata, meta_file)
+
+        prune_profiles(current_app.config.get('PROFILES_KEPT', DEFAULT_PROFILES_KEPT))
+        return job_id
+
+def _collapse(frame):
+    parts = []
+    while frame is not None:
+        code = frame.f_code
+        parts.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(parts))
+
+def profiled(analyzer):
+    """
+    Decorator for analysis views: run the view under AnalysisProfile when
+    requested_mode asks for it and return the job id in X-Analysis-Profile-Id.
+
+    Place it below token_required. Requests that do not ask for profiling
+    only pay for a header lookup.
+    """
+    def decorator(view):
+        @wraps(view)
+        def decorated(current_user, *args, **kwargs):
+            mode = requested_mode(current_user)
+            if mode is None:
+                return view(current_user, *args, **kwargs)
+
+            profile = AnalysisProfile(mode, current_app.config.get('PROFILE_SAMPLE_INTERVAL', DEFAULT_SAMPLE_INTERVAL))
+            with profile:
+                response = make_response(view(current_user, *args, **kwargs))
+
+            data = request.get_json(silent=True) or {}
+            job_id = profile.save({
+                'analyzer': analyzer,
+                'endpoint': request.endpoint,
+                'case_id': data.get('case_id'),
+                'user_id': current_user.id,
+                'status': response.status_code
+            })
+            response.headers[PROFILE_ID_HEADER] = job_id
+            return response
+        return decorated
+    return decorator
+
+def load_profile(job_id):
+    """Metadata of a stored profile, or None when the id is unknown"""
+    if not JOB_ID_PATTERN.match(job_id):
+        return None
+    path = os.path.join(profile_directory(), job_id, 'meta.json')
+    if not os.path.exists(path):
+        return None
+    with open(path) as meta_file:
+        return json.load(meta_file)
+
+def artifact_path(job_id, artifact):
+    return os.path.join(profile_directory(), job_id, ARTIFACTS[artifact][0])
+
+def list_profiles(user_id=None):
+    """Stored profiles, newest first, optionally only those one user requested"""
+    directory = profile_directory()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for job_id in os.listdir(directory):
+        metadata = load_profile(job_id)
+        if metadata is not None and (user_id is None or metadata.get('user_id') == user_id):
+            profiles.append(metadata)
+    profiles.sort(key=lambda metadata: metadata['created_at'], reverse=True)
+    return profiles
+
+def prune_profiles(keep):
+    """Delete all but the newest keep profiles"""
+    directory = profile_directory()
+    entries = [
+        os.path.join(directory, job_id) for job_id in os.listdir(directory) if JOB_ID_PATTERN.match(job_id)
+    ]
+    entries.sort(key=os.path.getmtime, reverse=True)
+    for path in entries[keep:]:
+        shutil.rmtree(path, ignore_errors=True)
@@ -3,6 +3,7 @@ from flask import request, jsonify, current_app
 import jwt
 from datetime import datetime, timedelta
 from src.backend.models.user_model import User, UserActivity
+from src.database.sharding import route_request
 
 def token_required(f):
     @wraps(f)
@@ -17,6 +18,10 @@ def token_required(f):
             except IndexError:
                 return jsonify({'message': 'Invalid token format'}), 401
 
+        # EventSource cannot set headers, so event streams may pass the token in the query string
+        if not token and request.accept_mimetypes.best == 'text/event-stream':
+            token = request.args.get('access_token')
+
         if not token:
             return jsonify({'message': 'Token is missing'}), 401
 
@@ -56,6 +61,9 @@ def token_required(f):
         except jwt.InvalidTokenError:
             return jsonify({'message': 'Invalid token'}), 401
 
+        # Case data of the request's department or case lives in that shard
+        route_request(current_user, kwargs)
+
         # Pass user to view
         return f(current_user, *args, **kwargs)
     
@@ -64,21 +72,17 @@ def token_required(f):
 def has_permission(user, permission_code):
     """Check if a user has a specific permission"""
     
+    # Roles and their parsed permissions come from the reference cache
+    from src.backend.utils.reference_data import get_role
+    role = get_role(user.role_id)
+    if role is None:
+        return False
+    
     # Super admin has all permissions
-    if user.role.name == 'Administrator':
+    if role['name'] == 'Administrator':
         return True
-        
-    # Convert permission string to JSON if needed
-    import json
-    if user.role.permissions is None:
-        permissions = []
-    else:
-        try:
-            permissions = json.loads(user.role.permissions)
-        except:
-            permissions = []
     
-    return permission_code in permissions
+    return permission_code in role['permission_set']
 
 def generate_token(user, expiration_minutes=60, fresh_login=False):
     """Generate a JWT token for authentication"""
@@ -0,0 +1,207 @@
+from flask import jsonify, current_app
+from sqlalchemy import select, insert
+from src.database.db_init import db
+from src.database.counters import increment_counters
+
+# Batch write modes
+ATOMIC = 'atomic'    # All items are written, or none if any item is invalid
+PARTIAL = 'partial'  # Valid items are written, invalid items are reported
+
+DEFAULT_MAX_BATCH_ITEMS = 10000
+IN_QUERY_CHUNK_SIZE = 500
+
+def parse_batch_request(data):
+    """
+    Extract the items and mode from a batch request body.
+
+    Returns:
+        tuple: (items, mode, error_response) - error_response is None when valid
+    """
+    if not data or not isinstance(data.get('items'), list):
+        return None, None, (jsonify({'message': 'Request body must contain an "items" array'}), 400)
+
+    items = data['items']
+    mode = data.get('mode', ATOMIC)
+
+    if mode not in (ATOMIC, PARTIAL):
+        return None, None, (jsonify({'message': f'Invalid mode, expected "{ATOMIC}" or "{PARTIAL}"'}), 400)
+
+    max_items = current_app.config.get('MAX_BATCH_ITEMS', DEFAULT_MAX_BATCH_ITEMS)
+    if not items:
+        return None, None, (jsonify({'message': 'No items provided'}), 400)
+    if len(items) > max_items:
+        return None, None, (jsonify({'message': f'Too many items, maximum is {max_items} per request'}), 413)
+
+    return items, mode, None
+
+def missing_fields(item, required_fields):
+    """List the required fields absent from a batch item"""
+    if not isinstance(item, dict):
+        return list(required_fields)
+    return [field for field in required_fields if field not in item]
+
+def coerce_id(value):
+    """An integer id from a JSON value (an int, or a string of digits), or None if it is not one"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+def coerce_ids(items, fields):
+    """
+    Convert the id fields set in batch items to ints, in place.
+
+    Run before existing_ids, which needs hashable, comparable values.
+
+    Returns:
+        dict: Item index -> error message, for items with a field that is not an integer id
+    """
+    errors = {}
+    for index, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        for field in fields:
+            if item.get(field) is None:
+                continue
+            value = coerce_id(item[field])
+            if value is None:
+                errors[index] = f'{field} must be an integer id'
+                break
+            item[field] = value
+    return errors
+
+# Names of column Python types in validation messages
+TYPE_NAMES = {str: 'a string', int: 'an integer', float: 'a number', bool: 'a boolean'}
+
+def invalid_value(model, item, fields):
+    """
+    Check a batch item's values against the model's column types and lengths.
+
+    One value the database rejects fails the whole executemany, so items are
+    checked before bulk_insert. Enum and date fields are parsed by the caller.
+
+    Returns:
+        str: Error message for the first field the column cannot store, or None
+    """
+    columns = model.__table__.c
+    for field in fields:
+        if field not in item:
+            continue  # Required fields are checked by missing_fields; the rest have defaults
+        value = item[field]
+        column = columns[field]
+        if value is None:
+            if not column.nullable:
+                return f'{field} must not be null'
+            continue
+        python_type = column.type.python_type
+        if isinstance(value, bool) and python_type is not bool:
+            valid = False
+        elif python_type is float:
+            valid = isinstance(value, (int, float))
+        else:
+            valid = isinstance(value, python_type)
+        if not valid:
+            return f'{field} must be {TYPE_NAMES[python_type]}'
+        length = getattr(column.type, 'length', None)
+        if length and len(value) > length:
+            return f'{field} must be at most {length} characters'
+    return None
+
+def existing_ids(column, ids):
+    """
+    Return the subset of ids present in column, using chunked IN queries.
+
+    Args:
+        column: Mapped primary key or unique column, e.g. Evidence.id
+        ids (iterable): Candidate values
+
+    Returns:
+        set: Values that exist
+    """
+    candidates = list({value for value in ids if value is not None})
+    found = set()
+    for start in range(0, len(candidates), IN_QUERY_CHUNK_SIZE):
+        chunk = candidates[start:start + IN_QUERY_CHUNK_SIZE]
+        found.update(db.session.scalars(select(column).where(column.in_(chunk))))
+    return found
+
+def bulk_insert(model, rows):
+    """
+    Insert many rows with a single executemany and return their new ids.
+
+    Counter columns on the rows' parents are updated in the same transaction,
+    since Core inserts do not fire the ORM events that normally maintain them.
+
+    Returns:
+        list: Primary keys in the same order as rows
+    """
+    if not rows:
+        return []
+    result = db.session.execute(
+        insert(model).returning(model.id, sort_by_parameter_order=True),
+        rows
+    )
+    ids = list(result.scalars())
+    increment_counters(model, rows)
+    return ids
+
+def batch_response(results, mode, written):
+    """
+    Build the response for a batch write.
+
+    Args:
+        results (list): Per-item result dicts, in request order
+        mode (str): ATOMIC or PARTIAL
+        written (bool): Whether any rows were committed
+
+    Returns:
+        tuple: Flask response and status code
+    """
+    created = sum(1 for result in results if result['status'] == 'created')
+    failed = sum(1 for result in results if result['status'] == 'error')
+
+    if failed and not written:
+        status_code = 400
+        message = f'{failed} invalid items, nothing was created'
+    elif failed:
+        status_code = 207
+        message = f'Created {created} items, {failed} failed'
+    else:
+        status_code = 201
+        message = f'Created {created} items'
+
+    return jsonify({
+        'message': message,
+        'mode': mode,
+        'created': created,
+        'failed': failed,
+        'results': results
+    }), status_code
+
+def split_valid(errors, count, mode):
+    """
+    Decide which items to write given per-item validation errors.
+
+    Args:
+        errors (dict): Item index -> error message
+        count (int): Number of items in the request
+        mode (str): ATOMIC or PARTIAL
+
+    Returns:
+        tuple: (indices to write, per-item results pre-filled for the rest)
+    """
+    results = [None] * count
+    for index, message in errors.items():
+        results[index] = {'index': index, 'status': 'error', 'message': message}
+
+    valid = [index for index in range(count) if index not in errors]
+
+    if errors and mode == ATOMIC:
+        for index in valid:
+            results[index] = {'index': index, 'status': 'skipped'}
+        return [], results
+
+    return valid, results
@@ -0,0 +1,369 @@
+"""
+Live case activity as server-sent events.
+
+The API write paths publish a small delta (new evidence, notes, timeline
+events, custody changes, analysis results) for the case they touched, and
+GET /api/case/<id>/events streams them to the open case pages, so clients
+apply changes as they happen instead of re-fetching whole lists on a timer.
+
+Events are delivered in-process to the streams of the worker that handled
+the write. With several worker processes, set CASE_EVENTS_BROKER to the
+address of a local broker that relays events between them:
+
+    python -m src.backend.utils.case_events --address 127.0.0.1:7480
+    python -m src.backend.utils.case_events --address /run/case-events.sock
+
+Each worker keeps the last CASE_EVENTS_HISTORY events per case, so a client
+that reconnects with Last-Event-ID gets what it missed; when that is no
+longer possible it receives a resync event and reloads the case once.
+
+Every open stream holds a server thread: run threaded (or gevent) workers,
+and keep CASE_EVENTS_MAX_SECONDS finite so long-lived streams are recycled
+(EventSource reconnects on its own).
+"""
+import argparse
+import json
+import logging
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+import uuid
+from collections import OrderedDict, deque
+from datetime import datetime
+from flask import Response, current_app, has_app_context
+from src.backend.utils.metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HISTORY = 100             # Recent events kept per case for Last-Event-ID resumes
+DEFAULT_HISTORY_CASES = 1000      # Cases whose recent events are kept per process
+DEFAULT_QUEUE_SIZE = 500          # Events buffered per stream before it has to resync
+DEFAULT_KEEPALIVE_SECONDS = 15.0  # Comment lines that keep idle streams open through proxies
+DEFAULT_MAX_SECONDS = 3600.0      # Streams close after this long and the client reconnects
+RECONNECT_SECONDS = 2.0           # Wait before reconnecting to the broker
+CLIENT_RETRY_MS = 3000            # Reconnect delay suggested to EventSource clients
+
+# Permissions that decide which events a stream may receive
+STREAM_PERMISSIONS = ('evidence:view', 'analysis:view', 'notes:view_all')
+
+CASE_EVENTS_PUBLISHED = Counter(
+    'case_events_published_total', 'Case activity events published by this process', ('type',)
+)
+CASE_EVENT_STREAMS = Gauge('case_event_streams', 'Open case event streams, summed over workers')
+
+class Subscription:
+    """One open stream: a bounded queue of the case's events"""
+
+    def __init__(self, case_id, queue_size=DEFAULT_QUEUE_SIZE):
+        self.case_id = case_id
+        self.queue = queue.Queue(queue_size)
+        self.overflowed = False
+
+    def put(self, event):
+        try:
+            self.queue.put_nowait(event)
+        except queue.Full:
+            # A stream that cannot keep up is told to reload instead of being sent a partial history
+            self.overflowed = True
+
+class CaseEventBus:
+    """In-process publish/subscribe of case events, optionally relayed through a broker"""
+
+    def __init__(self, history=DEFAULT_HISTORY, history_cases=DEFAULT_HISTORY_CASES,
+                 queue_size=DEFAULT_QUEUE_SIZE, broker=None):
+        self.history = history
+        self.history_cases = history_cases
+        self.queue_size = queue_size
+        self.broker = BrokerLink(self, broker) if broker else None
+        self._subscriptions = {}
+        self._recent = OrderedDict()
+        self._lock = threading.Lock()
+
+    def publish(self, event):
+        """Deliver event to this process's streams and, through the broker, to other workers"""
+        if self.broker is not None:
+            self.broker.ensure_started()
+            self.broker.send(event)
+        self.deliver(event)
+
+    def deliver(self, event):
+        with self._lock:
+            recent = self._recent.get(event['case_id'])
+            if recent is None:
+                recent = self._recent[event['case_id']] = deque(maxlen=self.history)
+                while len(self._recent) > self.history_cases:
+                    self._recent.popitem(last=False)
+            else:
+                self._recent.move_to_end(event['case_id'])
+            recent.append(event)
+            subscriptions = list(self._subscriptions.get(event['case_id'], ()))
+        for subscription in subscriptions:
+            subscription.put(event)
+
+    def subscribe(self, case_id, last_event_id=None):
+        """
+        Open a subscription to a case.
+
+        Returns:
+            tuple: (Subscription, the events after last_event_id, or None
+            when last_event_id is no longer in the history)
+        """
+        if self.broker is not None:
+            self.broker.ensure_started()
+        subscription = Subscription(case_id, self.queue_size)
+        with self._lock:
+            self._subscriptions.setdefault(case_id, set()).add(subscription)
+            recent = list(self._recent.get(case_id, ()))
+        missed = []
+        if last_event_id:
+            ids = [event['id'] for event in recent]
+            missed = recent[ids.index(last_event_id) + 1:] if last_event_id in ids else None
+        CASE_EVENT_STREAMS.set(self.stream_count())
+        return subscription, missed
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscriptions = self._subscriptions.get(subscription.case_id)
+            if subscriptions is not None:
+                subscriptions.discard(subscription)
+                if not subscriptions:
+                    del self._subscriptions[subscription.case_id]
+        CASE_EVENT_STREAMS.set(self.stream_count())
+
+    def stream_count(self):
+        with self._lock:
+            return sum(len(subscriptions) for subscriptions in self._subscriptions.values())
+
+def init_case_events(app):
+    """Set up the case event bus; CASE_EVENTS_BROKER relays events between worker processes"""
+    app.config.setdefault('CASE_EVENTS_BROKER', None)
+    app.config.setdefault('CASE_EVENTS_HISTORY', DEFAULT_HISTORY)
+    app.config.setdefault('CASE_EVENTS_KEEPALIVE_SECONDS', DEFAULT_KEEPALIVE_SECONDS)
+    app.config.setdefault('CASE_EVENTS_MAX_SECONDS', DEFAULT_MAX_SECONDS)
+    bus = CaseEventBus(history=app.config['CASE_EVENTS_HISTORY'], broker=app.config['CASE_EVENTS_BROKER'])
+    app.extensions['case_events'] = bus
+    return bus
+
+def publish_case_event(case_id, event_type, data, permission=None, private_to=None):
+    """
+    Publish a change to a case's event streams. Call after the change is committed.
+
+    Args:
+        permission: Permission a user needs to receive the event
+        private_to: User id of the only reader (besides notes:view_all holders) of a private note
+    """
+    if not has_app_context():
+        return
+    bus = current_app.extensions.get('case_events')
+    if bus is None:
+        return
+    bus.publish({
+        'id': uuid.uuid4().hex,
+        'type': event_type,
+        'case_id': int(case_id),
+        'time': datetime.utcnow().isoformat(),
+        'data': data,
+        'permission': permission,
+        'private_to': private_to
+    })
+    CASE_EVENTS_PUBLISHED.labels(event_type).inc()
+
+def visible_to(event, user_id, permissions):
+    if event['permission'] and not permissions.get(event['permission']):
+        return False
+    if event['private_to'] is not None and event['private_to'] != user_id:
+        return permissions.get('notes:view_all', False)
+    return True
+
+def format_event(event):
+    payload = json.dumps({'case_id': event['case_id'], 'time': event['time'], **event['data']})
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+def case_event_stream(current_user, case_id, last_event_id=None):
+    """
+    A text/event-stream response of a case's events for current_user.
+
+    Permissions are checked once up front and the request's database
+    session is released, so an open stream holds no connection.
+    """
+    from src.backend.utils.auth import has_permission
+    from src.database.db_init import db
+
+    bus = current_app.extensions['case_events']
+    keepalive = current_app.config['CASE_EVENTS_KEEPALIVE_SECONDS']
+    max_seconds = current_app.config['CASE_EVENTS_MAX_SECONDS']
+    user_id = current_user.id
+    permissions = {permission: has_permission(current_user, permission) for permission in STREAM_PERMISSIONS}
+    db.session.remove()
+
+    def generate():
+        # Subscribing here rather than in the view: a generator that never starts never runs its finally
+        subscription, missed = bus.subscribe(case_id, last_event_id)
+        deadline = time.monotonic() + max_seconds
+        try:
+            yield f"retry: {CLIENT_RETRY_MS}\n\n"
+            if missed is None:
+                yield "event: resync\ndata: {}\n\n"
+            else:
+                for event in missed:
+                    if visible_to(event, user_id, permissions):
+                        yield format_event(event)
+            while time.monotonic() < deadline:
+                try:
+                    event = subscription.queue.get(timeout=min(keepalive, max(deadline - time.monotonic(), 0)))
+                except queue.Empty:
+                    yield ": keepalive\n\n"
+                    continue
+                if subscription.overflowed:
+                    while not subscription.queue.empty():
+                        subscription.queue.get_nowait()
+                    subscription.overflowed = False
+                    yield "event: resync\ndata: {}\n\n"
+                    continue
+                if visible_to(event, user_id, permissions):
+                    yield format_event(event)
+        finally:
+            bus.unsubscribe(subscription)
+
+    return Response(generate(), mimetype='text/event-stream', headers={
+        'Cache-Control': 'no-cache, no-transform',
+        'X-Accel-Buffering': 'no'  # Stop nginx from buffering the stream
+    })
+
+def parse_address(address):
+    """(family, address) of 'host:port' or a Unix socket path"""
+    host, separator, port = address.rpartition(':')
+    if separator and port.isdigit() and '/' not in address:
+        return socket.AF_INET, (host or '127.0.0.1', int(port))
+    return socket.AF_UNIX, address
+
+class BrokerLink:
+    """
+    Connection of one worker process to the broker.
+
+    Started on first use in each worker process, since threads and sockets
+    do not survive the fork of a preloading server. Events published while
+    the broker is unreachable reach only the local streams.
+    """
+
+    def __init__(self, bus, address):
+        self.bus = bus
+        self.family, self.address = parse_address(address)
+        self._pid = None
+        self._socket = None
+        self._lock = threading.Lock()
+        self._send_lock = threading.Lock()
+
+    def ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            self._socket = None
+            threading.Thread(target=self._run, name='case-events-broker', daemon=True).start()
+
+    def send(self, event):
+        connection = self._socket
+        if connection is None:
+            return
+        line = (json.dumps(event) + '\n').encode()
+        try:
+            with self._send_lock:
+                connection.sendall(line)
+        except OSError as error:
+            logger.warning("Case event broker send failed: %s", error)
+            self._close(connection)
+
+    def _close(self, connection):
+        if self._socket is connection:
+            self._socket = None
+        try:
+            connection.close()
+        except OSError:
+            pass
+
+    def _run(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            try:
+                connection = socket.socket(self.family, socket.SOCK_STREAM)
+                connection.connect(self.address)
+            except OSError as error:
+                logger.warning("Case event broker %s is unavailable: %s", self.address, error)
+                time.sleep(RECONNECT_SECONDS)
+                continue
+            self._socket = connection
+            try:
+                for line in connection.makefile('rb'):
+                    self.bus.deliver(json.loads(line))
+            except (OSError, ValueError) as error:
+                logger.warning("Case event broker connection lost: %s", error)
+            self._close(connection)
+            time.sleep(RECONNECT_SECONDS)
+
+class _RelayHandler(socketserver.StreamRequestHandler):
+    """Forwards each event line a worker sends to every other connected worker"""
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.clients.add(self)
+        try:
+            for line in self.rfile:
+                with server.lock:
+                    others = [client for client in server.clients if client is not self]
+                for client in others:
+                    try:
+                        with client.send_lock:
+                            client.wfile.write(line)
+                    except OSError:
+                        pass
+        finally:
+            with server.lock:
+                server.clients.discard(self)
+
+    def setup(self):
+        super().setup()
+        self.send_lock = threading.Lock()
+
+class _TCPBroker(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+    daemon_threads = True
+
+class _UnixBroker(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+def make_broker(address):
+    """A threaded relay server listening on address ('host:port' or a Unix socket path)"""
+    family, bind_address = parse_address(address)
+    if family == socket.AF_UNIX and os.path.exists(bind_address):
+        os.unlink(bind_address)
+    server = (_UnixBroker if family == socket.AF_UNIX else _TCPBroker)(bind_address, _RelayHandler)
+    server.lock = threading.Lock()
+    server.clients = set()
+    return server
+
+def main():
+    parser = argparse.ArgumentParser(description='Relay case events between API worker processes')
+    parser.add_argument('--address', default=os.getenv('CASE_EVENTS_BROKER', '127.0.0.1:7480'),
+                        help="'host:port' or a Unix socket path (defaults to CASE_EVENTS_BROKER)")
+    args = parser.parse_args()
+    server = make_broker(args.address)
+    print(f"Relaying case events on {args.address}", flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../../..')))
+    main()
@@ -0,0 +1,244 @@
+import os
+import time
+from datetime import datetime
+from sqlalchemy import select, delete, insert
+from src.database.db_init import db
+from src.backend.models.evidence_model import CustodyChange, CustodyVerification, GENESIS_HASH, custody_record_hash
+
+# Verification statuses
+VALID = 'valid'
+BROKEN = 'broken'
+UNSEALED = 'unsealed'  # Legacy records without a sequence number or hash
+
+DEFAULT_PAGE_SIZE = 1000   # Evidence items per read page / worker task
+MAX_REPORTED_BREAKS = 1000
+
+# Column order of the rows handed to verify_chain
+CHAIN_COLUMNS = (
+    CustodyChange.evidence_id,
+    CustodyChange.seq,
+    CustodyChange.from_user_id,
+    CustodyChange.to_user_id,
+    CustodyChange.change_time,
+    CustodyChange.reason,
+    CustodyChange.location,
+    CustodyChange.witness_id,
+    CustodyChange.notes,
+    CustodyChange.prev_hash,
+    CustodyChange.record_hash
+)
+
+def last_custody_record(evidence_id):
+    """Head of an evidence item's custody chain, found through the (evidence_id, seq) index"""
+    return (CustodyChange.query
+            .filter_by(evidence_id=evidence_id)
+            .order_by(CustodyChange.seq.desc().nulls_last(), CustodyChange.id.desc())
+            .first())
+
+def seal_chain(evidence_id):
+    """
+    Number and hash a legacy custody chain in collection order.
+
+    Only chains with no sealed records are touched, so existing hashes are
+    never rewritten. Does not commit.
+
+    Returns:
+        CustodyChange: The new chain head, or None if nothing was sealed
+    """
+    records = (CustodyChange.query
+               .filter_by(evidence_id=evidence_id)
+               .order_by(CustodyChange.change_time, CustodyChange.id)
+               .all())
+    if not records or any(record.seq is not None for record in records):
+        return None
+
+    previous = None
+    for record in records:
+        record.link_to(previous)
+        previous = record
+    return previous
+
+def verify_chain(evidence_id, records):
+    """
+    Check one evidence item's custody chain.
+
+    Args:
+        evidence_id (int): Evidence item the records belong to
+        records (list): Row tuples in CHAIN_COLUMNS order, sorted by seq
+
+    Returns:
+        tuple: (evidence_id, status, record_count, break_seq, break_reason)
+    """
+    if any(row[1] is None for row in records):
+        return (evidence_id, UNSEALED, len(records), None, 'Chain contains records without a sequence number')
+
+    prev_hash = GENESIS_HASH
+    holder = None
+    for expected_seq, row in enumerate(records, 1):
+        _, seq, from_user_id, to_user_id, change_time, reason, location, witness_id, notes, stored_prev, stored_hash = row
+
+        if seq != expected_seq:
+            return (evidence_id, BROKEN, len(records), seq, f'Sequence gap: expected {expected_seq}, found {seq}')
+        if stored_prev != prev_hash:
+            return (evidence_id, BROKEN, len(records), seq, f'Previous hash does not match record {seq - 1}')
+        if custody_record_hash(evidence_id, seq, from_user_id, to_user_id, change_time,
+                               reason, location, witness_id, notes, stored_prev) != stored_hash:
+            return (evidence_id, BROKEN, len(records), seq, 'Record content does not match its hash')
+        if seq > 1 and from_user_id != holder:
+            return (evidence_id, BROKEN, len(records), seq,
+                    f'Transfer is from user {from_user_id} but user {holder} held the evidence')
+
+        prev_hash = stored_hash
+        holder = to_user_id
+
+    return (evidence_id, VALID, len(records), None, None)
+
+def verify_chains(chains):
+    """Verify a list of (evidence_id, records) chains; runs inside worker processes"""
+    return [verify_chain(evidence_id, records) for evidence_id, records in chains]
+
+def read_chain_pages(page_size=DEFAULT_PAGE_SIZE):
+    """
+    Stream custody records grouped into whole chains.
+
+    Pages by evidence id (keyset pagination) so each read is a short indexed
+    range query and nothing holds a cursor open between pages.
+
+    Yields:
+        list: (evidence_id, records) pairs for up to page_size evidence items
+    """
+    last_id = 0
+    while True:
+        page_ids = db.session.scalars(
+            select(CustodyChange.evidence_id)
+            .where(CustodyChange.evidence_id > last_id)
+            .group_by(CustodyChange.evidence_id)
+            .order_by(CustodyChange.evidence_id)
+            .limit(page_size)
+        ).all()
+        if not page_ids:
+            return
+
+        rows = db.session.execute(
+            select(*CHAIN_COLUMNS)
+            .where(CustodyChange.evidence_id.between(page_ids[0], page_ids[-1]))
+            .order_by(CustodyChange.evidence_id, CustodyChange.seq, CustodyChange.id)
+        )
+
+        chains = {}
+        for row in rows:
+            chains.setdefault(row[0], []).append(tuple(row))
+        yield list(chains.items())
+
+        last_id = page_ids[-1]
+
+def write_verification_statuses(results, verified_at):
+    """Replace the stored verification status of each verified evidence item"""
+    if not results:
+        return
+    db.session.execute(
+        delete(CustodyVerification).where(CustodyVerification.evidence_id.in_([r[0] for r in results]))
+    )
+    db.session.execute(insert(CustodyVerification), [{
+        'evidence_id': evidence_id,
+        'status': status,
+        'record_count': record_count,
+        'break_seq': break_seq,
+        'break_reason': break_reason,
+        'verified_at': verified_at
+    } for evidence_id, status, record_count, break_seq, break_reason in results])
+    db.session.commit()
+
+def verify_custody_chains(workers=None, page_size=DEFAULT_PAGE_SIZE):
+    """
+    Verify every custody chain and store a status per evidence item.
+
+    Pages of chains are read in the calling process and verified in a
+    process pool; at most two pages per worker are in flight, so memory
+    stays bounded however many records there are. Must run inside an
+    application context.
+
+    Args:
+        workers (int): Worker processes; 0 verifies inline, None uses one per CPU
+        page_size (int): Evidence items per page
+
+    Returns:
+        dict: Totals and the first MAX_REPORTED_BREAKS broken or unsealed chains
+    """
+    started = time.monotonic()
+    verified_at = datetime.utcnow()
+    report = {'evidence_checked': 0, 'records_checked': 0, VALID: 0, BROKEN: 0, UNSEALED: 0, 'breaks': []}
+
+    def collect(results):
+        for result in results:
+            evidence_id, status, record_count, break_seq, break_reason = result
+            report['evidence_checked'] += 1
+            report['records_checked'] += record_count
+            report[status] += 1
+            if status != VALID and len(report['breaks']) < MAX_REPORTED_BREAKS:
+                report['breaks'].append({
+                    'evidence_id': evidence_id,
+                    'status': status,
+                    'break_seq': break_seq,
+                    'reason': break_reason
+                })
+        write_verification_statuses(results, verified_at)
+
+    if workers == 0:
+        for chains in read_chain_pages(page_size):
+            collect(verify_chains(chains))
+    else:
+        # multiprocessing is only needed here, so web workers never import it
+        from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+        workers = workers or os.cpu_count() or 1
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            max_pending = workers * 2
+            pending = set()
+            for chains in read_chain_pages(page_size):
+                pending.add(pool.submit(verify_chains, chains))
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        collect(future.result())
+            for future in pending:
+                collect(future.result())
+
+    report['elapsed_seconds'] = round(time.monotonic() - started, 3)
+    return report
+
+def verify_evidence_custody(evidence_id):
+    """Verify a single evidence item's chain inline and store its status"""
+    rows = db.session.execute(
+        select(*CHAIN_COLUMNS)
+        .where(CustodyChange.evidence_id == evidence_id)
+        .order_by(CustodyChange.seq, CustodyChange.id)
+    )
+    result = verify_chain(evidence_id, [tuple(row) for row in rows])
+    write_verification_statuses([result], datetime.utcnow())
+    return result
+
+def seal_legacy_chains(page_size=DEFAULT_PAGE_SIZE):
+    """
+    Seal every chain that still has unnumbered records, committing per page.
+
+    Returns:
+        int: Number of chains sealed
+    """
+    sealed = 0
+    last_id = 0
+    while True:
+        evidence_ids = db.session.scalars(
+            select(CustodyChange.evidence_id)
+            .where(CustodyChange.seq.is_(None), CustodyChange.evidence_id > last_id)
+            .group_by(CustodyChange.evidence_id)
+            .order_by(CustodyChange.evidence_id)
+            .limit(page_size)
+        ).all()
+        if not evidence_ids:
+            return sealed
+
+        for evidence_id in evidence_ids:
+            if seal_chain(evidence_id) is not None:
+                sealed += 1
+        db.session.commit()
+        last_id = evidence_ids[-1]
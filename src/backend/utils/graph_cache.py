@@ -0,0 +1,332 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+from flask import current_app
+from sqlalchemy import select, func, or_
+from src.database.db_init import db
+from src.database.sharding import current_shard, all_shards, use_shard, shard_name
+from src.backend.models.case_model import Case
+from src.backend.models.evidence_model import Evidence
+from src.backend.models.suspect_model import Suspect, SuspectEvidenceLink
+from src.backend.models.analysis_model import EvidenceCorrelation
+from src.backend.models.user_model import ReferenceDataVersion
+from src.backend.utils.reference_data import bump_versions
+from src.backend.utils.metrics import count_cache_lookup
+from src.analysis_tools.evidence_graph import (
+    EvidenceGraph, NODE_TYPES, CASE, EVIDENCE, SUSPECT, LOCATION,
+    MEMBER, LINK, CORRELATION, SHARED_LOCATION, node_keys, normalize_location
+)
+
+GRAPH_VERSION = 'graph'
+DEFAULT_MAX_CASE_GRAPHS = 32
+
+# Row sources of the graph; ids only grow, which is what incremental sync relies on
+SOURCES = {
+    'links': SuspectEvidenceLink,
+    'correlations': EvidenceCorrelation,
+    'evidence': Evidence,
+    'suspects': Suspect
+}
+
+def _case_filters(case_id):
+    case_evidence = select(Evidence.id).where(Evidence.case_id == case_id)
+    case_suspects = select(Suspect.id).where(Suspect.case_id == case_id)
+    return {
+        'links': or_(SuspectEvidenceLink.suspect_id.in_(case_suspects),
+                     SuspectEvidenceLink.evidence_id.in_(case_evidence)),
+        'correlations': or_(EvidenceCorrelation.evidence_a_id.in_(case_evidence),
+                            EvidenceCorrelation.evidence_b_id.in_(case_evidence)),
+        'evidence': Evidence.case_id == case_id,
+        'suspects': Suspect.case_id == case_id
+    }
+
+def read_watermarks(case_id=None):
+    """
+    (max id, row count) of every row source in one query, plus the graph version.
+
+    Appended rows show up as a higher max id; deletions, and rows that
+    committed out of id order, as a count the appended rows do not explain.
+    """
+    filters = _case_filters(case_id) if case_id is not None else {}
+    columns = []
+    for name, model in SOURCES.items():
+        for label, aggregate in (('max', func.max(model.id)), ('count', func.count(model.id))):
+            query = select(aggregate)
+            if name in filters:
+                query = query.where(filters[name])
+            columns.append(query.scalar_subquery().label(f'{name}_{label}'))
+    columns.append(
+        select(ReferenceDataVersion.version)
+        .where(ReferenceDataVersion.name == GRAPH_VERSION)
+        .scalar_subquery()
+        .label('version')
+    )
+    row = db.session.execute(select(*columns)).one()._mapping
+    return {
+        'sources': {name: (row[f'{name}_max'] or 0, row[f'{name}_count']) for name in SOURCES},
+        'version': row['version'] or 0
+    }
+
+def load_edges(graph_labels, case_id=None, after=None):
+    """
+    Read graph edges from the database as packed node keys.
+
+    Args:
+        graph_labels (callable): Maps a normalized location label to its code
+        case_id (int): Restrict to one case's evidence and suspects (and their links)
+        after (dict): Row source -> max id already loaded; only newer rows are read
+
+    Returns:
+        tuple: (source keys, destination keys, kinds, rows read per source)
+    """
+    filters = _case_filters(case_id) if case_id is not None else {}
+    after = after or {}
+    src, dst, kinds = [], [], []
+    rows_read = {}
+
+    def rows(name, *columns):
+        model = SOURCES[name]
+        query = select(*columns).where(model.id > after.get(name, 0))
+        if name in filters:
+            query = query.where(filters[name])
+        result = db.session.execute(query).all()
+        rows_read[name] = len(result)
+        return result
+
+    def add(src_type, src_ids, dst_type, dst_ids, kind):
+        if len(src_ids):
+            src.append(node_keys(src_type, src_ids))
+            dst.append(node_keys(dst_type, dst_ids))
+            kinds.append(np.full(len(src_ids), kind, dtype=np.int8))
+
+    links = np.array(rows('links', SuspectEvidenceLink.suspect_id, SuspectEvidenceLink.evidence_id),
+                     dtype=np.int64).reshape(-1, 2)
+    add(SUSPECT, links[:, 0], EVIDENCE, links[:, 1], LINK)
+
+    correlations = np.array(rows('correlations', EvidenceCorrelation.evidence_a_id, EvidenceCorrelation.evidence_b_id),
+                            dtype=np.int64).reshape(-1, 2)
+    add(EVIDENCE, correlations[:, 0], EVIDENCE, correlations[:, 1], CORRELATION)
+
+    evidence_rows = rows('evidence', Evidence.id, Evidence.case_id, Evidence.location_found)
+    evidence_ids = np.array([row[0] for row in evidence_rows], dtype=np.int64)
+    add(CASE, np.array([row[1] for row in evidence_rows], dtype=np.int64), EVIDENCE, evidence_ids, MEMBER)
+    located = [(row[0], graph_labels(normalize_location(row[2]))) for row in evidence_rows if normalize_location(row[2])]
+    if located:
+        located = np.array(located, dtype=np.int64)
+        add(EVIDENCE, located[:, 0], LOCATION, located[:, 1], SHARED_LOCATION)
+
+    suspects = np.array(rows('suspects', Suspect.case_id, Suspect.id), dtype=np.int64).reshape(-1, 2)
+    add(CASE, suspects[:, 0], SUSPECT, suspects[:, 1], MEMBER)
+
+    def joined(parts):
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+
+    return joined(src), joined(dst), (np.concatenate(kinds) if kinds else np.empty(0, dtype=np.int8)), rows_read
+
+class _CachedGraph:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.graph = None
+        self.watermarks = None
+
+class GraphCache:
+    """
+    Per-process cache of the global graph and of recently used case graphs.
+
+    Before each use the graph is checked against the database with one
+    aggregate query. Rows appended since the last check (new links,
+    correlations, evidence and suspects, from any process) are added to
+    the graph incrementally; anything else - deleted rows, rows committed
+    out of id order, or a bumped 'graph' version after an evidence item's
+    location changed - rebuilds it.
+
+    Under department sharding a cache reads the shards it was created for:
+    one shard, or all of them for a global graph across departments. Ids
+    are unique across shards, so their rows join into one graph.
+    """
+
+    def __init__(self, shards=(None,), max_case_graphs=DEFAULT_MAX_CASE_GRAPHS):
+        self.shards = list(shards)
+        self.max_case_graphs = max_case_graphs
+        self._lock = threading.Lock()
+        self._global = _CachedGraph()
+        self._cases = OrderedDict()
+
+    def _entry(self, case_id):
+        if case_id is None:
+            return self._global
+        with self._lock:
+            entry = self._cases.get(case_id)
+            if entry is None:
+                entry = self._cases[case_id] = _CachedGraph()
+                while len(self._cases) > self.max_case_graphs:
+                    self._cases.popitem(last=False)
+            else:
+                self._cases.move_to_end(case_id)
+            return entry
+
+    def query(self, function, case_id=None):
+        """
+        Run function(graph) on an up-to-date graph for the scope.
+
+        The graph is locked for the duration of the call, so keep it to a
+        traversal and return plain results.
+        """
+        entry = self._entry(case_id)
+        with entry.lock:
+            self._sync(entry, case_id)
+            return function(entry.graph)
+
+    def _read_watermarks(self, case_id):
+        """read_watermarks of every shard, with the sources keyed by (shard name, source)"""
+        sources = {}
+        version = 0
+        for shard in self.shards:
+            with use_shard(shard):
+                watermarks = read_watermarks(case_id)
+            sources.update({(shard_name(shard), name): value for name, value in watermarks['sources'].items()})
+            version = watermarks['version']
+        return {'sources': sources, 'version': version}
+
+    def _load_edges(self, graph_labels, case_id, after=None):
+        """load_edges of every shard, joined, with rows read keyed like _read_watermarks"""
+        src, dst, kinds, rows_read = [], [], [], {}
+        for shard in self.shards:
+            name = shard_name(shard)
+            shard_after = {source: after[(name, source)] for source in SOURCES} if after else None
+            with use_shard(shard):
+                shard_src, shard_dst, shard_kinds, read = load_edges(graph_labels, case_id, shard_after)
+            src.append(shard_src)
+            dst.append(shard_dst)
+            kinds.append(shard_kinds)
+            rows_read.update({(name, source): count for source, count in read.items()})
+        return np.concatenate(src), np.concatenate(dst), np.concatenate(kinds), rows_read
+
+    def _sync(self, entry, case_id):
+        current = self._read_watermarks(case_id)
+        previous = entry.watermarks
+
+        if entry.graph is not None and previous['version'] == current['version']:
+            if current['sources'] == previous['sources']:
+                count_cache_lookup('graph', 'hit')
+                return
+            if all(current['sources'][key][1] >= previous['sources'][key][1] for key in current['sources']):
+                after = {key: previous['sources'][key][0] for key in current['sources']}
+                graph = entry.graph
+                src, dst, kinds, rows_read = self._load_edges(
+                    lambda label: graph.location_code(label, create=True), case_id, after
+                )
+                # Every new row must have an id above the old watermark, or some were missed
+                if all(previous['sources'][key][1] + rows_read[key] == current['sources'][key][1]
+                       for key in current['sources']):
+                    graph.add_edges(src, dst, kinds)
+                    entry.watermarks = current
+                    count_cache_lookup('graph', 'incremental')
+                    return
+
+        count_cache_lookup('graph', 'miss')
+        labels = {}
+        src, dst, kinds, _ = self._load_edges(lambda label: labels.setdefault(label, len(labels)), case_id)
+        entry.graph = EvidenceGraph(src, dst, kinds, location_labels=list(labels))
+        entry.watermarks = current
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def graph_cache(every_shard=False):
+    """
+    The cache for the current application's database and shard.
+
+    With every_shard, the cache whose global graph spans the primary and
+    every department shard; case graphs should use the case's own shard.
+    """
+    shards = all_shards() if every_shard else [current_shard()]
+    key = (str(db.engine.url), tuple(shard_name(shard) for shard in shards))
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = _caches[key] = GraphCache(
+                    shards, current_app.config.get('GRAPH_MAX_CASE_GRAPHS', DEFAULT_MAX_CASE_GRAPHS)
+                )
+    return cache
+
+def invalidate_graphs():
+    """Force every process to rebuild its graphs; call after committing a non-append change"""
+    bump_versions(GRAPH_VERSION)
+
+def parse_node(value):
+    """
+    Parse a 'type:id' node reference, e.g. 'suspect:12'.
+
+    Locations are referenced by their text: 'location:main street'.
+
+    Returns:
+        tuple: (type code, id or normalized label), or None if malformed
+    """
+    node_type, _, node_id = (value or '').partition(':')
+    if node_type not in NODE_TYPES or not node_id:
+        return None
+    if node_type == 'location':
+        return LOCATION, normalize_location(node_id)
+    try:
+        return NODE_TYPES.index(node_type), int(node_id)
+    except ValueError:
+        return None
+
+def resolve_node(graph, node):
+    """Graph index of a parsed node reference, or None if it is not in the graph"""
+    node_type, node_id = node
+    if node_type == LOCATION:
+        node_id = graph.location_code(node_id)
+        if node_id is None:
+            return None
+    return graph.node_index(node_type, node_id)
+
+def describe_nodes(graph, indices):
+    """
+    Node dictionaries with display labels, loaded with one IN query per type.
+
+    Returns:
+        list: {'type', 'id', 'label'} per index, in the given order
+    """
+    keys = [graph.node_key(int(index)) for index in indices]
+    ids_by_type = {}
+    for node_type, node_id in keys:
+        ids_by_type.setdefault(node_type, set()).add(node_id)
+
+    queries = {
+        'case': lambda ids: db.session.execute(
+            select(Case.id, Case.case_number).where(Case.id.in_(ids))
+        ).all(),
+        'evidence': lambda ids: db.session.execute(
+            select(Evidence.id, Evidence.evidence_number).where(Evidence.id.in_(ids))
+        ).all(),
+        'suspect': lambda ids: [
+            (row.id, f"{row.first_name} {row.last_name}")
+            for row in db.session.execute(
+                select(Suspect.id, Suspect.first_name, Suspect.last_name).where(Suspect.id.in_(ids))
+            )
+        ]
+    }
+    labels = {node_type: {} for node_type in queries}
+    # Look in the request's shard first; nodes of a global graph may live in any other
+    shards = [current_shard()] + [shard for shard in all_shards() if shard is not current_shard()]
+    for shard in shards:
+        missing = {node_type: ids - labels[node_type].keys()
+                   for node_type, ids in ids_by_type.items() if node_type in queries}
+        missing = {node_type: ids for node_type, ids in missing.items() if ids}
+        if not missing:
+            break
+        with use_shard(shard):
+            for node_type, ids in missing.items():
+                labels[node_type].update(queries[node_type](ids))
+
+    nodes = []
+    for node_type, node_id in keys:
+        if node_type == 'location':
+            nodes.append({'type': node_type, 'id': graph.location_labels[node_id], 'label': graph.location_labels[node_id]})
+        else:
+            nodes.append({'type': node_type, 'id': node_id, 'label': labels.get(node_type, {}).get(node_id)})
+    return nodes
@@ -0,0 +1,209 @@
+import hashlib
+import zlib
+from functools import wraps
+from flask import request, make_response
+
+try:
+    import brotli
+except ImportError:  # br is only offered when the Brotli package is installed
+    brotli = None
+
+DEFAULT_MIN_SIZE = 1024       # Bytes below which responses are sent uncompressed
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_BROTLI_QUALITY = 5
+COMPRESSIBLE_MIMETYPES = {
+    'application/json',
+    'application/x-ndjson',
+    'text/plain',
+    'text/html',
+    'text/csv',
+    'application/javascript'
+}
+
+def init_http_middleware(app):
+    """
+    Add conditional GET and response compression to every API response.
+
+    Successful GET responses without an ETag get a strong one from a hash
+    of their body, and a matching If-None-Match turns them into a 304.
+    Views that can tell their version cheaply use @versioned instead, which
+    answers 304 before the handler runs. Compressible responses of at least
+    COMPRESS_MIN_SIZE bytes (and all streamed ones) are then encoded with
+    brotli or gzip, whichever the client prefers.
+    """
+    app.config.setdefault('COMPRESS_MIN_SIZE', DEFAULT_MIN_SIZE)
+    app.config.setdefault('COMPRESS_GZIP_LEVEL', DEFAULT_GZIP_LEVEL)
+    app.config.setdefault('COMPRESS_BROTLI_QUALITY', DEFAULT_BROTLI_QUALITY)
+
+    @app.after_request
+    def conditional_and_compressed(response):
+        response = apply_conditional_get(response)
+        return compress_response(response, app.config)
+
+def body_etag(data):
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+def etag_matches(etag):
+    """
+    Whether If-None-Match names etag in any content encoding.
+
+    Compressed representations carry the identity ETag plus an encoding
+    suffix, so all variants validate against the same underlying body.
+    """
+    if_none_match = request.if_none_match
+    if not if_none_match:
+        return False
+    if if_none_match.star_tag:
+        return True
+    return any(
+        if_none_match.contains_weak(candidate)
+        for candidate in (etag, f'{etag}-gzip', f'{etag}-br')
+    )
+
+def not_modified(etag, weak=False, source=None):
+    """An empty 304 carrying the validator and caching headers of source"""
+    response = make_response('', 304)
+    response.set_etag(etag, weak=weak)
+    if source is not None:
+        for header in ('Cache-Control', 'Expires', 'Vary'):
+            if header in source.headers:
+                response.headers[header] = source.headers[header]
+    return response
+
+def apply_conditional_get(response):
+    if request.method not in ('GET', 'HEAD') or response.status_code != 200:
+        return response
+    if response.is_streamed or response.direct_passthrough or 'Content-Encoding' in response.headers:
+        return response
+
+    etag, weak = response.get_etag()
+    if etag is None:
+        data = response.get_data()
+        if not data:
+            return response
+        etag = body_etag(data)
+        response.set_etag(etag)
+        weak = False
+
+    if etag_matches(etag):
+        return not_modified(etag, weak, response)
+    return response
+
+def versioned(stamp, permission=None):
+    """
+    Derive a view's ETag from model version stamps instead of its body.
+
+    stamp receives the view's URL arguments and returns a value that
+    changes whenever the response would, or None to fall back to body
+    hashing. The ETag also covers the query string and the caller's user
+    and role, so it is never shared between users. Apply below
+    @token_required.
+
+    A caller without permission never gets a 304: the view runs and
+    answers with its own authorization error.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated(current_user, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return f(current_user, *args, **kwargs)
+
+            if permission is not None:
+                from src.backend.utils.auth import has_permission
+                if not has_permission(current_user, permission):
+                    return f(current_user, *args, **kwargs)
+
+            version = stamp(*args, **kwargs)
+            if version is None:
+                return f(current_user, *args, **kwargs)
+
+            from src.backend.utils.reference_data import get_role
+            role = get_role(current_user.role_id)
+            etag = body_etag(repr((
+                request.full_path,
+                current_user.id,
+                current_user.role_id,
+                role['permissions'] if role else None,
+                version
+            )).encode('utf-8'))
+
+            if etag_matches(etag):
+                return not_modified(etag)
+
+            response = make_response(f(current_user, *args, **kwargs))
+            if response.status_code == 200:
+                response.set_etag(etag)
+            return response
+        return decorated
+    return decorator
+
+def choose_encoding():
+    offered = ['br', 'gzip'] if brotli is not None else ['gzip']
+    return request.accept_encodings.best_match(offered)
+
+class _GzipStream:
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)  # 31: gzip container
+
+    def compress(self, chunk):
+        return self._compressor.compress(chunk)
+
+    def finish(self):
+        return self._compressor.flush()
+
+class _BrotliStream:
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, chunk):
+        return self._compressor.process(chunk)
+
+    def finish(self):
+        return self._compressor.finish()
+
+def _compress_chunks(chunks, compressor):
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode('utf-8')
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.finish()
+
+def compress_response(response, config):
+    if response.status_code < 200 or response.status_code in (204, 206, 304) or request.method == 'HEAD':
+        return response
+    if 'Content-Encoding' in response.headers or response.mimetype not in COMPRESSIBLE_MIMETYPES:
+        return response
+    if 'no-transform' in response.headers.get('Cache-Control', ''):
+        return response
+
+    response.vary.add('Accept-Encoding')
+    streamed = response.is_streamed or response.direct_passthrough
+    if not streamed and response.calculate_content_length() < config['COMPRESS_MIN_SIZE']:
+        return response
+
+    encoding = choose_encoding()
+    if encoding is None:
+        return response
+
+    if encoding == 'br':
+        compressor = _BrotliStream(config['COMPRESS_BROTLI_QUALITY'])
+    else:
+        compressor = _GzipStream(config['COMPRESS_GZIP_LEVEL'])
+
+    if streamed:
+        # Compress chunk by chunk as the body is produced
+        response.response = _compress_chunks(response.response, compressor)
+        response.direct_passthrough = False
+        response.headers.pop('Content-Length', None)
+    else:
+        response.set_data(b''.join(_compress_chunks([response.get_data()], compressor)))
+
+    response.headers['Content-Encoding'] = encoding
+
+    # A strong validator names exact bytes, so each encoding gets its own
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(f'{etag}-{encoding}')
+    return response
@@ -0,0 +1,226 @@
+import gzip
+import hashlib
+import json
+import os
+from collections import Counter, defaultdict
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import select, delete, insert, func
+from src.database.db_init import db
+from src.backend.models.audit_model import LogArchiveSegment, LogArchiveKey, LogSealBatch
+from src.backend.utils.log_sealing import SEALED_LOGS
+
+DEFAULT_RETENTION_DAYS = 90
+ARCHIVE_CHUNK_SIZE = 10000
+DELETE_CHUNK_SIZE = 500
+
+# Columns indexed per archived segment so lookups by them only open matching files
+ARCHIVE_KEYS = {
+    'evidence_logs': ('evidence_id', 'user_id'),
+    'user_activities': ('user_id',)
+}
+
+def archive_directory():
+    return current_app.config.get('LOG_ARCHIVE_DIR') or os.path.join(current_app.instance_path, 'log_archive')
+
+def column_names(log_table):
+    return [column.key for column in SEALED_LOGS[log_table][1]]
+
+def _serialize(value):
+    return value.isoformat() if isinstance(value, datetime) else value
+
+def archive_old_logs(retention_days=DEFAULT_RETENTION_DAYS, chunk_size=ARCHIVE_CHUNK_SIZE):
+    """
+    Move log rows older than the retention period into monthly archive files.
+
+    Each run writes new gzip JSONL files under <table>/<YYYY-MM>/ and never
+    rewrites existing ones. Only rows already covered by a sealed Merkle batch
+    are archived, so inclusion proofs stay available for them. Files are
+    written before the database transaction that records their segments and
+    deletes the hot rows; if that transaction fails the files are removed.
+
+    Returns:
+        dict: Log table -> number of rows archived
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    report = {}
+
+    for log_table, (model, columns) in SEALED_LOGS.items():
+        names = column_names(log_table)
+        sealed_max = db.session.scalar(
+            select(func.max(LogSealBatch.last_id)).where(LogSealBatch.log_table == log_table)
+        ) or 0
+        archived = 0
+
+        while True:
+            rows = db.session.execute(
+                select(*columns)
+                .where(model.timestamp < cutoff, model.id <= sealed_max)
+                .order_by(model.id)
+                .limit(chunk_size)
+            ).all()
+            if not rows:
+                break
+
+            by_month = defaultdict(list)
+            for row in rows:
+                record = dict(zip(names, row))
+                by_month[record['timestamp'].strftime('%Y-%m')].append(record)
+
+            written = []
+            try:
+                for month, records in by_month.items():
+                    path, digest = write_segment_file(log_table, month, records)
+                    written.append(path)
+                    record_segment(log_table, month, path, digest, records)
+
+                ids = [row[0] for row in rows]
+                for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+                    db.session.execute(delete(model).where(model.id.in_(ids[start:start + DELETE_CHUNK_SIZE])))
+                db.session.commit()
+            except Exception:
+                db.session.rollback()
+                for path in written:
+                    os.remove(os.path.join(archive_directory(), path))
+                raise
+
+            archived += len(rows)
+            if len(rows) < chunk_size:
+                break
+
+        report[log_table] = archived
+
+    return report
+
+def write_segment_file(log_table, month, records):
+    """
+    Write records to a new compressed segment file.
+
+    Returns:
+        tuple: (path relative to the archive directory, sha256 of the file)
+    """
+    relative_path = os.path.join(
+        log_table, month, f"part-{records[0]['id']:010d}-{records[-1]['id']:010d}.jsonl.gz"
+    )
+    full_path = os.path.join(archive_directory(), relative_path)
+    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+
+    # Exclusive create: segments are append-only and never overwritten
+    with open(full_path, 'xb') as raw, gzip.GzipFile(fileobj=raw, mode='wb') as archive_file:
+        for record in records:
+            line = json.dumps({key: _serialize(value) for key, value in record.items()}, separators=(',', ':'))
+            archive_file.write(line.encode('utf-8') + b'\n')
+
+    with open(full_path, 'rb') as archive_file:
+        digest = hashlib.sha256(archive_file.read()).hexdigest()
+
+    return relative_path, digest
+
+def record_segment(log_table, month, path, digest, records):
+    """Index a written segment by id range, time range and key values"""
+    segment = LogArchiveSegment(
+        log_table=log_table,
+        month=month,
+        path=path,
+        first_id=records[0]['id'],
+        last_id=records[-1]['id'],
+        first_timestamp=min(record['timestamp'] for record in records),
+        last_timestamp=max(record['timestamp'] for record in records),
+        row_count=len(records),
+        sha256=digest
+    )
+    db.session.add(segment)
+    db.session.flush()
+
+    key_rows = []
+    for key_name in ARCHIVE_KEYS[log_table]:
+        counts = Counter(record[key_name] for record in records if record[key_name] is not None)
+        key_rows.extend({
+            'segment_id': segment.id,
+            'key_name': key_name,
+            'key_value': key_value,
+            'row_count': count
+        } for key_value, count in counts.items())
+    if key_rows:
+        db.session.execute(insert(LogArchiveKey), key_rows)
+
+    return segment
+
+def read_segment(segment, verify=False):
+    """
+    Iterate the records of an archived segment in id order.
+
+    Args:
+        segment (LogArchiveSegment): Segment to read
+        verify (bool): Check the file against its recorded digest first
+    """
+    full_path = os.path.join(archive_directory(), segment.path)
+    if verify:
+        with open(full_path, 'rb') as archive_file:
+            if hashlib.sha256(archive_file.read()).hexdigest() != segment.sha256:
+                raise ValueError(f'Archive segment {segment.path} does not match its recorded digest')
+
+    with gzip.open(full_path, 'rt', encoding='utf-8') as archive_file:
+        for line in archive_file:
+            yield json.loads(line)
+
+def query_archived_logs(log_table, key_name=None, key_value=None, start=None, end=None, limit=100):
+    """
+    Read archived log rows, newest first.
+
+    Segments are narrowed through the index tables first, so only files
+    that can contain matching rows are opened.
+
+    Args:
+        log_table (str): evidence_logs or user_activities
+        key_name (str): Optional indexed column to filter on, see ARCHIVE_KEYS
+        key_value (int): Value for key_name
+        start (datetime): Optional earliest timestamp
+        end (datetime): Optional latest timestamp
+        limit (int): Maximum rows returned
+
+    Returns:
+        list: Archived rows as dictionaries
+    """
+    query = LogArchiveSegment.query.filter(LogArchiveSegment.log_table == log_table)
+    if key_name:
+        query = query.join(LogArchiveKey).filter(
+            LogArchiveKey.key_name == key_name,
+            LogArchiveKey.key_value == key_value
+        )
+    if start:
+        query = query.filter(LogArchiveSegment.last_timestamp >= start)
+    if end:
+        query = query.filter(LogArchiveSegment.first_timestamp <= end)
+
+    results = []
+    for segment in query.order_by(LogArchiveSegment.last_id.desc()):
+        for record in reversed(list(read_segment(segment))):
+            if key_name and record.get(key_name) != key_value:
+                continue
+            timestamp = datetime.fromisoformat(record['timestamp'])
+            if (start and timestamp < start) or (end and timestamp > end):
+                continue
+            results.append(record)
+            if len(results) >= limit:
+                return results
+    return results
+
+def find_archived_entry(log_table, entry_id):
+    """
+    Look up one archived log row by id.
+
+    Returns:
+        tuple: Row values in SEALED_LOGS column order, or None
+    """
+    segments = LogArchiveSegment.query.filter(
+        LogArchiveSegment.log_table == log_table,
+        LogArchiveSegment.first_id <= entry_id,
+        LogArchiveSegment.last_id >= entry_id
+    )
+    names = column_names(log_table)
+    for segment in segments:
+        for record in read_segment(segment):
+            if record['id'] == entry_id:
+                return tuple(record[name] for name in names)
+    return None
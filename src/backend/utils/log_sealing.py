@@ -0,0 +1,319 @@
+import hashlib
+import json
+import logging
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import select, insert, func, and_, or_
+from sqlalchemy.exc import IntegrityError
+from src.database.db_init import db
+from src.backend.models.audit_model import LogSealBatch, LogMerkleNode
+from src.backend.models.evidence_model import EvidenceLog
+from src.backend.models.user_model import UserActivity
+
+logger = logging.getLogger(__name__)
+
+GENESIS_HASH = '0' * 64
+
+DEFAULT_BATCH_SIZE = 1024   # Log rows per Merkle tree
+DEFAULT_SEAL_DELAY = 5      # Seconds a row must age before it is sealed
+DEFAULT_SEAL_INTERVAL = 60  # Seconds between background sealing runs
+
+# Sealed log tables and the columns each leaf hash covers, in order
+SEALED_LOGS = {
+    'evidence_logs': (EvidenceLog, (
+        EvidenceLog.id, EvidenceLog.evidence_id, EvidenceLog.user_id, EvidenceLog.action,
+        EvidenceLog.timestamp, EvidenceLog.details, EvidenceLog.ip_address
+    )),
+    'user_activities': (UserActivity, (
+        UserActivity.id, UserActivity.user_id, UserActivity.activity_type,
+        UserActivity.description, UserActivity.ip_address, UserActivity.timestamp
+    ))
+}
+
+def leaf_hash(log_table, row):
+    """Hash of one log row; the 0x00 prefix keeps leaves distinct from inner nodes"""
+    values = [value.isoformat() if isinstance(value, datetime) else value for value in row]
+    content = json.dumps([log_table] + values, separators=(',', ':'))
+    return hashlib.sha256(b'\x00' + content.encode('utf-8')).hexdigest()
+
+def node_hash(left, right):
+    return hashlib.sha256(b'\x01' + bytes.fromhex(left) + bytes.fromhex(right)).hexdigest()
+
+def build_merkle_levels(leaves):
+    """
+    Build every level of a Merkle tree, leaves first.
+
+    A node without a sibling is promoted to the next level unchanged rather
+    than paired with a copy of itself.
+
+    Returns:
+        list: One list of hex hashes per level; the last level holds the root
+    """
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        below = levels[-1]
+        above = [node_hash(below[i], below[i + 1]) for i in range(0, len(below) - 1, 2)]
+        if len(below) % 2:
+            above.append(below[-1])
+        levels.append(above)
+    return levels
+
+def proof_positions(leaf_index, leaf_count):
+    """
+    (level, position) of each sibling on the path from a leaf to the root.
+
+    Levels where the path node has no sibling are skipped.
+
+    Returns:
+        list: (level, sibling position, sibling is on the left) tuples
+    """
+    positions = []
+    index = leaf_index
+    width = leaf_count
+    level = 0
+    while width > 1:
+        sibling = index ^ 1
+        if sibling < width:
+            positions.append((level, sibling, sibling < index))
+        index //= 2
+        width = (width + 1) // 2
+        level += 1
+    return positions
+
+def root_from_proof(leaf, proof):
+    """Fold a leaf hash with its proof path, as a verifier would"""
+    current = leaf
+    for step in proof:
+        if step['side'] == 'left':
+            current = node_hash(step['hash'], current)
+        else:
+            current = node_hash(current, step['hash'])
+    return current
+
+def compute_batch_hash(seq, log_table, first_id, last_id, leaf_count, merkle_root, prev_hash, sealed_at):
+    content = json.dumps([
+        seq, log_table, first_id, last_id, leaf_count, merkle_root, prev_hash, sealed_at.isoformat()
+    ], separators=(',', ':'))
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def seal_pending_logs(batch_size=DEFAULT_BATCH_SIZE, seal_delay=DEFAULT_SEAL_DELAY):
+    """
+    Seal all unsealed log rows older than seal_delay seconds into Merkle batches.
+
+    Each batch covers a contiguous id range of one log table and is chained to
+    the previous batch (of any table) through its hash. The delay leaves room
+    for transactions that took an id but have not committed yet. If another
+    process seals the same rows first, the unique batch sequence makes this
+    run stop without writing anything.
+
+    Returns:
+        int: Number of batches sealed
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=seal_delay)
+    sealed = 0
+
+    for log_table, (model, columns) in SEALED_LOGS.items():
+        while True:
+            last_sealed = db.session.scalar(
+                select(func.max(LogSealBatch.last_id)).where(LogSealBatch.log_table == log_table)
+            ) or 0
+            rows = db.session.execute(
+                select(*columns)
+                .where(model.id > last_sealed)
+                .order_by(model.id)
+                .limit(batch_size)
+            ).all()
+            fetched = len(rows)
+
+            # Batches are contiguous id ranges, so stop at the first row that is too recent
+            for index, row in enumerate(rows):
+                timestamp = row._mapping[model.timestamp]
+                if timestamp is not None and timestamp > cutoff:
+                    rows = rows[:index]
+                    break
+            if not rows:
+                break
+
+            try:
+                seal_batch(log_table, rows)
+            except IntegrityError:
+                db.session.rollback()
+                logger.info("Log batch for %s was sealed by another process", log_table)
+                return sealed
+            sealed += 1
+
+            if len(rows) < fetched or fetched < batch_size:
+                break
+
+    return sealed
+
+def unsealed_row_counts():
+    """
+    Rows of each sealed log table not yet covered by a batch.
+
+    Returns:
+        dict: log table name -> number of unsealed rows
+    """
+    counts = {}
+    for log_table, (model, columns) in SEALED_LOGS.items():
+        last_sealed = select(func.coalesce(func.max(LogSealBatch.last_id), 0)).where(
+            LogSealBatch.log_table == log_table
+        ).scalar_subquery()
+        counts[log_table] = db.session.scalar(select(func.count(model.id)).where(model.id > last_sealed))
+    return counts
+
+def seal_batch(log_table, rows):
+    """Build the Merkle tree for rows, store it and its chained root, and commit"""
+    levels = build_merkle_levels([leaf_hash(log_table, tuple(row)) for row in rows])
+
+    previous = db.session.execute(
+        select(LogSealBatch.seq, LogSealBatch.batch_hash).order_by(LogSealBatch.seq.desc()).limit(1)
+    ).first()
+    seq = previous.seq + 1 if previous else 1
+    prev_hash = previous.batch_hash if previous else GENESIS_HASH
+    sealed_at = datetime.utcnow()
+
+    batch = LogSealBatch(
+        seq=seq,
+        log_table=log_table,
+        first_id=rows[0][0],
+        last_id=rows[-1][0],
+        leaf_count=len(rows),
+        merkle_root=levels[-1][0],
+        prev_hash=prev_hash,
+        sealed_at=sealed_at
+    )
+    batch.batch_hash = compute_batch_hash(
+        seq, log_table, batch.first_id, batch.last_id, batch.leaf_count, batch.merkle_root, prev_hash, sealed_at
+    )
+    db.session.add(batch)
+    db.session.flush()
+
+    node_rows = []
+    for level, hashes in enumerate(levels):
+        for position, value in enumerate(hashes):
+            node_rows.append({
+                'batch_id': batch.id,
+                'level': level,
+                'position': position,
+                'hash': value,
+                'entry_id': rows[position][0] if level == 0 else None
+            })
+    db.session.execute(insert(LogMerkleNode), node_rows)
+    db.session.commit()
+    return batch
+
+def inclusion_proof(log_table, entry_id):
+    """
+    Prove that a log row is included in a sealed batch.
+
+    Uses index lookups only: the batch by (log_table, last_id), the leaf by
+    (batch_id, entry_id) and the O(log n) sibling nodes by primary key.
+
+    Returns:
+        dict: Proof and verification result, or None if the row is not sealed yet
+    """
+    model, columns = SEALED_LOGS[log_table]
+
+    batch = (LogSealBatch.query
+             .filter(LogSealBatch.log_table == log_table,
+                     LogSealBatch.last_id >= entry_id,
+                     LogSealBatch.first_id <= entry_id)
+             .order_by(LogSealBatch.last_id)
+             .first())
+    if not batch:
+        return None
+
+    leaf = LogMerkleNode.query.filter_by(batch_id=batch.id, level=0, entry_id=entry_id).first()
+    if not leaf:
+        return None
+
+    positions = proof_positions(leaf.position, batch.leaf_count)
+    siblings = {}
+    if positions:
+        siblings = {
+            (node.level, node.position): node.hash
+            for node in LogMerkleNode.query.filter(
+                LogMerkleNode.batch_id == batch.id,
+                or_(*[and_(LogMerkleNode.level == level, LogMerkleNode.position == position)
+                      for level, position, _ in positions])
+            )
+        }
+    proof = [{
+        'level': level,
+        'hash': siblings.get((level, position)),
+        'side': 'left' if is_left else 'right'
+    } for level, position, is_left in positions]
+
+    # Recompute the leaf from the stored row so later edits to it are detected
+    row = db.session.execute(select(*columns).where(model.id == entry_id)).first()
+    archived = row is None
+    if archived:
+        from src.backend.utils.log_archive import find_archived_entry
+        row = find_archived_entry(log_table, entry_id)
+    current_leaf = leaf_hash(log_table, tuple(row)) if row else None
+
+    previous_hash = GENESIS_HASH
+    if batch.seq > 1:
+        previous_hash = db.session.scalar(select(LogSealBatch.batch_hash).where(LogSealBatch.seq == batch.seq - 1))
+
+    root_matches = root_from_proof(leaf.hash, proof) == batch.merkle_root
+    batch_hash_matches = compute_batch_hash(
+        batch.seq, batch.log_table, batch.first_id, batch.last_id, batch.leaf_count,
+        batch.merkle_root, batch.prev_hash, batch.sealed_at
+    ) == batch.batch_hash
+    chain_matches = previous_hash == batch.prev_hash
+    entry_matches = current_leaf == leaf.hash
+
+    return {
+        'log_table': log_table,
+        'entry_id': entry_id,
+        'leaf_index': leaf.position,
+        'leaf_hash': leaf.hash,
+        'proof': proof,
+        'batch': {
+            'seq': batch.seq,
+            'first_id': batch.first_id,
+            'last_id': batch.last_id,
+            'leaf_count': batch.leaf_count,
+            'merkle_root': batch.merkle_root,
+            'prev_hash': batch.prev_hash,
+            'batch_hash': batch.batch_hash,
+            'sealed_at': batch.sealed_at.isoformat()
+        },
+        'archived': archived,
+        'entry_matches': entry_matches,
+        'root_matches': root_matches,
+        'batch_hash_matches': batch_hash_matches,
+        'chain_matches': chain_matches,
+        'verified': entry_matches and root_matches and batch_hash_matches and chain_matches
+    }
+
+def start_log_sealer(app, interval=DEFAULT_SEAL_INTERVAL):
+    """
+    Seal logs every interval seconds on a daemon thread.
+
+    Request handlers keep writing log rows exactly as before; sealing only
+    reads rows that are already committed.
+
+    Returns:
+        threading.Event: Set it to stop the thread
+    """
+    stop = threading.Event()
+
+    def run():
+        while not stop.wait(interval):
+            with app.app_context():
+                try:
+                    seal_pending_logs(
+                        batch_size=app.config.get('LOG_SEAL_BATCH_SIZE', DEFAULT_BATCH_SIZE),
+                        seal_delay=app.config.get('LOG_SEAL_DELAY', DEFAULT_SEAL_DELAY)
+                    )
+                except Exception:
+                    db.session.rollback()
+                    logger.exception("Log sealing run failed")
+                finally:
+                    db.session.remove()
+
+    threading.Thread(target=run, name='log-sealer', daemon=True).start()
+    return stop
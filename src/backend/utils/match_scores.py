@@ -0,0 +1,98 @@
+from sqlalchemy import select, update, func, bindparam
+from src.database.db_init import db
+from src.backend.models.suspect_model import Suspect, SuspectEvidenceLink, MATCH_STATUS_SCORES, RELIABILITY_WEIGHTS
+from src.backend.models.evidence_model import Evidence
+
+UPDATE_CHUNK_SIZE = 1000
+
+def score_from_counts(groups):
+    """
+    compute_match_score over grouped links.
+
+    Args:
+        groups (iterable): (match_status, reliability value, link count) tuples
+
+    Returns:
+        int: Match score, 0-100
+    """
+    total = 0
+    score = 0
+    for match_status, reliability, count in groups:
+        total += count
+        if match_status in MATCH_STATUS_SCORES and reliability in RELIABILITY_WEIGHTS:
+            score += count * MATCH_STATUS_SCORES[match_status] * RELIABILITY_WEIGHTS[reliability]
+    if total == 0:
+        return 0
+    return min(round((score / total) * 100), 100)
+
+def grouped_link_counts(suspect_ids=None):
+    """
+    Count links per (suspect, match status, evidence reliability) in one grouped query.
+
+    Args:
+        suspect_ids: Optional ids or select() of ids to restrict the aggregation to
+
+    Returns:
+        dict: suspect id -> list of (match_status, reliability value, count)
+    """
+    query = (
+        select(SuspectEvidenceLink.suspect_id, SuspectEvidenceLink.match_status, Evidence.reliability, func.count())
+        .join(Evidence, Evidence.id == SuspectEvidenceLink.evidence_id)
+        .group_by(SuspectEvidenceLink.suspect_id, SuspectEvidenceLink.match_status, Evidence.reliability)
+    )
+    if suspect_ids is not None:
+        query = query.where(SuspectEvidenceLink.suspect_id.in_(suspect_ids))
+
+    groups = {}
+    for suspect_id, match_status, reliability, count in db.session.execute(query):
+        groups.setdefault(suspect_id, []).append((match_status, reliability.value if reliability else None, count))
+    return groups
+
+def _write_scores(scores):
+    rows = [{'suspect_id': suspect_id, 'score': score} for suspect_id, score in scores.items()]
+    table = Suspect.__table__
+    statement = update(table).where(table.c.id == bindparam('suspect_id')).values(match_score=bindparam('score'))
+    for start in range(0, len(rows), UPDATE_CHUNK_SIZE):
+        db.session.execute(statement, rows[start:start + UPDATE_CHUNK_SIZE])
+
+def refresh_match_scores(suspect_ids):
+    """
+    Recompute the stored match score of the given suspects. Does not commit.
+
+    Call after changing their evidence links, or with suspects_linked_to()
+    after changing an evidence item's reliability.
+    """
+    suspect_ids = set(suspect_ids)
+    if not suspect_ids:
+        return
+    # Pending link changes must be visible to the aggregation
+    db.session.flush()
+    groups = grouped_link_counts(suspect_ids)
+    _write_scores({suspect_id: score_from_counts(groups.get(suspect_id, ())) for suspect_id in suspect_ids})
+
+def suspects_linked_to(evidence_id):
+    """Ids of suspects with a link to an evidence item"""
+    return db.session.scalars(
+        select(SuspectEvidenceLink.suspect_id)
+        .where(SuspectEvidenceLink.evidence_id == evidence_id)
+        .distinct()
+    ).all()
+
+def recompute_match_scores():
+    """
+    Recompute every stored match score from one grouped aggregation and commit.
+
+    Only suspects whose stored score differs are written.
+
+    Returns:
+        int: Number of suspects whose score was corrected
+    """
+    groups = grouped_link_counts()
+    changed = {}
+    for suspect_id, stored in db.session.execute(select(Suspect.id, Suspect.match_score)):
+        score = score_from_counts(groups.get(suspect_id, ()))
+        if score != stored:
+            changed[suspect_id] = score
+    _write_scores(changed)
+    db.session.commit()
+    return len(changed)
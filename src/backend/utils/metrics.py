@@ -0,0 +1,444 @@
+import atexit
+import glob
+import json
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from flask import request, g, Response, current_app, jsonify
+
+REQUEST_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+ANALYSIS_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+SIZE_CLASSES = ((10, '0-10'), (100, '10-100'), (1000, '100-1k'), (10000, '1k-10k'))
+DEFAULT_FLUSH_SECONDS = 5
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+class _Child:
+    __slots__ = ('lock',)
+
+    def __init__(self):
+        self.lock = threading.Lock()
+
+class _CounterChild(_Child):
+    __slots__ = ('value',)
+
+    def __init__(self, metric):
+        super().__init__()
+        self.value = 0.0
+
+    def inc(self, amount=1):
+        with self.lock:
+            self.value += amount
+
+    def snapshot(self):
+        return self.value
+
+class _GaugeChild(_Child):
+    __slots__ = ('value', 'function')
+
+    def __init__(self, metric):
+        super().__init__()
+        self.value = 0.0
+        self.function = None
+
+    def set(self, value):
+        self.value = value
+
+    def set_function(self, function):
+        """Read the value from function whenever the gauge is collected"""
+        self.function = function
+
+    def snapshot(self):
+        if self.function is not None:
+            try:
+                return float(self.function())
+            except Exception:
+                return math.nan
+        return self.value
+
+class _HistogramChild(_Child):
+    __slots__ = ('buckets', 'counts', 'sum')
+
+    def __init__(self, metric):
+        super().__init__()
+        self.buckets = metric.buckets
+        self.counts = [0] * (len(metric.buckets) + 1)  # Last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        with self.lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def snapshot(self):
+        with self.lock:
+            return {'counts': list(self.counts), 'sum': self.sum}
+
+class _Metric:
+    kind = None
+    child_class = None
+
+    def __init__(self, name, documentation, labelnames=(), registry=None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+        (registry or REGISTRY).register(self)
+
+    def labels(self, *values):
+        """The child for one combination of label values, created on first use"""
+        key = tuple(str(value) for value in values)
+        child = self._children.get(key)
+        if child is None:
+            if len(key) != len(self.labelnames):
+                raise ValueError(f'{self.name} takes labels {self.labelnames}')
+            with self._lock:
+                child = self._children.get(key)
+                if child is None:
+                    child = self._children[key] = self.child_class(self)
+        return child
+
+    def reset(self):
+        with self._lock:
+            self._children = {}
+
+    def snapshot(self):
+        return {
+            'type': self.kind,
+            'help': self.documentation,
+            'labelnames': list(self.labelnames),
+            'samples': [[list(key), child.snapshot()] for key, child in list(self._children.items())]
+        }
+
+class Counter(_Metric):
+    kind = 'counter'
+    child_class = _CounterChild
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+class Gauge(_Metric):
+    """
+    A value that goes up and down.
+
+    mode decides how gauges from several worker processes combine: 'sum'
+    adds the values of live processes (pool connections), 'live' reports
+    only the process answering the scrape, for values that describe shared
+    state such as table row counts.
+    """
+    kind = 'gauge'
+    child_class = _GaugeChild
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, mode='sum'):
+        self.mode = mode
+        super().__init__(name, documentation, labelnames, registry)
+
+    def set(self, value):
+        self.labels().set(value)
+
+    def set_function(self, function):
+        self.labels().set_function(function)
+
+    def snapshot(self):
+        data = super().snapshot()
+        data['mode'] = self.mode
+        return data
+
+class Histogram(_Metric):
+    """Observations counted into buckets fixed at creation, so observing never allocates"""
+    kind = 'histogram'
+    child_class = _HistogramChild
+
+    def __init__(self, name, documentation, labelnames=(), registry=None, buckets=REQUEST_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+    def snapshot(self):
+        data = super().snapshot()
+        data['buckets'] = list(self.buckets)
+        return data
+
+class Registry:
+    def __init__(self):
+        self._metrics = {}
+
+    def register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f'Metric {metric.name} is already registered')
+        self._metrics[metric.name] = metric
+
+    def snapshot(self, include_live=True):
+        """Plain-data copy of every metric, as written to the multiprocess directory"""
+        return {
+            name: metric.snapshot()
+            for name, metric in self._metrics.items()
+            if include_live or getattr(metric, 'mode', None) != 'live'
+        }
+
+    def reset(self):
+        for metric in self._metrics.values():
+            metric.reset()
+
+REGISTRY = Registry()
+
+# Application metrics
+HTTP_REQUESTS = Counter(
+    'http_requests_total', 'HTTP requests handled', ('blueprint', 'endpoint', 'method', 'status')
+)
+HTTP_REQUEST_SECONDS = Histogram(
+    'http_request_duration_seconds', 'HTTP request latency', ('blueprint', 'endpoint', 'method')
+)
+ANALYSIS_STAGE_SECONDS = Histogram(
+    'analysis_stage_duration_seconds', 'Analysis runtime by analyzer, stage and case size',
+    ('analyzer', 'stage', 'size'), buckets=ANALYSIS_BUCKETS
+)
+CACHE_LOOKUPS = Counter(
+    'cache_lookups_total', 'Cache lookups by cache and result', ('cache', 'result')
+)
+DB_POOL_CONNECTIONS = Gauge(
+    'db_pool_connections', 'Database pool connections by state, summed over workers', ('state',)
+)
+AUDIT_LOG_UNSEALED = Gauge(
+    'audit_log_unsealed_rows', 'Audit log rows waiting to be sealed into a Merkle batch', ('log_table',),
+    mode='live'
+)
+
+def size_class(count):
+    """Coarse input size label, so histograms stay few while still separating small and large cases"""
+    for limit, label in SIZE_CLASSES:
+        if count < limit:
+            return label
+    return f'{SIZE_CLASSES[-1][0] // 1000}k+'
+
+def observe_analysis(analyzer, stage, seconds, item_count):
+    ANALYSIS_STAGE_SECONDS.labels(analyzer, stage, size_class(item_count)).observe(seconds)
+
+def count_cache_lookup(cache, result, amount=1):
+    if amount:
+        CACHE_LOOKUPS.labels(cache, result).inc(amount)
+
+class MultiprocessWriter:
+    """
+    Shares this process's metrics with the other workers through a directory.
+
+    Every process writes a JSON snapshot of its metrics to its own file
+    every flush interval and at exit; a scrape merges all files with the
+    answering process's live values. Counters and histograms of exited
+    workers keep counting towards the totals, so they never go backwards;
+    their gauges are dropped. Clear the directory when deploying.
+    """
+
+    def __init__(self, directory, flush_seconds=DEFAULT_FLUSH_SECONDS, registry=REGISTRY):
+        self.directory = directory
+        self.flush_seconds = flush_seconds
+        self.registry = registry
+        self._pid = None
+        self._path = None
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+        atexit.register(self.flush)
+
+    def ensure_started(self):
+        """Start the flush thread in this process; after a fork, start over with empty metrics"""
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            if self._pid is not None:
+                # Forked worker: the parent's counts are in the parent's file already
+                self.registry.reset()
+            self._pid = pid
+            self._path = os.path.join(self.directory, f'{pid}-{time.time_ns()}.json')
+            thread = threading.Thread(target=self._run, name='metrics-flush', daemon=True)
+            thread.start()
+
+    def _run(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def flush(self):
+        if self._pid != os.getpid():
+            return
+        data = {'pid': self._pid, 'written_at': time.time(), 'metrics': self.registry.snapshot(include_live=False)}
+        temporary = f'{self._path}.tmp'
+        with open(temporary, 'w') as snapshot_file:
+            json.dump(data, snapshot_file)
+        os.replace(temporary, self._path)
+
+    def other_snapshots(self):
+        """Snapshots written by other processes, with a flag telling whether each is still running"""
+        for path in glob.glob(os.path.join(self.directory, '*.json')):
+            if path == self._path:
+                continue
+            try:
+                with open(path) as snapshot_file:
+                    data = json.load(snapshot_file)
+            except (OSError, ValueError):
+                continue  # Being replaced, or left half-written by a killed process
+            yield data['metrics'], _process_alive(data['pid'])
+
+def _process_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def merge_snapshots(snapshots):
+    """
+    Combine metric snapshots of several processes.
+
+    Args:
+        snapshots (iterable): (snapshot, process alive) pairs
+
+    Returns:
+        dict: One snapshot with counters, histograms and 'sum' gauges added up
+    """
+    merged = {}
+    for snapshot, alive in snapshots:
+        for name, metric in snapshot.items():
+            if metric['type'] == 'gauge' and not alive:
+                continue
+            target = merged.get(name)
+            if target is None:
+                target = merged[name] = dict(metric, samples={})
+            for labels, value in metric['samples']:
+                key = tuple(labels)
+                current = target['samples'].get(key)
+                if current is None:
+                    target['samples'][key] = value if not isinstance(value, dict) else {
+                        'counts': list(value['counts']), 'sum': value['sum']
+                    }
+                elif isinstance(value, dict):
+                    if len(current['counts']) == len(value['counts']):
+                        current['counts'] = [a + b for a, b in zip(current['counts'], value['counts'])]
+                        current['sum'] += value['sum']
+                else:
+                    target['samples'][key] = current + value
+    return merged
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+
+def _label_text(names, values, extra=None):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{' + ','.join(pairs) + '}' if pairs else ''
+
+def _number(value):
+    if math.isnan(value):
+        return 'NaN'
+    if math.isinf(value):
+        return '+Inf' if value > 0 else '-Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+def render_text(merged):
+    """Prometheus text exposition format (0.0.4) of a merged snapshot"""
+    lines = []
+    for name in sorted(merged):
+        metric = merged[name]
+        lines.append(f"# HELP {name} {metric['help']}")
+        lines.append(f"# TYPE {name} {metric['type']}")
+        names = metric['labelnames']
+        for labels in sorted(metric['samples']):
+            value = metric['samples'][labels]
+            if metric['type'] == 'histogram':
+                cumulative = 0
+                for bound, count in zip(metric['buckets'] + [math.inf], value['counts']):
+                    cumulative += count
+                    bound_label = 'le="' + _number(bound) + '"'
+                    lines.append(f"{name}_bucket{_label_text(names, labels, bound_label)} {cumulative}")
+                lines.append(f"{name}_sum{_label_text(names, labels)} {_number(value['sum'])}")
+                lines.append(f"{name}_count{_label_text(names, labels)} {cumulative}")
+            else:
+                lines.append(f"{name}{_label_text(names, labels)} {_number(value)}")
+    return '\n'.join(lines) + '\n'
+
+def collect(registry=REGISTRY, writer=None):
+    """Merged snapshot of this process and, with a writer, every other worker"""
+    snapshots = [(registry.snapshot(), True)]
+    if writer is not None:
+        snapshots.extend(writer.other_snapshots())
+    return merge_snapshots(snapshots)
+
+def init_metrics(app):
+    """
+    Record request metrics and serve them at /api/metrics.
+
+    Every request is counted and timed by blueprint and endpoint. Set
+    METRICS_DIR to a directory shared by the workers to aggregate them;
+    otherwise each worker reports only itself. When METRICS_TOKEN is set,
+    scrapes must send it as a bearer token.
+    """
+    app.config.setdefault('METRICS_ENABLED', True)
+    app.config.setdefault('METRICS_DIR', None)
+    app.config.setdefault('METRICS_FLUSH_SECONDS', DEFAULT_FLUSH_SECONDS)
+    app.config.setdefault('METRICS_TOKEN', None)
+    if not app.config['METRICS_ENABLED']:
+        return
+
+    writer = None
+    if app.config['METRICS_DIR']:
+        writer = MultiprocessWriter(app.config['METRICS_DIR'], app.config['METRICS_FLUSH_SECONDS'])
+    app.extensions['metrics_writer'] = writer
+
+    with app.app_context():
+        from src.database.db_init import db
+        _register_pool_gauges(db.engine)
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+        if writer is not None:
+            writer.ensure_started()
+
+    @app.after_request
+    def record_request(response):
+        started = g.get('metrics_started')
+        if started is not None:
+            blueprint = request.blueprint or ''
+            endpoint = request.endpoint or 'unmatched'
+            HTTP_REQUEST_SECONDS.labels(blueprint, endpoint, request.method).observe(time.perf_counter() - started)
+            HTTP_REQUESTS.labels(blueprint, endpoint, request.method, response.status_code).inc()
+        return response
+
+    @app.route('/api/metrics', methods=['GET'])
+    def metrics():
+        token = current_app.config['METRICS_TOKEN']
+        if token and request.headers.get('Authorization') != f'Bearer {token}':
+            return jsonify({'message': 'Metrics token is missing or invalid'}), 401
+
+        _update_audit_gauges()
+        return Response(render_text(collect(writer=writer)), mimetype='text/plain', content_type=CONTENT_TYPE)
+
+def _register_pool_gauges(engine):
+    pool = engine.pool
+    states = {
+        'checked_out': 'checkedout',
+        'idle': 'checkedin',
+        'size': 'size',
+        'overflow': 'overflow'
+    }
+    for state, method in states.items():
+        read = getattr(pool, method, None)
+        if callable(read):
+            # QueuePool reports overflow as negative while the pool is not yet full
+            DB_POOL_CONNECTIONS.labels(state).set_function(lambda read=read: max(read(), 0))
+
+def _update_audit_gauges():
+    from src.backend.utils.log_sealing import unsealed_row_counts
+    for log_table, count in unsealed_row_counts().items():
+        AUDIT_LOG_UNSEALED.labels(log_table).set(count)
@@ -0,0 +1,203 @@
+import heapq
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from flask import request, g
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_QUERY_THRESHOLD = 30      # Queries per request above which a request is flagged
+DEFAULT_SLOW_QUERY_MS = 200       # Statements slower than this are flagged
+DEFAULT_SLOWEST_KEPT = 3          # Slowest statements reported per request
+STATEMENT_PREVIEW_LENGTH = 300
+
+_local = threading.local()
+_listening = False
+_listen_lock = threading.Lock()
+
+class QueryStats:
+    """
+    SQL statements executed while a collector is active.
+
+    Counts statements and their total database time, and keeps the slowest
+    few (or every statement, when record_statements is set).
+    """
+
+    def __init__(self, keep_slowest=DEFAULT_SLOWEST_KEPT, record_statements=False):
+        self.count = 0
+        self.duration = 0.0
+        self.keep_slowest = keep_slowest
+        self.statements = [] if record_statements else None
+        self._slowest = []  # Min-heap of (seconds, order, statement)
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.duration += seconds
+        if self.statements is not None:
+            self.statements.append((statement, seconds))
+        if self.keep_slowest:
+            entry = (seconds, self.count, statement)
+            if len(self._slowest) < self.keep_slowest:
+                heapq.heappush(self._slowest, entry)
+            elif seconds > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def slowest(self):
+        """Slowest statements, slowest first, as (statement, seconds) pairs"""
+        return [(statement, seconds) for seconds, _, statement in sorted(self._slowest, reverse=True)]
+
+def _collectors():
+    collectors = getattr(_local, 'collectors', None)
+    if collectors is None:
+        collectors = _local.collectors = []
+    return collectors
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if getattr(_local, 'collectors', None):
+        conn.info.setdefault('query_profiler_started', []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    collectors = getattr(_local, 'collectors', None)
+    started = conn.info.get('query_profiler_started')
+    if not collectors or not started:
+        return
+    seconds = time.perf_counter() - started.pop()
+    for stats in collectors:
+        stats.record(statement, seconds)
+
+def _listen():
+    """Attach the cursor events to every engine, including ones created later"""
+    global _listening
+    with _listen_lock:
+        if not _listening:
+            event.listen(Engine, 'before_cursor_execute', _before_cursor_execute)
+            event.listen(Engine, 'after_cursor_execute', _after_cursor_execute)
+            _listening = True
+
+@contextmanager
+def count_queries(keep_slowest=DEFAULT_SLOWEST_KEPT, record_statements=True):
+    """
+    Collect the SQL statements executed on this thread inside the block.
+
+    Requests made through Flask's test client run on the calling thread,
+    so their queries are included.
+
+        with count_queries() as stats:
+            client.get('/api/case/1/view', headers=headers)
+        print(stats.count, stats.duration)
+    """
+    _listen()
+    stats = QueryStats(keep_slowest, record_statements)
+    collectors = _collectors()
+    collectors.append(stats)
+    try:
+        yield stats
+    finally:
+        collectors.remove(stats)
+
+@contextmanager
+def assert_max_queries(limit, label=None):
+    """
+    Fail with the executed statements if the block runs more than limit queries.
+
+    Locks in an endpoint's query budget in tests:
+
+        with assert_max_queries(9, 'report detail'):
+            response = client.get(f'/api/analysis/reports/{report_id}', headers=headers)
+    """
+    with count_queries() as stats:
+        yield stats
+    if stats.count > limit:
+        listing = '\n'.join(
+            f"  {number}. [{seconds * 1000:.1f}ms] {' '.join(statement.split())[:STATEMENT_PREVIEW_LENGTH]}"
+            for number, (statement, seconds) in enumerate(stats.statements, 1)
+        )
+        raise AssertionError(
+            f"{label or 'Block'} ran {stats.count} queries, budget is {limit}:\n{listing}"
+        )
+
+def init_query_profiler(app):
+    """
+    Count the SQL statements and database time of every request.
+
+    Adds a Server-Timing header (db and total time, with the query count)
+    and logs a structured record per request: at WARNING when the request
+    ran more than QUERY_THRESHOLD queries (or its QUERY_BUDGETS entry, keyed
+    by endpoint name) or any statement took longer than SLOW_QUERY_MS, at
+    DEBUG otherwise. Initialize before the HTTP middleware so the total
+    includes compression.
+    """
+    app.config.setdefault('QUERY_PROFILER_ENABLED', True)
+    app.config.setdefault('QUERY_THRESHOLD', DEFAULT_QUERY_THRESHOLD)
+    app.config.setdefault('QUERY_BUDGETS', {})
+    app.config.setdefault('SLOW_QUERY_MS', DEFAULT_SLOW_QUERY_MS)
+    app.config.setdefault('QUERY_PROFILER_SLOWEST', DEFAULT_SLOWEST_KEPT)
+    app.config.setdefault('SERVER_TIMING_HEADER', True)
+    if not app.config['QUERY_PROFILER_ENABLED']:
+        return
+    _listen()
+
+    @app.before_request
+    def start_query_profile():
+        stats = QueryStats(app.config['QUERY_PROFILER_SLOWEST'])
+        _collectors().append(stats)
+        g.query_stats = stats
+        g.query_profile_started = time.perf_counter()
+
+    @app.after_request
+    def report_query_profile(response):
+        stats = g.get('query_stats')
+        if stats is None:
+            return response
+        total = time.perf_counter() - g.query_profile_started
+
+        if app.config['SERVER_TIMING_HEADER']:
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries", app;dur={total * 1000:.1f}'
+            )
+        _log_profile(app.config, stats, total, response.status_code)
+        return response
+
+    @app.teardown_request
+    def stop_query_profile(exc):
+        stats = g.pop('query_stats', None)
+        if stats is not None and stats in _collectors():
+            _collectors().remove(stats)
+
+def _log_profile(config, stats, total, status_code):
+    threshold = config['QUERY_BUDGETS'].get(request.endpoint, config['QUERY_THRESHOLD'])
+    slow_seconds = config['SLOW_QUERY_MS'] / 1000
+    slowest = stats.slowest()
+
+    flags = []
+    if threshold is not None and stats.count > threshold:
+        flags.append('query_count_exceeded')
+    if slowest and slowest[0][1] > slow_seconds:
+        flags.append('slow_query')
+
+    level = logging.WARNING if flags else logging.DEBUG
+    if not logger.isEnabledFor(level):
+        return
+
+    record = {
+        'method': request.method,
+        'path': request.path,
+        'endpoint': request.endpoint,
+        'status': status_code,
+        'queries': stats.count,
+        'query_threshold': threshold,
+        'db_ms': round(stats.duration * 1000, 2),
+        'total_ms': round(total * 1000, 2),
+        'slowest': [
+            {'ms': round(seconds * 1000, 2), 'statement': ' '.join(statement.split())[:STATEMENT_PREVIEW_LENGTH]}
+            for statement, seconds in slowest
+        ],
+        'flags': flags
+    }
+    # The JSON message suits plain handlers; the extra attribute suits structured ones
+    logger.log(level, 'request_queries %s', json.dumps(record), extra={'query_profile': record})
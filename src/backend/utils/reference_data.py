@@ -0,0 +1,283 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, update, insert, func
+from sqlalchemy.exc import IntegrityError
+from src.database.db_init import db
+from src.backend.models.user_model import User, Role, ReferenceDataVersion
+from src.backend.utils.metrics import count_cache_lookup
+
+USERS = 'users'
+ROLES = 'roles'
+
+INVESTIGATOR_ROLE_ID = 2  # Assuming role_id 2 is "Investigator"
+
+DEFAULT_MAX_USERS = 5000       # Users kept in memory per process
+DEFAULT_CHECK_INTERVAL = 5     # Seconds between version checks against the database
+DEFAULT_MAX_AGE = 300          # Seconds before data is reloaded even without a version change
+
+USER_COLUMNS = (
+    User.id, User.username, User.first_name, User.last_name,
+    User.role_id, User.department, User.badge_number, User.is_active
+)
+
+class ReferenceCache:
+    """
+    Process-local copy of small, rarely written reference rows.
+
+    Users are loaded lazily by id and kept in an LRU of bounded size; roles
+    and the investigator list are loaded whole on first use. Every process
+    compares its copy with the reference_data_versions table at most once
+    per check interval and drops whatever changed, so a write made through
+    one worker reaches the others within that interval. The writing process
+    drops its own copy immediately.
+    """
+
+    def __init__(self, max_users=DEFAULT_MAX_USERS, check_interval=DEFAULT_CHECK_INTERVAL, max_age=DEFAULT_MAX_AGE):
+        self.max_users = max_users
+        self.check_interval = check_interval
+        self.max_age = max_age
+        self._lock = threading.Lock()
+        self._users = OrderedDict()  # user id -> user dict, least recently used first
+        self._roles = None           # role id -> role dict
+        self._investigators = None   # (list, digest)
+        self._versions = {}          # name -> version the cached data belongs to
+        self._generation = {USERS: 0, ROLES: 0}
+        self._checked_at = 0
+        self._loaded_at = time.monotonic()
+
+    def _check_versions(self):
+        """Drop cached data whose version changed since it was loaded"""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return
+
+        versions = dict(db.session.execute(
+            select(ReferenceDataVersion.name, ReferenceDataVersion.version)
+        ).all())
+
+        with self._lock:
+            expired = now - self._loaded_at >= self.max_age
+            for name in (USERS, ROLES):
+                if expired or versions.get(name, 0) != self._versions.get(name, 0):
+                    self._drop(name)
+            self._versions = {name: versions.get(name, 0) for name in (USERS, ROLES)}
+            self._checked_at = now
+            if expired:
+                self._loaded_at = now
+
+    def _drop(self, name):
+        # Role user counts and the investigator list are derived from users
+        self._generation[name] += 1
+        if name == USERS:
+            self._generation[ROLES] += 1
+            self._users.clear()
+            self._investigators = None
+        self._roles = None
+
+    def invalidate(self, *names):
+        """Forget cached data locally and force a version check on next use"""
+        with self._lock:
+            for name in names or (USERS, ROLES):
+                self._drop(name)
+            self._checked_at = 0
+
+    def users(self, user_ids):
+        """
+        User dictionaries for a set of ids; ids not cached are loaded with one query.
+
+        Returns:
+            dict: user id -> user dict, without ids that do not exist
+        """
+        ids = {user_id for user_id in user_ids if user_id is not None}
+        if not ids:
+            return {}
+        self._check_versions()
+
+        with self._lock:
+            found = {}
+            for user_id in ids:
+                user = self._users.get(user_id)
+                if user is not None:
+                    self._users.move_to_end(user_id)
+                    found[user_id] = user
+            missing = ids - found.keys()
+            generation = self._generation[USERS]
+        count_cache_lookup('reference_users', 'hit', len(found))
+        count_cache_lookup('reference_users', 'miss', len(missing))
+
+        if missing:
+            loaded = {}
+            for row in db.session.execute(select(*USER_COLUMNS).where(User.id.in_(missing))):
+                user = dict(row._mapping)
+                user['full_name'] = f"{row.first_name} {row.last_name}"
+                loaded[row.id] = user
+            found.update(loaded)
+
+            with self._lock:
+                # Data loaded before an invalidation may already be stale, so do not keep it
+                if generation == self._generation[USERS]:
+                    self._users.update(loaded)
+                    while len(self._users) > self.max_users:
+                        self._users.popitem(last=False)
+
+        return found
+
+    def roles(self):
+        """
+        All roles with parsed permissions and user counts.
+
+        Returns:
+            dict: role id -> role dict
+        """
+        self._check_versions()
+        with self._lock:
+            if self._roles is not None:
+                count_cache_lookup('reference_roles', 'hit')
+                return self._roles
+            generation = self._generation[ROLES]
+        count_cache_lookup('reference_roles', 'miss')
+
+        user_counts = dict(db.session.execute(
+            select(User.role_id, func.count(User.id)).group_by(User.role_id)
+        ).all())
+        roles = {}
+        for role in db.session.execute(
+            select(Role.id, Role.name, Role.description, Role.permissions).order_by(Role.id)
+        ):
+            roles[role.id] = {
+                'id': role.id,
+                'name': role.name,
+                'description': role.description,
+                'permissions': role.permissions,
+                'permission_set': frozenset(_parse_permissions(role.permissions)),
+                'user_count': user_counts.get(role.id, 0)
+            }
+
+        with self._lock:
+            if generation == self._generation[ROLES]:
+                self._roles = roles
+        return roles
+
+    def investigators(self):
+        """
+        Investigators for the UI dropdown.
+
+        Returns:
+            tuple: (investigator list, digest of the list for use in ETags)
+        """
+        self._check_versions()
+        with self._lock:
+            if self._investigators is not None:
+                count_cache_lookup('reference_investigators', 'hit')
+                return self._investigators
+            generation = self._generation[USERS]
+        count_cache_lookup('reference_investigators', 'miss')
+
+        rows = db.session.execute(
+            select(User.id, User.first_name, User.last_name)
+            .where(User.role_id == INVESTIGATOR_ROLE_ID)
+            .order_by(User.id)
+        ).all()
+        investigators = [{'id': row.id, 'name': f"{row.first_name} {row.last_name}"} for row in rows]
+        digest = hashlib.sha1(json.dumps(investigators, separators=(',', ':')).encode('utf-8')).hexdigest()[:16]
+
+        with self._lock:
+            if generation == self._generation[USERS]:
+                self._investigators = (investigators, digest)
+        return investigators, digest
+
+def _parse_permissions(permissions):
+    if permissions is None:
+        return []
+    try:
+        return json.loads(permissions)
+    except (TypeError, ValueError):
+        return []
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+def reference_cache():
+    """The cache for the current application's database"""
+    key = str(db.engine.url)
+    cache = _caches.get(key)
+    if cache is None:
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                config = current_app.config
+                cache = _caches[key] = ReferenceCache(
+                    max_users=config.get('REFERENCE_CACHE_MAX_USERS', DEFAULT_MAX_USERS),
+                    check_interval=config.get('REFERENCE_CACHE_CHECK_SECONDS', DEFAULT_CHECK_INTERVAL),
+                    max_age=config.get('REFERENCE_CACHE_MAX_AGE', DEFAULT_MAX_AGE)
+                )
+    return cache
+
+def get_user_names(user_ids):
+    """Full names for a set of user ids"""
+    return {user_id: user['full_name'] for user_id, user in reference_cache().users(user_ids).items()}
+
+def get_user_name(user_id):
+    """Full name of one user, or None if the user does not exist"""
+    user = reference_cache().users([user_id]).get(user_id)
+    return user['full_name'] if user else None
+
+def get_all_roles():
+    """All roles in id order"""
+    return list(reference_cache().roles().values())
+
+def get_role(role_id):
+    """One role dictionary, or None if the role does not exist"""
+    return reference_cache().roles().get(role_id)
+
+def get_available_investigators():
+    """
+    Investigators for the UI dropdown.
+
+    Returns:
+        tuple: (investigator list, version digest)
+    """
+    return reference_cache().investigators()
+
+def bump_versions(*names):
+    """
+    Increment shared version rows in reference_data_versions.
+
+    Runs in its own short transaction, so call it after committing the
+    change the new version stands for.
+    """
+    table = ReferenceDataVersion.__table__
+    now = datetime.utcnow()
+
+    def advance(name):
+        return update(table).where(table.c.name == name).values(version=table.c.version + 1, updated_at=now)
+
+    with db.engine.begin() as connection:
+        for name in names:
+            if connection.execute(advance(name)).rowcount:
+                continue
+            try:
+                with connection.begin_nested():
+                    connection.execute(insert(table).values(name=name, version=1, updated_at=now))
+            except IntegrityError:
+                # Another process created the row first
+                connection.execute(advance(name))
+
+def invalidate_reference_data(*names):
+    """
+    Record that reference data changed; call after committing the change.
+
+    Bumps the shared version of each name so other processes reload it,
+    and drops this process's copy straight away.
+
+    Args:
+        names: USERS and/or ROLES; all reference data if omitted
+    """
+    names = names or (USERS, ROLES)
+    bump_versions(*names)
+    reference_cache().invalidate(*names)
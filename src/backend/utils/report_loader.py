@@ -0,0 +1,163 @@
+from sqlalchemy import select
+from sqlalchemy.orm import selectinload
+from src.database.db_init import db
+from src.backend.models.analysis_model import AnalysisReport, PatternAnalysis, EvidenceCorrelation, ProbabilityAssessment
+from src.backend.models.evidence_model import Evidence
+from src.backend.models.suspect_model import Suspect
+from src.backend.utils.reference_data import get_user_names
+
+MAX_SECTION_LIMIT = 1000
+
+# Response section -> (child model, report relationship, report counter column)
+REPORT_SECTIONS = {
+    'patterns': (PatternAnalysis, 'identified_patterns', 'pattern_count'),
+    'correlations': (EvidenceCorrelation, 'evidence_correlations', 'correlation_count'),
+    'probability_assessments': (ProbabilityAssessment, 'probability_assessments', 'probability_count')
+}
+
+def load_report_detail(report_id, limit=None, after=None):
+    """
+    Build the report detail response with a fixed number of queries.
+
+    The report and its children come from one query per table (selectinload,
+    or one keyset page per section when limit is given); evidence numbers
+    and suspect names referenced by the children are resolved with one IN
+    query each, and user names from the reference cache.
+
+    Args:
+        report_id (int): Report to load
+        limit (int): Optional maximum children per section
+        after (dict): Section name -> last child id of the previous page
+
+    Returns:
+        dict: Report detail, or None if the report does not exist
+    """
+    if limit is None:
+        report = (AnalysisReport.query
+                  .options(*[selectinload(getattr(AnalysisReport, relationship))
+                             for _, relationship, _ in REPORT_SECTIONS.values()])
+                  .filter(AnalysisReport.id == report_id)
+                  .first())
+        if report is None:
+            return None
+        children = {
+            section: getattr(report, relationship)
+            for section, (_, relationship, _) in REPORT_SECTIONS.items()
+        }
+    else:
+        report = db.session.get(AnalysisReport, report_id)
+        if report is None:
+            return None
+        after = after or {}
+        children = {
+            section: (model.query
+                      .filter(model.report_id == report_id, model.id > (after.get(section) or 0))
+                      .order_by(model.id)
+                      .limit(limit)
+                      .all())
+            for section, (model, _, _) in REPORT_SECTIONS.items()
+        }
+
+    user_names = get_user_names([report.analyst_id, report.reviewer_id])
+    evidence_numbers = _evidence_numbers(
+        [c.evidence_a_id for c in children['correlations']] + [c.evidence_b_id for c in children['correlations']]
+    )
+    suspect_names = _suspect_names(a.suspect_id for a in children['probability_assessments'])
+
+    report_detail = {
+        'id': report.id,
+        'case_id': report.case_id,
+        'title': report.title,
+        'analysis_type': report.analysis_type.value,
+        'analyst_id': report.analyst_id,
+        'analyst_name': user_names.get(report.analyst_id),
+        'created_at': report.created_at.isoformat() if report.created_at else None,
+        'updated_at': report.updated_at.isoformat() if report.updated_at else None,
+        'executive_summary': report.executive_summary,
+        'methodology': report.methodology,
+        'findings': report.findings,
+        'conclusions': report.conclusions,
+        'recommendations': report.recommendations,
+        'overall_confidence': report.overall_confidence.value if report.overall_confidence else None,
+        'supporting_evidence_ids': report.supporting_evidence_ids,
+        'report_file': report.report_file,
+        'is_final': report.is_final,
+        'reviewer_id': report.reviewer_id,
+        'reviewer_name': user_names.get(report.reviewer_id),
+        'review_comments': report.review_comments,
+        'review_date': report.review_date.isoformat() if report.review_date else None,
+        'patterns': [pattern_dict(pattern) for pattern in children['patterns']],
+        'correlations': [correlation_dict(correlation, evidence_numbers) for correlation in children['correlations']],
+        'probability_assessments': [
+            assessment_dict(assessment, suspect_names) for assessment in children['probability_assessments']
+        ]
+    }
+
+    if limit is not None:
+        report_detail['pagination'] = {
+            section: {
+                'total': getattr(report, counter),
+                'next_after': children[section][-1].id if len(children[section]) == limit else None
+            }
+            for section, (_, _, counter) in REPORT_SECTIONS.items()
+        }
+        report_detail['pagination']['limit'] = limit
+
+    return report_detail
+
+def _evidence_numbers(evidence_ids):
+    ids = {evidence_id for evidence_id in evidence_ids if evidence_id is not None}
+    if not ids:
+        return {}
+    return dict(db.session.execute(
+        select(Evidence.id, Evidence.evidence_number).where(Evidence.id.in_(ids))
+    ).all())
+
+def _suspect_names(suspect_ids):
+    ids = {suspect_id for suspect_id in suspect_ids if suspect_id is not None}
+    if not ids:
+        return {}
+    rows = db.session.execute(
+        select(Suspect.id, Suspect.first_name, Suspect.last_name).where(Suspect.id.in_(ids))
+    )
+    # Same format as Suspect.get_full_name
+    return {row.id: f"{row.first_name} {row.last_name}" for row in rows}
+
+def pattern_dict(pattern):
+    return {
+        'id': pattern.id,
+        'pattern_name': pattern.pattern_name,
+        'description': pattern.description,
+        'detection_method': pattern.detection_method,
+        'confidence_score': pattern.confidence_score,
+        'evidence_ids': pattern.evidence_ids,
+        'visual_representation': pattern.visual_representation,
+        'created_at': pattern.created_at.isoformat() if pattern.created_at else None
+    }
+
+def correlation_dict(correlation, evidence_numbers):
+    return {
+        'id': correlation.id,
+        'evidence_a_id': correlation.evidence_a_id,
+        'evidence_a_number': evidence_numbers.get(correlation.evidence_a_id),
+        'evidence_b_id': correlation.evidence_b_id,
+        'evidence_b_number': evidence_numbers.get(correlation.evidence_b_id),
+        'correlation_type': correlation.correlation_type,
+        'correlation_strength': correlation.correlation_strength,
+        'description': correlation.description,
+        'detected_by': correlation.detected_by
+    }
+
+def assessment_dict(assessment, suspect_names):
+    return {
+        'id': assessment.id,
+        'suspect_id': assessment.suspect_id,
+        'suspect_name': suspect_names.get(assessment.suspect_id),
+        'hypothesis': assessment.hypothesis,
+        'probability_score': assessment.probability_score,
+        'confidence_interval': assessment.confidence_interval,
+        'assessment_method': assessment.assessment_method,
+        'factors_considered': assessment.factors_considered,
+        'supporting_evidence_ids': assessment.supporting_evidence_ids,
+        'conflicting_evidence_ids': assessment.conflicting_evidence_ids
+    }
@@ -0,0 +1,71 @@
+from src.backend.utils.serialization import Schema, Field
+
+def _user_name(attribute):
+    """Computed field resolving a user id through context['user_names']"""
+    def compute(obj, context):
+        return context['user_names'].get(getattr(obj, attribute))
+    return compute
+
+# Item shapes returned by the list endpoints
+
+CASE_SUMMARY = Schema(
+    'id',
+    'case_number',
+    'title',
+    'status',
+    'priority',
+    'crime_type',
+    'opened_date',
+    'investigator_id',
+    Field('investigator_name', compute=_user_name('investigator_id')),
+    'evidence_count',
+    'suspect_count'
+)
+
+EVIDENCE_SUMMARY = Schema(
+    'id',
+    'evidence_number',
+    'case_id',
+    'evidence_type',
+    'description',
+    'location_found',
+    'collection_date',
+    'status',
+    'reliability',
+    'is_key_evidence',
+    'storage_location',
+    'chain_of_custody_complete',
+    'file_count',
+    'analysis_count',
+    Field('custody_changes', 'custody_count')
+)
+
+SUSPECT_SUMMARY = Schema(
+    'id',
+    'case_id',
+    Field('name', compute=lambda suspect, context: suspect.get_full_name()),
+    'alias',
+    'status',
+    Field('evidence_count', compute=lambda suspect, context: context['evidence_counts'].get(suspect.id, 0)),
+    Field('interview_count', compute=lambda suspect, context: context['interview_counts'].get(suspect.id, 0)),
+    'risk_assessment',
+    'match_score'
+)
+
+REPORT_SUMMARY = Schema(
+    'id',
+    'case_id',
+    'title',
+    'analysis_type',
+    'analyst_id',
+    Field('analyst_name', compute=_user_name('analyst_id')),
+    'created_at',
+    'updated_at',
+    'overall_confidence',
+    'is_final',
+    'reviewer_id',
+    Field('reviewer_name', compute=_user_name('reviewer_id')),
+    'pattern_count',
+    'correlation_count',
+    'probability_count'
+)
@@ -0,0 +1,131 @@
+import threading
+from flask import current_app
+from sqlalchemy import select, update, insert, func
+from sqlalchemy.exc import IntegrityError
+from src.database.db_init import db
+from src.database.sharding import current_shard, shard_name
+from src.backend.models.case_model import CaseSequence
+from src.backend.models.evidence_model import Evidence
+from src.backend.utils.batch import existing_ids
+
+EVIDENCE_SEQUENCE = 'evidence'
+DEFAULT_BLOCK_SIZE = 20
+
+class SequenceAllocator:
+    """
+    Hands out per-case sequence numbers from the case_sequences counter table.
+
+    Each process reserves a block of numbers with one short UPDATE ... RETURNING
+    on its own connection and serves later requests from memory, so concurrent
+    workers only touch the counter row once per block. Numbers are unique but
+    may have gaps: a block that is not used up before the process exits is lost.
+    
+    The counter row lives with the case's other rows, so reservations run on
+    the engine db.session routes case_sequences to: the current department
+    shard, or the primary.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._blocks = {}  # (database url, shard name, name, case_id) -> [next value, end value)
+    
+    def next_value(self, case_id, name=EVIDENCE_SEQUENCE):
+        """Return one sequence number, reserving a new block when needed"""
+        # Schema shards share the primary's URL, so the shard name is part of the key
+        key = (str(db.engine.url), shard_name(current_shard()), name, case_id)
+        
+        with self._lock:
+            block = self._blocks.get(key)
+            if not block or block[0] >= block[1]:
+                block_size = current_app.config.get('SEQUENCE_BLOCK_SIZE', DEFAULT_BLOCK_SIZE)
+                block = self._blocks[key] = list(self._reserve(case_id, name, block_size))
+            
+            value = block[0]
+            block[0] += 1
+            return value
+    
+    def reserve(self, case_id, count, name=EVIDENCE_SEQUENCE):
+        """
+        Reserve count consecutive numbers directly from the counter table.
+        
+        Used by bulk imports, which need a whole range at once rather than
+        numbers from the per-process block.
+        
+        Returns:
+            range: The reserved numbers
+        """
+        start, end = self._reserve(case_id, name, count)
+        return range(start, end)
+    
+    def _reserve(self, case_id, name, size):
+        """Atomically advance the counter by size and return the half-open range reserved"""
+        table = CaseSequence.__table__
+        advance = (
+            update(table)
+            .where(table.c.case_id == case_id, table.c.name == name)
+            .values(last_value=table.c.last_value + size)
+            .returning(table.c.last_value)
+        )
+        
+        # Separate short transaction so the counter row is never locked for a whole request
+        engine = db.session.get_bind(mapper=CaseSequence.__mapper__, clause=advance)
+        with engine.begin() as connection:
+            last_value = connection.execute(advance).scalar()
+            
+            if last_value is None:
+                # First allocation for this case: continue after the highest number already used
+                seed = _seed_value(connection, case_id, name)
+                try:
+                    with connection.begin_nested():
+                        connection.execute(insert(table).values(case_id=case_id, name=name, last_value=seed + size))
+                    last_value = seed + size
+                except IntegrityError:
+                    # Another worker created the row first
+                    last_value = connection.execute(advance).scalar()
+                    if last_value is None:
+                        raise
+        
+        return last_value - size + 1, last_value + 1
+    
+    def reset(self):
+        """Forget all in-memory blocks (e.g., after the counter table is rebuilt)"""
+        with self._lock:
+            self._blocks.clear()
+
+def _seed_value(connection, case_id, name):
+    if name == EVIDENCE_SEQUENCE:
+        # Numbers supplied by users, and those of deleted items, keep the count from telling what is free
+        evidence = Evidence.__table__
+        prefix = evidence_number_prefix(case_id)
+        numbers = connection.execute(
+            select(evidence.c.evidence_number)
+            .where(evidence.c.case_id == case_id, evidence.c.evidence_number.startswith(prefix, autoescape=True))
+        ).scalars()
+        return max((int(number[len(prefix):]) for number in numbers if number[len(prefix):].isdigit()), default=0)
+    return 0
+
+allocator = SequenceAllocator()
+
+def evidence_number_prefix(case_id):
+    return f"E-{case_id}-"
+
+def format_evidence_number(case_id, value):
+    return f"{evidence_number_prefix(case_id)}{value:03d}"
+
+def next_evidence_number(case_id):
+    """Generate the next unused evidence number for a case"""
+    while True:
+        number = format_evidence_number(case_id, allocator.next_value(case_id))
+        # A user may have supplied this number for another item; skip it
+        if db.session.scalar(select(Evidence.id).where(Evidence.evidence_number == number)) is None:
+            return number
+
+def allocate_evidence_numbers(case_id, count):
+    """Generate count unused evidence numbers for a case, normally in one counter update"""
+    numbers = []
+    while len(numbers) < count:
+        candidates = [format_evidence_number(case_id, value)
+                      for value in allocator.reserve(case_id, count - len(numbers))]
+        taken = existing_ids(Evidence.evidence_number, candidates)
+        numbers.extend(number for number in candidates if number not in taken)
+    return numbers
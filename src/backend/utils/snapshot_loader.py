@@ -0,0 +1,79 @@
+from sqlalchemy import select
+from src.database.db_init import db
+from src.backend.models.evidence_model import Evidence
+from src.backend.models.suspect_model import Suspect, SuspectEvidenceLink
+from src.analysis_tools.case_snapshot import build_case_snapshot
+
+def _value(member):
+    return member.value if member is not None else None
+
+def load_case_snapshot(case_id, include_evidence=True, include_suspects=True):
+    """
+    Load a case's evidence, suspects and suspect links into a CaseSnapshot.
+
+    Uses projected Core selects so no ORM objects are hydrated; each row is
+    a plain tuple that goes straight into the snapshot's NumPy columns.
+
+    Args:
+        case_id (int): Case to load
+        include_evidence (bool): Skip the evidence query when False
+        include_suspects (bool): Skip the suspect and link queries when False
+
+    Returns:
+        CaseSnapshot: Columnar snapshot of the case
+    """
+    evidence_rows = []
+    suspect_rows = []
+    link_rows = []
+
+    if include_evidence:
+        evidence_rows = db.session.execute(
+            select(
+                Evidence.id,
+                Evidence.evidence_number,
+                Evidence.evidence_type,
+                Evidence.description,
+                Evidence.location_found,
+                Evidence.collection_date,
+                Evidence.status,
+                Evidence.reliability
+            )
+            .where(Evidence.case_id == case_id)
+            .order_by(Evidence.id)
+        )
+
+        evidence_rows = [
+            (row[0], row[1], _value(row[2]), row[3], row[4], row[5], _value(row[6]), _value(row[7]))
+            for row in evidence_rows
+        ]
+
+    if include_suspects:
+        suspect_rows = [
+            (row[0], f"{row[1]} {row[2]}", _value(row[3]))
+            for row in db.session.execute(
+                select(Suspect.id, Suspect.first_name, Suspect.last_name, Suspect.status)
+                .where(Suspect.case_id == case_id)
+                .order_by(Suspect.id)
+            )
+        ]
+
+        # Linked evidence may belong to another case, so its type and reliability come from the join
+        link_rows = [
+            (row[0], row[1], row[2], row[3], _value(row[4]), _value(row[5]))
+            for row in db.session.execute(
+                select(
+                    SuspectEvidenceLink.suspect_id,
+                    SuspectEvidenceLink.evidence_id,
+                    SuspectEvidenceLink.match_status,
+                    SuspectEvidenceLink.confidence,
+                    Evidence.evidence_type,
+                    Evidence.reliability
+                )
+                .join(Evidence, Evidence.id == SuspectEvidenceLink.evidence_id)
+                .join(Suspect, Suspect.id == SuspectEvidenceLink.suspect_id)
+                .where(Suspect.case_id == case_id)
+                .order_by(SuspectEvidenceLink.suspect_id, SuspectEvidenceLink.id)
+            )
+        ]
+
+    return build_case_snapshot(case_id, evidence_rows, suspect_rows, link_rows)
@@ -0,0 +1,296 @@
+"""
+Timing and memory benchmark for the analysis_tools analyzers.
+
+Runs find_evidence_correlations, detect_patterns and
+calculate_suspect_probabilities over seeded synthetic cases (see
+synthetic_cases) at increasing sizes, on the columnar snapshot input the
+analysis endpoints use and optionally on the older list-of-dicts input.
+Each run appends one JSON line to a history file and prints the change
+against the previous run, so regressions show up between commits.
+
+    python -m src.benchmarks.analysis_benchmark
+    python -m src.benchmarks.analysis_benchmark --sizes 10,1000,100000 --analyzers patterns
+    python -m src.benchmarks.analysis_benchmark --legacy --history /tmp/history.jsonl
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.analysis_tools.evidence_correlation import find_evidence_correlations
+from src.analysis_tools.pattern_detection import detect_patterns
+from src.analysis_tools.probability_calculator import calculate_suspect_probabilities
+from src.benchmarks.synthetic_cases import (
+    DEFAULT_SEED, generate_case, case_snapshot, evidence_dicts, suspect_dicts
+)
+
+DEFAULT_SIZES = (10, 100, 1000, 10000, 100000)
+DEFAULT_HISTORY = 'benchmark_history.jsonl'
+
+# name -> (analyzer, dict input builder, largest default size for snapshot input, for dict input)
+# Correlations are pairwise and their output grows with the square of the case,
+# and the dict inputs run the pure Python loops, so both stop earlier by default.
+ANALYZERS = {
+    'correlations': (find_evidence_correlations, evidence_dicts, 10000, 1000),
+    'patterns': (detect_patterns, evidence_dicts, 100000, 10000),
+    'probabilities': (calculate_suspect_probabilities, suspect_dicts, 100000, 100000)
+}
+
+def time_call(function, repeat, budget):
+    """
+    Time repeated calls with the garbage collector paused, as timeit does.
+
+    Stops early once the runs so far exceed budget seconds, so the largest
+    sizes are timed once instead of holding up the whole suite.
+
+    Returns:
+        tuple: (list of run times in seconds, result of the last call)
+    """
+    times = []
+    result = None
+    gc_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            result = None
+            gc.collect()
+            gc.disable()
+            start = time.perf_counter()
+            result = function()
+            times.append(time.perf_counter() - start)
+            if gc_enabled:
+                gc.enable()
+            if sum(times) >= budget:
+                break
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return times, result
+
+def peak_memory(function):
+    """
+    Peak bytes allocated by Python and NumPy during one call (tracemalloc).
+
+    Measured in a separate call because tracing slows allocation down.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+def environment():
+    """Commit and interpreter details recorded with every run"""
+    def git(*args):
+        try:
+            return subprocess.run(
+                ['git', *args], capture_output=True, text=True, timeout=10,
+                cwd=os.path.dirname(os.path.abspath(__file__))
+            ).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+
+    return {
+        'commit': git('rev-parse', 'HEAD'),
+        'dirty': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.machine(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count()
+    }
+
+def run_benchmarks(sizes, analyzers, seed=DEFAULT_SEED, repeat=5, budget=5.0, legacy=False,
+                   no_limits=False, measure_memory=True, progress=None):
+    """
+    Benchmark each analyzer at each size.
+
+    Args:
+        sizes (iterable): Evidence counts to generate
+        analyzers (iterable): Names from ANALYZERS
+        seed (int): Generator seed
+        repeat (int): Maximum timed runs per measurement
+        budget (float): Seconds after which a measurement stops repeating
+        legacy (bool): Also benchmark the list-of-dicts input
+        no_limits (bool): Ignore the per-analyzer size limits
+        measure_memory (bool): Record tracemalloc peaks
+        progress (callable): Called with each result as it completes
+
+    Returns:
+        list: One result dictionary per (analyzer, input, size)
+    """
+    results = []
+    for size in sizes:
+        started = time.perf_counter()
+        rows = generate_case(size, seed)
+        generate_seconds = time.perf_counter() - started
+
+        snapshot = None
+        snapshot_seconds = None
+        for name in analyzers:
+            analyzer, dict_builder, snapshot_limit, dict_limit = ANALYZERS[name]
+            for input_kind, limit in (('snapshot', snapshot_limit), ('dicts', dict_limit)):
+                if input_kind == 'dicts' and not legacy:
+                    continue
+                if size > limit and not no_limits:
+                    continue
+
+                # Building the input is part of what the endpoints pay for, so it is timed too
+                if input_kind == 'snapshot':
+                    if snapshot is None:
+                        started = time.perf_counter()
+                        # Token features are built lazily and then cached, so build them up
+                        # front or only the first timed run would pay for them
+                        snapshot = case_snapshot(rows).prepare_features()
+                        snapshot_seconds = time.perf_counter() - started
+                    data, prepare_seconds = snapshot, snapshot_seconds
+                else:
+                    started = time.perf_counter()
+                    data = dict_builder(rows)
+                    prepare_seconds = time.perf_counter() - started
+
+                times, output = time_call(lambda: analyzer(data), repeat, budget)
+                result = {
+                    'analyzer': name,
+                    'input': input_kind,
+                    'size': size,
+                    'suspects': len(rows[1]),
+                    'links': len(rows[2]),
+                    'output_count': len(output),
+                    'runs': len(times),
+                    'min_seconds': min(times),
+                    'median_seconds': statistics.median(times),
+                    'generate_seconds': generate_seconds,
+                    'prepare_seconds': prepare_seconds,
+                    'peak_bytes': None
+                }
+                output = None
+                if measure_memory:
+                    result['peak_bytes'] = peak_memory(lambda: analyzer(data))
+
+                results.append(result)
+                if progress:
+                    progress(result)
+        rows = snapshot = data = None
+    return results
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as history_file:
+        return [json.loads(line) for line in history_file if line.strip()]
+
+def append_history(path, record):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    with open(path, 'a') as history_file:
+        history_file.write(json.dumps(record, sort_keys=True) + '\n')
+
+def find_baseline(history, baseline=None):
+    """The run to compare against: the latest run of a given commit prefix, or simply the latest run"""
+    for record in reversed(history):
+        if baseline is None or (record['environment'].get('commit') or '').startswith(baseline):
+            return record
+    return None
+
+def measurement_key(result):
+    return result['analyzer'], result['input'], result['size']
+
+def speed_ratio(result, previous):
+    """min_seconds of result relative to the same measurement in previous, or None"""
+    before = previous.get(measurement_key(result))
+    if before is None or before['min_seconds'] <= 0:
+        return None
+    return result['min_seconds'] / before['min_seconds']
+
+def format_bytes(count):
+    if count is None:
+        return '-'
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if count < 1024 or unit == 'GB':
+            return f"{count:.0f}{unit}" if unit == 'B' else f"{count:.1f}{unit}"
+        count /= 1024
+
+def format_row(result, ratio=None):
+    change = f"{(ratio - 1) * 100:+7.1f}%" if ratio is not None else ''
+    return (f"{result['analyzer']:14}{result['input']:10}{result['size']:>8}"
+            f"{result['min_seconds'] * 1000:12.2f}ms{result['median_seconds'] * 1000:12.2f}ms"
+            f"{result['runs']:>5}{format_bytes(result['peak_bytes']):>10}{result['output_count']:>10}  {change}")
+
+def parse_sizes(value):
+    return [int(size) for size in value.split(',') if size]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--sizes', type=parse_sizes, default=list(DEFAULT_SIZES),
+                        help='Comma-separated evidence counts (default: 10 to 100000)')
+    parser.add_argument('--analyzers', default=','.join(ANALYZERS),
+                        help=f"Comma-separated subset of {', '.join(ANALYZERS)}")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--repeat', type=int, default=5, help='Maximum timed runs per measurement')
+    parser.add_argument('--budget', type=float, default=5.0, help='Seconds after which a measurement stops repeating')
+    parser.add_argument('--legacy', action='store_true', help='Also benchmark the list-of-dicts input')
+    parser.add_argument('--no-limits', action='store_true', help='Run every analyzer at every size')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc runs')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help='JSON Lines file runs are appended to')
+    parser.add_argument('--baseline', help='Commit (prefix) to compare against; default the previous run')
+    parser.add_argument('--no-save', action='store_true', help='Print results without appending them')
+    args = parser.parse_args()
+
+    analyzers = [name for name in args.analyzers.split(',') if name]
+    unknown = [name for name in analyzers if name not in ANALYZERS]
+    if unknown:
+        parser.error(f"unknown analyzers: {', '.join(unknown)}")
+
+    history = load_history(args.history)
+    baseline_record = find_baseline(history, args.baseline)
+    previous = {}
+    if baseline_record:
+        previous = {measurement_key(result): result for result in baseline_record['results']}
+        print(f"Comparing with {(baseline_record['environment'].get('commit') or 'unknown')[:12]} "
+              f"from {baseline_record['timestamp']}")
+
+    print(f"{'analyzer':14}{'input':10}{'size':>8}{'min':>14}{'median':>14}{'runs':>5}{'peak':>10}{'output':>10}")
+
+    def progress(result):
+        print(format_row(result, speed_ratio(result, previous)), flush=True)
+
+    results = run_benchmarks(
+        args.sizes, analyzers, seed=args.seed, repeat=args.repeat, budget=args.budget,
+        legacy=args.legacy, no_limits=args.no_limits, measure_memory=not args.no_memory,
+        progress=progress
+    )
+
+    record = {
+        'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'environment': environment(),
+        'parameters': {
+            'seed': args.seed,
+            'sizes': args.sizes,
+            'analyzers': analyzers,
+            'repeat': args.repeat,
+            'budget': args.budget,
+            'legacy': args.legacy,
+            'no_limits': args.no_limits
+        },
+        'results': results
+    }
+    if not args.no_save:
+        append_history(args.history, record)
+        print(f"Appended run to {args.history}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,459 @@
+"""
+Offline load test for the API with a seeded database.
+
+Seeds a SQLite file (or any SQLAlchemy URL, e.g. a local Postgres) through
+the models with synthetic cases, mints investigator tokens with
+generate_token, and drives a weighted mix of list, detail, create and
+analyze requests from concurrent virtual users. Requests go through the
+WSGI app in-process, so nothing listens on a port and no network is used.
+Reports p50/p95/p99 latency, throughput, error counts and SQL queries per
+endpoint.
+
+    python -m src.benchmarks.load_test --cases 20 --evidence 200 --users 8 --duration 30
+    python -m src.benchmarks.load_test --database-uri postgresql://localhost/evidence_load --no-seed
+    python -m src.benchmarks.load_test --weights evidence_list=5,analyze_patterns=1 --json results.json
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from flask import Flask
+from sqlalchemy import select, func
+from src.database.db_init import db, init_db
+from src.backend.models.user_model import User, Role
+from src.backend.models.case_model import Case, CaseStatus, CasePriority
+from src.backend.models.evidence_model import Evidence, EvidenceType, EvidenceStatus, ReliabilityLevel
+from src.backend.models.suspect_model import Suspect, SuspectEvidenceLink, SuspectStatus
+from src.backend.models import analysis_model, audit_model
+from src.backend.utils.auth import generate_token
+from src.backend.utils.sequence import allocate_evidence_numbers
+from src.backend.utils.match_scores import recompute_match_scores
+from src.backend.utils.reference_data import invalidate_reference_data, ROLES
+from src.backend.utils.serialization import ApiJSONProvider
+from src.backend.utils.http_middleware import init_http_middleware
+from src.backend.utils.query_profiler import init_query_profiler, count_queries
+from src.backend.utils.metrics import init_metrics
+from src.benchmarks.synthetic_cases import DEFAULT_SEED, generate_case, MATCH_STATUSES, EVIDENCE_TYPES
+
+INVESTIGATOR_ROLE = 'Investigator'
+INVESTIGATOR_PERMISSIONS = [
+    'case:view', 'case:create', 'case:update',
+    'evidence:view', 'evidence:create', 'evidence:update',
+    'suspect:view', 'suspect:create', 'suspect:update',
+    'analysis:view', 'analysis:run', 'analysis:create'
+]
+SEED_CHUNK_SIZE = 1000
+
+def create_app(database_uri):
+    """
+    The API application configured the way server.py configures it.
+
+    Built here rather than imported so the load test does not start the
+    background log sealer or depend on server.py's module-level setup.
+    """
+    from src.backend.api.evidence_api import evidence_bp
+    from src.backend.api.case_api import case_bp
+    from src.backend.api.suspect_api import suspect_bp
+    from src.backend.api.analysis_api import analysis_bp
+    from src.backend.api.auth_api import auth_bp
+    from src.backend.api.audit_api import audit_bp
+    from src.backend.api.graph_api import graph_bp
+
+    app = Flask(__name__)
+    app.json = ApiJSONProvider(app)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['JWT_SECRET_KEY'] = os.getenv('JWT_SECRET_KEY', 'load-test-secret-key-not-for-production')
+    if database_uri.startswith('sqlite'):
+        # Concurrent writers wait for the file lock instead of failing straight away
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {'connect_args': {'timeout': 30, 'check_same_thread': False}}
+
+    init_db(app)
+    app.register_blueprint(evidence_bp, url_prefix='/api/evidence')
+    app.register_blueprint(case_bp, url_prefix='/api/case')
+    app.register_blueprint(suspect_bp, url_prefix='/api/suspect')
+    app.register_blueprint(analysis_bp, url_prefix='/api/analysis')
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(audit_bp, url_prefix='/api/audit')
+    app.register_blueprint(graph_bp, url_prefix='/api/graph')
+    init_metrics(app)
+    init_query_profiler(app)
+    init_http_middleware(app)
+    return app
+
+def seed_database(cases, evidence_per_case, suspects_per_case, links_per_suspect, investigators,
+                  seed=DEFAULT_SEED, progress=None):
+    """
+    Populate the database with investigators and synthetic cases through the models.
+
+    Counter columns are maintained by the model events as rows are added;
+    suspect match scores are recomputed once at the end. Run inside an
+    application context.
+
+    Returns:
+        dict: Number of rows created per table
+    """
+    role = Role.query.filter_by(name=INVESTIGATOR_ROLE).first()
+    if role is None:
+        role = Role(name=INVESTIGATOR_ROLE, description='Case management and evidence analysis')
+        db.session.add(role)
+    if not role.permissions:
+        role.permissions = json.dumps(INVESTIGATOR_PERMISSIONS)
+    db.session.flush()
+
+    existing_users = db.session.scalar(select(func.count(User.id)))
+    users = [User(
+        username=f'loadtest{existing_users + i}',
+        email=f'loadtest{existing_users + i}@example.com',
+        password_hash='!',  # Never used to log in; tokens are minted directly
+        first_name='Load',
+        last_name=f'Investigator {i + 1}',
+        department=f'Unit {i % 4 + 1}',
+        role_id=role.id,
+        is_active=True
+    ) for i in range(investigators)]
+    db.session.add_all(users)
+    db.session.commit()
+    invalidate_reference_data(ROLES)
+
+    rng = random.Random(seed)
+    counts = {'cases': 0, 'evidence': 0, 'suspects': 0, 'links': 0}
+    for case_index in range(cases):
+        investigator = users[case_index % len(users)] if users else db.session.get(User, 1)
+        case = Case(
+            case_number=f'LT-{seed}-{case_index + 1:05d}',
+            title=f'Load test case {case_index + 1}',
+            description='Synthetic case created by the load test',
+            status=rng.choice([CaseStatus.ACTIVE] * 4 + list(CaseStatus)),
+            priority=rng.choice(list(CasePriority)),
+            crime_type=rng.choice(['burglary', 'robbery', 'fraud', 'assault', 'homicide']),
+            crime_date=datetime(2024, 1, 1),
+            investigator_id=investigator.id,
+            department=investigator.department
+        )
+        db.session.add(case)
+        # Evidence numbers come from the counter table on a separate connection,
+        # which would wait on this transaction's write lock under SQLite
+        db.session.commit()
+
+        evidence_rows, suspect_rows, link_rows = generate_case(
+            evidence_per_case, seed + case_index, suspects_per_case, case.id, links_per_suspect
+        )
+        numbers = allocate_evidence_numbers(case.id, len(evidence_rows))
+
+        evidence_items = {}
+        for row, number in zip(evidence_rows, numbers):
+            evidence_items[row[0]] = Evidence(
+                evidence_number=number,
+                case_id=case.id,
+                evidence_type=EvidenceType(row[2]),
+                description=row[3],
+                location_found=row[4],
+                collection_date=row[5] or datetime(2024, 3, 1),
+                collector_id=investigator.id,
+                status=EvidenceStatus(row[6]),
+                reliability=ReliabilityLevel(row[7])
+            )
+        suspects = {row[0]: Suspect(
+            case_id=case.id,
+            first_name='Suspect',
+            last_name=f'{case.id}-{row[0]}',
+            status=SuspectStatus(row[2]),
+            added_by=investigator.id
+        ) for row in suspect_rows}
+        db.session.add_all(list(evidence_items.values()) + list(suspects.values()))
+        db.session.flush()
+
+        links = [SuspectEvidenceLink(
+            suspect_id=suspects[suspect_id].id,
+            evidence_id=evidence_items[evidence_id].id,
+            match_status=match_status,
+            confidence=confidence,
+            linked_by=investigator.id
+        ) for suspect_id, evidence_id, match_status, confidence, _, _ in link_rows]
+        for start in range(0, len(links), SEED_CHUNK_SIZE):
+            db.session.add_all(links[start:start + SEED_CHUNK_SIZE])
+            db.session.flush()
+        db.session.commit()
+
+        counts['cases'] += 1
+        counts['evidence'] += len(evidence_items)
+        counts['suspects'] += len(suspects)
+        counts['links'] += len(links)
+        if progress:
+            progress(counts)
+
+    recompute_match_scores()
+    counts['users'] = len(users)
+    return counts
+
+class Targets:
+    """Ids the workload picks from, refreshed from the database before a run"""
+
+    def __init__(self):
+        self.case_ids = db.session.scalars(select(Case.id)).all()
+        self.evidence_by_case = {}
+        for evidence_id, case_id in db.session.execute(select(Evidence.id, Evidence.case_id)):
+            self.evidence_by_case.setdefault(case_id, []).append(evidence_id)
+        self.suspects_by_case = {}
+        for suspect_id, case_id in db.session.execute(select(Suspect.id, Suspect.case_id)):
+            self.suspects_by_case.setdefault(case_id, []).append(suspect_id)
+        self.populated_cases = [case_id for case_id in self.case_ids
+                                if self.evidence_by_case.get(case_id) and self.suspects_by_case.get(case_id)]
+
+    def case(self, rng):
+        return rng.choice(self.populated_cases or self.case_ids)
+
+    def evidence(self, rng, case_id=None):
+        return rng.choice(self.evidence_by_case[case_id or self.case(rng)])
+
+    def suspect(self, rng, case_id=None):
+        return rng.choice(self.suspects_by_case[case_id or self.case(rng)])
+
+def _create_evidence(targets, rng):
+    return 'POST', '/api/evidence/', {
+        'case_id': targets.case(rng),
+        'evidence_type': rng.choice(EVIDENCE_TYPES),
+        'description': 'Load test item recovered near the scene',
+        'location_found': f'Warehouse {rng.randint(1, 20)}',
+        'collection_date': datetime(2024, 3, rng.randint(1, 28), rng.randint(0, 23)).isoformat(),
+        'reliability': rng.choice(['high', 'medium', 'low'])
+    }
+
+def _link_evidence(targets, rng):
+    case_id = targets.case(rng)
+    return 'POST', f'/api/suspect/{targets.suspect(rng, case_id)}/evidence', {
+        'evidence_id': targets.evidence(rng, case_id),
+        'match_status': rng.choice(MATCH_STATUSES),
+        'confidence': round(rng.uniform(0.2, 1.0), 2)
+    }
+
+# Endpoint name -> (default weight, request builder returning (method, path, JSON body))
+WORKLOAD = {
+    'case_list': (10, lambda targets, rng: ('GET', '/api/case/', None)),
+    'case_detail': (10, lambda targets, rng: ('GET', f'/api/case/{targets.case(rng)}', None)),
+    'case_view': (8, lambda targets, rng: ('GET', f'/api/case/{targets.case(rng)}/view', None)),
+    'evidence_list': (15, lambda targets, rng: ('GET', f'/api/evidence/?case_id={targets.case(rng)}', None)),
+    'evidence_detail': (15, lambda targets, rng: ('GET', f'/api/evidence/{targets.evidence(rng)}', None)),
+    'suspect_list': (10, lambda targets, rng: (
+        'GET', f'/api/suspect/?case_id={targets.case(rng)}&sort_by=match_score', None)),
+    'suspect_detail': (8, lambda targets, rng: ('GET', f'/api/suspect/{targets.suspect(rng)}', None)),
+    'evidence_create': (5, _create_evidence),
+    'link_create': (5, _link_evidence),
+    'analyze_patterns': (4, lambda targets, rng: (
+        'POST', '/api/analysis/analyze/patterns', {'case_id': targets.case(rng)})),
+    'analyze_probabilities': (4, lambda targets, rng: (
+        'POST', '/api/analysis/analyze/probabilities', {'case_id': targets.case(rng)})),
+    'analyze_correlations': (2, lambda targets, rng: (
+        'POST', '/api/analysis/analyze/correlations', {'case_id': targets.case(rng), 'min_strength': 0.6}))
+}
+
+def run_load(app, targets, tokens, users, weights, duration=None, requests_per_user=None,
+             warmup=0, think_time=0.0, seed=DEFAULT_SEED):
+    """
+    Drive the workload from concurrent virtual users.
+
+    Args:
+        app: Flask application under test
+        targets (Targets): Ids to request
+        tokens (list): Bearer tokens, assigned to users round robin
+        users (int): Concurrent virtual users (threads)
+        weights (dict): Endpoint name -> relative weight
+        duration (float): Seconds to run; used when requests_per_user is None
+        requests_per_user (int): Fixed number of requests per user
+        warmup (int): Requests per user sent first and not recorded
+        think_time (float): Mean pause between a user's requests, in seconds
+        seed (int): Seed for the users' request choices
+
+    Returns:
+        tuple: (samples as (endpoint, status, seconds, queries) tuples, wall-clock seconds)
+    """
+    names = [name for name in weights if weights[name] > 0]
+    cumulative = np.cumsum([weights[name] for name in names]).tolist()
+
+    samples = []
+    samples_lock = threading.Lock()
+    state = {}
+
+    def start_clock():
+        # Runs once, as the last user finishes warming up and before any is released
+        state['started'] = time.perf_counter()
+        state['deadline'] = state['started'] + (duration or 0)
+
+    start_barrier = threading.Barrier(users + 1, action=start_clock)
+
+    def virtual_user(index):
+        rng = random.Random(f'{seed}-{index}')
+        client = app.test_client()
+        headers = {'Authorization': f'Bearer {tokens[index % len(tokens)]}'}
+        recorded = []
+
+        def send(record):
+            name = rng.choices(names, cum_weights=cumulative)[0]
+            method, path, body = WORKLOAD[name][1](targets, rng)
+            with count_queries(keep_slowest=0, record_statements=False) as queries:
+                started = time.perf_counter()
+                response = client.open(path, method=method, json=body, headers=headers)
+                elapsed = time.perf_counter() - started
+                response.close()
+            if record:
+                recorded.append((name, response.status_code, elapsed, queries.count))
+            if think_time:
+                time.sleep(rng.expovariate(1 / think_time))
+
+        for _ in range(warmup):
+            send(False)
+        start_barrier.wait()
+        if requests_per_user is not None:
+            for _ in range(requests_per_user):
+                send(True)
+        else:
+            while time.perf_counter() < state['deadline']:
+                send(True)
+        with samples_lock:
+            samples.extend(recorded)
+
+    threads = [threading.Thread(target=virtual_user, args=(index,), daemon=True) for index in range(users)]
+    for thread in threads:
+        thread.start()
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+    return samples, time.perf_counter() - state['started']
+
+def summarize(samples, elapsed):
+    """
+    Latency percentiles, throughput, errors and query counts per endpoint and overall.
+
+    Returns:
+        dict: Endpoint name (and 'all') -> statistics
+    """
+    by_endpoint = {}
+    for name, status, seconds, queries in samples:
+        by_endpoint.setdefault(name, []).append((status, seconds, queries))
+    by_endpoint['all'] = [(status, seconds, queries) for _, status, seconds, queries in samples]
+
+    summary = {}
+    for name, rows in by_endpoint.items():
+        if not rows:
+            continue
+        statuses = np.array([row[0] for row in rows])
+        latencies = np.array([row[1] for row in rows]) * 1000
+        queries = np.array([row[2] for row in rows])
+        p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+        summary[name] = {
+            'requests': len(rows),
+            'errors': int((statuses >= 400).sum()),
+            'status_counts': {str(code): int(count) for code, count in zip(*np.unique(statuses, return_counts=True))},
+            'throughput_rps': len(rows) / elapsed if elapsed else None,
+            'p50_ms': float(p50),
+            'p95_ms': float(p95),
+            'p99_ms': float(p99),
+            'max_ms': float(latencies.max()),
+            'mean_queries': float(queries.mean()),
+            'max_queries': int(queries.max())
+        }
+    return summary
+
+def print_summary(summary, elapsed):
+    print(f"{'endpoint':24}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50':>10}{'p95':>10}{'p99':>10}"
+          f"{'queries':>9}{'max q':>7}")
+    names = sorted((name for name in summary if name != 'all'), key=lambda name: -summary[name]['p95_ms'])
+    for name in names + ['all']:
+        stats = summary[name]
+        print(f"{name:24}{stats['requests']:>9}{stats['errors']:>8}{stats['throughput_rps']:>9.1f}"
+              f"{stats['p50_ms']:>8.1f}ms{stats['p95_ms']:>8.1f}ms{stats['p99_ms']:>8.1f}ms"
+              f"{stats['mean_queries']:>9.1f}{stats['max_queries']:>7}")
+    print(f"{summary['all']['requests']} requests in {elapsed:.1f}s")
+
+def parse_weights(value):
+    weights = {}
+    for item in value.split(','):
+        if item:
+            name, _, weight = item.partition('=')
+            if name not in WORKLOAD:
+                raise argparse.ArgumentTypeError(f"unknown endpoint {name}; choose from {', '.join(WORKLOAD)}")
+            weights[name] = float(weight or 1)
+    return weights
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--database-uri', help='SQLAlchemy URL (default: a fresh SQLite file in a temp directory)')
+    parser.add_argument('--no-seed', action='store_true', help='Use the data already in the database')
+    parser.add_argument('--cases', type=int, default=20)
+    parser.add_argument('--evidence', type=int, default=100, help='Evidence items per case')
+    parser.add_argument('--suspects', type=int, default=8, help='Suspects per case')
+    parser.add_argument('--links', type=int, default=6, help='Average evidence links per suspect')
+    parser.add_argument('--investigators', type=int, default=10, help='Investigator accounts to seed and mint tokens for')
+    parser.add_argument('--users', type=int, default=8, help='Concurrent virtual users')
+    parser.add_argument('--duration', type=float, default=30.0, help='Seconds to run')
+    parser.add_argument('--requests', type=int, help='Requests per user instead of a fixed duration')
+    parser.add_argument('--warmup', type=int, default=5, help='Unrecorded requests per user before measuring')
+    parser.add_argument('--think-time', type=float, default=0.0, help='Mean pause between requests, in seconds')
+    parser.add_argument('--weights', type=parse_weights,
+                        help='Endpoint weights, e.g. case_list=2,analyze_patterns=0 (others keep their defaults)')
+    parser.add_argument('--only', action='store_true', help='Run only the endpoints named in --weights')
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--json', help='Also write the summary to this file')
+    args = parser.parse_args()
+
+    database_uri = args.database_uri
+    if database_uri is None:
+        directory = tempfile.mkdtemp(prefix='evidence-load-')
+        database_uri = f"sqlite:///{os.path.join(directory, 'load_test.db')}"
+        print(f"Database: {database_uri}")
+
+    app = create_app(database_uri)
+    with app.app_context():
+        if not args.no_seed:
+            started = time.perf_counter()
+            counts = seed_database(
+                args.cases, args.evidence, args.suspects, args.links, args.investigators, args.seed,
+                progress=lambda counts: print(f"\rSeeded {counts['cases']}/{args.cases} cases", end='', flush=True)
+            )
+            print(f"\rSeeded {counts['cases']} cases, {counts['evidence']} evidence items, "
+                  f"{counts['suspects']} suspects, {counts['links']} links in {time.perf_counter() - started:.1f}s")
+
+        role = Role.query.filter_by(name=INVESTIGATOR_ROLE).first()
+        investigators = User.query.filter_by(role_id=role.id).all() if role else []
+        tokens = [generate_token(user, expiration_minutes=24 * 60) for user in investigators or [db.session.get(User, 1)]]
+        targets = Targets()
+        if not targets.populated_cases:
+            parser.error('the database has no cases with both evidence and suspects; run without --no-seed')
+
+    weights = {name: weight for name, (weight, _) in WORKLOAD.items()}
+    if args.only:
+        weights = {name: 0 for name in WORKLOAD}
+    weights.update(args.weights or {})
+
+    print(f"Running {args.users} users for "
+          f"{f'{args.requests} requests each' if args.requests else f'{args.duration:.0f}s'}")
+    samples, elapsed = run_load(
+        app, targets, tokens, args.users, weights, duration=args.duration, requests_per_user=args.requests,
+        warmup=args.warmup, think_time=args.think_time, seed=args.seed
+    )
+    summary = summarize(samples, elapsed)
+    print_summary(summary, elapsed)
+
+    if args.json:
+        with open(args.json, 'w') as output:
+            json.dump({
+                'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+                'database': database_uri.split('://')[0],
+                'parameters': {key: value for key, value in vars(args).items() if key != 'database_uri'},
+                'elapsed_seconds': elapsed,
+                'endpoints': summary
+            }, output, indent=2, sort_keys=True)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+"""
+Microbenchmark for list response serialization.
+
+Compares the hand-built evidence list dictionaries with the stdlib JSON
+encoder (the previous code path) against EVIDENCE_SUMMARY with
+ApiJSONProvider. Uses transient model instances, so no database is needed.
+
+    python -m src.benchmarks.serialization_benchmark --rows 5000 --repeat 20
+"""
+import argparse
+import os
+import sys
+import timeit
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+from src.backend.models import analysis_model, case_model, suspect_model, user_model, audit_model
+from src.backend.models.evidence_model import Evidence, EvidenceType, EvidenceStatus, ReliabilityLevel
+from src.backend.utils.schemas import EVIDENCE_SUMMARY
+from src.backend.utils.serialization import ApiJSONProvider, orjson
+
+def make_evidence(count):
+    types = list(EvidenceType)
+    statuses = list(EvidenceStatus)
+    start = datetime(2024, 1, 1, 8, 30)
+    return [Evidence(
+        id=i,
+        evidence_number=f"E-1-{i:03d}",
+        case_id=1 + i % 50,
+        evidence_type=types[i % len(types)],
+        description=f"Evidence item {i} recovered near the scene",
+        location_found="Warehouse 4, north entrance",
+        collection_date=start + timedelta(minutes=i),
+        status=statuses[i % len(statuses)],
+        reliability=ReliabilityLevel.MEDIUM,
+        is_key_evidence=i % 7 == 0,
+        storage_location="Locker B-12",
+        chain_of_custody_complete=True,
+        file_count=i % 3,
+        analysis_count=i % 2,
+        custody_count=1 + i % 4
+    ) for i in range(1, count + 1)]
+
+def legacy_dicts(evidence_items):
+    """The evidence list loop as it was written before EVIDENCE_SUMMARY"""
+    evidence_list = []
+    for item in evidence_items:
+        evidence_list.append({
+            'id': item.id,
+            'evidence_number': item.evidence_number,
+            'case_id': item.case_id,
+            'evidence_type': item.evidence_type.value,
+            'description': item.description,
+            'location_found': item.location_found,
+            'collection_date': item.collection_date.isoformat() if item.collection_date else None,
+            'status': item.status.value,
+            'reliability': item.reliability.value,
+            'is_key_evidence': item.is_key_evidence,
+            'storage_location': item.storage_location,
+            'chain_of_custody_complete': item.chain_of_custody_complete,
+            'file_count': item.file_count,
+            'analysis_count': item.analysis_count,
+            'custody_changes': item.custody_count
+        })
+    return evidence_list
+
+def best_of(function, repeat):
+    return min(timeit.repeat(function, number=1, repeat=repeat))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=5000)
+    parser.add_argument('--repeat', type=int, default=20)
+    args = parser.parse_args()
+
+    app = Flask(__name__)
+    default_provider = DefaultJSONProvider(app)
+    api_provider = ApiJSONProvider(app)
+    items = make_evidence(args.rows)
+
+    # Both paths must produce the same JSON document
+    assert default_provider.loads(default_provider.dumps(legacy_dicts(items))) == \
+        api_provider.loads(api_provider.dumps(EVIDENCE_SUMMARY.many(items)))
+
+    legacy_build = best_of(lambda: legacy_dicts(items), args.repeat)
+    schema_build = best_of(lambda: EVIDENCE_SUMMARY.many(items), args.repeat)
+    legacy_rows = legacy_dicts(items)
+    schema_rows = EVIDENCE_SUMMARY.many(items)
+    legacy_encode = best_of(lambda: default_provider.dumps(legacy_rows), args.repeat)
+    schema_encode = best_of(lambda: api_provider.dumps(schema_rows), args.repeat)
+
+    print(f"{args.rows} evidence rows, best of {args.repeat} (encoder: {'orjson' if orjson else 'json'})")
+    print(f"{'':12}{'build':>12}{'encode':>12}{'total':>12}")
+    for label, build, encode in (('legacy', legacy_build, legacy_encode), ('schema', schema_build, schema_encode)):
+        print(f"{label:12}{build * 1000:10.2f}ms{encode * 1000:10.2f}ms{(build + encode) * 1000:10.2f}ms")
+    print(f"speedup: {(legacy_build + legacy_encode) / (schema_build + schema_encode):.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,248 @@
+"""
+Cold-start budget for the API workers and CLI tools.
+
+Starts fresh interpreters that import the modules server.py loads (read from
+its source), build the app and run init_db, and times each phase. The check
+fails (exit status 1) when the median cold start exceeds the budget or when a
+heavy dependency (numpy, pandas, scikit-learn, ...) is imported at startup
+instead of on first use, so CI catches a top-level import that slows every
+worker down. tests/test_startup_budget.py runs the same check under pytest.
+
+    python -m src.benchmarks.startup_budget
+    python -m src.benchmarks.startup_budget --budget-ms 800 --runs 15
+    python -m src.benchmarks.startup_budget --compare HEAD~1      # before/after report
+    python -m src.benchmarks.startup_budget --importtime 15       # slowest imports
+"""
+import argparse
+import ast
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.benchmarks.analysis_benchmark import environment, load_history, append_history, find_baseline
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+DEFAULT_BUDGET_MS = 1500
+DEFAULT_RUNS = 7
+DEFAULT_HISTORY = 'startup_history.jsonl'
+
+# Modules that must only load when a request or command needs them
+DEFERRED_MODULES = (
+    'numpy', 'pandas', 'sklearn', 'scipy', 'cv2', 'spacy', 'nltk', 'networkx', 'matplotlib',
+    'multiprocessing', 'src.analysis_tools.case_snapshot', 'src.analysis_tools.comprehensive_analysis',
+    'src.analysis_tools.evidence_correlation', 'src.analysis_tools.evidence_graph',
+    'src.analysis_tools.pattern_detection', 'src.analysis_tools.probability_calculator'
+)
+
+SERVER_MODULE = os.path.join('src', 'backend', 'server.py')
+
+def server_imports(root):
+    """
+    The project modules server.py imports at startup and the blueprints it registers.
+
+    Read from server.py's source rather than by importing it, so the list
+    follows server.py without starting the app, and a module missing from a
+    checkout is reported instead of failing the run.
+
+    Returns:
+        tuple: (support module names, (module, blueprint attribute, url prefix) per blueprint)
+    """
+    with open(os.path.join(root, SERVER_MODULE)) as source:
+        tree = ast.parse(source.read())
+    imported = {}
+    for node in tree.body:
+        if isinstance(node, ast.ImportFrom) and node.module and node.module.startswith('src.'):
+            imported.update({alias.asname or alias.name: node.module for alias in node.names})
+    blueprints = []
+    for node in ast.walk(tree):
+        if (isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute)
+                and node.func.attr == 'register_blueprint' and node.args
+                and isinstance(node.args[0], ast.Name) and node.args[0].id in imported):
+            prefix = next((keyword.value.value for keyword in node.keywords if keyword.arg == 'url_prefix'), None)
+            blueprints.append((imported[node.args[0].id], node.args[0].id, prefix))
+    blueprint_modules = {module for module, _, _ in blueprints}
+    support = [module for module in dict.fromkeys(imported.values()) if module not in blueprint_modules]
+    return support, blueprints
+
+# Runs in a fresh interpreter; it must also work against older checkouts for --compare
+STARTUP_SCRIPT = r'''
+import importlib, importlib.util, inspect, json, sys, time
+started = time.perf_counter()
+root, database_uri, check_schema, blueprints, support, deferred = json.loads(sys.argv[1])
+sys.path.insert(0, root)
+from flask import Flask
+missing = []
+for name in support + [entry[0] for entry in blueprints]:
+    if importlib.util.find_spec(name) is None:
+        missing.append(name)
+    else:
+        importlib.import_module(name)
+imported = time.perf_counter()
+
+from src.database.db_init import init_db
+app = Flask('startup_budget')
+app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['JWT_SECRET_KEY'] = 'startup-budget'
+if 'check_schema' in inspect.signature(init_db).parameters:
+    init_db(app, check_schema=check_schema)
+else:
+    init_db(app)
+for name, attribute, prefix in blueprints:
+    if name not in missing:
+        app.register_blueprint(getattr(sys.modules[name], attribute), url_prefix=prefix)
+ready = time.perf_counter()
+print(json.dumps({
+    'import_ms': (imported - started) * 1000,
+    'init_ms': (ready - imported) * 1000,
+    'missing': missing,
+    'deferred_loaded': [name for name in deferred if name in sys.modules]
+}))
+'''
+
+def run_startup(root, database_uri, check_schema=True, importtime=False):
+    """
+    Start one interpreter and time its startup.
+
+    Returns:
+        dict: import_ms, init_ms, total_ms (wall clock including interpreter
+        start), missing modules, deferred modules that loaded, and the raw
+        -X importtime output when requested
+    """
+    support, blueprints = server_imports(root)
+    arguments = json.dumps([root, database_uri, check_schema, blueprints, support, DEFERRED_MODULES])
+    command = [sys.executable] + (['-X', 'importtime'] if importtime else []) + ['-c', STARTUP_SCRIPT, arguments]
+    started = time.perf_counter()
+    completed = subprocess.run(command, capture_output=True, text=True, cwd=root)
+    total_ms = (time.perf_counter() - started) * 1000
+    if completed.returncode != 0:
+        raise RuntimeError(f"Startup failed in {root}:\n{completed.stderr[-3000:]}")
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['total_ms'] = total_ms
+    if importtime:
+        result['importtime'] = completed.stderr
+    return result
+
+def measure(root, runs, check_schema=True):
+    """Median phase timings over several cold starts against a database that is already set up"""
+    directory = tempfile.mkdtemp(prefix='startup_budget_')
+    try:
+        database_uri = f"sqlite:///{os.path.join(directory, 'startup.db')}"
+        run_startup(root, database_uri, check_schema=True)  # Creates the schema; not counted
+        results = [run_startup(root, database_uri, check_schema) for _ in range(runs)]
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    return {
+        'check_schema': check_schema,
+        'runs': runs,
+        'import_ms': statistics.median(result['import_ms'] for result in results),
+        'init_ms': statistics.median(result['init_ms'] for result in results),
+        'total_ms': statistics.median(result['total_ms'] for result in results),
+        'missing': results[0]['missing'],
+        'deferred_loaded': results[0]['deferred_loaded']
+    }
+
+def slowest_imports(root, count):
+    """The modules with the largest cumulative -X importtime, slowest first"""
+    directory = tempfile.mkdtemp(prefix='startup_budget_')
+    try:
+        output = run_startup(root, f"sqlite:///{os.path.join(directory, 'startup.db')}", importtime=True)['importtime']
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    rows = []
+    for line in output.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative_us), int(self_us), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+def checkout(ref):
+    """A temporary worktree of ref, for measuring the code before a change"""
+    directory = tempfile.mkdtemp(prefix='startup_baseline_')
+    subprocess.run(['git', 'worktree', 'add', '--detach', directory, ref],
+                   cwd=ROOT, check=True, capture_output=True)
+    return directory
+
+def remove_checkout(directory):
+    subprocess.run(['git', 'worktree', 'remove', '--force', directory], cwd=ROOT, capture_output=True)
+    shutil.rmtree(directory, ignore_errors=True)
+
+def format_measurement(label, measurement):
+    return (f"{label:28}{measurement['import_ms']:10.1f}ms{measurement['init_ms']:10.1f}ms"
+            f"{measurement['total_ms']:10.1f}ms  {', '.join(measurement['deferred_loaded']) or '-'}")
+
+def format_change(before, after):
+    return '  '.join(
+        f"{phase} {(after[phase] / before[phase] - 1) * 100:+.1f}%"
+        for phase in ('import_ms', 'init_ms', 'total_ms') if before[phase] > 0
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help='Largest acceptable median cold start, interpreter start included')
+    parser.add_argument('--runs', type=int, default=DEFAULT_RUNS, help='Cold starts per measurement')
+    parser.add_argument('--compare', metavar='REF', help='Also measure a git ref and report the change')
+    parser.add_argument('--importtime', type=int, metavar='N', help='Print the N slowest imports')
+    parser.add_argument('--history', default=DEFAULT_HISTORY, help='JSON Lines file runs are appended to')
+    parser.add_argument('--no-save', action='store_true', help='Print results without appending them')
+    args = parser.parse_args()
+
+    print(f"{'':28}{'imports':>12}{'init_db':>12}{'total':>12}  deferred modules loaded")
+    current = {
+        'schema_check': measure(ROOT, args.runs, check_schema=True),
+        'skip_schema_check': measure(ROOT, args.runs, check_schema=False)
+    }
+    for label, measurement in current.items():
+        print(format_measurement(label, measurement))
+    if current['schema_check']['missing']:
+        print(f"Not found, skipped: {', '.join(current['schema_check']['missing'])}")
+
+    if args.compare:
+        directory = checkout(args.compare)
+        try:
+            before = measure(directory, args.runs, check_schema=True)
+        finally:
+            remove_checkout(directory)
+        print(format_measurement(f"{args.compare} schema_check", before))
+        print(f"Change against {args.compare}: {format_change(before, current['schema_check'])}")
+    else:
+        baseline = find_baseline(load_history(args.history))
+        if baseline:
+            print(f"Change against {(baseline['environment'].get('commit') or 'unknown')[:12]}: "
+                  f"{format_change(baseline['results']['schema_check'], current['schema_check'])}")
+
+    if args.importtime:
+        print(f"\n{'cumulative':>12}{'self':>10}  module")
+        for cumulative_us, self_us, name in slowest_imports(ROOT, args.importtime):
+            print(f"{cumulative_us / 1000:10.1f}ms{self_us / 1000:8.1f}ms  {name}")
+
+    if not args.no_save:
+        append_history(args.history, {
+            'timestamp': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+            'environment': environment(),
+            'parameters': {'runs': args.runs, 'budget_ms': args.budget_ms},
+            'results': current
+        })
+
+    failures = []
+    measured = current['schema_check']['total_ms']
+    if measured > args.budget_ms:
+        failures.append(f"cold start {measured:.0f}ms exceeds the {args.budget_ms:.0f}ms budget")
+    if current['schema_check']['deferred_loaded']:
+        failures.append(f"imported at startup: {', '.join(current['schema_check']['deferred_loaded'])}")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    sys.exit(1 if failures else 0)
+
+if __name__ == '__main__':
+    main()
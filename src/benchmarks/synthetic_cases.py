@@ -0,0 +1,215 @@
+"""
+Seeded synthetic case data for benchmarking the analyzers.
+
+Distributions are chosen to resemble real case files rather than uniform
+noise, since the analyzers' cost depends on how much items overlap:
+
+- locations follow a Zipf distribution over a pool of places, and the same
+  place is written several ways ("Warehouse 4", "warehouse 4, north door")
+- collection times cluster around a handful of incidents (searches, raids)
+  with a tail of stragglers collected days later
+- descriptions draw words from a Zipfian vocabulary, so a few terms
+  ("knife", "phone") are shared widely and most are rare
+- evidence types, reliability and link match statuses are skewed the way
+  intake usually is (mostly physical and digital, mostly medium reliability)
+
+The same seed and size always produce the same case.
+"""
+import os
+import sys
+from datetime import datetime, timedelta
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+
+from src.analysis_tools.case_snapshot import build_case_snapshot
+
+EVIDENCE_TYPES = ('physical', 'digital', 'documentary', 'testimonial', 'biological', 'trace', 'demonstrative')
+EVIDENCE_TYPE_WEIGHTS = (0.34, 0.24, 0.12, 0.1, 0.08, 0.08, 0.04)
+EVIDENCE_STATUSES = ('collected', 'processing', 'analyzed', 'verified', 'inconclusive')
+EVIDENCE_STATUS_WEIGHTS = (0.35, 0.25, 0.25, 0.1, 0.05)
+RELIABILITY_LEVELS = ('high', 'medium', 'low', 'unknown')
+RELIABILITY_WEIGHTS = (0.25, 0.45, 0.2, 0.1)
+SUSPECT_STATUSES = ('person_of_interest', 'primary_suspect', 'secondary_suspect', 'cleared')
+SUSPECT_STATUS_WEIGHTS = (0.5, 0.1, 0.25, 0.15)
+MATCH_STATUSES = ('match', 'partial_match', 'possible_match', 'no_match', 'inconclusive')
+MATCH_STATUS_WEIGHTS = (0.2, 0.25, 0.3, 0.15, 0.1)
+
+PLACE_KINDS = ('Warehouse', 'Apartment', 'Parking Garage', 'Alley', 'Storage Unit', 'Office', 'Dock', 'Motel Room')
+PLACE_DETAILS = ('', ', north entrance', ', rear door', ', second floor', ', loading bay')
+VOCABULARY_ROOTS = (
+    'knife', 'phone', 'glove', 'blood', 'fiber', 'receipt', 'laptop', 'bag', 'cash', 'shoe', 'print', 'key',
+    'camera', 'footage', 'letter', 'vehicle', 'jacket', 'bottle', 'cigarette', 'hair', 'tool', 'ledger', 'card',
+    'statement', 'weapon', 'casing', 'rope', 'mask', 'watch', 'ticket'
+)
+DESCRIPTION_FILLER = ('recovered', 'near', 'the', 'with', 'from', 'under', 'inside', 'beside')
+
+ZIPF_EXPONENT = 1.1
+DEFAULT_SEED = 20240101
+
+def zipf_weights(count, exponent=ZIPF_EXPONENT):
+    """Normalized Zipf probabilities for ranks 1..count"""
+    weights = 1.0 / np.arange(1, count + 1, dtype=np.float64) ** exponent
+    return weights / weights.sum()
+
+def make_vocabulary(size):
+    """Root words first (the frequent ranks), then numbered rare variants"""
+    words = list(VOCABULARY_ROOTS)
+    index = 0
+    while len(words) < size:
+        words.append(f"{VOCABULARY_ROOTS[index % len(VOCABULARY_ROOTS)]}{index // len(VOCABULARY_ROOTS)}x")
+        index += 1
+    return words[:size]
+
+def make_places(count):
+    return [f"{PLACE_KINDS[i % len(PLACE_KINDS)]} {i // len(PLACE_KINDS) + 1}" for i in range(count)]
+
+def generate_evidence_rows(count, rng, case_id=1, start=datetime(2024, 3, 1, 21, 0)):
+    """
+    Evidence tuples in CaseSnapshot order:
+    (id, evidence_number, type, description, location, collection_date, status, reliability)
+    """
+    # Places and vocabulary grow sublinearly with the case, as they do in practice
+    places = make_places(max(4, int(count ** 0.6)))
+    place_choice = rng.choice(len(places), size=count, p=zipf_weights(len(places)))
+    detail_choice = rng.integers(0, len(PLACE_DETAILS), size=count)
+    missing_location = rng.random(count) < 0.05
+
+    vocabulary = make_vocabulary(max(len(VOCABULARY_ROOTS), int(40 * count ** 0.5)))
+    word_weights = zipf_weights(len(vocabulary))
+    word_counts = rng.integers(3, 9, size=count)
+    words = rng.choice(len(vocabulary), size=int(word_counts.sum()), p=word_weights)
+    fillers = rng.integers(0, len(DESCRIPTION_FILLER), size=int(word_counts.sum()))
+
+    # Incidents spread over a few weeks; items cluster within hours of one
+    incident_count = max(1, int(count ** 0.4))
+    incident_hours = np.sort(rng.uniform(0, 24 * 21, size=incident_count))
+    incident_choice = rng.integers(0, incident_count, size=count)
+    offsets = np.where(
+        rng.random(count) < 0.85,
+        np.abs(rng.normal(0, 3, size=count)),    # Collected during the incident response
+        rng.exponential(48, size=count)          # Stragglers submitted days later
+    )
+    hours = incident_hours[incident_choice] + offsets
+    missing_date = rng.random(count) < 0.03
+
+    types = rng.choice(len(EVIDENCE_TYPES), size=count, p=EVIDENCE_TYPE_WEIGHTS)
+    statuses = rng.choice(len(EVIDENCE_STATUSES), size=count, p=EVIDENCE_STATUS_WEIGHTS)
+    reliabilities = rng.choice(len(RELIABILITY_LEVELS), size=count, p=RELIABILITY_WEIGHTS)
+
+    rows = []
+    position = 0
+    for i in range(count):
+        n = int(word_counts[i])
+        text = ' '.join(
+            f"{DESCRIPTION_FILLER[fillers[position + j]]} {vocabulary[words[position + j]]}" for j in range(n)
+        )
+        position += n
+
+        location = None
+        if not missing_location[i]:
+            location = places[place_choice[i]] + PLACE_DETAILS[detail_choice[i]]
+            if i % 3 == 0:
+                location = location.lower()
+
+        rows.append((
+            i + 1,
+            f"E-{case_id}-{i + 1:03d}",
+            EVIDENCE_TYPES[types[i]],
+            text.capitalize(),
+            location,
+            None if missing_date[i] else start + timedelta(hours=float(hours[i])),
+            EVIDENCE_STATUSES[statuses[i]],
+            RELIABILITY_LEVELS[reliabilities[i]]
+        ))
+    return rows
+
+def generate_suspect_rows(count, rng):
+    """Suspect tuples in CaseSnapshot order: (id, full_name, status)"""
+    statuses = rng.choice(len(SUSPECT_STATUSES), size=count, p=SUSPECT_STATUS_WEIGHTS)
+    return [(i + 1, f"Suspect {i + 1}", SUSPECT_STATUSES[statuses[i]]) for i in range(count)]
+
+def generate_link_rows(evidence_rows, suspect_rows, rng, mean_links=6):
+    """
+    Link tuples in CaseSnapshot order:
+    (suspect_id, evidence_id, match_status, confidence, evidence_type, reliability)
+
+    A few prime suspects carry most links (Zipf over suspects); each suspect
+    links an evidence item at most once.
+    """
+    if not evidence_rows or not suspect_rows:
+        return []
+    total = min(len(suspect_rows) * mean_links, len(suspect_rows) * len(evidence_rows))
+    per_suspect = rng.multinomial(total, zipf_weights(len(suspect_rows)))
+    per_suspect = np.minimum(per_suspect, len(evidence_rows))
+
+    rows = []
+    for suspect, links in zip(suspect_rows, per_suspect):
+        evidence_indices = rng.choice(len(evidence_rows), size=int(links), replace=False)
+        statuses = rng.choice(len(MATCH_STATUSES), size=int(links), p=MATCH_STATUS_WEIGHTS)
+        confidences = np.round(rng.uniform(0.2, 1.0, size=int(links)), 2)
+        for index, status, confidence in zip(evidence_indices, statuses, confidences):
+            evidence = evidence_rows[index]
+            rows.append((suspect[0], evidence[0], MATCH_STATUSES[status], float(confidence), evidence[2], evidence[7]))
+    return rows
+
+def suspect_count_for(evidence_count):
+    return max(2, int(evidence_count ** 0.5))
+
+def generate_case(evidence_count, seed=DEFAULT_SEED, suspect_count=None, case_id=1, mean_links=6):
+    """
+    Rows for one synthetic case.
+
+    Args:
+        evidence_count (int): Number of evidence items
+        seed (int): Random seed; the same seed and sizes give the same rows
+        suspect_count (int): Number of suspects, default sqrt(evidence_count)
+        case_id (int): Case id used in evidence numbers
+        mean_links (int): Average evidence links per suspect
+
+    Returns:
+        tuple: (evidence rows, suspect rows, link rows) in CaseSnapshot tuple layouts
+    """
+    rng = np.random.default_rng([seed, evidence_count])
+    evidence_rows = generate_evidence_rows(evidence_count, rng, case_id)
+    suspect_rows = generate_suspect_rows(suspect_count or suspect_count_for(evidence_count), rng)
+    link_rows = generate_link_rows(evidence_rows, suspect_rows, rng, mean_links)
+    return evidence_rows, suspect_rows, link_rows
+
+def case_snapshot(rows, case_id=1):
+    """CaseSnapshot of generated rows, as the analysis endpoints build it"""
+    evidence_rows, suspect_rows, link_rows = rows
+    return build_case_snapshot(case_id, evidence_rows, suspect_rows, link_rows)
+
+def evidence_dicts(rows):
+    """Generated evidence in the list-of-dicts form the analyzers also accept"""
+    return [{
+        'id': row[0],
+        'evidence_number': row[1],
+        'type': row[2],
+        'description': row[3],
+        'location': row[4],
+        'date': row[5].isoformat() if row[5] else None,
+        'status': row[6],
+        'reliability': row[7]
+    } for row in rows[0]]
+
+def suspect_dicts(rows):
+    """Generated suspects with their evidence links in the list-of-dicts form"""
+    evidence_rows, suspect_rows, link_rows = rows
+    links = {}
+    for suspect_id, evidence_id, match_status, confidence, evidence_type, reliability in link_rows:
+        links.setdefault(suspect_id, []).append({
+            'evidence_id': evidence_id,
+            'match_status': match_status,
+            'confidence': confidence,
+            'evidence_type': evidence_type,
+            'reliability': reliability
+        })
+    return [{
+        'id': suspect_id,
+        'name': name,
+        'status': status,
+        'evidence_links': links.get(suspect_id, [])
+    } for suspect_id, name, status in suspect_rows]
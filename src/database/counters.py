@@ -0,0 +1,155 @@
+from collections import Counter
+from sqlalchemy import event, update, select, func, inspect, bindparam
+from src.database.db_init import db
+
+class CounterColumn:
+    """A parent column that holds the number of child rows pointing at it"""
+
+    def __init__(self, parent_model, column_name, child_model, foreign_key):
+        self.parent_model = parent_model
+        self.column_name = column_name
+        self.child_model = child_model
+        self.foreign_key = foreign_key
+
+    def __repr__(self):
+        return f'<CounterColumn {self.parent_model.__tablename__}.{self.column_name}>'
+
+    @property
+    def column(self):
+        return self.parent_model.__table__.c[self.column_name]
+
+    def adjust(self, connection, parent_id, delta):
+        """Add delta to one parent's counter with an atomic in-database update"""
+        if parent_id is None or not delta:
+            return
+        table = self.parent_model.__table__
+        connection.execute(
+            update(table)
+            .where(table.c.id == parent_id)
+            .values({self.column_name: self.column + delta})
+        )
+
+    def adjust_many(self, connection, deltas):
+        """Apply a {parent_id: delta} mapping with one executemany update"""
+        rows = [{'parent_id': parent_id, 'delta': delta}
+                for parent_id, delta in deltas.items() if parent_id is not None and delta]
+        if not rows:
+            return
+        table = self.parent_model.__table__
+        connection.execute(
+            update(table)
+            .where(table.c.id == bindparam('parent_id'))
+            .values({self.column_name: self.column + bindparam('delta')}),
+            rows
+        )
+
+    def repair(self, connection):
+        """
+        Recompute the counter from the child table.
+
+        Returns:
+            int: Number of parent rows whose stored count was wrong
+        """
+        table = self.parent_model.__table__
+        child = self.child_model.__table__
+        actual = (
+            select(func.count())
+            .select_from(child)
+            .where(child.c[self.foreign_key] == table.c.id)
+            .scalar_subquery()
+        )
+        result = connection.execute(
+            update(table)
+            .where(self.column != actual)
+            .values({self.column_name: actual})
+        )
+        return result.rowcount
+
+def counter_columns():
+    """All maintained counters"""
+    from src.backend.models.case_model import Case
+    from src.backend.models.evidence_model import Evidence, EvidenceFile, EvidenceAnalysis, CustodyChange
+    from src.backend.models.suspect_model import Suspect
+    from src.backend.models.analysis_model import AnalysisReport, PatternAnalysis, EvidenceCorrelation, ProbabilityAssessment
+
+    return [
+        CounterColumn(Case, 'evidence_count', Evidence, 'case_id'),
+        CounterColumn(Case, 'suspect_count', Suspect, 'case_id'),
+        CounterColumn(Evidence, 'file_count', EvidenceFile, 'evidence_id'),
+        CounterColumn(Evidence, 'analysis_count', EvidenceAnalysis, 'evidence_id'),
+        CounterColumn(Evidence, 'custody_count', CustodyChange, 'evidence_id'),
+        CounterColumn(AnalysisReport, 'pattern_count', PatternAnalysis, 'report_id'),
+        CounterColumn(AnalysisReport, 'correlation_count', EvidenceCorrelation, 'report_id'),
+        CounterColumn(AnalysisReport, 'probability_count', ProbabilityAssessment, 'report_id')
+    ]
+
+def counter_for(child_model):
+    """Counters maintained from inserts and deletes of child_model"""
+    return [counter for counter in counter_columns() if counter.child_model is child_model]
+
+_events_registered = False
+
+def register_counter_events():
+    """
+    Keep counter columns in step with ORM inserts, deletes and re-parenting.
+
+    The updates run on the flush's connection, so they commit or roll back
+    together with the child rows. Core bulk inserts bypass these events and
+    must call increment_counters themselves. Safe to call more than once.
+    """
+    global _events_registered
+    if _events_registered:
+        return
+
+    for counter in counter_columns():
+        event.listen(counter.child_model, 'after_insert', _make_insert_listener(counter))
+        event.listen(counter.child_model, 'after_delete', _make_delete_listener(counter))
+        event.listen(counter.child_model, 'after_update', _make_update_listener(counter))
+    _events_registered = True
+
+def _make_insert_listener(counter):
+    def after_insert(mapper, connection, target):
+        counter.adjust(connection, getattr(target, counter.foreign_key), 1)
+    return after_insert
+
+def _make_delete_listener(counter):
+    def after_delete(mapper, connection, target):
+        counter.adjust(connection, getattr(target, counter.foreign_key), -1)
+    return after_delete
+
+def _make_update_listener(counter):
+    def after_update(mapper, connection, target):
+        history = inspect(target).attrs[counter.foreign_key].history
+        if not history.has_changes():
+            return
+        for old_parent in history.deleted:
+            counter.adjust(connection, old_parent, -1)
+        for new_parent in history.added:
+            counter.adjust(connection, new_parent, 1)
+    return after_update
+
+def increment_counters(child_model, rows):
+    """
+    Count rows inserted in bulk (bypassing ORM events) against their parents.
+
+    Args:
+        child_model: Model the rows were inserted into
+        rows (list): The inserted row dictionaries
+    """
+    connection = db.session.connection()
+    for counter in counter_for(child_model):
+        counter.adjust_many(connection, Counter(row.get(counter.foreign_key) for row in rows))
+
+def repair_counters():
+    """
+    Recompute every counter column from its child table and commit.
+
+    Returns:
+        dict: Counter name -> number of rows corrected
+    """
+    connection = db.session.connection()
+    repaired = {}
+    for counter in counter_columns():
+        repaired[f'{counter.parent_model.__tablename__}.{counter.column_name}'] = counter.repair(connection)
+    db.session.commit()
+    return repaired
@@ -1,21 +1,54 @@
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.session import Session
 from datetime import datetime
 
+class RoutingSession(Session):
+    """
+    Session class of db.session.
+    
+    Routers registered with add_bind_router (department shards, read
+    replicas) are asked in turn for the engine of each statement; when all
+    return None, the primary database and the usual bind keys are used.
+    """
+    routers = ()
+    
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            for router in self.routers:
+                engine = router(mapper, clause)
+                if engine is not None:
+                    return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def add_bind_router(router):
+    """Register router(mapper, clause) -> engine or None with RoutingSession, once"""
+    if router not in RoutingSession.routers:
+        RoutingSession.routers = RoutingSession.routers + (router,)
+
 # Initialize SQLAlchemy instance
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 
-def init_db(app):
-    """Initialize the database with the Flask app"""
+def init_db(app, check_schema=True):
+    """
+    Initialize the database with the Flask app.
+    
+    The schema check compares the database's migration version with the
+    latest migration (see src.database.migrate) and, when AUTO_MIGRATE is on,
+    applies pending migrations. check_schema=False skips it, for workers and
+    CLI tools started against a database already migrated.
+    """
     db.init_app(app)
     
-    # Create tables if they don't exist
+    # Maintain denormalized counter columns on child inserts and deletes
+    from src.database.counters import register_counter_events
+    register_counter_events()
+    
+    if not check_schema:
+        return
+    
+    from src.database.migrate import ensure_schema
     with app.app_context():
-        db.create_all()
-        
-        # Check if we need to add initial data
-        from src.backend.models.user_model import User
-        if User.query.count() == 0:
-            create_default_admin()
+        ensure_schema(auto_migrate=app.config.get('AUTO_MIGRATE', True))
 
 def create_default_admin():
     """Create a default admin user if no users exist"""
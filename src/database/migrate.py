@@ -0,0 +1,358 @@
+"""
+Versioned schema migrations.
+
+Migrations live in src/database/migrations as NNNN_description.py modules,
+applied in version order. Each defines upgrade(op), which changes the schema
+through an Operations object, and optionally backfill(), which fills new
+columns through db.session once the schema change has committed. The applied
+versions are recorded in schema_migrations, so the startup check is a single
+max(version) query instead of reflecting every table.
+
+Databases created with create_all before migrations existed already have
+some of the changes, so operations skip tables, columns and indexes that
+exist. Table and column definitions come from the models.
+
+    python -m src.database.migrate --database-uri postgresql://localhost/evidence
+    python -m src.database.migrate --status
+    python -m src.database.migrate --to 3
+"""
+import argparse
+import glob
+import importlib.util
+import logging
+import os
+import re
+import sys
+from datetime import datetime
+from sqlalchemy import MetaData, Table, Column, Integer, String, DateTime, select, func, insert, inspect, text
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from sqlalchemy.schema import CreateColumn, CreateTable
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'migrations')
+MIGRATION_FILE = re.compile(r'^(\d{4})_(\w+)\.py$')
+ADVISORY_LOCK_ID = 7242031  # pg_advisory_lock key held while migrating on PostgreSQL
+
+_version_metadata = MetaData()
+schema_migrations = Table(
+    'schema_migrations', _version_metadata,
+    Column('version', Integer, primary_key=True),
+    Column('name', String(100), nullable=False),
+    Column('applied_at', DateTime, nullable=False)
+)
+
+class SchemaVersionError(RuntimeError):
+    """The database schema is older than the code and automatic migration is off"""
+
+class Migration:
+    def __init__(self, version, name, path):
+        self.version = version
+        self.name = name
+        self.path = path
+        self._module = None
+
+    @property
+    def module(self):
+        if self._module is None:
+            spec = importlib.util.spec_from_file_location(f'migration_{self.version:04d}_{self.name}', self.path)
+            self._module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(self._module)
+        return self._module
+
+    @property
+    def description(self):
+        return (self.module.__doc__ or self.name).strip().splitlines()[0]
+
+    def __repr__(self):
+        return f'<Migration {self.version:04d} {self.name}>'
+
+def discover_migrations(directory=MIGRATIONS_DIR):
+    """Migrations in version order; versions must be unique"""
+    migrations = {}
+    for path in glob.glob(os.path.join(directory, '*.py')):
+        match = MIGRATION_FILE.match(os.path.basename(path))
+        if not match:
+            continue
+        version = int(match.group(1))
+        if version in migrations:
+            raise ValueError(f'Duplicate migration version {version:04d}')
+        migrations[version] = Migration(version, match.group(2), path)
+    return [migrations[version] for version in sorted(migrations)]
+
+def latest_version():
+    migrations = discover_migrations()
+    return migrations[-1].version if migrations else 0
+
+def current_version(engine):
+    """Highest applied version, 0 for a database without schema_migrations"""
+    try:
+        with engine.connect() as connection:
+            return connection.execute(select(func.max(schema_migrations.c.version))).scalar() or 0
+    except (OperationalError, ProgrammingError):
+        return 0
+
+def applied_versions(engine):
+    try:
+        with engine.connect() as connection:
+            return {row.version: row for row in connection.execute(select(schema_migrations))}
+    except (OperationalError, ProgrammingError):
+        return {}
+
+class Operations:
+    """
+    Schema changes available to a migration's upgrade(op).
+
+    On PostgreSQL, create_index(..., concurrently=True) builds the index with
+    CREATE INDEX CONCURRENTLY after the migration's transaction commits, so
+    writes to the table are not blocked while it builds. On SQLite, columns
+    that ALTER TABLE cannot add are added by rebuilding the table: the rows
+    are copied into a new table in one INSERT ... SELECT and it replaces the
+    old one.
+    """
+
+    def __init__(self, connection, metadata):
+        self.connection = connection
+        self.metadata = metadata
+        self.dialect = connection.dialect.name
+        self.deferred_indexes = []
+        self._inspector = None
+
+    @property
+    def inspector(self):
+        if self._inspector is None:
+            self._inspector = inspect(self.connection)
+        return self._inspector
+
+    def _changed(self):
+        self._inspector = None
+
+    def table(self, table_name):
+        return self.metadata.tables[table_name]
+
+    def has_table(self, table_name):
+        return self.inspector.has_table(table_name)
+
+    def has_column(self, table_name, column_name):
+        return any(column['name'] == column_name for column in self.inspector.get_columns(table_name))
+
+    def has_index(self, table_name, index_name):
+        return any(index['name'] == index_name for index in self.inspector.get_indexes(table_name))
+
+    def execute(self, statement, parameters=None):
+        result = self.connection.execute(text(statement) if isinstance(statement, str) else statement, parameters)
+        self._changed()
+        return result
+
+    def create_table(self, table_name):
+        """Create a model's table and its indexes unless the table exists"""
+        if self.has_table(table_name):
+            return False
+        self.table(table_name).create(self.connection)
+        self._changed()
+        return True
+
+    def add_column(self, table_name, column_name):
+        """Add a model column unless it exists; NOT NULL columns need a server_default"""
+        if self.has_column(table_name, column_name):
+            return False
+        column = self.table(table_name).c[column_name]
+        if self.dialect == 'sqlite' and (column.unique or column.primary_key or
+                                         (not column.nullable and column.server_default is None)):
+            self.rebuild_table(table_name)
+            return True
+        ddl = CreateColumn(column).compile(dialect=self.connection.dialect)
+        self.execute(f'ALTER TABLE {table_name} ADD COLUMN {ddl}')
+        return True
+
+    def alter_column_type(self, table_name, column_name):
+        """Change a column to its model type; SQLite does not enforce declared types, so it is left as is"""
+        if self.dialect == 'sqlite':
+            return False
+        column = self.table(table_name).c[column_name]
+        ddl = column.type.compile(dialect=self.connection.dialect)
+        self.execute(f'ALTER TABLE {table_name} ALTER COLUMN {column_name} TYPE {ddl}')
+        return True
+
+    def create_index(self, table_name, index_name, concurrently=False):
+        """Create one of a model's indexes unless it exists"""
+        index = next(index for index in self.table(table_name).indexes if index.name == index_name)
+        if self.dialect == 'postgresql' and concurrently:
+            self.deferred_indexes.append(index)
+            return
+        if not self.has_index(table_name, index_name):
+            index.create(self.connection)
+            self._changed()
+
+    def rebuild_table(self, table_name):
+        """
+        Recreate a table from its model definition, keeping the rows (SQLite).
+
+        Columns the old table lacks take their server defaults; columns the
+        model no longer has are dropped. Foreign key enforcement is off for
+        SQLite migrations, so the swap does not cascade.
+        """
+        table = self.table(table_name)
+        temporary = f'_rebuild_{table_name}'
+        existing = {column['name'] for column in self.inspector.get_columns(table_name)}
+        copied = ', '.join(column.name for column in table.columns if column.name in existing)
+
+        self.execute(f'DROP TABLE IF EXISTS {temporary}')
+        self.execute(CreateTable(table.to_metadata(MetaData(), name=temporary)))
+        self.execute(f'INSERT INTO {temporary} ({copied}) SELECT {copied} FROM {table_name}')
+        self.execute(f'DROP TABLE {table_name}')
+        self.execute(f'ALTER TABLE {temporary} RENAME TO {table_name}')
+        for index in table.indexes:
+            index.create(self.connection)
+        self._changed()
+
+def _create_concurrent_indexes(engine, indexes):
+    """CREATE INDEX CONCURRENTLY outside any transaction, replacing leftovers of failed builds"""
+    with engine.connect().execution_options(isolation_level='AUTOCOMMIT') as connection:
+        for index in indexes:
+            valid = connection.execute(text(
+                'SELECT i.indisvalid FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid WHERE c.relname = :name'
+            ), {'name': index.name}).scalar()
+            if valid:
+                continue
+            if valid is False:
+                connection.execute(text(f'DROP INDEX CONCURRENTLY IF EXISTS {index.name}'))
+            columns = ', '.join(column.name for column in index.columns)
+            unique = 'UNIQUE ' if index.unique else ''
+            connection.execute(text(
+                f'CREATE {unique}INDEX CONCURRENTLY {index.name} ON {index.table.name} ({columns})'
+            ))
+
+def _load_models():
+    # Every table must be in db.metadata before migrations look definitions up
+    from src.backend.models import analysis_model, audit_model, case_model, evidence_model, replica_model, shard_model, suspect_model, user_model
+
+def upgrade(target=None, progress=None):
+    """
+    Apply pending migrations up to target (default: all). Run in an app context.
+
+    Returns:
+        list: The migrations applied
+    """
+    from src.database.db_init import db
+    _load_models()
+    engine = db.engine
+    migrations = [migration for migration in discover_migrations()
+                  if target is None or migration.version <= target]
+
+    lock = None
+    if engine.dialect.name == 'postgresql':
+        # Workers booting together with AUTO_MIGRATE wait here instead of racing
+        lock = engine.connect()
+        lock.execute(text('SELECT pg_advisory_lock(:key)'), {'key': ADVISORY_LOCK_ID})
+
+    applied = []
+    try:
+        _version_metadata.create_all(engine)
+        done = set(applied_versions(engine))
+        for migration in migrations:
+            if migration.version in done:
+                continue
+            if progress:
+                progress(migration)
+            _apply(engine, db, migration)
+            applied.append(migration)
+    finally:
+        if lock is not None:
+            lock.execute(text('SELECT pg_advisory_unlock(:key)'), {'key': ADVISORY_LOCK_ID})
+            lock.close()
+    return applied
+
+def _apply(engine, db, migration):
+    sqlite = engine.dialect.name == 'sqlite'
+    with engine.connect() as connection:
+        if sqlite:
+            # Only takes effect outside a transaction; table rebuilds would otherwise cascade deletes
+            foreign_keys = connection.exec_driver_sql('PRAGMA foreign_keys').scalar()
+            connection.exec_driver_sql('PRAGMA foreign_keys=OFF')
+            connection.commit()
+        with connection.begin():
+            op = Operations(connection, db.metadata)
+            migration.module.upgrade(op)
+        if sqlite:
+            connection.exec_driver_sql(f'PRAGMA foreign_keys={int(foreign_keys)}')
+            connection.commit()
+
+    if op.deferred_indexes:
+        _create_concurrent_indexes(engine, op.deferred_indexes)
+
+    backfill = getattr(migration.module, 'backfill', None)
+    if backfill is not None:
+        backfill()
+        db.session.remove()
+
+    with engine.begin() as connection:
+        connection.execute(insert(schema_migrations).values(
+            version=migration.version, name=migration.name, applied_at=datetime.utcnow()
+        ))
+    logger.info('Applied migration %04d %s', migration.version, migration.name)
+
+def ensure_schema(auto_migrate=True):
+    """
+    Startup check: compare the database's schema version with the code's.
+
+    Behind and auto_migrate: apply the pending migrations, and create the
+    default admin on a new database. Behind otherwise: raise
+    SchemaVersionError. Ahead (a newer release already migrated it): log a
+    warning and carry on, as during a rolling deploy.
+    """
+    from src.database.db_init import db, create_default_admin
+    engine = db.engine
+    version = current_version(engine)
+    latest = latest_version()
+    if version == latest:
+        return
+    if version > latest:
+        logger.warning('Database schema is at version %d, newer than this release (%d)', version, latest)
+        return
+    if not auto_migrate:
+        raise SchemaVersionError(
+            f'Database schema is at version {version} but this release needs {latest}; '
+            f'run "python -m src.database.migrate" or "flask migrate"'
+        )
+
+    upgrade()
+    from src.backend.models.user_model import User
+    if db.session.scalar(select(func.count(User.id))) == 0:
+        create_default_admin()
+
+def print_status():
+    """One line per migration, marking which are applied. Run in an app context."""
+    from src.database.db_init import db
+    applied = applied_versions(db.engine)
+    for migration in discover_migrations():
+        row = applied.get(migration.version)
+        state = f"applied {row.applied_at:%Y-%m-%d %H:%M}" if row else 'pending'
+        print(f"{migration.version:04d}  {state:22}  {migration.description}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Apply schema migrations without starting the API')
+    parser.add_argument('--database-uri', default=os.getenv('DATABASE_URI', 'sqlite:///evidence_analysis.db'))
+    parser.add_argument('--to', type=int, help='Stop after this version')
+    parser.add_argument('--status', action='store_true', help='List migrations and whether they are applied')
+    args = parser.parse_args()
+
+    from flask import Flask
+    from src.database.db_init import db, init_db
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = args.database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    init_db(app, check_schema=False)
+
+    with app.app_context():
+        if args.status:
+            print_status()
+            return
+        applied = upgrade(args.to, progress=lambda migration: print(
+            f"Applying {migration.version:04d} {migration.description}", flush=True
+        ))
+        print(f"{len(applied)} migrations applied; schema at version {current_version(db.engine)}")
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    main()
@@ -0,0 +1,13 @@
+"""Tables of the original schema"""
+
+TABLES = (
+    'roles', 'users', 'user_activities',
+    'cases', 'case_notes', 'timeline_events',
+    'evidence', 'evidence_files', 'custody_changes', 'evidence_analyses', 'evidence_logs',
+    'suspects', 'suspect_evidence_links', 'suspect_interviews', 'suspect_alibis',
+    'analysis_reports', 'pattern_analyses', 'evidence_correlations', 'probability_assessments'
+)
+
+def upgrade(op):
+    for table_name in TABLES:
+        op.create_table(table_name)
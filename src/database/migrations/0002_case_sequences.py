@@ -0,0 +1,4 @@
+"""Per-case sequences for evidence numbers"""
+
+def upgrade(op):
+    op.create_table('case_sequences')
@@ -0,0 +1,16 @@
+"""Denormalized child counters on cases, evidence and analysis reports"""
+
+COLUMNS = {
+    'cases': ('evidence_count', 'suspect_count'),
+    'evidence': ('file_count', 'analysis_count', 'custody_count'),
+    'analysis_reports': ('pattern_count', 'correlation_count', 'probability_count')
+}
+
+def upgrade(op):
+    for table_name, column_names in COLUMNS.items():
+        for column_name in column_names:
+            op.add_column(table_name, column_name)
+
+def backfill():
+    from src.database.counters import repair_counters
+    repair_counters()
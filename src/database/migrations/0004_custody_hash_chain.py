@@ -0,0 +1,7 @@
+"""Hash-linked custody records and stored chain verification results"""
+
+def upgrade(op):
+    for column_name in ('seq', 'prev_hash', 'record_hash'):
+        op.add_column('custody_changes', column_name)
+    op.create_index('custody_changes', 'ix_custody_changes_evidence_seq', concurrently=True)
+    op.create_table('custody_verifications')
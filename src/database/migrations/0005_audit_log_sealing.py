@@ -0,0 +1,5 @@
+"""Merkle batches sealing the evidence log and user activity tables"""
+
+def upgrade(op):
+    op.create_table('log_seal_batches')
+    op.create_table('log_merkle_nodes')
@@ -0,0 +1,14 @@
+"""Monthly log archive segments and the timestamp indexes archiving scans"""
+
+INDEXES = {
+    'evidence_logs': ('ix_evidence_logs_evidence_timestamp', 'ix_evidence_logs_timestamp'),
+    'user_activities': ('ix_user_activities_user_timestamp', 'ix_user_activities_timestamp')
+}
+
+def upgrade(op):
+    op.create_table('log_archive_segments')
+    op.create_table('log_archive_keys')
+    # The log tables are the busiest writers, so their indexes build without blocking inserts
+    for table_name, index_names in INDEXES.items():
+        for index_name in index_names:
+            op.create_index(table_name, index_name, concurrently=True)
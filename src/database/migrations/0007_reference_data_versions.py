@@ -0,0 +1,4 @@
+"""Shared version rows for the reference data and graph caches"""
+
+def upgrade(op):
+    op.create_table('reference_data_versions')
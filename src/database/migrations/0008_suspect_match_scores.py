@@ -0,0 +1,10 @@
+"""Materialized suspect match scores with sort indexes"""
+
+def upgrade(op):
+    op.add_column('suspects', 'match_score')
+    op.create_index('suspects', 'ix_suspects_case_match_score', concurrently=True)
+    op.create_index('suspects', 'ix_suspects_match_score', concurrently=True)
+
+def backfill():
+    from src.backend.utils.match_scores import recompute_match_scores
+    recompute_match_scores()
@@ -0,0 +1,4 @@
+"""Per-user flag that profiles every analysis request"""
+
+def upgrade(op):
+    op.add_column('users', 'profile_analysis')
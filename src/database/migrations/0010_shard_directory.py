@@ -0,0 +1,4 @@
+"""Directory of case data moved into department shards"""
+
+def upgrade(op):
+    op.create_table('shard_directory')
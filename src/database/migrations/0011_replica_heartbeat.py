@@ -0,0 +1,4 @@
+"""Heartbeat row read replicas measure their lag by"""
+
+def upgrade(op):
+    op.create_table('replica_heartbeats')
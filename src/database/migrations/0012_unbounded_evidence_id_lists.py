@@ -0,0 +1,6 @@
+"""Text columns for the evidence id lists of patterns and probability assessments"""
+
+def upgrade(op):
+    op.alter_column_type('pattern_analyses', 'evidence_ids')
+    op.alter_column_type('probability_assessments', 'supporting_evidence_ids')
+    op.alter_column_type('probability_assessments', 'conflicting_evidence_ids')
@@ -0,0 +1,301 @@
+"""
+Read replicas of the primary database.
+
+Set READ_REPLICA_URIS to one or more replica URIs (a list, or a string
+separated by commas). Reads of GET requests, and of views decorated with
+replica_reads such as the analyze endpoints, then go to a replica, so heavy
+analysis reads do not compete with evidence ingestion on the primary:
+
+- The first write of a request (a flush, an insert/update/delete or a raw
+  connection) pins the rest of the request to the primary, so the request
+  reads its own writes. The response then carries a short-lived cookie that
+  keeps the client's next requests on the primary until replicas have
+  caught up (REPLICA_STICKY_SECONDS).
+- Lag is measured from a heartbeat row the primary updates every
+  REPLICA_HEARTBEAT_SECONDS. Replicas more than REPLICA_MAX_LAG_SECONDS
+  behind, or unreachable, are skipped; when no replica qualifies, reads
+  fall back to the primary.
+
+Statements routed to a department shard (src.database.sharding) are not
+affected; init_replicas must run after init_sharding.
+
+Replicas are kept up to date outside the application: by streaming
+replication on PostgreSQL, or for local testing with two SQLite files by
+
+    python -m src.database.replicas sync --replica sqlite:///replica.db --interval 2
+    python -m src.database.replicas status --replica sqlite:///replica.db
+"""
+import argparse
+import itertools
+import logging
+import os
+import sqlite3
+import sys
+import threading
+import time
+from datetime import datetime
+from functools import wraps
+from flask import g, has_app_context, request
+from sqlalchemy import create_engine, select, update, insert
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import SQLAlchemyError
+from src.database.db_init import db, add_bind_router
+from src.backend.models.replica_model import ReplicaHeartbeat
+from src.backend.utils.metrics import Counter, Gauge
+
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_ID = 1
+STICKY_COOKIE = 'db_primary_until'
+DEFAULT_MAX_LAG = 5.0            # Seconds a replica may trail the primary and still serve reads
+DEFAULT_LAG_CHECK_INTERVAL = 1.0  # Seconds between lag measurements of a replica
+DEFAULT_HEARTBEAT_INTERVAL = 1.0  # Seconds between heartbeat writes on the primary
+
+DB_READS = Counter(
+    'db_reads_total', 'Read statements of replica-eligible requests by where they ran', ('target',)
+)
+REPLICA_LAG = Gauge(
+    'db_replica_lag_seconds', 'Last measured lag of each read replica', ('replica',), mode='live'
+)
+
+class Replica:
+    """One read replica and its cached lag"""
+
+    def __init__(self, name, url, max_lag=DEFAULT_MAX_LAG, check_interval=DEFAULT_LAG_CHECK_INTERVAL):
+        self.name = name
+        self.url = make_url(url)
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.engine = create_engine(self.url)
+        self.lag = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+
+    def current_lag(self):
+        """Seconds the replica trails the primary, or None when it cannot be measured"""
+        now = time.monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            with self._lock:
+                if self._checked_at is None or now - self._checked_at >= self.check_interval:
+                    self.lag = self.measure_lag()
+                    self._checked_at = time.monotonic()
+                    REPLICA_LAG.labels(self.name).set(self.lag if self.lag is not None else float('inf'))
+        return self.lag
+
+    def measure_lag(self):
+        try:
+            with self.engine.connect() as connection:
+                beat_at = connection.scalar(
+                    select(ReplicaHeartbeat.beat_at).where(ReplicaHeartbeat.id == HEARTBEAT_ID)
+                )
+        except SQLAlchemyError as error:
+            logger.warning("Read replica %s is unavailable: %s", self.name, error)
+            return None
+        if beat_at is None:
+            return None
+        return max((datetime.utcnow() - beat_at).total_seconds(), 0.0)
+
+    @property
+    def usable(self):
+        lag = self.current_lag()
+        return lag is not None and lag <= self.max_lag
+
+    def __repr__(self):
+        return f'<Replica {self.name}: {self.url.render_as_string(hide_password=True)}>'
+
+class ReplicaSet:
+    def __init__(self, replicas):
+        self.replicas = replicas
+        self._turn = itertools.count()
+
+    def choose(self):
+        """A replica within its lag limit, taking turns between them; None when none qualifies"""
+        start = next(self._turn)
+        for offset in range(len(self.replicas)):
+            replica = self.replicas[(start + offset) % len(self.replicas)]
+            if replica.usable:
+                return replica
+        return None
+
+def parse_replica_uris(value):
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = value.split(',')
+    return [uri.strip() for uri in value if uri.strip()]
+
+def init_replicas(app):
+    """
+    Route the reads of GET requests and replica_reads views to READ_REPLICA_URIS.
+
+    Without replicas configured nothing changes. Call after init_sharding.
+    """
+    uris = parse_replica_uris(app.config.get('READ_REPLICA_URIS'))
+    if not uris:
+        return None
+    max_lag = app.config.get('REPLICA_MAX_LAG_SECONDS', DEFAULT_MAX_LAG)
+    sticky_seconds = app.config.get('REPLICA_STICKY_SECONDS', max_lag)
+    heartbeat_interval = app.config.get('REPLICA_HEARTBEAT_SECONDS', DEFAULT_HEARTBEAT_INTERVAL)
+    check_interval = app.config.get('REPLICA_LAG_CHECK_SECONDS', DEFAULT_LAG_CHECK_INTERVAL)
+    replica_set = ReplicaSet([
+        Replica(f'replica{number}', uri, max_lag, check_interval) for number, uri in enumerate(uris, 1)
+    ])
+    app.extensions['replicas'] = replica_set
+    add_bind_router(route_statement)
+    heartbeat = HeartbeatWriter(app, heartbeat_interval) if heartbeat_interval > 0 else None
+
+    @app.before_request
+    def choose_read_target():
+        if heartbeat is not None:
+            heartbeat.ensure_started()
+        g.replica_set = replica_set
+        g.replica_reads = request.method in ('GET', 'HEAD') and not _sticky_to_primary()
+
+    @app.after_request
+    def stick_after_write(response):
+        # The client's next reads go to the primary until replicas have this request's writes
+        if g.get('db_pinned') and sticky_seconds > 0:
+            response.set_cookie(STICKY_COOKIE, f'{time.time() + sticky_seconds:.3f}',
+                                max_age=int(sticky_seconds) + 1, httponly=True, samesite='Lax')
+        return response
+
+    logger.info("Read replicas enabled: %s", ', '.join(repr(replica) for replica in replica_set.replicas))
+    return replica_set
+
+def _sticky_to_primary():
+    try:
+        return float(request.cookies.get(STICKY_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+def replica_reads(view):
+    """
+    Let a non-GET view that mostly reads (an analysis run) read from a replica.
+
+    Place it directly below the route decorator, so the user lookup of
+    token_required reads from the replica too. Writes still go to the
+    primary and pin the rest of the request there.
+    """
+    @wraps(view)
+    def decorated(*args, **kwargs):
+        if 'replica_set' in g:
+            g.replica_reads = not _sticky_to_primary()
+        return view(*args, **kwargs)
+    return decorated
+
+def route_statement(mapper, clause):
+    """
+    Bind router: a replica engine for a read of a replica-eligible request, else None.
+
+    Anything that is not a SELECT pins the request to the primary. The
+    request keeps the replica it picked first, so its reads see one
+    replica's state.
+    """
+    if not has_app_context() or 'replica_set' not in g:
+        return None
+    if clause is None or not getattr(clause, 'is_select', False):
+        g.db_pinned = True
+        return None
+    if not g.get('replica_reads') or g.get('db_pinned'):
+        return None
+    if 'replica' not in g:
+        g.replica = g.replica_set.choose()
+    if g.replica is None:
+        DB_READS.labels('primary_fallback').inc()
+        return None
+    DB_READS.labels('replica').inc()
+    return g.replica.engine
+
+class HeartbeatWriter:
+    """
+    Updates the heartbeat row on the primary every interval seconds.
+
+    Started on the first request of each worker process, since threads do
+    not survive the fork of a preloading server.
+    """
+
+    def __init__(self, app, interval=DEFAULT_HEARTBEAT_INTERVAL):
+        self.app = app
+        self.interval = interval
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def ensure_started(self):
+        pid = os.getpid()
+        if self._pid == pid:
+            return
+        with self._lock:
+            if self._pid == pid:
+                return
+            self._pid = pid
+            threading.Thread(target=self._run, name='replica-heartbeat', daemon=True).start()
+
+    def _run(self):
+        pid = os.getpid()
+        while self._pid == pid:
+            with self.app.app_context():
+                try:
+                    write_heartbeat(db.engine)
+                except SQLAlchemyError:
+                    logger.exception("Replica heartbeat write failed")
+            time.sleep(self.interval)
+
+def write_heartbeat(engine):
+    with engine.begin() as connection:
+        now = datetime.utcnow()
+        updated = connection.execute(
+            update(ReplicaHeartbeat).where(ReplicaHeartbeat.id == HEARTBEAT_ID).values(beat_at=now)
+        ).rowcount
+        if not updated:
+            connection.execute(insert(ReplicaHeartbeat).values(id=HEARTBEAT_ID, beat_at=now))
+
+def sqlite_path(url):
+    """File path of a SQLite URL, including URI-style ones such as sqlite:///file:replica.db?mode=ro&uri=true"""
+    path = make_url(url).database
+    return path[len('file:'):] if path.startswith('file:') else path
+
+def sync_sqlite_replica(primary_path, replica_path):
+    """Copy a SQLite primary onto a replica file with the online backup API"""
+    source = sqlite3.connect(primary_path)
+    target = sqlite3.connect(replica_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+def main():
+    parser = argparse.ArgumentParser(description='Keep local SQLite read replicas in sync and report their lag')
+    parser.add_argument('command', choices=('sync', 'status'))
+    parser.add_argument('--database-uri', default=os.getenv('DATABASE_URI', 'sqlite:///evidence_analysis.db'),
+                        help='The primary database')
+    parser.add_argument('--replica', action='append', default=parse_replica_uris(os.getenv('READ_REPLICA_URIS')),
+                        help='Replica URI (repeatable; defaults to READ_REPLICA_URIS)')
+    parser.add_argument('--interval', type=float, default=0, help='Seconds between syncs; 0 syncs once')
+    args = parser.parse_args()
+    if not args.replica:
+        parser.error('No replicas given; pass --replica or set READ_REPLICA_URIS')
+
+    if args.command == 'status':
+        for number, uri in enumerate(args.replica, 1):
+            lag = Replica(f'replica{number}', uri).measure_lag()
+            print(f"replica{number}: " + (f"{lag:.1f}s behind" if lag is not None else 'no heartbeat'))
+        return
+
+    primary = make_url(args.database_uri)
+    if primary.get_backend_name() != 'sqlite':
+        parser.error('sync copies SQLite files; replicate PostgreSQL with streaming replication')
+    primary_engine = create_engine(primary)
+    while True:
+        # The copy carries a fresh heartbeat, so a replica synced every interval trails by about that much
+        write_heartbeat(primary_engine)
+        for uri in args.replica:
+            sync_sqlite_replica(sqlite_path(primary), sqlite_path(uri))
+        print(f"{datetime.utcnow().isoformat(timespec='seconds')} synced {len(args.replica)} replicas", flush=True)
+        if not args.interval:
+            break
+        time.sleep(args.interval)
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    main()
@@ -0,0 +1,166 @@
+"""
+Split an existing single database into department shards.
+
+Creates each configured shard (see src.database.sharding) and moves the
+cases of its departments, with all their rows in the sharded tables, out of
+the primary database. Moved rows keep their ids; the shard_directory table
+records where each case, evidence item, suspect and report went.
+
+Cases move in chunks. Each chunk is copied into the shard in one
+transaction (replacing any copy a failed run left behind), then recorded in
+the directory and deleted from the primary in another, so an interrupted
+run can simply be started again. Stop the API while splitting: running
+workers cache directory lookups.
+
+    python -m src.database.shard_tool --shards shards.json
+    python -m src.database.shard_tool --shards shards.json --shard homicide --dry-run
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime
+from sqlalchemy import select, delete, insert, func
+from src.database.db_init import db
+from src.database.sharding import SHARDED_TABLES, ROUTING_KEYS, create_shard_schema, get_router
+
+DEFAULT_CHUNK_SIZE = 200  # Cases per transaction
+
+def _member_ids(table_name, case_ids):
+    """Select of the ids (or parent keys) of table_name's rows that belong to case_ids"""
+    table = db.metadata.tables[table_name]
+    parent = SHARDED_TABLES[table_name]
+    if parent is None:
+        return select(table.c.id).where(table.c.id.in_(case_ids))
+    column, parent_table = parent
+    return select(table.c.id).where(table.c[column].in_(_member_ids(parent_table, case_ids)))
+
+def _member_filter(table_name, case_ids):
+    table = db.metadata.tables[table_name]
+    parent = SHARDED_TABLES[table_name]
+    if parent is None:
+        return table.c.id.in_(case_ids)
+    column, parent_table = parent
+    return table.c[column].in_(_member_ids(parent_table, case_ids))
+
+def department_case_ids(shard):
+    """Ids of the primary's cases that belong to the shard's departments"""
+    cases = db.metadata.tables['cases']
+    with db.engine.connect() as connection:
+        return list(connection.scalars(
+            select(cases.c.id).where(cases.c.department.in_(shard.departments)).order_by(cases.c.id)
+        ))
+
+def count_rows(shard):
+    """Rows per sharded table that a split would move into shard"""
+    case_ids = department_case_ids(shard)
+    counts = {}
+    with db.engine.connect() as connection:
+        for table_name in SHARDED_TABLES:
+            table = db.metadata.tables[table_name]
+            counts[table_name] = connection.scalar(
+                select(func.count()).select_from(table).where(_member_filter(table_name, case_ids))
+            ) if case_ids else 0
+    return counts
+
+def move_cases(shard, case_ids):
+    """
+    Move a chunk of cases and their rows from the primary into shard.
+
+    Returns:
+        dict: table name -> rows moved
+    """
+    moved = {}
+    directory = db.metadata.tables['shard_directory']
+
+    with shard.engine.begin() as target:
+        for table_name in reversed(list(SHARDED_TABLES)):
+            target.execute(delete(db.metadata.tables[table_name]).where(_member_filter(table_name, case_ids)))
+        with db.engine.connect() as source:
+            for table_name in SHARDED_TABLES:
+                table = db.metadata.tables[table_name]
+                rows = [dict(row._mapping) for row in source.execute(
+                    select(table).where(_member_filter(table_name, case_ids))
+                )]
+                if rows:
+                    target.execute(insert(table), rows)
+                moved[table_name] = len(rows)
+
+    moved_at = datetime.utcnow()
+    with db.engine.begin() as primary:
+        entries = []
+        for table_name in ROUTING_KEYS.values():
+            entries.extend({
+                'entity': table_name,
+                'entity_id': entity_id,
+                'shard': shard.name,
+                'moved_at': moved_at
+            } for entity_id in primary.scalars(_member_ids(table_name, case_ids)))
+        if entries:
+            primary.execute(insert(directory), entries)
+        for table_name in reversed(list(SHARDED_TABLES)):
+            primary.execute(delete(db.metadata.tables[table_name]).where(_member_filter(table_name, case_ids)))
+    return moved
+
+def split_shard(shard, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    Create shard and move its departments' cases into it. Run in an app context.
+
+    Returns:
+        dict: table name -> rows moved
+    """
+    create_shard_schema(shard)
+    totals = dict.fromkeys(SHARDED_TABLES, 0)
+    case_ids = department_case_ids(shard)
+    for start in range(0, len(case_ids), chunk_size):
+        chunk = case_ids[start:start + chunk_size]
+        for table_name, count in move_cases(shard, chunk).items():
+            totals[table_name] += count
+        if progress:
+            progress(shard, start + len(chunk), len(case_ids))
+    return totals
+
+def main():
+    parser = argparse.ArgumentParser(description='Split the primary database into department shards')
+    parser.add_argument('--database-uri', default=os.getenv('DATABASE_URI', 'sqlite:///evidence_analysis.db'))
+    parser.add_argument('--shards', default=os.getenv('DEPARTMENT_SHARDS'),
+                        help='DEPARTMENT_SHARDS as JSON, or a file containing it')
+    parser.add_argument('--shard', action='append', help='Only split this shard (repeatable)')
+    parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Cases moved per transaction')
+    parser.add_argument('--dry-run', action='store_true', help='Report the rows each shard would receive')
+    args = parser.parse_args()
+
+    shards = args.shards
+    if shards and os.path.exists(shards):
+        with open(shards) as shards_file:
+            shards = shards_file.read()
+    if not shards:
+        parser.error('No shards configured; pass --shards or set DEPARTMENT_SHARDS')
+
+    from flask import Flask
+    from src.database.db_init import init_db
+    from src.database.sharding import init_sharding
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = args.database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['DEPARTMENT_SHARDS'] = shards
+    init_db(app)
+    init_sharding(app)
+
+    with app.app_context():
+        router = get_router()
+        selected = [router.shards[name] for name in args.shard] if args.shard else list(router.shards.values())
+        for shard in selected:
+            if args.dry_run:
+                counts = count_rows(shard)
+                print(f"{shard.name}: " + ', '.join(f"{table} {count}" for table, count in counts.items() if count))
+                continue
+            started = time.monotonic()
+            totals = split_shard(shard, args.chunk_size, progress=lambda shard, done, total: print(
+                f"{shard.name}: {done}/{total} cases moved", flush=True
+            ))
+            print(f"{shard.name}: {sum(totals.values())} rows moved in {time.monotonic() - started:.1f}s")
+
+if __name__ == '__main__':
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../..')))
+    main()
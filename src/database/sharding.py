@@ -0,0 +1,411 @@
+"""
+Department sharding of case data.
+
+Cases and everything that hangs off them (notes, timeline, evidence and its
+files, custody and analyses, suspects, analysis reports) can be kept in a
+store of their own per department: a SQLite file, or a schema of the
+PostgreSQL database. Users, roles, reference data and the sealed audit logs
+stay in the primary database, which also keeps the cases of departments
+without a shard.
+
+Shards are configured with DEPARTMENT_SHARDS, a list (or JSON string) of
+
+    {"name": "unit1", "index": 1, "departments": ["Unit 1"], "database": "sqlite:///shards/unit1.db"}
+    {"name": "homicide", "index": 2, "departments": ["Homicide"], "schema": "shard_homicide"}
+
+A shard's index must never change: rows created in it take ids from
+index * SHARD_ID_SPAN up, so a case, evidence, suspect or report id names
+its shard and ids stay unique across shards. Rows moved out of the primary
+by src.database.shard_tool keep their ids and are found through the
+shard_directory table.
+
+token_required routes each request once the user is known: by the case,
+evidence, suspect or report id in the URL, query string or JSON body, or
+else by the user's department. Statements on sharded tables, and statements
+without a mapped entity, then run on the shard; the rest run on the primary.
+Shard connections can read the primary's tables too (ATTACH on SQLite,
+search_path on PostgreSQL), so statements joining case data to users or
+evidence logs keep working. A commit that writes to both is two commits,
+not one distributed transaction.
+"""
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from flask import g, has_app_context, current_app, request
+from sqlalchemy import MetaData, Integer, create_engine, event, inspect, select, text
+from sqlalchemy.engine import make_url
+from src.database.db_init import db, add_bind_router
+from src.backend.models.shard_model import ShardDirectoryEntry
+
+logger = logging.getLogger(__name__)
+
+SHARD_ID_SPAN = 10 ** 9  # Ids of shard index n start above n * SHARD_ID_SPAN; the primary is index 0
+PRIMARY_ALIAS = 'primary_db'  # Name the primary SQLite database is attached under in shard connections
+DEFAULT_FAN_OUT_WORKERS = 8
+DIRECTORY_CACHE_SIZE = 65536
+
+# Sharded tables in insert order, each with the column that ties its rows to a parent table
+SHARDED_TABLES = {
+    'cases': None,
+    'case_notes': ('case_id', 'cases'),
+    'case_sequences': ('case_id', 'cases'),
+    'evidence': ('case_id', 'cases'),
+    'timeline_events': ('case_id', 'cases'),
+    'evidence_files': ('evidence_id', 'evidence'),
+    'custody_changes': ('evidence_id', 'evidence'),
+    'custody_verifications': ('evidence_id', 'evidence'),
+    'evidence_analyses': ('evidence_id', 'evidence'),
+    'suspects': ('case_id', 'cases'),
+    'suspect_evidence_links': ('suspect_id', 'suspects'),
+    'suspect_interviews': ('suspect_id', 'suspects'),
+    'suspect_alibis': ('suspect_id', 'suspects'),
+    'analysis_reports': ('case_id', 'cases'),
+    'pattern_analyses': ('report_id', 'analysis_reports'),
+    'evidence_correlations': ('report_id', 'analysis_reports'),
+    'probability_assessments': ('report_id', 'analysis_reports')
+}
+
+# Request parameters that route a request, and the table their id belongs to, in order of precedence
+ROUTING_KEYS = {
+    'case_id': 'cases',
+    'evidence_id': 'evidence',
+    'suspect_id': 'suspects',
+    'report_id': 'analysis_reports'
+}
+
+class Shard:
+    """One department shard and its lazily created engine"""
+
+    def __init__(self, name, index, departments, primary_url, database=None, schema=None, instance_path=None):
+        if index < 1:
+            raise ValueError(f"Shard {name}: index must be 1 or more; 0 is the primary database")
+        if bool(database) == bool(schema):
+            raise ValueError(f"Shard {name}: set exactly one of database and schema")
+        self.name = name
+        self.index = index
+        self.departments = tuple(departments)
+        self.schema = schema
+        self.primary_url = primary_url
+        self.url = None
+        if database:
+            if primary_url.get_backend_name() != 'sqlite':
+                raise ValueError(f"Shard {name}: database shards need a SQLite primary; use schema on PostgreSQL")
+            self.url = make_url(database)
+            if self.url.database and not os.path.isabs(self.url.database) and instance_path:
+                self.url = self.url.set(database=os.path.join(instance_path, self.url.database))
+        elif primary_url.get_backend_name() != 'postgresql':
+            raise ValueError(f"Shard {name}: schema shards need a PostgreSQL primary")
+        if primary_url.get_backend_name() == 'sqlite' and not primary_url.database:
+            raise ValueError("Department shards need a file-based primary database, not an in-memory one")
+        self._engine = None
+        self._lock = threading.Lock()
+
+    @property
+    def first_id(self):
+        return self.index * SHARD_ID_SPAN
+
+    @property
+    def engine(self):
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    self._engine = self._create_engine()
+        return self._engine
+
+    def _create_engine(self):
+        if self.url is not None:
+            os.makedirs(os.path.dirname(self.url.database) or '.', exist_ok=True)
+            engine = create_engine(self.url)
+            primary_path = self.primary_url.database
+
+            @event.listens_for(engine, 'connect')
+            def attach_primary(dbapi_connection, connection_record):
+                cursor = dbapi_connection.cursor()
+                cursor.execute(f'ATTACH DATABASE ? AS {PRIMARY_ALIAS}', (primary_path,))
+                cursor.close()
+            return engine
+
+        engine = create_engine(self.primary_url)
+        schema = self.schema
+
+        @event.listens_for(engine, 'connect')
+        def set_search_path(dbapi_connection, connection_record):
+            # Outside a transaction, so a rollback cannot undo it
+            autocommit = dbapi_connection.autocommit
+            dbapi_connection.autocommit = True
+            cursor = dbapi_connection.cursor()
+            cursor.execute(f'SET search_path TO "{schema}", public')
+            cursor.close()
+            dbapi_connection.autocommit = autocommit
+        return engine
+
+    def dispose(self):
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+    def __repr__(self):
+        return f'<Shard {self.index} {self.name}: {", ".join(self.departments)}>'
+
+class ShardRouter:
+    """The configured shards of one app, and lookups from departments and ids to them"""
+
+    def __init__(self, shards):
+        self.shards = {shard.name: shard for shard in shards}
+        self.by_index = {}
+        self.by_department = {}
+        for shard in shards:
+            if shard.index in self.by_index:
+                raise ValueError(f"Shards {self.by_index[shard.index].name} and {shard.name} share index {shard.index}")
+            self.by_index[shard.index] = shard
+            for department in shard.departments:
+                if department in self.by_department:
+                    raise ValueError(f"Department {department} is assigned to more than one shard")
+                self.by_department[department] = shard
+        self._directory = OrderedDict()
+        self._directory_lock = threading.Lock()
+
+    def for_department(self, department):
+        """The department's shard, or None when its cases stay in the primary"""
+        return self.by_department.get(department)
+
+    def for_id(self, table_name, entity_id):
+        """
+        The shard holding a row of a sharded table, or None for the primary.
+
+        Ids above SHARD_ID_SPAN carry their shard's index; lower ids were
+        created in the primary and are looked up in the shard directory in
+        case the split tool moved them.
+        """
+        index = entity_id // SHARD_ID_SPAN
+        if index:
+            return self.by_index.get(index)
+        key = (table_name, entity_id)
+        with self._directory_lock:
+            if key in self._directory:
+                self._directory.move_to_end(key)
+                return self.shards.get(self._directory[key])
+        # The directory lives in the primary, which plain ORM statements on it reach
+        name = db.session.scalar(
+            select(ShardDirectoryEntry.shard).where(
+                ShardDirectoryEntry.entity == table_name, ShardDirectoryEntry.entity_id == entity_id
+            )
+        )
+        with self._directory_lock:
+            self._directory[key] = name
+            if len(self._directory) > DIRECTORY_CACHE_SIZE:
+                self._directory.popitem(last=False)
+        return self.shards.get(name)
+
+    def for_request(self, current_user, view_args):
+        for key, table_name in ROUTING_KEYS.items():
+            entity_id = _routing_id(key, view_args)
+            if entity_id is not None:
+                return self.for_id(table_name, entity_id)
+        return self.for_department(current_user.department)
+
+    def dispose(self):
+        for shard in self.shards.values():
+            shard.dispose()
+
+def _routing_id(key, view_args):
+    """An id from the URL, query string or JSON body, or None"""
+    value = view_args.get(key)
+    if value is None:
+        value = request.args.get(key)
+    if value is None and request.is_json:
+        body = request.get_json(silent=True)
+        if isinstance(body, dict):
+            value = body.get(key)
+    try:
+        return int(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+def load_shard_config(config, primary_url, instance_path=None):
+    """
+    Shards from a DEPARTMENT_SHARDS value: a list of dicts or the same as JSON.
+
+    Returns:
+        list: Shard objects, empty when sharding is not configured
+    """
+    if not config:
+        return []
+    if isinstance(config, str):
+        config = json.loads(config)
+    return [Shard(
+        entry['name'],
+        int(entry['index']),
+        entry.get('departments', []),
+        make_url(primary_url),
+        database=entry.get('database'),
+        schema=entry.get('schema'),
+        instance_path=instance_path
+    ) for entry in config]
+
+def init_sharding(app):
+    """
+    Route case data to department shards per DEPARTMENT_SHARDS.
+
+    Without shards configured nothing changes: every statement runs on the
+    primary database as before.
+    """
+    shards = load_shard_config(
+        app.config.get('DEPARTMENT_SHARDS'), app.config['SQLALCHEMY_DATABASE_URI'], app.instance_path
+    )
+    if not shards:
+        return None
+    router = ShardRouter(shards)
+    app.extensions['sharding'] = router
+    add_bind_router(route_statement)
+    logger.info("Department sharding enabled: %s", ', '.join(repr(shard) for shard in shards))
+    return router
+
+def get_router():
+    return current_app.extensions.get('sharding') if has_app_context() else None
+
+def current_shard():
+    """The shard the current app context is routed to, or None for the primary"""
+    return g.get('shard') if has_app_context() else None
+
+def route_statement(mapper, clause):
+    """
+    Bind router: the shard engine for a statement, or None for the primary.
+
+    Mapped global tables (users, logs, ...) always use the primary, so a
+    request reads its own uncommitted writes to them.
+    """
+    shard = current_shard()
+    if shard is None:
+        return None
+    if mapper is not None:
+        table = inspect(mapper).local_table
+    else:
+        table = getattr(clause, 'table', None)  # Core insert, update and delete
+    if table is not None and getattr(table, 'name', None) not in SHARDED_TABLES:
+        return None
+    return shard.engine
+
+def route_request(current_user, view_args):
+    """Pick the shard for the rest of the request; called by token_required"""
+    router = get_router()
+    if router is not None:
+        g.shard = router.for_request(current_user, view_args)
+
+def route_to_department(department):
+    """Route the rest of the request to a department's shard, e.g. for a case created for another department"""
+    router = get_router()
+    if router is not None:
+        g.shard = router.for_department(department)
+
+def same_shard(department_a, department_b):
+    router = get_router()
+    return router is None or router.for_department(department_a) is router.for_department(department_b)
+
+@contextmanager
+def use_shard(shard):
+    """Route statements in the block to shard (None for the primary)"""
+    previous = g.get('shard')
+    g.shard = shard
+    try:
+        yield shard
+    finally:
+        g.shard = previous
+
+def all_shards():
+    """None (the primary) followed by every configured shard"""
+    router = get_router()
+    return [None] + (list(router.shards.values()) if router else [])
+
+def shard_name(shard):
+    return shard.name if shard is not None else 'primary'
+
+def fan_out(query, workers=None):
+    """
+    Run query() against the primary and every shard in parallel and collect the results.
+
+    Each run gets its own app context and session, so query must return
+    plain data rather than ORM objects. Without shards, query runs inline.
+
+    Returns:
+        list: (shard name, result) pairs, primary first
+    """
+    shards = all_shards()
+    if len(shards) == 1:
+        return [(shard_name(None), query())]
+
+    app = current_app._get_current_object()
+
+    def run(shard):
+        with app.app_context():
+            g.shard = shard
+            try:
+                return query()
+            finally:
+                db.session.remove()
+
+    workers = workers or app.config.get('SHARD_FAN_OUT_WORKERS', DEFAULT_FAN_OUT_WORKERS)
+    with ThreadPoolExecutor(max_workers=min(len(shards), workers), thread_name_prefix='shard-fan-out') as pool:
+        results = list(pool.map(run, shards))
+    return [(shard_name(shard), result) for shard, result in zip(shards, results)]
+
+def shard_metadata(schema):
+    """
+    Copies of the sharded tables under schema ('main' for a SQLite shard file).
+
+    Foreign keys to tables that stay in the primary are dropped, since they
+    cannot be enforced across databases; keys between sharded tables stay.
+    SQLite copies use AUTOINCREMENT so ids start from the shard's range.
+    """
+    metadata = MetaData()
+    for name in SHARDED_TABLES:
+        copy = db.metadata.tables[name].to_metadata(metadata, schema=schema)
+        for constraint in list(copy.foreign_key_constraints):
+            if any(element.target_fullname.split('.')[-2] not in SHARDED_TABLES for element in constraint.elements):
+                copy.constraints.discard(constraint)
+                for element in constraint.elements:
+                    copy.foreign_keys.discard(element)
+                    element.parent.foreign_keys.discard(element)
+        copy.dialect_options['sqlite']['autoincrement'] = True
+    return metadata
+
+def _id_tables(metadata):
+    """Tables whose primary key is a single integer id, which shard id ranges apply to"""
+    return [table for table in metadata.sorted_tables
+            if [column.name for column in table.primary_key.columns] == ['id']
+            and isinstance(table.c.id.type, Integer)]
+
+def create_shard_schema(shard):
+    """
+    Create the shard's tables if missing and start their ids at the shard's range.
+
+    Safe to run again. SQLite shards and the primary are switched to WAL
+    journaling, so readers in one connection do not block commits in another.
+    """
+    if shard.schema:
+        with db.engine.begin() as connection:
+            connection.execute(text(f'CREATE SCHEMA IF NOT EXISTS "{shard.schema}"'))
+    schema = shard.schema or 'main'
+    metadata = shard_metadata(schema)
+
+    with shard.engine.begin() as connection:
+        if not shard.schema:
+            connection.exec_driver_sql('PRAGMA main.journal_mode=WAL')
+            connection.exec_driver_sql(f'PRAGMA {PRIMARY_ALIAS}.journal_mode=WAL')
+        existing = set(inspect(connection).get_table_names(schema=schema))
+        created = [table for table in metadata.sorted_tables if table.name not in existing]
+        metadata.create_all(connection, tables=created)
+        for table in _id_tables(metadata):
+            if table not in created:
+                continue
+            if shard.schema:
+                connection.execute(text("SELECT setval(pg_get_serial_sequence(:table, 'id'), :start)"),
+                                   {'table': f'"{shard.schema}".{table.name}', 'start': shard.first_id})
+            else:
+                connection.execute(text('INSERT INTO main.sqlite_sequence (name, seq) VALUES (:table, :start)'),
+                                   {'table': table.name, 'start': shard.first_id})
+    return [table.name for table in created]
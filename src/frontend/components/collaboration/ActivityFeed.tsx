@@ -4,6 +4,7 @@ import {
   FaFileUpload, FaUserPlus, FaEye, FaFilter, FaCalendarAlt,
   FaSort, FaSearch, FaSync
 } from 'react-icons/fa';
+import useCaseEvents, { CaseEvent } from './useCaseEvents';
 
 interface ActivityFeedProps {
   caseId?: string;
@@ -80,6 +81,47 @@ const formatTimestamp = (timestamp: string): string => {
   });
 };
 
+// Turns a server-sent case event into a feed entry
+const activityFromEvent = (event: CaseEvent): ActivityItem => {
+  const { data } = event;
+  const userId = data.user_id ?? data.analyst_id ?? data.collector_id ?? data.to_user_id;
+  const activity: ActivityItem = {
+    id: event.id,
+    type: 'evidence_modified',
+    userId: `user-${userId}`,
+    userName: data.user_name || data.created_by || `User ${userId}`,
+    userAvatar: '',
+    timestamp: data.time,
+    content: ''
+  };
+  
+  switch(event.type) {
+    case 'evidence_added':
+      return { ...activity, type: 'evidence_added', content: 'Added new evidence',
+        itemId: data.evidence_number, itemName: data.description };
+    case 'custody_changed':
+      return { ...activity, content: 'Transferred custody of evidence',
+        itemId: String(data.evidence_id), itemName: data.reason };
+    case 'evidence_analyzed':
+      return { ...activity, content: 'Recorded evidence analysis',
+        itemId: String(data.evidence_id), itemName: data.analysis_method };
+    case 'note_added':
+      return { ...activity, type: 'note_added', content: 'Added case note',
+        itemId: String(data.id), itemName: data.note_text };
+    case 'timeline_event_added':
+      return { ...activity, type: 'timeline_event_added', content: 'Added timeline event',
+        itemId: String(data.id), itemName: data.event_description };
+    case 'analysis_completed':
+      return { ...activity, type: 'report_generated', content: `Completed ${data.analyzer} analysis`,
+        itemId: data.report_id ? String(data.report_id) : undefined };
+    case 'report_added':
+      return { ...activity, type: 'report_generated', content: 'Created analysis report',
+        itemId: String(data.report_id), itemName: data.title };
+    default:
+      return activity;
+  }
+};
+
 const ActivityFeed: React.FC<ActivityFeedProps> = ({ caseId }) => {
   const [activities, setActivities] = useState<ActivityItem[]>([]);
   const [filteredActivities, setFilteredActivities] = useState<ActivityItem[]>([]);
@@ -90,6 +132,7 @@ const ActivityFeed: React.FC<ActivityFeedProps> = ({ caseId }) => {
   const [searchQuery, setSearchQuery] = useState('');
   const [sortOrder, setSortOrder] = useState<'newest' | 'oldest'>('newest');
   const [autoRefresh, setAutoRefresh] = useState<boolean>(true);
+  const [reloadCount, setReloadCount] = useState(0);
   
   useEffect(() => {
     // In a real app, this would be an API call
@@ -217,22 +260,15 @@ const ActivityFeed: React.FC<ActivityFeedProps> = ({ caseId }) => {
     };
     
     fetchActivities();
-    
-    // Set up auto-refresh interval if enabled
-    let refreshInterval: NodeJS.Timeout | null = null;
-    
-    if (autoRefresh) {
-      refreshInterval = setInterval(() => {
-        fetchActivities();
-      }, 30000); // Refresh every 30 seconds
-    }
-    
-    return () => {
-      if (refreshInterval) {
-        clearInterval(refreshInterval);
-      }
-    };
-  }, [caseId, autoRefresh]);
+  }, [caseId, reloadCount]);
+  
+  // New activity is pushed by the server instead of re-fetching the whole feed on a timer
+  useCaseEvents(
+    caseId,
+    event => setActivities(current => [activityFromEvent(event), ...current]),
+    () => setReloadCount(count => count + 1),
+    autoRefresh
+  );
   
   // Apply filters and search whenever dependencies change
   useEffect(() => {
@@ -315,11 +351,7 @@ const ActivityFeed: React.FC<ActivityFeedProps> = ({ caseId }) => {
   };
   
   const handleRefresh = () => {
-    // In a real app, this would call the API again
-    setLoading(true);
-    setTimeout(() => {
-      setLoading(false);
-    }, 1000);
+    setReloadCount(count => count + 1);
   };
   
   return (
@@ -341,7 +373,7 @@ const ActivityFeed: React.FC<ActivityFeedProps> = ({ caseId }) => {
               onChange={() => setAutoRefresh(!autoRefresh)}
             />
             <label className="form-check-label" htmlFor="autoRefreshToggle">
-              Auto-refresh
+              Live updates
             </label>
           </div>
           <button 
@@ -526,15 +558,17 @@ const ActivityFeed: React.FC<ActivityFeedProps> = ({ caseId }) => {
                       <button className="btn btn-sm btn-link p-0">View Details</button>
                     </div>
                   </div>
-                  <div>
-                    <img 
-                      src={activity.userAvatar} 
-                      alt={activity.userName} 
-                      className="rounded-circle"
-                      width="32"
-                      height="32"
-                    />
-                  </div>
+                  {activity.userAvatar && (
+                    <div>
+                      <img 
+                        src={activity.userAvatar} 
+                        alt={activity.userName} 
+                        className="rounded-circle"
+                        width="32"
+                        height="32"
+                      />
+                    </div>
+                  )}
                 </div>
               </div>
             ))}
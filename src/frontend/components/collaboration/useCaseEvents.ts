@@ -0,0 +1,60 @@
+import { useEffect, useRef } from 'react';
+import axios from 'axios';
+
+export type CaseEventType = 'evidence_added' | 'custody_changed' | 'evidence_analyzed' |
+  'note_added' | 'timeline_event_added' | 'analysis_completed' | 'report_added';
+
+export interface CaseEvent {
+  id: string;
+  type: CaseEventType;
+  data: { case_id: number; time: string; [key: string]: any };
+}
+
+const CASE_EVENT_TYPES: CaseEventType[] = [
+  'evidence_added', 'custody_changed', 'evidence_analyzed',
+  'note_added', 'timeline_event_added', 'analysis_completed', 'report_added'
+];
+
+// Subscribes to a case's server-sent event stream. EventSource reconnects on its own
+// and resumes from the last event it received; onResync is called when the server
+// could not replay what was missed and the caller should reload its lists once.
+const useCaseEvents = (
+  caseId: string | undefined,
+  onEvent: (event: CaseEvent) => void,
+  onResync?: () => void,
+  enabled: boolean = true
+) => {
+  // Keep the latest callbacks without reopening the stream on every render
+  const handlers = useRef({ onEvent, onResync });
+  handlers.current = { onEvent, onResync };
+
+  useEffect(() => {
+    if (!caseId || !enabled || typeof EventSource === 'undefined') {
+      return;
+    }
+
+    // EventSource cannot send an Authorization header, so the token goes in the query string
+    const token = localStorage.getItem('token') || '';
+    const source = new EventSource(
+      `${axios.defaults.baseURL || ''}/api/case/${caseId}/events?access_token=${encodeURIComponent(token)}`
+    );
+
+    const listeners = CASE_EVENT_TYPES.map(type => {
+      const listener = (message: MessageEvent) => {
+        handlers.current.onEvent({ id: message.lastEventId, type, data: JSON.parse(message.data) });
+      };
+      source.addEventListener(type, listener as EventListener);
+      return { type, listener };
+    });
+    const resyncListener = () => handlers.current.onResync && handlers.current.onResync();
+    source.addEventListener('resync', resyncListener);
+
+    return () => {
+      listeners.forEach(({ type, listener }) => source.removeEventListener(type, listener as EventListener));
+      source.removeEventListener('resync', resyncListener);
+      source.close();
+    };
+  }, [caseId, enabled]);
+};
+
+export default useCaseEvents;
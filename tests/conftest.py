@@ -0,0 +1,56 @@
+import os
+import sys
+
+import pytest
+from flask import Flask
+
+# Add the project root directory to Python's path
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, project_root)
+
+from src.database.db_init import db, init_db
+from src.backend.api.evidence_api import evidence_bp
+from src.backend.api.case_api import case_bp
+from src.backend.api.suspect_api import suspect_bp
+from src.backend.api.analysis_api import analysis_bp
+from src.backend.api.auth_api import auth_bp
+from src.backend.api.audit_api import audit_bp
+from src.backend.api.graph_api import graph_bp
+from src.backend.models.user_model import User, Role
+from src.backend.utils.auth import generate_token
+from src.backend.utils.serialization import ApiJSONProvider
+from src.backend.utils.case_events import init_case_events
+from src.benchmarks.load_test import seed_database
+
+@pytest.fixture(scope='session')
+def app(tmp_path_factory):
+    """The API, set up as server.py does, on a fresh SQLite database seeded with a few synthetic cases"""
+    app = Flask(__name__)
+    app.json = ApiJSONProvider(app)
+    app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}"
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['JWT_SECRET_KEY'] = 'test-secret-key-for-the-api-test-suite'
+    app.config['TESTING'] = True
+    init_db(app)
+    init_case_events(app)
+    app.register_blueprint(evidence_bp, url_prefix='/api/evidence')
+    app.register_blueprint(case_bp, url_prefix='/api/case')
+    app.register_blueprint(suspect_bp, url_prefix='/api/suspect')
+    app.register_blueprint(analysis_bp, url_prefix='/api/analysis')
+    app.register_blueprint(auth_bp, url_prefix='/api/auth')
+    app.register_blueprint(audit_bp, url_prefix='/api/audit')
+    app.register_blueprint(graph_bp, url_prefix='/api/graph')
+    with app.app_context():
+        seed_database(cases=3, evidence_per_case=3, suspects_per_case=2, links_per_suspect=1, investigators=2)
+    return app
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+@pytest.fixture
+def admin_headers(app):
+    """Authorization header for the seeded administrator"""
+    with app.app_context():
+        admin = User.query.join(Role).filter(Role.name == 'Administrator').first()
+        return {'Authorization': f'Bearer {generate_token(admin)}'}
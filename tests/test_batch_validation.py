@@ -0,0 +1,55 @@
+def _report_id(client, headers):
+    response = client.post('/api/analysis/analyze/comprehensive', headers=headers, json={'case_id': 1})
+    assert response.status_code == 201
+    return response.get_json()['report_id']
+
+def test_evidence_batch_rejects_bad_items_individually(client, admin_headers):
+    base = {'case_id': 1, 'evidence_type': 'physical', 'description': 'Glove',
+            'collection_date': '2024-01-01T00:00:00'}
+    items = [
+        {**base, 'location_found': 'x' * 201},
+        {**base, 'collector_id': 99999},
+        {**base, 'is_key_evidence': 'yes'},
+        {**base, 'description': None},
+        {**base, 'collector_id': '1'},
+        base
+    ]
+    response = client.post('/api/evidence/batch', headers=admin_headers, json={'items': items, 'mode': 'partial'})
+    assert response.status_code == 207
+    results = response.get_json()['results']
+    assert [result['status'] for result in results] == ['error', 'error', 'error', 'error', 'created', 'created']
+    assert results[0]['message'] == 'location_found must be at most 200 characters'
+    assert results[1]['message'] == 'Collector not found'
+
+def test_analysis_batches_reject_bad_items_individually(client, admin_headers):
+    report_id = _report_id(client, admin_headers)
+
+    response = client.post(f'/api/analysis/reports/{report_id}/patterns/batch', headers=admin_headers, json={
+        'mode': 'partial',
+        'items': [{'pattern_name': 'p' * 101, 'description': 'd'},
+                  {'pattern_name': 'Repeat', 'description': 'd', 'confidence_score': 'high'},
+                  {'pattern_name': 'Repeat', 'description': 'd', 'confidence_score': 0.8}]
+    })
+    assert response.status_code == 207
+    assert [result['status'] for result in response.get_json()['results']] == ['error', 'error', 'created']
+
+    correlation = {'evidence_a_id': 1, 'evidence_b_id': 2, 'correlation_type': 'temporal',
+                   'correlation_strength': 0.5, 'description': 'd'}
+    response = client.post(f'/api/analysis/reports/{report_id}/correlations/batch', headers=admin_headers, json={
+        'mode': 'partial',
+        'items': [{**correlation, 'correlation_strength': True},
+                  {**correlation, 'detected_by': 'm' * 101},
+                  correlation]
+    })
+    assert response.status_code == 207
+    assert [result['status'] for result in response.get_json()['results']] == ['error', 'error', 'created']
+
+    assessment = {'suspect_id': 1, 'hypothesis': 'Present at the scene', 'probability_score': 0.4}
+    response = client.post(f'/api/analysis/reports/{report_id}/probabilities/batch', headers=admin_headers, json={
+        'mode': 'partial',
+        'items': [{**assessment, 'probability_score': '0.4'},
+                  {**assessment, 'confidence_interval': 'c' * 51},
+                  assessment]
+    })
+    assert response.status_code == 207
+    assert [result['status'] for result in response.get_json()['results']] == ['error', 'error', 'created']
@@ -0,0 +1,16 @@
+def test_custody_change_with_string_user_id_keeps_chain_valid(client, admin_headers):
+    response = client.post('/api/evidence/1/custody', headers=admin_headers,
+                           json={'to_user_id': '1', 'witness_id': '2', 'reason': 'Transfer to lab'})
+    assert response.status_code == 201
+
+    response = client.post('/api/evidence/1/custody/verify', headers=admin_headers)
+    assert response.status_code == 200
+    assert response.get_json()['status'] == 'valid'
+
+def test_custody_change_rejects_unknown_user(client, admin_headers):
+    response = client.post('/api/evidence/1/custody', headers=admin_headers, json={'to_user_id': 99999})
+    assert response.status_code == 400
+
+def test_custody_change_rejects_non_integer_user_id(client, admin_headers):
+    response = client.post('/api/evidence/1/custody', headers=admin_headers, json={'to_user_id': [1]})
+    assert response.status_code == 400
@@ -0,0 +1,37 @@
+EVIDENCE = {'evidence_type': 'physical', 'description': 'Receipt', 'collection_date': '2024-01-01T00:00:00'}
+
+def _evidence_number(client, headers, case_id, evidence_number=None):
+    body = {**EVIDENCE, 'case_id': case_id}
+    if evidence_number:
+        body['evidence_number'] = evidence_number
+    response = client.post('/api/evidence/', headers=headers, json=body)
+    assert response.status_code == 201
+    return client.get(f"/api/evidence/{response.get_json()['evidence_id']}", headers=headers).get_json()['evidence_number']
+
+def test_generated_numbers_skip_numbers_already_used(client, admin_headers):
+    response = client.post('/api/case/', headers=admin_headers, json={'title': 'Numbering', 'crime_type': 'theft'})
+    assert response.status_code == 201
+    case_id = response.get_json()['case_id']
+
+    # The counter starts after the highest number in use, not after the item count
+    _evidence_number(client, admin_headers, case_id, f'E-{case_id}-050')
+    assert _evidence_number(client, admin_headers, case_id) == f'E-{case_id}-051'
+
+    # A number supplied ahead of the counter is skipped rather than reused
+    _evidence_number(client, admin_headers, case_id, f'E-{case_id}-052')
+    assert _evidence_number(client, admin_headers, case_id) == f'E-{case_id}-053'
+
+    # Batches reserve past this process's block of 20 and skip taken numbers too
+    _evidence_number(client, admin_headers, case_id, f'E-{case_id}-071')
+    response = client.post('/api/evidence/batch', headers=admin_headers,
+                           json={'items': [{**EVIDENCE, 'case_id': case_id}]})
+    assert response.status_code == 201
+    assert response.get_json()['results'][0]['evidence_number'] == f'E-{case_id}-072'
+
+def test_duplicate_supplied_number_is_rejected(client, admin_headers):
+    response = client.post('/api/evidence/', headers=admin_headers,
+                           json={**EVIDENCE, 'case_id': 2, 'evidence_number': 'DUP-1'})
+    assert response.status_code == 201
+    response = client.post('/api/evidence/', headers=admin_headers,
+                           json={**EVIDENCE, 'case_id': 2, 'evidence_number': 'DUP-1'})
+    assert response.status_code == 409
@@ -0,0 +1,11 @@
+from src.benchmarks.startup_budget import ROOT, DEFAULT_BUDGET_MS, measure, server_imports
+
+def test_startup_modules_follow_server():
+    support, blueprints = server_imports(ROOT)
+    assert {'src.database.sharding', 'src.database.replicas', 'src.backend.utils.case_events'} <= set(support)
+    assert ('src.backend.api.graph_api', 'graph_bp', '/api/graph') in blueprints
+
+def test_cold_start_defers_heavy_modules_and_meets_budget():
+    measurement = measure(ROOT, runs=3)
+    assert measurement['deferred_loaded'] == []
+    assert measurement['total_ms'] <= DEFAULT_BUDGET_MS